@@ -2,7 +2,7 @@
 탄소 인지형 스케줄링 애플리케이션을 위한 Prometheus 메트릭.
 """
 
-from prometheus_client import Counter, Gauge, CollectorRegistry
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry
 
 # 메트릭을 위한 커스텀 레지스트리 생성
 metrics_registry = CollectorRegistry()
@@ -94,7 +94,9 @@ def setup_metrics():
         'migration_data_transferred': migration_data_transferred_gb,
         'migrations_in_progress': migrations_in_progress,
         'migration_cost': migration_cost_gco2,
-        'appwrappers_by_cluster': appwrappers_by_cluster
+        'appwrappers_by_cluster': appwrappers_by_cluster,
+        'tenant_dispatch_latency': tenant_dispatch_latency_seconds,
+        'tenant_queue_depth': tenant_dispatch_queue_depth
     }
 
 # 마이그레이션 메트릭
@@ -131,3 +133,19 @@ appwrappers_by_cluster = Gauge(
     ['cluster'],
     registry=metrics_registry
 )
+
+# 테넌트별 배포 메트릭
+tenant_dispatch_latency_seconds = Histogram(
+    'tenant_dispatch_latency_seconds',
+    'Time from AppWrapper submission to Job creation per tenant',
+    ['tenant'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200),
+    registry=metrics_registry
+)
+
+tenant_dispatch_queue_depth = Gauge(
+    'tenant_dispatch_queue_depth',
+    'Number of ready AppWrappers waiting for dispatch per tenant',
+    ['tenant'],
+    registry=metrics_registry
+)
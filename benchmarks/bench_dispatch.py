@@ -0,0 +1,109 @@
+"""
+Dispatcher 벤치마크
+API 왕복 지연이 있는 fake Spoke API에 대해 동시 실행 한도별 배포 처리량 측정
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_dispatch.py --jobs 1000 --clusters 3 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict
+from hub.dispatcher import HubDispatcher
+from hub.models import ClusterInfo, ClusterResources, SchedulingPlan
+from hub.store import HubStore
+from benchmarks.bench_store import make_appwrapper, make_decision
+
+# (전체 한도, 클러스터별 한도)
+LIMITS = [(1, 1), (16, 4), (64, 16), (256, 64)]
+
+
+class FakeBatchApi:
+    """
+    요청마다 latency만큼 걸리는 batch/v1 Jobs API 대역
+    capacity를 넘는 동시 요청은 API 서버 처리 한도처럼 대기시킨다.
+    """
+
+    def __init__(self, latency: float, capacity: int):
+        self.latency = latency
+        self._capacity = threading.Semaphore(capacity)
+
+    def create_namespaced_job(self, namespace: str, body):
+        with self._capacity:
+            time.sleep(self.latency)
+        return body
+
+
+async def bench_limits(
+    jobs: int,
+    clusters: int,
+    latency: float,
+    capacity: int,
+    max_concurrency: int,
+    cluster_concurrency: int
+) -> Dict[str, float]:
+    """
+    배포 사이클 1회의 처리량 측정
+
+    Args:
+        jobs: 배포할 AppWrapper 수
+        clusters: Spoke 클러스터 수
+        latency: Job 생성 요청 1회의 지연 (초)
+        capacity: 클러스터 API 서버가 동시에 처리하는 요청 수
+        max_concurrency: Dispatcher 전체 한도
+        cluster_concurrency: Dispatcher 클러스터별 한도
+    """
+    names = [f"C{i}" for i in range(clusters)]
+    store = HubStore()
+    for name in names:
+        await store.update_cluster_info(ClusterInfo(
+            name=name, geolocation=name, carbon_intensity=100,
+            resources=ClusterResources(cpu_available=1e6, cpu_total=1e6, mem_available_gb=1e6, mem_total_gb=1e6),
+            kubeconfig_context=name
+        ))
+    for i in range(jobs):
+        await store.add_appwrapper(make_appwrapper(i))
+    decisions = [make_decision(i, names[i % clusters]) for i in range(jobs)]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=time.time(), decisions={d.job_id: d for d in decisions})
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan),
+        max_concurrency=max_concurrency, cluster_concurrency=cluster_concurrency
+    )
+    for name in names:
+        dispatcher.client_pool.register(name, FakeBatchApi(latency, capacity))
+
+    started = time.perf_counter()
+    await dispatcher.run_dispatch_cycle()
+    elapsed = time.perf_counter() - started
+    assert (await store.get_stats())["running"] == jobs
+
+    return {"cycle_s": elapsed, "jobs_per_s": jobs / elapsed}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Dispatcher benchmark")
+    parser.add_argument("--jobs", type=int, default=1000, help="배포할 AppWrapper 수")
+    parser.add_argument("--clusters", type=int, default=3, help="Spoke 클러스터 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Job 생성 요청 지연 (ms)")
+    parser.add_argument("--capacity", type=int, default=32, help="클러스터 API 서버 동시 처리 한도")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    for max_concurrency, cluster_concurrency in LIMITS:
+        result = await bench_limits(
+            args.jobs, args.clusters, args.latency_ms / 1000, args.capacity,
+            max_concurrency, cluster_concurrency
+        )
+        label = f"total={max_concurrency}/cluster={cluster_concurrency}"
+        print(f"{label:28s} " + "  ".join(f"{k}={v:,.2f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
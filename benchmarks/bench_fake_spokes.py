@@ -0,0 +1,136 @@
+"""
+Fake Spoke 부하 벤치마크
+in-process fake Spoke API(hub.fake_spoke)에 대해 실제 Dispatcher(비동기 전송)와 완료 추적 informer를 돌려
+배포 처리량과 제출부터 완료 반영까지의 시간 측정
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_fake_spokes.py --jobs 10000 --spokes 20 --latency-ms 5
+    PYTHONPATH=. python benchmarks/bench_fake_spokes.py --jobs 10000 --spokes 20 --indexed-batch 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict
+from hub.dispatcher import HubDispatcher
+from hub.fake_spoke import FakeSpoke, serve_fake_spokes, write_kubeconfig
+from hub.informer import CompletionTracker
+from hub.kube_clients import KubeClientPool
+from hub.models import ClusterInfo, ClusterResources, SchedulingPlan
+from hub.store import HubStore
+from benchmarks.bench_store import make_appwrapper, make_decision
+
+
+async def bench_fake_spokes(
+    jobs: int,
+    spokes: int,
+    latency: float,
+    job_seconds: float,
+    error_rate: float,
+    indexed_batch: int,
+    max_concurrency: int,
+    cluster_concurrency: int
+) -> Dict[str, float]:
+    """
+    배포 사이클 1회와 모든 Job 완료 반영까지 측정
+
+    Args:
+        jobs: AppWrapper 수
+        spokes: fake Spoke 수
+        latency: 요청별 API 지연 (초)
+        job_seconds: Pod 실행 시간 (초)
+        error_rate: Spoke별 요청 오류 확률
+        indexed_batch: Indexed Job 묶음 크기 (0이면 개별 Job)
+        max_concurrency: Dispatcher 전체 한도
+        cluster_concurrency: Dispatcher 클러스터별 한도
+    """
+    names = [f"C{i}" for i in range(spokes)]
+    fakes = {
+        name: FakeSpoke(name, nodes=8, node_cpu=64.0, node_mem_gb=256.0, job_duration=job_seconds,
+                        latency=latency, error_rate=error_rate, seed=i)
+        for i, name in enumerate(names)
+    }
+
+    store = HubStore()
+    for name in names:
+        await store.update_cluster_info(ClusterInfo(
+            name=name, geolocation=name, carbon_intensity=100,
+            resources=ClusterResources(cpu_available=512, cpu_total=512, mem_available_gb=2048, mem_total_gb=2048),
+            kubeconfig_context=f"fake-{name.lower()}"
+        ))
+    for i in range(jobs):
+        await store.add_appwrapper(make_appwrapper(i))
+    decisions = [make_decision(i, names[i % spokes]) for i in range(jobs)]
+    await store.apply_decisions(decisions)
+    plan = SchedulingPlan(version=1, created_at=time.time(), decisions={d.job_id: d for d in decisions})
+
+    async with serve_fake_spokes(fakes) as base_url:
+        with tempfile.TemporaryDirectory() as tmp:
+            kubeconfig = os.path.join(tmp, "config")
+            write_kubeconfig(kubeconfig, base_url, fakes)
+            pool = KubeClientPool(config_file=kubeconfig, pool_maxsize=cluster_concurrency)
+            scheduler = SimpleNamespace(
+                current_plan=plan,
+                mark_cluster_unavailable=lambda cluster, until: None,
+                mark_cluster_available=lambda cluster: None
+            )
+            dispatcher = HubDispatcher(
+                store=store, scheduler=scheduler, client_pool=pool,
+                max_concurrency=max_concurrency, cluster_concurrency=cluster_concurrency,
+                indexed_batch_size=indexed_batch, backoff_base=0.05, backoff_max=0.5
+            )
+            tracker = CompletionTracker(store=store, client_pool=pool, resync_interval=60)
+            await tracker.sync_informers()
+
+            started = time.perf_counter()
+            cycles = 0
+            # 오류 주입 시 백오프가 끝난 클러스터에 다시 배포
+            while (await store.get_stats())["running"] + (await store.get_stats())["completed"] < jobs:
+                await dispatcher.run_dispatch_cycle()
+                cycles += 1
+                if cycles > 1:
+                    await asyncio.sleep(0.05)
+            dispatched = time.perf_counter() - started
+
+            while (await store.get_stats())["completed"] < jobs:
+                await asyncio.sleep(0.05)
+            finished = time.perf_counter() - started
+
+            await tracker.stop()
+            await pool.stop()
+
+    return {
+        "dispatch_s": dispatched,
+        "jobs_per_s": jobs / dispatched,
+        "cycles": cycles,
+        "all_completed_s": finished,
+        "api_requests": sum(fake.requests for fake in fakes.values()),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Dispatcher + informer benchmark against fake spokes")
+    parser.add_argument("--jobs", type=int, default=10000, help="AppWrapper 수")
+    parser.add_argument("--spokes", type=int, default=20, help="fake Spoke 수")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="요청별 API 지연 (ms)")
+    parser.add_argument("--job-seconds", type=float, default=2.0, help="Pod 실행 시간 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="요청 오류 주입 확률")
+    parser.add_argument("--indexed-batch", type=int, default=0, help="Indexed Job 묶음 크기 (0: 개별 Job)")
+    parser.add_argument("--concurrency", type=int, default=256, help="Dispatcher 전체 한도")
+    parser.add_argument("--cluster-concurrency", type=int, default=16, help="Dispatcher 클러스터별 한도")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    result = await bench_fake_spokes(
+        args.jobs, args.spokes, args.latency_ms / 1000, args.job_seconds, args.error_rate,
+        args.indexed_batch, args.concurrency, args.cluster_concurrency
+    )
+    print("  ".join(f"{k}={v:,.2f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
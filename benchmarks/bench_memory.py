@@ -0,0 +1,88 @@
+"""
+AppWrapper 메모리 벤치마크
+pydantic AppWrapper와 store 레코드(AppWrapperRecord)의 작업당 메모리 비교
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_memory.py --jobs 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import tracemalloc
+from typing import Callable
+from hub.models import AppWrapper, AppWrapperSpec, SchedulingDecision
+from hub.records import AppWrapperRecord
+from hub.store import HubStore
+
+CLUSTERS = ["KR", "JP", "CN"]
+
+
+def make_appwrapper(index: int) -> AppWrapper:
+    """제출 직후 형태의 AppWrapper (API 요청마다 새 객체)"""
+    return AppWrapper(
+        metadata={"user": f"team-{index % 3}", "submitted_at": str(1_700_000_000.0 + index)},
+        spec=AppWrapperSpec(
+            job_id=f"bench-{index:07d}",
+            cpu=1.0,
+            mem_gb=2.0,
+            runtime_minutes=30,
+            deadline_minutes=240,
+            affinity_clusters=list(CLUSTERS)
+        )
+    )
+
+
+def measure(jobs: int, build: Callable[[], object]) -> float:
+    """build()가 남긴 메모리를 작업당 바이트로 측정"""
+    gc.collect()
+    tracemalloc.start()
+    retained = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current / jobs
+
+
+async def fill_store(jobs: int) -> HubStore:
+    """store에 제출 후 절반에 스케줄링 결정 적용"""
+    store = HubStore()
+    for i in range(jobs):
+        await store.add_appwrapper(make_appwrapper(i))
+    await store.apply_decisions([
+        SchedulingDecision(
+            job_id=f"bench-{i:07d}",
+            target_cluster=CLUSTERS[i % 3],
+            start_time_minutes=0,
+            estimated_co2_g=1.0,
+            reason="benchmark"
+        )
+        for i in range(0, jobs, 2)
+    ])
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AppWrapper memory benchmark")
+    parser.add_argument("--jobs", type=int, default=100000, help="AppWrapper 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    scale = 100000 / 1024 / 1024
+
+    per_model = measure(args.jobs, lambda: [make_appwrapper(i) for i in range(args.jobs)])
+    per_record = measure(
+        args.jobs,
+        lambda: [AppWrapperRecord.from_model(make_appwrapper(i)) for i in range(args.jobs)]
+    )
+    per_store = measure(args.jobs, lambda: asyncio.run(fill_store(args.jobs)))
+
+    print(f"pydantic AppWrapper  {per_model:8.0f} B/job  {per_model * scale:7.1f} MiB/100k")
+    print(f"AppWrapperRecord     {per_record:8.0f} B/job  {per_record * scale:7.1f} MiB/100k")
+    print(f"HubStore (+indexes)  {per_store:8.0f} B/job  {per_store * scale:7.1f} MiB/100k")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+HubStore shard 벤치마크
+shard 수별 동시 제출/수정 처리량과, 대량 스케줄링 결정 적용 중의 제출 지연 측정
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_shards.py --jobs 20000 --decisions 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List
+from hub.store import HubStore
+from benchmarks.bench_store import make_appwrapper, make_decision, percentiles
+
+SHARD_COUNTS = [1, 2, 4, 8, 16]
+
+
+async def bench_throughput(shards: int, jobs: int, concurrency: int) -> Dict[str, float]:
+    """
+    동시 제출 후 동시 수정(patch) 처리량
+
+    Args:
+        shards: shard 수
+        jobs: 제출할 AppWrapper 수
+        concurrency: 동시 클라이언트 수
+    """
+    store = HubStore(shards=shards)
+    appwrappers = [make_appwrapper(i) for i in range(jobs)]
+
+    async def submit(offset: int):
+        for appwrapper in appwrappers[offset::concurrency]:
+            await store.add_appwrapper(appwrapper)
+
+    def touch(aw):
+        aw.status.message = "touched"
+
+    async def update(offset: int):
+        for i in range(offset, jobs, concurrency):
+            await store.patch_appwrapper(f"bench-{i}", touch)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(i) for i in range(concurrency)))
+    submit_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(update(i) for i in range(concurrency)))
+    update_elapsed = time.perf_counter() - started
+
+    return {"submits_per_s": jobs / submit_elapsed, "updates_per_s": jobs / update_elapsed}
+
+
+async def bench_bulk_apply(shards: int, decisions: int, concurrency: int) -> Dict[str, float]:
+    """
+    대량 apply_decisions가 실행되는 동안 다른 클라이언트의 제출 지연
+
+    Args:
+        shards: shard 수
+        decisions: 한 번에 적용할 스케줄링 결정 수
+        concurrency: 동시에 제출하는 클라이언트 수
+    """
+    store = HubStore(shards=shards)
+    for i in range(decisions):
+        await store.add_appwrapper(make_appwrapper(i))
+    batch = [make_decision(i, "KR") for i in range(decisions)]
+
+    latencies: List[float] = []
+    applying = True
+
+    async def client(offset: int):
+        index = decisions + offset
+        while applying:
+            # 요청 도착부터 응답까지: 이벤트 루프 차례를 기다리는 시간 포함 (HTTP 요청 처리와 같은 조건)
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            await store.add_appwrapper(make_appwrapper(index))
+            latencies.append(time.perf_counter() - started)
+            index += concurrency
+
+    clients = [asyncio.create_task(client(i)) for i in range(concurrency)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await store.apply_decisions(batch)
+    apply_elapsed = time.perf_counter() - started
+    applying = False
+    await asyncio.gather(*clients)
+
+    result = {f"submit_{k}": v for k, v in percentiles(latencies).items()}
+    result["submit_max_ms"] = max(latencies) * 1e3
+    result["submits_during_apply"] = len(latencies)
+    result["apply_ms"] = apply_elapsed * 1e3
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="HubStore shard benchmark")
+    parser.add_argument("--jobs", type=int, default=20000, help="처리량 측정 AppWrapper 수")
+    parser.add_argument("--decisions", type=int, default=20000, help="한 번에 적용할 스케줄링 결정 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 클라이언트 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    for shards in SHARD_COUNTS:
+        result = await bench_throughput(shards, args.jobs, args.concurrency)
+        result.update(await bench_bulk_apply(shards, args.decisions, args.concurrency))
+        print(f"shards={shards:<3d} " + "  ".join(f"{k}={v:,.1f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+"""
+HubStore 벤치마크
+백엔드(memory, memory+WAL, sqlite)별 배치 제출 쓰기 지연, 조회 지연, WAL 복구 시간 측정
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_store.py --jobs 10000 --restore 1000000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+from hub.models import AppWrapper, AppWrapperSpec, SchedulingDecision
+from hub.store import HubStore
+from hub.sqlite_store import SqliteHubStore
+from hub.wal import WriteAheadLog
+
+# 측정 대상 백엔드: (이름, fsync 정책 또는 sqlite synchronous 설정)
+BACKENDS = [
+    ("memory", None),
+    ("wal", "never"),
+    ("wal", "interval"),
+    ("wal", "always"),
+    ("sqlite", "NORMAL"),
+    ("sqlite", "FULL"),
+]
+
+
+def make_appwrapper(index: int) -> AppWrapper:
+    """벤치마크용 AppWrapper"""
+    return AppWrapper(
+        metadata={"user": f"team-{index % 3}"},
+        spec=AppWrapperSpec(
+            job_id=f"bench-{index}",
+            cpu=1.0,
+            mem_gb=2.0,
+            runtime_minutes=30,
+            deadline_minutes=240
+        )
+    )
+
+
+def make_decision(index: int, cluster: str) -> SchedulingDecision:
+    """벤치마크용 스케줄링 결정"""
+    return SchedulingDecision(
+        job_id=f"bench-{index}",
+        target_cluster=cluster,
+        start_time_minutes=0,
+        estimated_co2_g=1.0,
+        reason="benchmark"
+    )
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 분포 (마이크로초)"""
+    ordered = sorted(samples)
+    return {
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p99_us": ordered[int(len(ordered) * 0.99)] * 1e6,
+        "mean_us": statistics.fmean(ordered) * 1e6,
+    }
+
+
+async def open_store(backend: str, option, data_dir: str):
+    """벤치마크용 store 생성"""
+    if backend == "sqlite":
+        return SqliteHubStore(os.path.join(data_dir, "hub.db"), synchronous=option)
+    store = HubStore()
+    if backend == "wal":
+        await store.open_wal(WriteAheadLog(data_dir, fsync=option))
+    return store
+
+
+async def timed(call) -> float:
+    """비동기 호출 소요 시간 (초)"""
+    started = time.perf_counter()
+    await call
+    return time.perf_counter() - started
+
+
+async def bench_backend(backend: str, option, jobs: int, concurrency: int) -> Dict[str, float]:
+    """
+    배치 제출 쓰기 지연과 주요 조회 지연 측정
+
+    Args:
+        backend: memory, wal, sqlite
+        option: fsync 정책 또는 sqlite synchronous 설정
+        jobs: 제출할 AppWrapper 수
+        concurrency: 동시에 제출하는 클라이언트 수
+    """
+    appwrappers = [make_appwrapper(i) for i in range(jobs)]
+    latencies: List[float] = []
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = await open_store(backend, option, data_dir)
+
+        async def client(offset: int):
+            for appwrapper in appwrappers[offset::concurrency]:
+                started = time.perf_counter()
+                await store.add_appwrapper(appwrapper)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        result = percentiles(latencies)
+        result["writes_per_s"] = jobs / elapsed
+
+        # 10%에 스케줄링 결정 적용 후 스케줄러/디스패처가 쓰는 조회 측정
+        decisions = [make_decision(i, "KR") for i in range(0, jobs, 10)]
+        result["apply_decisions_ms"] = await timed(store.apply_decisions(decisions)) * 1e3
+        result["pending_ms"] = await timed(store.get_pending_appwrappers()) * 1e3
+        result["dispatchable_ms"] = await timed(store.get_dispatchable_appwrappers()) * 1e3
+        result["stats_ms"] = await timed(store.get_stats()) * 1e3
+        await store.close()
+
+    return result
+
+
+async def bench_restore(records: int) -> Dict[str, float]:
+    """
+    스냅샷 + WAL 복구 시간 측정
+    절반은 스냅샷, 나머지 절반은 WAL 재생으로 복구
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = HubStore()
+        await store.open_wal(WriteAheadLog(data_dir, fsync="never", checkpoint_records=records * 2))
+        half = records // 2
+        for i in range(half):
+            await store.add_appwrapper(make_appwrapper(i))
+        await store.checkpoint()
+        for i in range(half, records):
+            await store.add_appwrapper(make_appwrapper(i))
+        await store._wal.close()
+
+        restored = HubStore()
+        started = time.perf_counter()
+        await restored.open_wal(WriteAheadLog(data_dir))
+        elapsed = time.perf_counter() - started
+        assert (await restored.get_stats())["total_appwrappers"] == records
+        await restored._wal.close()
+
+    return {"records": records, "restore_s": elapsed}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="HubStore benchmark")
+    parser.add_argument("--jobs", type=int, default=10000, help="제출할 AppWrapper 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 제출 클라이언트 수")
+    parser.add_argument("--restore", type=int, default=100000, help="복구 측정 레코드 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    for backend, option in BACKENDS:
+        result = await bench_backend(backend, option, args.jobs, args.concurrency)
+        label = f"{backend}/{option}" if option else backend
+        print(f"{label:16s} " + "  ".join(f"{k}={v:,.1f}" for k, v in result.items()))
+
+    result = await bench_restore(args.restore)
+    print(f"restore          records={result['records']:,}  restore_s={result['restore_s']:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""
+Kubernetes 클라이언트 전송 벤치마크
+로컬 fake API 서버(uvicorn)에 대해 동기(threaded) 클라이언트와 비동기(httpx) 클라이언트의
+Dispatcher 배포 처리량 비교
+
+사용법:
+    PYTHONPATH=. python benchmarks/bench_transport.py --jobs 2000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict
+import uvicorn
+from fastapi import FastAPI, Request
+from hub.dispatcher import HubDispatcher
+from hub.kube_clients import KubeClientPool
+from hub.models import ClusterInfo, ClusterResources, SchedulingPlan
+from hub.store import HubStore
+from benchmarks.bench_store import make_appwrapper, make_decision
+
+# (전체 한도, 클러스터별 한도)
+LIMITS = [(64, 16), (256, 64), (1024, 256)]
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: fake
+  cluster: {{server: "http://127.0.0.1:{port}"}}
+users:
+- name: bench
+  user: {{token: "bench"}}
+contexts:
+- name: fake
+  context: {{cluster: fake, user: bench}}
+current-context: fake
+"""
+
+
+def _serve_fake_api(sock: socket.socket, latency: float):
+    """Job 생성 요청마다 latency만큼 기다렸다가 201로 응답하는 fake API 서버"""
+    api = FastAPI()
+
+    @api.post("/apis/batch/v1/namespaces/{namespace}/jobs", status_code=201)
+    async def create_job(namespace: str, request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        return body
+
+    uvicorn.Server(uvicorn.Config(api, log_level="warning", backlog=4096)).run(sockets=[sock])
+
+
+def start_fake_api(latency: float) -> int:
+    """
+    fake API 서버를 별도 프로세스에서 시작 (클라이언트와 GIL을 나눠 쓰지 않도록)
+
+    Returns:
+        서버 포트
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    multiprocessing.Process(target=_serve_fake_api, args=(sock, latency), daemon=True).start()
+
+    # 서버가 요청을 받을 때까지 대기
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return port
+        except OSError:
+            time.sleep(0.05)
+
+
+async def bench_transport(
+    kubeconfig: str,
+    transport: str,
+    jobs: int,
+    clusters: int,
+    max_concurrency: int,
+    cluster_concurrency: int
+) -> Dict[str, float]:
+    """
+    배포 사이클 1회의 처리량 측정 (모든 클러스터가 같은 fake API 서버를 가리킴)
+
+    Args:
+        kubeconfig: fake API 서버를 가리키는 kubeconfig 경로
+        transport: "async" 또는 "threaded"
+        jobs: 배포할 AppWrapper 수
+        clusters: Spoke 클러스터 수
+        max_concurrency: Dispatcher 전체 한도
+        cluster_concurrency: Dispatcher 클러스터별 한도
+    """
+    names = [f"C{i}" for i in range(clusters)]
+    store = HubStore()
+    for name in names:
+        await store.update_cluster_info(ClusterInfo(
+            name=name, geolocation=name, carbon_intensity=100,
+            resources=ClusterResources(cpu_available=1e6, cpu_total=1e6, mem_available_gb=1e6, mem_total_gb=1e6),
+            kubeconfig_context="fake"
+        ))
+    for i in range(jobs):
+        await store.add_appwrapper(make_appwrapper(i))
+    decisions = [make_decision(i, names[i % clusters]) for i in range(jobs)]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=time.time(), decisions={d.job_id: d for d in decisions})
+    pool = KubeClientPool(config_file=kubeconfig, pool_maxsize=max_concurrency, transport=transport)
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan),
+        max_concurrency=max_concurrency, cluster_concurrency=cluster_concurrency,
+        client_pool=pool
+    )
+    dispatcher._running = True
+
+    started = time.perf_counter()
+    await dispatcher.run_dispatch_cycle()
+    elapsed = time.perf_counter() - started
+    threads = threading.active_count()
+    await dispatcher.stop()
+    assert (await store.get_stats())["running"] == jobs
+
+    return {"cycle_s": elapsed, "jobs_per_s": jobs / elapsed, "threads": threads}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Kubernetes client transport benchmark")
+    parser.add_argument("--jobs", type=int, default=2000, help="배포할 AppWrapper 수")
+    parser.add_argument("--clusters", type=int, default=4, help="Spoke 클러스터 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake API 서버 응답 지연 (ms)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    port = start_fake_api(args.latency_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kubeconfig = os.path.join(tmp, "config")
+        with open(kubeconfig, "w") as f:
+            f.write(KUBECONFIG.format(port=port))
+
+        for max_concurrency, cluster_concurrency in LIMITS:
+            for transport in ("threaded", "async"):
+                result = await bench_transport(
+                    kubeconfig, transport, args.jobs, args.clusters, max_concurrency, cluster_concurrency
+                )
+                label = f"{transport:8s} total={max_concurrency}/cluster={cluster_concurrency}"
+                print(f"{label:36s} " + "  ".join(f"{k}={v:,.2f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
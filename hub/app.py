@@ -4,20 +4,31 @@ Hub Cluster FastAPI 애플리케이션
 """
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import uvicorn
+import asyncio
+import json
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
+from urllib.parse import quote
+
+import httpx
 
 from hub.models import (
     AppWrapper, AppWrapperSpec, ClusterInfo, ClusterResources,
-    ClusterStatus, GateStatus
+    ClusterStatus, GateStatus, PartitionHandoff
 )
-from hub.store import hub_store
+from hub.store import HubStore, hub_store
 from hub.scheduler import hub_scheduler
 from hub.dispatcher import hub_dispatcher
+from hub.informer import completion_tracker
+from hub.garbage_collector import job_garbage_collector, matches, parse_selector
+from hub.partition import PartitionManager
+from hub.archive import JobArchive, JobArchiver
+from hub.wal import WriteAheadLog
+from hub.watch import WatchExpiredError
 from app.carbon_client import CarbonClient
 from app.metrics import setup_metrics, metrics_registry
 import os
@@ -31,6 +42,88 @@ logger = logging.getLogger(__name__)
 
 # 전역 인스턴스
 carbon_client: CarbonClient = None
+# 샤딩 모드 (HUB_LEASE_DB 설정 시)에서만 생성
+partition_manager: Optional[PartitionManager] = None
+# 보존 모드 (HUB_ARCHIVE_DIR 설정 시)에서만 생성
+job_archiver: Optional[JobArchiver] = None
+
+
+# ==================== 샤딩 모드 ====================
+
+async def forward_to_hub(hub_id: str, path: str, payload: Dict) -> Dict:
+    """
+    다른 Hub 프로세스로 요청 전달
+
+    Args:
+        hub_id: 대상 Hub ID
+        path: API 경로
+        payload: JSON 본문
+
+    Returns:
+        대상 Hub의 응답
+    """
+    url = partition_manager.url_of(hub_id)
+    if not url:
+        raise HTTPException(status_code=503, detail=f"Hub {hub_id} is not reachable")
+
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(f"{url}{path}", json=payload)
+            response.raise_for_status()
+            return response.json()
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to forward {path} to {hub_id}: {e}")
+        raise HTTPException(status_code=502, detail=f"Failed to forward to hub {hub_id}")
+
+
+async def handoff_partition(gained: Set[str], lost: Set[str]):
+    """
+    파티션 소유권 변경 시 상태 이관
+
+    잃은 클러스터의 ClusterInfo와, 이제 다른 Hub 소유가 된 미배포 AppWrapper를
+    새 소유 Hub로 넘긴다. 잃은 클러스터에서 실행 중인 AppWrapper도 함께 넘긴다:
+    ClusterInfo를 지우면 이 Hub의 CompletionTracker가 그 클러스터의 informer를 중지하므로,
+    새 소유 Hub의 informer가 Job 종료를 반영해야 한다.
+    """
+    handoffs: Dict[str, PartitionHandoff] = {}
+    moved: Dict[str, str] = {}
+
+    for cluster_name in lost:
+        cluster_info = await hub_store.get_cluster_info(cluster_name)
+        owner = partition_manager.owner_of(cluster_name)
+        if cluster_info and owner and owner != partition_manager.hub_id:
+            handoffs.setdefault(owner, PartitionHandoff()).clusters.append(cluster_info)
+            moved[cluster_name] = owner
+
+    for aw in await hub_store.get_running_appwrappers():
+        owner = moved.get(aw.status.cluster)
+        if owner:
+            handoffs[owner].appwrappers.append(aw.to_model())
+
+    for aw in await hub_store.get_pending_appwrappers():
+        owner = partition_manager.route(aw.spec)
+        if owner is None and not partition_manager.owned_clusters:
+            # 소유 클러스터가 없으면 coordinator에게 재배정 요청
+            owner = partition_manager.coordinator_id
+        if owner and owner != partition_manager.hub_id:
+            handoffs.setdefault(owner, PartitionHandoff()).appwrappers.append(aw.to_model())
+
+    for owner, handoff in handoffs.items():
+        try:
+            await forward_to_hub(owner, "/hub/partition/adopt", handoff.dict())
+        except HTTPException:
+            # 실패 시 로컬에 유지하고 다음 재배치 때 재시도
+            continue
+
+        for cluster_info in handoff.clusters:
+            await hub_store.remove_cluster_info(cluster_info.name)
+        for aw in handoff.appwrappers:
+            await hub_store.remove_appwrapper(aw.spec.job_id)
+
+        logger.info(
+            f"Handed off {len(handoff.clusters)} clusters and "
+            f"{len(handoff.appwrappers)} AppWrappers to {owner}"
+        )
 
 
 @asynccontextmanager
@@ -39,12 +132,33 @@ async def lifespan(app: FastAPI):
     Hub Cluster 앱 라이프사이클 관리
     """
     # 시작
-    global carbon_client
+    global carbon_client, partition_manager, job_archiver
 
     logger.info("=" * 60)
     logger.info("Starting CASPIAN Hub Cluster")
     logger.info("=" * 60)
 
+    # 영속화: 데이터 디렉토리가 지정되면 스냅샷 + WAL에서 상태 복구
+    # (sqlite 백엔드는 자체적으로 영속화하므로 메모리 백엔드에만 적용)
+    data_dir = os.getenv("HUB_DATA_DIR")
+    if data_dir and isinstance(hub_store, HubStore):
+        await hub_store.open_wal(WriteAheadLog(
+            data_dir,
+            fsync=os.getenv("HUB_WAL_FSYNC", "always"),
+            fsync_interval=float(os.getenv("HUB_WAL_FSYNC_INTERVAL", "0.05")),
+            checkpoint_records=int(os.getenv("HUB_WAL_CHECKPOINT_RECORDS", "100000"))
+        ))
+
+    # 보존: 종료 후 HUB_ARCHIVE_TTL이 지난 완료/실패 작업을 압축 아카이브로 이동
+    archive_dir = os.getenv("HUB_ARCHIVE_DIR")
+    if archive_dir:
+        job_archiver = JobArchiver(
+            JobArchive(archive_dir, segment_records=int(os.getenv("HUB_ARCHIVE_SEGMENT_RECORDS", "10000"))),
+            ttl_seconds=float(os.getenv("HUB_ARCHIVE_TTL", "3600")),
+            interval=float(os.getenv("HUB_ARCHIVE_INTERVAL", "60"))
+        )
+        await job_archiver.start()
+
     # CarbonClient 초기화
     api_key = os.getenv("ELECTRICITYMAP_API_KEY", "your_api_key_here")
     zones_str = os.getenv("CARBON_ZONES", "KR,JP,CN")
@@ -75,24 +189,42 @@ async def lifespan(app: FastAPI):
                                 matched = False
                                 for cluster_info in all_clusters:
                                     if cluster_info.geolocation == zone_name:
-                                        cluster_info.carbon_intensity = ci
-                                        cluster_info.last_updated = time.time()
-                                        await hub_store.update_cluster_info(cluster_info)
+                                        await hub_store.update_cluster_info(cluster_info.model_copy(
+                                            update={"carbon_intensity": ci, "last_updated": time.time()}
+                                        ))
                                         logger.info(f"Synced {cluster_info.name} ({zone_name}): {ci} gCO2/kWh")
                                         matched = True
                                 if not matched:
                                     logger.warning(f"No cluster found for zone {zone_name}")
+                    if partition_manager:
+                        await partition_manager.publish_clusters(all_clusters)
             except Exception as e:
                 logger.error(f"Error in carbon sync: {e}", exc_info=True)
 
     sync_task = asyncio.create_task(sync_cluster_info())
 
+    # 샤딩 모드: 여러 Hub 프로세스가 클러스터 파티션을 나눠 소유
+    lease_db = os.getenv("HUB_LEASE_DB")
+    if lease_db:
+        port = os.getenv("HUB_PORT", "8080")
+        partition_manager = PartitionManager(
+            hub_id=os.getenv("HUB_ID", f"hub-{port}"),
+            hub_url=os.getenv("HUB_URL", f"http://localhost:{port}"),
+            lease_db=lease_db,
+            lease_ttl=float(os.getenv("HUB_LEASE_TTL", "15"))
+        )
+        partition_manager.on_change(handoff_partition)
+        await partition_manager.start()
+
     # Hub Scheduler 시작
     await hub_scheduler.start()
 
     # Hub Dispatcher 시작
     await hub_dispatcher.start()
 
+    # Spoke Job 완료 추적 (list+watch informer)
+    await completion_tracker.start()
+
     logger.info("Hub Cluster started successfully")
 
     yield
@@ -106,12 +238,22 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    await completion_tracker.stop()
+    await job_garbage_collector.stop()
     await hub_scheduler.stop()
     await hub_dispatcher.stop()
 
+    if partition_manager:
+        await partition_manager.stop()
+
+    if job_archiver:
+        await job_archiver.stop()
+
     if carbon_client:
         await carbon_client.stop_polling()
 
+    await hub_store.close()
+
     logger.info("Hub Cluster shutdown complete")
 
 
@@ -151,6 +293,20 @@ async def register_cluster(cluster_info: ClusterInfo):
     if cluster_info.last_updated is None:
         cluster_info.last_updated = time.time()
 
+    # 샤딩 모드: 클러스터를 소유한 Hub로 전달
+    if partition_manager:
+        owner = await partition_manager.register_cluster(cluster_info.name)
+        if owner and owner != partition_manager.hub_id:
+            await forward_to_hub(
+                owner, "/hub/partition/adopt",
+                PartitionHandoff(clusters=[cluster_info]).dict()
+            )
+            return {
+                "status": "registered",
+                "cluster": cluster_info.name,
+                "hub": owner
+            }
+
     await hub_store.update_cluster_info(cluster_info)
     logger.info(f"Registered cluster: {cluster_info.name}")
 
@@ -183,21 +339,46 @@ async def get_cluster(cluster_name: str):
 # ==================== AppWrapper 관리 ====================
 
 @app.post("/hub/appwrappers")
-async def submit_appwrapper(spec: AppWrapperSpec):
+async def submit_appwrapper(spec: AppWrapperSpec, user: str = "default"):
     """
     AppWrapper 제출
 
     사용자가 작업을 제출하면 Hub가 스케줄링
+    user(쿼리 파라미터)는 테넌트로, Dispatcher가 테넌트별 가중치에 따라 공정하게 배포한다.
     """
     # AppWrapper 생성
     appwrapper = AppWrapper(
         metadata={
             "submitted_at": str(time.time()),
-            "user": "default"
+            "user": user
         },
         spec=spec
     )
 
+    # 샤딩 모드: affinity 기준 소유 Hub로 전달, 여러 파티션에 걸치면 coordinator가 결정
+    if partition_manager:
+        owner = partition_manager.route(spec)
+        if owner is None:
+            coordinator = partition_manager.coordinator_id
+            if not partition_manager.is_coordinator and coordinator != partition_manager.hub_id:
+                return await forward_to_hub(coordinator, f"/hub/appwrappers?user={quote(user)}", spec.dict())
+            owner = await partition_manager.assign(spec)
+
+        if owner and owner != partition_manager.hub_id:
+            appwrapper.metadata["partition_owner"] = owner
+            await forward_to_hub(
+                owner, "/hub/partition/adopt",
+                PartitionHandoff(appwrappers=[appwrapper]).dict()
+            )
+            return {
+                "status": "submitted",
+                "job_id": spec.job_id,
+                "hub": owner,
+                "message": "AppWrapper will be scheduled in next cycle"
+            }
+
+        appwrapper.metadata["partition_owner"] = partition_manager.hub_id
+
     job_id = await hub_store.add_appwrapper(appwrapper)
 
     logger.info(f"AppWrapper submitted: {job_id}")
@@ -211,39 +392,204 @@ async def submit_appwrapper(spec: AppWrapperSpec):
 
 @app.get("/hub/appwrappers")
 async def list_appwrappers():
-    """모든 AppWrapper 조회"""
-    appwrappers = await hub_store.get_all_appwrappers()
+    """
+    모든 AppWrapper 조회
+    version은 목록 시점의 store 버전으로, /hub/watch?since=version으로 이후 변경을 받는다.
+    """
+    snapshot = await hub_store.snapshot()
     stats = await hub_store.get_stats()
 
     return {
-        "appwrappers": [aw.dict() for aw in appwrappers],
+        "appwrappers": [aw.to_model().dict() for aw in snapshot.appwrappers.values()],
+        "version": snapshot.version,
         "stats": stats
     }
 
 
 @app.get("/hub/appwrappers/{job_id}")
 async def get_appwrapper(job_id: str):
-    """특정 AppWrapper 조회"""
+    """특정 AppWrapper 조회 (hot store에 없으면 아카이브에서 조회)"""
     appwrapper = await hub_store.get_appwrapper(job_id)
-    if not appwrapper:
-        raise HTTPException(status_code=404, detail=f"AppWrapper {job_id} not found")
+    if appwrapper:
+        return appwrapper.to_model().dict()
 
-    return appwrapper.dict()
+    if job_archiver:
+        archived = await asyncio.to_thread(job_archiver.archive.get, job_id)
+        if archived:
+            return archived.dict()
+
+    raise HTTPException(status_code=404, detail=f"AppWrapper {job_id} not found")
+
+
+@app.delete("/hub/appwrappers")
+async def delete_appwrappers(selector: str):
+    """
+    셀렉터(metadata, 예: user=alice,team!=infra)에 맞는 AppWrapper 일괄 삭제
+    실행 중인 Spoke Job은 백그라운드에서 삭제하고, informer가 삭제를 확인하면 AppWrapper를 제거한다.
+    """
+    try:
+        requirements = parse_selector(selector)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    selected = [aw for aw in await hub_store.get_all_appwrappers() if matches(aw.metadata, requirements)]
+    result = await job_garbage_collector.delete(selected)
+    logger.info(f"Bulk delete {selector!r}: {len(selected)} AppWrappers ({result['deleting']} deleting)")
+
+    return {"selector": selector, "matched": len(selected), **result}
 
 
 @app.delete("/hub/appwrappers/{job_id}")
 async def delete_appwrapper(job_id: str):
-    """AppWrapper 삭제"""
-    success = await hub_store.remove_appwrapper(job_id)
-    if not success:
+    """
+    AppWrapper 삭제
+    Spoke에서 실행 중이면 Job과 pod 삭제를 백그라운드 GC에 맡기고 "deleting"을 반환한다.
+    """
+    appwrapper = await hub_store.get_appwrapper(job_id)
+    if appwrapper is None:
         raise HTTPException(status_code=404, detail=f"AppWrapper {job_id} not found")
 
+    result = await job_garbage_collector.delete([appwrapper])
+
     return {
-        "status": "deleted",
+        "status": "deleting" if result["deleting"] else "deleted",
         "job_id": job_id
     }
 
 
+@app.get("/hub/deletions")
+async def list_deletions():
+    """Spoke Job 삭제 큐 상태 (요청 대기, informer 확인 대기)"""
+    return job_garbage_collector.stats()
+
+
+@app.get("/hub/watch")
+async def watch_appwrappers(since: Optional[int] = None):
+    """
+    AppWrapper 변경 스트림 (NDJSON, 한 줄에 이벤트 하나)
+
+    /hub/appwrappers 응답의 version 또는 마지막으로 받은 이벤트의 version을 since로 넘기면
+    그 이후 변경부터 이어서 받는다.
+    since가 너무 오래되었거나 구독자가 뒤처지면 type=ERROR, code=410 줄을 보내고 종료하며,
+    클라이언트는 전체 목록을 다시 읽은 뒤 재구독한다.
+    """
+    async def stream():
+        try:
+            async for event in hub_store.watch(since):
+                yield json.dumps({
+                    "version": event.version,
+                    "type": event.type.value,
+                    "object": event.object.to_model().dict()
+                }) + "\n"
+        except WatchExpiredError as e:
+            yield json.dumps({
+                "type": "ERROR",
+                "code": 410,
+                "message": str(e),
+                "oldest_version": e.oldest_version
+            }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# ==================== 아카이브 ====================
+
+@app.get("/hub/archive")
+async def query_archive(start: Optional[float] = None, end: Optional[float] = None, limit: int = 1000):
+    """
+    보관된 AppWrapper를 종료 시각 범위로 조회
+
+    시간 범위가 겹치는 세그먼트만 읽으며, 보관 순서대로 최대 limit개를 반환
+    """
+    if not job_archiver:
+        raise HTTPException(status_code=404, detail="Archive is not enabled (set HUB_ARCHIVE_DIR)")
+
+    appwrappers = await asyncio.to_thread(job_archiver.archive.query, start, end, limit)
+    return {
+        "appwrappers": [aw.dict() for aw in appwrappers],
+        "count": len(appwrappers)
+    }
+
+
+@app.get("/hub/archive/{job_id}")
+async def get_archived_appwrapper(job_id: str):
+    """보관된 AppWrapper 조회"""
+    if not job_archiver:
+        raise HTTPException(status_code=404, detail="Archive is not enabled (set HUB_ARCHIVE_DIR)")
+
+    appwrapper = await asyncio.to_thread(job_archiver.archive.get, job_id)
+    if not appwrapper:
+        raise HTTPException(status_code=404, detail=f"Archived AppWrapper {job_id} not found")
+
+    return appwrapper.dict()
+
+
+# ==================== 스케줄링 계획 ====================
+
+@app.get("/hub/plan")
+async def get_current_plan():
+    """
+    현재 게시된 스케줄링 계획 조회
+
+    솔버 실행 중에도 마지막으로 완성된 계획을 즉시 반환
+    """
+    plan = hub_scheduler.current_plan
+    if plan is None:
+        raise HTTPException(status_code=404, detail="No scheduling plan published yet")
+
+    return plan.dict()
+
+
+@app.get("/hub/migrations")
+async def list_migrations():
+    """진행 중인 라이브 마이그레이션 (단계, 전송량)"""
+    migrator = hub_dispatcher.migrator
+    migrations = list(migrator.in_progress.values()) if migrator else []
+
+    return {
+        "total": len(migrations),
+        "migrations": [m.dict() for m in migrations]
+    }
+
+
+# ==================== 파티션 (샤딩 모드) ====================
+
+@app.get("/hub/partition")
+async def get_partition():
+    """이 Hub의 파티션 상태 조회"""
+    if not partition_manager:
+        return {"mode": "single"}
+
+    return {
+        "mode": "sharded",
+        "hub_id": partition_manager.hub_id,
+        "owned_clusters": sorted(partition_manager.owned_clusters),
+        "is_coordinator": partition_manager.is_coordinator,
+        "coordinator": partition_manager.coordinator_id
+    }
+
+
+@app.post("/hub/partition/adopt")
+async def adopt_partition(handoff: PartitionHandoff):
+    """
+    다른 Hub가 넘긴 ClusterInfo와 AppWrapper 수용 (Hub 간 내부 API)
+
+    라우팅 없이 그대로 저장하므로 Hub 사이에서 요청이 순환하지 않는다.
+    """
+    for cluster_info in handoff.clusters:
+        await hub_store.update_cluster_info(cluster_info)
+    for appwrapper in handoff.appwrappers:
+        if partition_manager:
+            appwrapper.metadata["partition_owner"] = partition_manager.hub_id
+        await hub_store.add_appwrapper(appwrapper)
+
+    return {
+        "status": "adopted",
+        "clusters": len(handoff.clusters),
+        "appwrappers": len(handoff.appwrappers)
+    }
+
+
 # ==================== 수동 트리거 (테스트용) ====================
 
 @app.post("/hub/schedule")
@@ -286,6 +632,7 @@ async def get_stats():
 
     return {
         **stats,
+        "archived": job_archiver.archive.counts if job_archiver else {},
         "carbon_intensity": carbon_data
     }
 
@@ -309,12 +656,7 @@ async def get_metrics():
     metrics['clusters_ready'].set(stats['ready_clusters'])
 
     # 클러스터별 AppWrapper 분포 업데이트
-    all_appwrappers = await hub_store.get_all_appwrappers()
-    cluster_counts = {}
-    for aw in all_appwrappers:
-        cluster = aw.status.cluster
-        if cluster:
-            cluster_counts[cluster] = cluster_counts.get(cluster, 0) + 1
+    cluster_counts = await hub_store.get_cluster_counts()
 
     # 모든 클러스터에 대해 메트릭 설정 (없으면 0)
     all_clusters = await hub_store.get_all_cluster_info()
@@ -337,7 +679,7 @@ if __name__ == "__main__":
     uvicorn.run(
         "hub.app:app",
         host="0.0.0.0",
-        port=8080,
+        port=int(os.getenv("HUB_PORT", "8080")),
         reload=False,
         log_level="info"
     )
@@ -0,0 +1,397 @@
+"""
+Hub Job Archive
+완료/실패한 AppWrapper를 hot store에서 압축 아카이브로 옮기는 보존(retention) 관리
+
+디렉토리 구성:
+    manifest.json          세그먼트 목록(시간 범위, 레코드 수, 커밋된 크기)과 phase별 누적 보관 수
+    segment-<seq>.ndjson.gz 보관된 AppWrapper (한 줄에 하나, 배치마다 gzip member 하나씩 이어 붙임)
+    segment-<seq>.ids      닫힌 세그먼트의 job_id 목록 (job_id 조회 시 세그먼트 본문을 읽지 않고 걸러냄)
+
+세그먼트는 종료 시각 순서로 채워지므로 시간 범위 조회는 manifest의 범위가 겹치는
+세그먼트만 읽는다. manifest에 기록된 크기 이후의 바이트는 중단된 쓰기로 보고 잘라낸다.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+from pydantic import BaseModel, Field
+from hub.models import AppWrapper
+from hub.records import AppWrapperRecord
+
+logger = logging.getLogger(__name__)
+
+# 보관 대상 phase
+FINISHED_PHASES = ("Completed", "Failed")
+
+
+def finished_at(appwrapper) -> Optional[float]:
+    """
+    작업 종료 시각 (보존 기간의 기준)
+    completion_time이 없으면(시작 전 실패 등) 시작 시각, 제출 시각 순으로 대신 사용
+    """
+    status = appwrapper.status
+    if status.completion_time is not None:
+        return status.completion_time
+    if status.start_time is not None:
+        return status.start_time
+    submitted_at = appwrapper.metadata.get("submitted_at")
+    return float(submitted_at) if submitted_at else None
+
+
+class ArchiveEntry(BaseModel):
+    """아카이브 한 줄"""
+    t: float                  # 종료 시각
+    aw: AppWrapper
+
+
+class ArchiveSegment(BaseModel):
+    """아카이브 세그먼트 메타데이터"""
+    name: str
+    start_time: float = Field(description="세그먼트 내 가장 이른 종료 시각")
+    end_time: float = Field(description="세그먼트 내 가장 늦은 종료 시각")
+    count: int = 0
+    size: int = Field(default=0, description="커밋된 바이트 수")
+    sealed: bool = False
+
+
+class ArchiveManifest(BaseModel):
+    """아카이브 manifest 파일"""
+    next_seq: int = 0
+    segments: List[ArchiveSegment] = []
+    counts: Dict[str, int] = {}
+
+
+class JobArchive:
+    """
+    압축 NDJSON 세그먼트 아카이브
+
+    append/get/query는 파일 I/O를 하는 동기 메서드이므로 asyncio.to_thread로 호출한다.
+    manifest와 열린 세그먼트의 job_id 집합만 메모리에 두고, 닫힌 세그먼트는 조회 시에만 읽는다.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, archive_dir: str, segment_records: int = 10_000, id_cache_size: int = 8):
+        """
+        아카이브 초기화 (기존 manifest가 있으면 이어서 사용)
+
+        Args:
+            archive_dir: 아카이브 디렉토리
+            segment_records: 세그먼트 하나에 담을 최대 레코드 수
+            id_cache_size: 메모리에 캐시할 닫힌 세그먼트 job_id 목록 수
+        """
+        self.archive_dir = archive_dir
+        self.segment_records = segment_records
+        self.id_cache_size = id_cache_size
+        os.makedirs(archive_dir, exist_ok=True)
+
+        # append와 조회 스레드가 manifest를 동시에 보지 않도록 보호
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._open_ids: Set[str] = set()
+        self._id_cache: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._id_cache_lock = threading.Lock()
+        self._recover_open_segment()
+
+    # ==================== manifest ====================
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, name)
+
+    def _load_manifest(self) -> ArchiveManifest:
+        path = self._path(self.MANIFEST)
+        if not os.path.exists(path):
+            return ArchiveManifest()
+        with open(path, "rb") as f:
+            return ArchiveManifest.model_validate_json(f.read())
+
+    def _save_manifest(self):
+        """manifest 원자적 교체 (락 보유 상태에서 호출)"""
+        tmp_path = self._path(self.MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(self._manifest.model_dump_json())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(self.MANIFEST))
+
+    def _recover_open_segment(self):
+        """열린 세그먼트의 커밋되지 않은 꼬리를 잘라내고 job_id 집합 복원"""
+        segment = self._open_segment()
+        if segment is None:
+            return
+        path = self._path(segment.name)
+        if os.path.getsize(path) > segment.size:
+            logger.warning(f"Truncating uncommitted tail of archive segment {segment.name}")
+            with open(path, "r+b") as f:
+                f.truncate(segment.size)
+        self._open_ids = {entry["aw"]["spec"]["job_id"] for entry in self._read_segment(segment)}
+
+    def _open_segment(self) -> Optional[ArchiveSegment]:
+        segments = self._manifest.segments
+        if segments and not segments[-1].sealed:
+            return segments[-1]
+        return None
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """phase별 누적 보관 수 (메모리 요약 카운터)"""
+        return dict(self._manifest.counts)
+
+    @property
+    def total(self) -> int:
+        """누적 보관 수"""
+        return sum(self._manifest.counts.values())
+
+    # ==================== 쓰기 ====================
+
+    def append(self, appwrappers: List[AppWrapperRecord]):
+        """
+        AppWrapper 배치를 열린 세그먼트에 gzip member 하나로 추가하고 fsync
+
+        Args:
+            appwrappers: 보관할 레코드 (종료 시각이 있어야 함)
+        """
+        if not appwrappers:
+            return
+
+        entries = [(finished_at(aw), aw) for aw in appwrappers]
+        data = gzip.compress("".join(
+            ArchiveEntry.model_construct(t=t, aw=aw.to_model()).model_dump_json(exclude_defaults=True) + "\n"
+            for t, aw in entries
+        ).encode())
+        times = [t for t, _ in entries]
+
+        with self._lock:
+            segment = self._open_segment()
+            if segment is None:
+                segment = ArchiveSegment(
+                    name=f"segment-{self._manifest.next_seq:010d}.ndjson.gz",
+                    start_time=min(times),
+                    end_time=max(times)
+                )
+                self._manifest.next_seq += 1
+                self._manifest.segments.append(segment)
+
+            with open(self._path(segment.name), "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            segment.start_time = min(segment.start_time, *times)
+            segment.end_time = max(segment.end_time, *times)
+            segment.count += len(entries)
+            segment.size += len(data)
+            for _, aw in entries:
+                self._open_ids.add(aw.spec.job_id)
+                phase = aw.status.phase
+                self._manifest.counts[phase] = self._manifest.counts.get(phase, 0) + 1
+
+            if segment.count >= self.segment_records:
+                self._seal(segment)
+            self._save_manifest()
+
+        logger.info(f"Archived {len(entries)} AppWrappers into {segment.name}")
+
+    def _seal(self, segment: ArchiveSegment):
+        """세그먼트 닫기: job_id 목록 파일 기록 (락 보유 상태에서 호출)"""
+        with open(self._path(segment.name[:-len(".ndjson.gz")] + ".ids"), "w") as f:
+            f.write("\n".join(sorted(self._open_ids)))
+            f.flush()
+            os.fsync(f.fileno())
+        segment.sealed = True
+        self._open_ids = set()
+
+    # ==================== 조회 ====================
+
+    def _read_segment(self, segment: ArchiveSegment):
+        """세그먼트의 커밋된 부분만 읽어 줄 단위로 반환"""
+        with open(self._path(segment.name), "rb") as f:
+            data = f.read(segment.size)
+        for line in gzip.decompress(data).splitlines():
+            yield json.loads(line)
+
+    def _segment_ids(self, segment: ArchiveSegment) -> Set[str]:
+        """닫힌 세그먼트의 job_id 집합 (LRU 캐시)"""
+        with self._id_cache_lock:
+            ids = self._id_cache.get(segment.name)
+            if ids is not None:
+                self._id_cache.move_to_end(segment.name)
+                return ids
+        with open(self._path(segment.name[:-len(".ndjson.gz")] + ".ids")) as f:
+            ids = set(f.read().split("\n"))
+        with self._id_cache_lock:
+            self._id_cache[segment.name] = ids
+            if len(self._id_cache) > self.id_cache_size:
+                self._id_cache.popitem(last=False)
+        return ids
+
+    def get(self, job_id: str) -> Optional[AppWrapper]:
+        """
+        job_id로 보관된 AppWrapper 조회
+        최신 세그먼트부터 job_id 목록으로 걸러낸 뒤 해당 세그먼트만 읽는다.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            가장 최근에 보관된 AppWrapper (없으면 None)
+        """
+        with self._lock:
+            segments = [segment.model_copy() for segment in self._manifest.segments]
+            open_ids = set(self._open_ids)
+
+        for segment in reversed(segments):
+            ids = self._segment_ids(segment) if segment.sealed else open_ids
+            if job_id not in ids:
+                continue
+            found = None
+            for entry in self._read_segment(segment):
+                if entry["aw"]["spec"]["job_id"] == job_id:
+                    found = entry["aw"]
+            if found is not None:
+                return AppWrapper.model_validate(found)
+        return None
+
+    def query(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        limit: int = 1000
+    ) -> List[AppWrapper]:
+        """
+        종료 시각 범위로 보관된 AppWrapper 조회
+        manifest의 시간 범위가 겹치는 세그먼트만 읽는다.
+
+        Args:
+            start_time: 종료 시각 하한 (포함, None이면 제한 없음)
+            end_time: 종료 시각 상한 (미포함, None이면 제한 없음)
+            limit: 최대 반환 수
+
+        Returns:
+            보관 순서대로 정렬된 AppWrapper 리스트
+        """
+        with self._lock:
+            segments = [segment.model_copy() for segment in self._manifest.segments]
+
+        results: List[AppWrapper] = []
+        for segment in segments:
+            if start_time is not None and segment.end_time < start_time:
+                continue
+            if end_time is not None and segment.start_time >= end_time:
+                continue
+            for entry in self._read_segment(segment):
+                t = entry["t"]
+                if (start_time is None or t >= start_time) and (end_time is None or t < end_time):
+                    results.append(AppWrapper.model_validate(entry["aw"]))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+
+class JobArchiver:
+    """
+    보존 기간이 지난 완료/실패 AppWrapper를 주기적으로 아카이브로 옮기는 작업자
+
+    아카이브에 먼저 fsync한 뒤 store에서 삭제하므로 중단되어도 작업이 사라지지 않는다.
+    삭제는 읽은 시점의 resource_version과 같을 때만 하며, 그 사이 변경된 작업은
+    다음 주기에 다시 보관된다 (job_id 조회는 가장 최근 기록을 반환).
+    """
+
+    def __init__(
+        self,
+        archive: JobArchive,
+        store=None,
+        ttl_seconds: float = 3600,
+        interval: float = 60,
+        batch_size: int = 10_000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Archiver 초기화
+
+        Args:
+            archive: 보관할 JobArchive
+            store: 대상 Hub Store (기본값: 전역 hub_store)
+            ttl_seconds: 종료 후 hot store에 유지할 기간 (초)
+            interval: 보관 주기 (초)
+            batch_size: 한 주기에 옮길 최대 작업 수
+            clock: 현재 시각 함수 (기본값: time.time, 시뮬레이터는 가상 시계 사용)
+        """
+        if store is None:
+            from hub.store import hub_store
+            store = hub_store
+        self.archive = archive
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.interval = interval
+        self.batch_size = batch_size
+        self._clock = clock
+        self._running = False
+        self._task = None
+
+        logger.info(f"Job Archiver initialized (ttl: {ttl_seconds}s, interval: {interval}s)")
+
+    async def start(self):
+        """Archiver 시작"""
+        if self._running:
+            logger.warning("Archiver already running")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._archiver_loop())
+        logger.info("Job Archiver started")
+
+    async def stop(self):
+        """Archiver 중지"""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Job Archiver stopped")
+
+    async def _archiver_loop(self):
+        """보존 기간이 지난 작업이 남아 있는 동안은 쉬지 않고 배치 단위로 옮김"""
+        while self._running:
+            try:
+                archived = await self.run_archive_cycle()
+                if archived < self.batch_size:
+                    await asyncio.sleep(self.interval)
+            except Exception as e:
+                logger.error(f"Error in archiver loop: {e}", exc_info=True)
+                await asyncio.sleep(self.interval)
+
+    async def run_archive_cycle(self) -> int:
+        """
+        보관 사이클 1회 실행
+
+        Returns:
+            hot store에서 옮긴 작업 수
+        """
+        cutoff = self._clock() - self.ttl_seconds
+        expired = []
+        for appwrapper in await self.store.get_finished_appwrappers():
+            t = finished_at(appwrapper)
+            if t is not None and t <= cutoff:
+                expired.append(appwrapper)
+                if len(expired) >= self.batch_size:
+                    break
+        if not expired:
+            return 0
+
+        await asyncio.to_thread(self.archive.append, expired)
+        removed = await self.store.remove_appwrappers_if_unchanged(expired)
+        logger.info(f"Archive cycle: moved {removed}/{len(expired)} finished AppWrappers out of the hot store")
+        return removed
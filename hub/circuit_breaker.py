@@ -0,0 +1,159 @@
+"""
+Cluster Circuit Breaker
+Spoke 클러스터별 재시도 백오프와 circuit breaker
+
+API 오류가 날 때마다 연속 실패 수에 따라 지수 백오프(jitter 포함) 동안 해당 클러스터 요청을 멈춘다.
+연속 실패가 failure_threshold에 이르면 circuit이 열리고(open), 백오프가 끝나면
+요청 하나만 시험으로 보내는 half-open 상태가 된다. 시험 요청이 성공하면 닫히고(closed),
+실패하면 더 긴 백오프로 다시 열린다.
+"""
+
+import logging
+import random
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    """클러스터 하나의 circuit 상태"""
+
+    __slots__ = ("failures", "retry_at", "probing")
+
+    def __init__(self):
+        self.failures = 0           # 연속 실패 수
+        self.retry_at = 0.0         # 이 시각까지 요청 중지
+        self.probing = False        # half-open 시험 요청 진행 중
+
+
+class ClusterCircuitBreaker:
+    """
+    클러스터별 circuit breaker
+
+    - allow(cluster): 지금 요청을 보내도 되는지 (half-open이면 시험 요청 하나만 허용)
+    - record_success / record_failure: 요청 결과 반영
+    - release(cluster): 결과 없이 끝난 요청(취소) 반영 (half-open 시험 요청을 다시 허용)
+    - on_open(cluster, until): circuit이 열릴 때마다 호출 (until: half-open 시각)
+    - on_close(cluster): 열렸던 circuit이 닫힐 때 호출
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+        on_open: Optional[Callable[[str, float], None]] = None,
+        on_close: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Circuit breaker 초기화
+
+        Args:
+            failure_threshold: circuit을 여는 연속 실패 수
+            base_backoff: 첫 실패 후 백오프 (초, 실패마다 두 배)
+            max_backoff: 최대 백오프 (초)
+            clock: 현재 시각 함수
+            rng: [0, 1) 난수 함수 (jitter)
+            on_open: circuit이 열릴 때 호출
+            on_close: circuit이 닫힐 때 호출
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._rng = rng
+        self._on_open = on_open
+        self._on_close = on_close
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, cluster: str) -> str:
+        """클러스터의 circuit 상태 (closed, open, half_open)"""
+        circuit = self._circuits.get(cluster)
+        if circuit is None or circuit.failures < self.failure_threshold:
+            return CLOSED
+        return OPEN if self._clock() < circuit.retry_at else HALF_OPEN
+
+    def blocked(self, cluster: str) -> bool:
+        """지금 allow()가 False를 반환할지 (상태를 바꾸지 않음: 백오프 중이거나 half-open 시험 요청 진행 중)"""
+        circuit = self._circuits.get(cluster)
+        if circuit is None:
+            return False
+        if self._clock() < circuit.retry_at:
+            return True
+        return circuit.failures >= self.failure_threshold and circuit.probing
+
+    def allow(self, cluster: str) -> bool:
+        """
+        지금 클러스터에 요청을 보내도 되는지
+        half-open이면 첫 호출만 True를 반환하고 결과가 반영될 때까지 나머지는 막는다.
+
+        Args:
+            cluster: 클러스터 이름
+
+        Returns:
+            요청 허용 여부
+        """
+        circuit = self._circuits.get(cluster)
+        if circuit is None:
+            return True
+        if self._clock() < circuit.retry_at:
+            return False
+        if circuit.failures < self.failure_threshold:
+            return True
+        if circuit.probing:
+            return False
+        circuit.probing = True
+        return True
+
+    def record_success(self, cluster: str):
+        """요청 성공: 연속 실패 초기화 (열려 있었으면 닫음)"""
+        circuit = self._circuits.pop(cluster, None)
+        if circuit is not None and circuit.failures >= self.failure_threshold:
+            logger.info(f"Circuit for {cluster} closed")
+            if self._on_close:
+                self._on_close(cluster)
+
+    def release(self, cluster: str):
+        """
+        결과 없이 끝난 요청 (사이클/종료로 취소)
+        half-open 시험 요청이었으면 다음 시험 요청을 허용한다 (그대로 두면 클러스터가 영구히 막힘).
+        """
+        circuit = self._circuits.get(cluster)
+        if circuit is not None:
+            circuit.probing = False
+
+    def record_failure(self, cluster: str):
+        """요청 실패: 백오프를 늘리고, 연속 실패가 한도에 이르면 circuit을 엶"""
+        circuit = self._circuits.get(cluster)
+        if circuit is None:
+            circuit = self._circuits[cluster] = _Circuit()
+        elif self._clock() < circuit.retry_at:
+            # 백오프 전에 동시에 보낸 요청의 실패: 같은 장애이므로 한 번만 셈
+            return
+
+        circuit.failures += 1
+        circuit.probing = False
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (circuit.failures - 1))
+        # equal jitter: 여러 Hub가 같은 순간에 재시도하지 않도록 [backoff/2, backoff)
+        circuit.retry_at = self._clock() + backoff * (0.5 + self._rng() / 2)
+
+        if circuit.failures >= self.failure_threshold:
+            logger.warning(
+                f"Circuit for {cluster} open after {circuit.failures} consecutive failures "
+                f"(retry in {circuit.retry_at - self._clock():.1f}s)"
+            )
+            if self._on_open:
+                self._on_open(cluster, circuit.retry_at)
+
+    def next_retry_at(self) -> Optional[float]:
+        """백오프가 아직 끝나지 않은 클러스터 중 가장 이른 재시도 시각 (없으면 None)"""
+        now = self._clock()
+        pending = [c.retry_at for c in self._circuits.values() if c.retry_at > now]
+        return min(pending) if pending else None
@@ -5,16 +5,38 @@ AppWrapper를 실제 Spoke 클러스터에 배포
 
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, List, Optional
-from kubernetes import client, config
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from kubernetes import client
 from kubernetes.client.rest import ApiException
-from hub.models import AppWrapper, GateStatus
-from hub.store import hub_store
+from app.metrics import tenant_dispatch_latency_seconds, tenant_dispatch_queue_depth
+from hub.circuit_breaker import ClusterCircuitBreaker
+from hub.fair_queue import FairQueue, parse_weights, tenant_of
+from hub.kube_clients import AsyncBatchApi, KubeClientPool, call_api
+from hub.manifests import ManifestTemplates, shape_of
+from hub.migration import MigrationExecutor, TransferBackend
+from hub.models import AppWrapper, GateStatus, SchedulingDecision, SchedulingPlan
+from hub.records import AppWrapperRecord
+from hub.store import HubStore, hub_store
+from hub.timer_wheel import TimerWheel
+from hub.scheduler import HubScheduler, hub_scheduler
+from hub.watch import WatchEventType, WatchExpiredError
 
 logger = logging.getLogger(__name__)
 
 
+class DispatchOutcome(NamedTuple):
+    """Job 생성 요청 하나의 결과 (사이클 끝에 store에 일괄 반영)"""
+    job_id: str
+    cluster: str
+    started_at: float
+    error: Optional[str] = None           # Kubernetes API 오류 사유 (성공 시 None)
+    indexed_job: Optional[str] = None     # Indexed Job으로 묶여 생성된 경우 그 Job 이름
+    index: Optional[int] = None           # Indexed Job 안의 인덱스
+
+
 class HubDispatcher:
     """
     Hub Cluster의 Dispatcher
@@ -23,23 +45,137 @@ class HubDispatcher:
     - dispatching gate가 열려있는 AppWrapper 감지
     - targetCluster에 실제 Kubernetes Job 생성
     - AppWrapper 상태 업데이트
+
+    배치 대상은 Scheduler가 마지막으로 게시한 SchedulingPlan에서 읽으므로
+    최적화가 오래 걸려도 배포가 멈추지 않는다. Hub 재시작 직후 아직 계획이 없으면
+    store에 남은 targetCluster로 배포한다.
+
+    store watch로 배포 가능한 AppWrapper가 생기면 주기를 기다리지 않고 사이클을 실행하며,
+    dispatch_interval 주기 실행은 놓친 변경을 위한 보정으로 남는다.
+
+    한 사이클의 Job 생성 요청은 클러스터별 동시 실행 한도(cluster_concurrency)와
+    전체 한도(max_concurrency) 안에서 동시에 보내고, 결과는 모아서 store에 한 번에 반영한다.
+
+    계획된 시작 시각(start_at)이 아직 오지 않은 AppWrapper는 타이머 휠에 보류하고,
+    가장 이른 시작 시각에 맞춰 깨어나 배포한다. 재계획으로 시작 시각이 바뀌면 타이머만 옮긴다.
+
+    실행 중인 AppWrapper의 배치가 다른 클러스터로 바뀌면 MigrationExecutor에 넘겨
+    사이클을 막지 않고 백그라운드에서 옮긴다.
+
+    클러스터 API 장애(연결 실패, 401, 429, 5xx)는 클러스터별 circuit breaker에 반영한다.
+    백오프 중인 클러스터에는 요청을 보내지 않고 작업을 대기 상태로 남기며,
+    circuit이 열리면 half-open 될 때까지 Scheduler가 그 클러스터 용량을 0으로 계획한다.
+
+    Job 매니페스트는 형태(이미지, 명령, 리소스)별 템플릿에서 작업별 필드만 바꿔 만들고,
+    indexed_batch_size가 2 이상이면 같은 클러스터에 배치된 같은 형태의 AppWrapper를
+    Indexed Job 하나로 묶어 생성한다 (묶인 작업은 라이브 마이그레이션 대상에서 제외).
+
+    배포 순서는 테넌트(metadata["user"])별 가중 deficit round robin으로 정해, 한 사용자의 대량 제출이
+    다른 사용자의 배포를 막지 않는다. max_cycle_dispatch를 두면 한 사이클은 그 수까지만 배포하고
+    남은 작업은 곧바로 다음 사이클에서 이전 사이클이 멈춘 테넌트 차례부터 이어서 배포한다.
+    백오프 중인 클러스터에 묶인 작업은 남은 작업으로 세지 않고 재시도 시각까지 기다린다.
     """
 
-    def __init__(self, dispatch_interval: int = 30):
+    def __init__(
+        self,
+        dispatch_interval: int = 30,
+        store: Optional[HubStore] = None,
+        scheduler: Optional[HubScheduler] = None,
+        clock: Callable[[], float] = time.time,
+        watch_debounce: float = 1.0,
+        max_concurrency: int = 64,
+        cluster_concurrency: int = 16,
+        client_pool: Optional[KubeClientPool] = None,
+        timer_tick: float = 1.0,
+        live_migration: bool = True,
+        migration_link_concurrency: int = 2,
+        transfer: Optional[TransferBackend] = None,
+        failure_threshold: int = 5,
+        backoff_base: float = 5.0,
+        backoff_max: float = 300.0,
+        indexed_batch_size: int = 0,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        max_cycle_dispatch: int = 0
+    ):
         """
         Dispatcher 초기화
 
         Args:
             dispatch_interval: 배포 확인 주기 (초, 기본값: 30)
+            store: 사용할 Hub Store (기본값: 전역 hub_store)
+            scheduler: 계획을 읽을 Scheduler (기본값: 전역 hub_scheduler)
+            clock: 현재 시각 함수 (기본값: time.time, 시뮬레이터는 가상 시계 사용)
+            watch_debounce: 변경 감지 후 사이클 실행까지 대기 (초, 연속된 변경을 한 사이클로 묶음)
+            max_concurrency: 모든 클러스터에 동시에 보내는 최대 Job 생성 요청 수
+            cluster_concurrency: 클러스터 하나에 동시에 보내는 최대 Job 생성 요청 수
+            client_pool: context별 Kubernetes 클라이언트 풀 (기본값: 클러스터 한도만큼 연결을 유지하는 새 풀)
+            timer_tick: 보류 타이머 해상도 (초)
+            live_migration: 실행 중 작업의 클러스터 변경을 실제로 옮길지 여부
+            migration_link_concurrency: (원본, 대상) 링크별 동시 마이그레이션 수
+            transfer: 마이그레이션 데이터 전송 백엔드 (기본값: 즉시 완료)
+            failure_threshold: 클러스터 circuit을 여는 연속 실패 수
+            backoff_base: 클러스터 API 실패 후 첫 백오프 (초, 연속 실패마다 두 배)
+            backoff_max: 최대 백오프 (초)
+            indexed_batch_size: Indexed Job 하나에 묶는 최대 AppWrapper 수 (1 이하면 묶지 않음)
+            tenant_weights: 테넌트별 배포 가중치 (없는 테넌트는 1)
+            max_cycle_dispatch: 한 사이클에 배포하는 최대 AppWrapper 수 (0이면 제한 없음)
         """
         self.dispatch_interval = dispatch_interval
+        self.watch_debounce = watch_debounce
+        self.max_concurrency = max_concurrency
+        self.cluster_concurrency = cluster_concurrency
+        self.indexed_batch_size = indexed_batch_size
+        self.max_cycle_dispatch = max_cycle_dispatch
+        self.fair_queue = FairQueue(tenant_weights)
+        self.templates = ManifestTemplates()
+        self.store = store if store is not None else hub_store
+        self.scheduler = scheduler if scheduler is not None else hub_scheduler
+        self._clock = clock
         self._running = False
         self._task = None
-        self._k8s_clients: Dict[str, client.BatchV1Api] = {}
+        self._watch_task = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # 사이클 한도로 남긴 작업이 있으면 주기를 기다리지 않고 다음 사이클 실행
+        self._backlogged = False
+        # 대기열 깊이 gauge가 0이 아닌 테넌트 (비워지면 0으로 되돌림)
+        self._queued_tenants: Set[str] = set()
+        self.client_pool = client_pool if client_pool is not None else KubeClientPool(
+            pool_maxsize=cluster_concurrency
+        )
 
-        logger.info(f"Hub Dispatcher initialized (interval: {dispatch_interval}s)")
+        # 수동 트리거와 루프의 사이클이 겹쳐 같은 작업을 두 번 배포하지 않도록 직렬화
+        self._cycle_lock = asyncio.Lock()
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._cluster_limits: Dict[str, asyncio.Semaphore] = {}
+        # 계획된 시작 시각까지 보류 중인 job_id
+        self._deferred = TimerWheel(start=clock(), tick=timer_tick)
+        self.breaker = ClusterCircuitBreaker(
+            failure_threshold=failure_threshold,
+            base_backoff=backoff_base,
+            max_backoff=backoff_max,
+            clock=clock,
+            on_open=lambda cluster, until: self.scheduler.mark_cluster_unavailable(cluster, until),
+            on_close=lambda cluster: self.scheduler.mark_cluster_available(cluster)
+        )
+        # 동기(threaded) Kubernetes 클라이언트 호출 전용 스레드 (기본 executor 크기에 묶이지 않도록)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.migrator: Optional[MigrationExecutor] = None
+        if live_migration:
+            self.migrator = MigrationExecutor(
+                store=self.store,
+                client_pool=self.client_pool,
+                create_manifest=self._create_job_manifest,
+                transfer=transfer,
+                link_concurrency=migration_link_concurrency,
+                clock=clock
+            )
 
-    def _get_k8s_client(self, context_name: str) -> client.BatchV1Api:
+        logger.info(
+            f"Hub Dispatcher initialized (interval: {dispatch_interval}s, "
+            f"concurrency: {cluster_concurrency}/cluster, {max_concurrency} total)"
+        )
+
+    def _get_k8s_client(self, context_name: str) -> Union[AsyncBatchApi, client.BatchV1Api]:
         """
         특정 context의 Kubernetes 클라이언트 가져오기
 
@@ -47,21 +183,13 @@ class HubDispatcher:
             context_name: Kubeconfig context 이름
 
         Returns:
-            Kubernetes BatchV1Api 클라이언트
+            batch/v1 클라이언트 (비동기 AsyncBatchApi 또는 동기 BatchV1Api)
         """
-        if context_name not in self._k8s_clients:
-            try:
-                # 특정 context로 설정 로드
-                config.load_kube_config(context=context_name)
-                api_client = client.ApiClient()
-                batch_api = client.BatchV1Api(api_client)
-                self._k8s_clients[context_name] = batch_api
-                logger.info(f"Created K8s client for context: {context_name}")
-            except Exception as e:
-                logger.error(f"Failed to create K8s client for {context_name}: {e}")
-                raise
-
-        return self._k8s_clients[context_name]
+        try:
+            return self.client_pool.batch_api(context_name)
+        except Exception as e:
+            logger.error(f"Failed to create K8s client for {context_name}: {e}")
+            raise
 
     async def start(self):
         """Dispatcher 시작"""
@@ -70,7 +198,10 @@ class HubDispatcher:
             return
 
         self._running = True
+        self._wakeup = asyncio.Event()
         self._task = asyncio.create_task(self._dispatcher_loop())
+        self._watch_task = asyncio.create_task(self._watch_loop())
+        await self.client_pool.start()
         logger.info("Hub Dispatcher started")
 
     async def stop(self):
@@ -79,52 +210,188 @@ class HubDispatcher:
             return
 
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._task, self._watch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self.migrator is not None:
+            await self.migrator.stop()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        await self.client_pool.stop()
 
         logger.info("Hub Dispatcher stopped")
 
     async def _dispatcher_loop(self):
         """
         Dispatcher 메인 루프
-        주기적으로 배포 가능한 AppWrapper 확인 및 배포
+        배포 가능한 변경이 감지되거나 dispatch_interval이 지나면 배포 사이클 실행
         """
         logger.info("Dispatcher loop started")
 
         while self._running:
             try:
-                await asyncio.sleep(self.dispatch_interval)
+                if self._backlogged:
+                    self._wakeup.clear()
+                    await self.run_dispatch_cycle()
+                    continue
+
+                timeout = self.dispatch_interval
+                next_start = self.next_wakeup()
+                if next_start is not None:
+                    timeout = min(timeout, max(0.0, next_start - self._clock()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    # 스케줄링 결정 일괄 적용과 계획 게시를 한 사이클로 묶음
+                    await asyncio.sleep(self.watch_debounce)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
                 await self.run_dispatch_cycle()
 
             except Exception as e:
                 logger.error(f"Error in dispatcher loop: {e}", exc_info=True)
 
+    async def _watch_loop(self):
+        """store 변경을 구독하여 배포 가능한 AppWrapper가 생기면 메인 루프를 깨움"""
+        since = None
+        while self._running:
+            try:
+                async for event in self.store.watch(since):
+                    since = event.version
+                    if event.type != WatchEventType.DELETED and (
+                        self._is_dispatchable(event.object) or self._needs_migration(event.object)
+                    ):
+                        self._wakeup.set()
+            except WatchExpiredError as e:
+                # 놓친 변경이 있을 수 있으므로 즉시 한 번 전체 확인 후 현재 시점부터 재구독
+                logger.warning(f"Dispatcher watch expired: {e}")
+                since = None
+                self._wakeup.set()
+            except Exception as e:
+                logger.error(f"Error in dispatcher watch: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def next_wakeup(self) -> Optional[float]:
+        """보류 중인 AppWrapper의 가장 이른 계획 시작 시각 또는 클러스터 재시도 시각 (없으면 None)"""
+        times = [t for t in (self._deferred.next_deadline(), self.breaker.next_retry_at()) if t is not None]
+        return min(times) if times else None
+
+    @staticmethod
+    def _is_dispatchable(appwrapper: AppWrapperRecord) -> bool:
+        """targetCluster가 있고, 모든 gate가 열려 있으며, 아직 배포되지 않았는지"""
+        return (
+            not appwrapper.status.dispatched
+            and appwrapper.spec.target_cluster is not None
+            and all(gate.status == GateStatus.OPEN for gate in appwrapper.spec.dispatching_gates)
+        )
+
+    @staticmethod
+    def _needs_migration(appwrapper: AppWrapperRecord) -> bool:
+        """실행 중이고 targetCluster가 실행 클러스터와 다른지 (삭제 대기 중인 작업 제외)"""
+        return (
+            appwrapper.status.dispatched
+            and appwrapper.status.phase == "Running"
+            and appwrapper.status.cluster is not None
+            and appwrapper.spec.target_cluster is not None
+            and appwrapper.spec.target_cluster != appwrapper.status.cluster
+            and "indexed_job" not in appwrapper.metadata
+            and "deletion_requested_at" not in appwrapper.metadata
+        )
+
     async def run_dispatch_cycle(self):
         """
         배포 사이클 실행
-        gate가 열린 AppWrapper를 Spoke 클러스터에 배포
+        gate가 열린 AppWrapper를 Spoke 클러스터에 동시에 배포하고 결과를 일괄 반영
         """
-        # 배포 가능한 AppWrapper 찾기
-        dispatchable = await self._find_dispatchable_appwrappers()
+        async with self._cycle_lock:
+            # 사이클 동안 하나의 계획 스냅샷만 사용
+            plan = self.scheduler.current_plan
+            if plan is None:
+                # Hub 재시작 직후 첫 계획이 게시되기 전: store에 남은 배치(targetCluster)로 배포
+                plan = await self._store_plan()
+                if not plan.decisions:
+                    logger.debug("No scheduling plan published yet")
+                    return
+
+            if self.migrator is not None:
+                await self._start_migrations(plan)
+
+            # 배포 가능한 AppWrapper 찾기
+            ready = self._hold_until_start(await self._find_dispatchable_appwrappers(plan), plan)
+            ready_by_tenant: Dict[str, int] = {}
+            for aw in ready:
+                tenant = tenant_of(aw)
+                ready_by_tenant[tenant] = ready_by_tenant.get(tenant, 0) + 1
+            # 백오프 중이거나 circuit이 열린 클러스터의 작업은 재시도 시각(next_wakeup)까지 대기
+            # (남은 작업으로 세면 요청을 보내지 못하는 사이클을 쉬지 않고 반복함)
+            sendable = [
+                aw for aw in ready
+                if not self.breaker.blocked(plan.decisions[aw.spec.job_id].target_cluster)
+            ]
+            dispatchable = self.fair_queue.order(sendable, limit=self.max_cycle_dispatch)
+            self._backlogged = len(sendable) > len(dispatchable)
+
+            if not dispatchable:
+                self._set_queue_depth(ready_by_tenant)
+                logger.debug(f"No dispatchable AppWrappers ({len(ready)} waiting for cluster backoff)")
+                return
+
+            logger.info(
+                f"Found {len(ready)} dispatchable AppWrappers (plan v{plan.version}, "
+                f"{len(self._deferred)} deferred, {len(ready) - len(sendable)} waiting for cluster backoff, "
+                f"{len(sendable) - len(dispatchable)} left for next cycle)"
+            )
 
-        if not dispatchable:
-            logger.debug("No dispatchable AppWrappers")
-            return
+            started = time.perf_counter()
+            singles, batches = self._group_indexed(dispatchable, plan)
+            results = await asyncio.gather(
+                *(self._dispatch_appwrapper(aw, plan.decisions[aw.spec.job_id].target_cluster)
+                  for aw in singles),
+                *(self._dispatch_indexed(members, cluster) for cluster, members in batches)
+            )
+            outcomes = []
+            for result in results:
+                if isinstance(result, list):
+                    outcomes.extend(result)
+                elif result is not None:
+                    outcomes.append(result)
+            await self._apply_outcomes(outcomes, plan.version or None)
+            self._record_tenant_metrics(dispatchable, outcomes, ready_by_tenant)
+
+            succeeded = sum(1 for outcome in outcomes if outcome.error is None)
+            logger.info(
+                f"Dispatched {succeeded}/{len(dispatchable)} AppWrappers "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
 
-        logger.info(f"Found {len(dispatchable)} dispatchable AppWrappers")
+    async def _store_plan(self) -> SchedulingPlan:
+        """
+        게시된 계획이 없을 때 쓰는 임시 계획 (버전 0)
+        gate가 열리고 targetCluster가 정해진 AppWrapper를 그 클러스터에 바로 배포한다.
+        계획된 시작 시각은 store에 남지 않으므로 보류하지 않는다.
 
-        # 각 AppWrapper 배포
-        for aw in dispatchable:
-            try:
-                await self._dispatch_appwrapper(aw)
-            except Exception as e:
-                logger.error(f"Failed to dispatch {aw.spec.job_id}: {e}", exc_info=True)
+        Returns:
+            store의 배포 가능한 AppWrapper로 만든 SchedulingPlan
+        """
+        decisions = {
+            aw.spec.job_id: SchedulingDecision(
+                job_id=aw.spec.job_id,
+                target_cluster=aw.spec.target_cluster,
+                start_time_minutes=0,
+                estimated_co2_g=float(aw.metadata.get("estimated_co2_g", 0.0)),
+                reason="Placement restored from store before the first scheduling plan"
+            )
+            for aw in await self.store.get_dispatchable_appwrappers()
+        }
+        return SchedulingPlan(version=0, created_at=self._clock(), decisions=decisions)
 
-    async def _find_dispatchable_appwrappers(self) -> List[AppWrapper]:
+    async def _find_dispatchable_appwrappers(self, plan: SchedulingPlan) -> List[AppWrapperRecord]:
         """
         배포 가능한 AppWrapper 찾기
 
@@ -132,145 +399,371 @@ class HubDispatcher:
         1. targetCluster가 설정되어 있음
         2. 모든 dispatching gate가 열려있음
         3. 아직 배포되지 않음 (status.dispatched == False)
+        4. 현재 계획에 배치 결정이 있고, 그 클러스터가 store의 targetCluster와 같음
+
+        Args:
+            plan: 현재 스케줄링 계획
 
         Returns:
             배포 가능한 AppWrapper 리스트
         """
-        all_appwrappers = await hub_store.get_all_appwrappers()
-        dispatchable = []
+        # store 인덱스가 조건 1~3을 만족하는 것만 반환
+        dispatchable = await self.store.get_dispatchable_appwrappers()
 
-        for aw in all_appwrappers:
-            # targetCluster가 없으면 스킵
-            if not aw.spec.target_cluster:
-                continue
+        # 현재 계획에 없거나 계획과 store의 targetCluster가 다르면 (계획 반영 전후 경합) 다음 계획까지 대기
+        return [
+            aw for aw in dispatchable
+            if aw.spec.job_id in plan.decisions
+            and plan.decisions[aw.spec.job_id].target_cluster == aw.spec.target_cluster
+        ]
 
-            # 이미 배포되었으면 스킵
-            if aw.status.dispatched:
-                continue
+    async def _start_migrations(self, plan: SchedulingPlan):
+        """
+        현재 계획이 다른 클러스터에 배치한 실행 중 AppWrapper의 마이그레이션 시작 (완료를 기다리지 않음)
 
-            # 모든 gate가 열려있는지 확인
-            all_gates_open = all(
-                gate.status == GateStatus.OPEN
-                for gate in aw.spec.dispatching_gates
-            )
+        Args:
+            plan: 현재 스케줄링 계획
+        """
+        candidates = [
+            aw for aw in await self.store.get_running_appwrappers()
+            if self._needs_migration(aw)
+            and aw.spec.job_id in plan.decisions
+            and plan.decisions[aw.spec.job_id].target_cluster == aw.spec.target_cluster
+        ]
+        if candidates:
+            started = self.migrator.submit(candidates)
+            if started:
+                logger.info(f"Started {started} migrations ({len(self.migrator.in_progress)} in progress)")
+
+    def _hold_until_start(
+        self,
+        appwrappers: List[AppWrapperRecord],
+        plan: SchedulingPlan
+    ) -> List[AppWrapperRecord]:
+        """
+        계획된 시작 시각이 지난 AppWrapper만 반환하고 나머지는 타이머 휠에 보류
+        (재계획으로 시작 시각이 바뀐 보류 작업은 타이머만 옮김)
 
-            if all_gates_open:
-                dispatchable.append(aw)
+        Args:
+            appwrappers: 배포 가능한 AppWrapper
+            plan: 현재 스케줄링 계획
 
-        return dispatchable
+        Returns:
+            지금 배포할 AppWrapper
+        """
+        now = self._clock()
+        self._deferred.advance(now)
+
+        ready = []
+        for aw in appwrappers:
+            job_id = aw.spec.job_id
+            start_at = plan.decisions[job_id].start_at
+            if start_at is not None and start_at > now:
+                self._deferred.schedule(job_id, start_at)
+            else:
+                self._deferred.cancel(job_id)
+                ready.append(aw)
+        return ready
+
+    def _group_indexed(
+        self,
+        appwrappers: List[AppWrapperRecord],
+        plan: SchedulingPlan
+    ) -> Tuple[List[AppWrapperRecord], List[Tuple[str, List[AppWrapperRecord]]]]:
+        """
+        같은 클러스터에 배치된 같은 형태의 AppWrapper를 Indexed Job 단위로 묶음
 
-    async def _dispatch_appwrapper(self, appwrapper: AppWrapper):
+        Args:
+            appwrappers: 지금 배포할 AppWrapper
+            plan: 현재 스케줄링 계획
+
+        Returns:
+            (개별로 만들 AppWrapper, [(클러스터, 묶음)])
+        """
+        if self.indexed_batch_size < 2:
+            return appwrappers, []
+
+        groups: Dict[Tuple[str, Tuple], List[AppWrapperRecord]] = {}
+        for aw in appwrappers:
+            cluster = plan.decisions[aw.spec.job_id].target_cluster
+            groups.setdefault((cluster, shape_of(aw.spec)), []).append(aw)
+
+        singles, batches = [], []
+        for (cluster, _), members in groups.items():
+            for i in range(0, len(members), self.indexed_batch_size):
+                chunk = members[i:i + self.indexed_batch_size]
+                if len(chunk) > 1:
+                    batches.append((cluster, chunk))
+                else:
+                    singles.extend(chunk)
+        return singles, batches
+
+    def _record_tenant_metrics(
+        self,
+        dispatched: List[AppWrapperRecord],
+        outcomes: List[DispatchOutcome],
+        ready_by_tenant: Dict[str, int]
+    ):
         """
-        AppWrapper를 Spoke 클러스터에 배포
+        테넌트별 제출부터 Job 생성까지 지연과 사이클 후 남은 대기열 깊이 기록
 
         Args:
-            appwrapper: 배포할 AppWrapper
+            dispatched: 이번 사이클에 배포를 시도한 AppWrapper
+            outcomes: Job 생성 결과
+            ready_by_tenant: 사이클 시작 시 테넌트별 배포 가능 작업 수
         """
-        job_id = appwrapper.spec.job_id
-        target_cluster = appwrapper.spec.target_cluster
+        by_id = {aw.spec.job_id: aw for aw in dispatched}
+        remaining = dict(ready_by_tenant)
+        for outcome in outcomes:
+            if outcome.error is not None:
+                continue
+            aw = by_id[outcome.job_id]
+            tenant = tenant_of(aw)
+            remaining[tenant] -= 1
+            submitted_at = aw.metadata.get("submitted_at")
+            if submitted_at is not None:
+                tenant_dispatch_latency_seconds.labels(tenant=tenant).observe(
+                    max(0.0, outcome.started_at - float(submitted_at))
+                )
+        self._set_queue_depth(remaining)
+
+    def _set_queue_depth(self, depth: Dict[str, int]):
+        """테넌트별 대기열 깊이 gauge 갱신 (이번에 없는 테넌트는 0)"""
+        for tenant in self._queued_tenants - depth.keys():
+            tenant_dispatch_queue_depth.labels(tenant=tenant).set(0)
+        for tenant, count in depth.items():
+            tenant_dispatch_queue_depth.labels(tenant=tenant).set(count)
+        self._queued_tenants = {tenant for tenant, count in depth.items() if count}
+
+    def _cluster_limit(self, cluster: str) -> asyncio.Semaphore:
+        """클러스터별 동시 요청 한도"""
+        limit = self._cluster_limits.get(cluster)
+        if limit is None:
+            limit = self._cluster_limits[cluster] = asyncio.Semaphore(self.cluster_concurrency)
+        return limit
+
+    async def _call_api(self, func: Callable[..., Any], **kwargs) -> Any:
+        """
+        Kubernetes API 호출
+        비동기 클라이언트는 이벤트 루프에서 바로 기다리고, 동기 클라이언트는 전용 스레드에서 실행
+        """
+        if self._executor is None and not asyncio.iscoroutinefunction(func):
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="hub-dispatch"
+            )
+        return await call_api(func, self._executor, **kwargs)
 
-        logger.info(f"Dispatching {job_id} to {target_cluster}")
+    async def _dispatch_appwrapper(
+        self,
+        appwrapper: AppWrapperRecord,
+        target_cluster: Optional[str] = None
+    ) -> Optional[DispatchOutcome]:
+        """
+        AppWrapper를 Spoke 클러스터에 배포 (Job 생성 요청만, store 반영은 사이클 끝에 일괄)
 
-        # 클러스터 정보 가져오기
-        cluster_info = await hub_store.get_cluster_info(target_cluster)
-        if not cluster_info:
-            raise ValueError(f"Cluster {target_cluster} not found")
+        Args:
+            appwrapper: 배포할 AppWrapper
+            target_cluster: 배포 대상 클러스터 (기본값: spec.target_cluster)
 
-        # Kubernetes Job 매니페스트 생성
-        job_manifest = self._create_job_manifest(appwrapper)
+        Returns:
+            Job 생성 결과 (요청 전에 실패하거나 클러스터가 백오프 중이면 None)
+        """
+        job_id = appwrapper.spec.job_id
+        target_cluster = target_cluster or appwrapper.spec.target_cluster
 
-        # Spoke 클러스터에 Job 생성
         try:
+            # 클러스터 정보 가져오기
+            cluster_info = await self.store.get_cluster_info(target_cluster)
+            if not cluster_info:
+                raise ValueError(f"Cluster {target_cluster} not found")
+
+            # Kubernetes Job 매니페스트 생성
+            job_manifest = self._create_job_manifest(appwrapper, target_cluster)
             batch_api = self._get_k8s_client(cluster_info.kubeconfig_context)
 
-            # Job 생성 (동기 API를 비동기로 실행)
-            await asyncio.to_thread(
-                batch_api.create_namespaced_job,
-                namespace="default",
-                body=job_manifest
-            )
+            if not await self._create_job(batch_api, target_cluster, job_manifest):
+                return None
 
             logger.info(f"Successfully created Job {job_id} in {target_cluster}")
+            return DispatchOutcome(job_id, target_cluster, self._clock())
+
+        except ApiException as e:
+            logger.error(f"Kubernetes API error while dispatching {job_id}: {e}")
+            if e.status == 401:
+                # 토큰/인증서가 교체되었을 수 있으므로 다음 요청에서 kubeconfig를 다시 읽음
+                self.client_pool.invalidate(cluster_info.kubeconfig_context)
+            return DispatchOutcome(job_id, target_cluster, self._clock(), error=e.reason)
+        except Exception as e:
+            logger.error(f"Failed to dispatch {job_id}: {e}", exc_info=True)
+            return None
+
+    async def _create_job(self, batch_api: Any, target_cluster: str, manifest: Dict[str, Any]) -> bool:
+        """
+        클러스터/전체 한도와 circuit breaker 안에서 Job 생성 요청
+
+        Returns:
+            요청을 보냈는지 (클러스터가 백오프 중이면 False)
+
+        Raises:
+            ApiException: API 오류 응답
+        """
+        name = manifest["metadata"]["name"]
+        # 느린 클러스터가 전체 한도를 점유하지 않도록 클러스터 한도를 먼저 획득
+        async with self._cluster_limit(target_cluster):
+            # 한도를 기다리는 동안 앞선 요청이 실패했을 수 있으므로 여기서 확인
+            if not self.breaker.allow(target_cluster):
+                logger.debug(f"Skipping {name}: {target_cluster} is backing off")
+                return False
+            try:
+                async with self._global_limit:
+                    logger.info(f"Dispatching {name} to {target_cluster}")
+                    try:
+                        await self._call_api(
+                            batch_api.create_namespaced_job,
+                            namespace="default",
+                            body=manifest
+                        )
+                    except ApiException as e:
+                        self._record_api_result(target_cluster, e)
+                        raise
+                    except Exception:
+                        # 연결 실패, 타임아웃 등
+                        self.breaker.record_failure(target_cluster)
+                        raise
+                    self.breaker.record_success(target_cluster)
+            except asyncio.CancelledError:
+                # 결과 없이 취소됨 (CancelledError는 Exception이 아님): half-open 시험 요청이었으면 풀어 줌
+                self.breaker.release(target_cluster)
+                raise
+        return True
+
+    async def _dispatch_indexed(
+        self,
+        appwrappers: List[AppWrapperRecord],
+        target_cluster: str
+    ) -> List[DispatchOutcome]:
+        """
+        같은 형태의 AppWrapper 묶음을 Indexed Job 하나로 배포
+
+        Args:
+            appwrappers: 묶을 AppWrapper (인덱스 순서)
+            target_cluster: 배포 대상 클러스터
+
+        Returns:
+            AppWrapper별 결과 (요청 전에 실패하면 빈 리스트)
+        """
+        manifest = self.templates.render_indexed(appwrappers, target_cluster)
+        name = manifest["metadata"]["name"]
+
+        def outcomes(error: Optional[str] = None) -> List[DispatchOutcome]:
+            now = self._clock()
+            return [
+                DispatchOutcome(aw.spec.job_id, target_cluster, now, error, name, index)
+                for index, aw in enumerate(appwrappers)
+            ]
+
+        try:
+            cluster_info = await self.store.get_cluster_info(target_cluster)
+            if not cluster_info:
+                raise ValueError(f"Cluster {target_cluster} not found")
+            batch_api = self._get_k8s_client(cluster_info.kubeconfig_context)
 
-            # AppWrapper 상태 업데이트
-            appwrapper.status.dispatched = True
-            appwrapper.status.phase = "Running"
-            appwrapper.status.cluster = target_cluster
-            appwrapper.status.start_time = time.time()
-            appwrapper.status.message = f"Dispatched to {target_cluster}"
+            if not await self._create_job(batch_api, target_cluster, manifest):
+                return []
 
-            await hub_store.update_appwrapper(job_id, appwrapper)
+            logger.info(f"Successfully created Indexed Job {name} ({len(appwrappers)} AppWrappers) in {target_cluster}")
+            return outcomes()
 
         except ApiException as e:
-            logger.error(f"Kubernetes API error while dispatching {job_id}: {e}")
-            appwrapper.status.message = f"Dispatch failed: {e.reason}"
-            await hub_store.update_appwrapper(job_id, appwrapper)
-            raise
+            logger.error(f"Kubernetes API error while dispatching {name}: {e}")
+            if e.status == 401:
+                self.client_pool.invalidate(cluster_info.kubeconfig_context)
+            return outcomes(e.reason)
+        except Exception as e:
+            logger.error(f"Failed to dispatch {name}: {e}", exc_info=True)
+            return []
+
+    def _record_api_result(self, cluster: str, error: ApiException):
+        """
+        API 오류 응답을 circuit breaker에 반영
+        클러스터 장애(연결 실패, 인증 실패, 과부하, 서버 오류)만 실패로 세고,
+        그 밖의 응답(409, 422 등)은 API 서버가 동작한다는 뜻이므로 성공으로 센다.
+        """
+        if not error.status or error.status in (401, 429) or error.status >= 500:
+            self.breaker.record_failure(cluster)
+        else:
+            self.breaker.record_success(cluster)
 
-    def _create_job_manifest(self, appwrapper: AppWrapper) -> client.V1Job:
+    async def _apply_outcomes(self, outcomes: List[DispatchOutcome], plan_version: Optional[int] = None):
         """
-        AppWrapper로부터 Kubernetes Job 매니페스트 생성
+        Job 생성 결과를 store에 일괄 반영
+        (최신 버전에 적용하여 scheduler의 변경을 덮어쓰지 않음)
+
+        Args:
+            outcomes: 사이클의 Job 생성 결과
+            plan_version: 배치를 결정한 계획 버전
+        """
+        def mark_dispatched(outcome: DispatchOutcome) -> Callable[[AppWrapper], None]:
+            def mutate(aw: AppWrapper):
+                aw.status.dispatched = True
+                aw.status.cluster = outcome.cluster
+                aw.status.start_time = outcome.started_at
+                # informer가 이 반영보다 먼저 Job 종료를 반영했으면 종료 상태 유지
+                if aw.status.phase not in ("Completed", "Failed"):
+                    aw.status.phase = "Running"
+                    aw.status.message = f"Dispatched to {outcome.cluster}"
+                if outcome.indexed_job is not None:
+                    aw.metadata["indexed_job"] = outcome.indexed_job
+                    aw.metadata["job_index"] = str(outcome.index)
+                if plan_version is not None:
+                    aw.metadata["plan_version"] = str(plan_version)
+            return mutate
+
+        def mark_failed(outcome: DispatchOutcome) -> Callable[[AppWrapper], None]:
+            def mutate(aw: AppWrapper):
+                aw.status.message = f"Dispatch failed: {outcome.error}"
+            return mutate
+
+        patches: List[Tuple[str, Callable[[AppWrapper], None]]] = [
+            (outcome.job_id, mark_dispatched(outcome) if outcome.error is None else mark_failed(outcome))
+            for outcome in outcomes
+        ]
+        if patches:
+            await self.store.patch_appwrappers(patches)
+
+    def _create_job_manifest(
+        self,
+        appwrapper: AppWrapperRecord,
+        target_cluster: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        AppWrapper로부터 Kubernetes Job 매니페스트 생성 (형태별 템플릿에서 작업별 필드만 채움)
 
         Args:
             appwrapper: AppWrapper
+            target_cluster: 배포 대상 클러스터 (기본값: spec.target_cluster)
 
         Returns:
-            Kubernetes Job 매니페스트
-        """
-        spec = appwrapper.spec
-
-        # Job 매니페스트
-        job = client.V1Job(
-            api_version="batch/v1",
-            kind="Job",
-            metadata=client.V1ObjectMeta(
-                name=spec.job_id,
-                labels={
-                    "app": "caspian-workload",
-                    "job-id": spec.job_id,
-                    "scheduled-by": "caspian"
-                },
-                annotations={
-                    "caspian.io/target-cluster": spec.target_cluster,
-                    "caspian.io/estimated-co2": appwrapper.metadata.get("estimated_co2_g", "0")
-                }
-            ),
-            spec=client.V1JobSpec(
-                template=client.V1PodTemplateSpec(
-                    metadata=client.V1ObjectMeta(
-                        labels={
-                            "app": "caspian-workload",
-                            "job-id": spec.job_id
-                        }
-                    ),
-                    spec=client.V1PodSpec(
-                        containers=[
-                            client.V1Container(
-                                name="workload",
-                                image=spec.image,
-                                command=spec.command,
-                                resources=client.V1ResourceRequirements(
-                                    requests={
-                                        "cpu": f"{spec.cpu}",
-                                        "memory": f"{spec.mem_gb}Gi"
-                                    },
-                                    limits={
-                                        "cpu": f"{spec.cpu}",
-                                        "memory": f"{spec.mem_gb}Gi"
-                                    }
-                                )
-                            )
-                        ],
-                        restart_policy="Never"
-                    )
-                ),
-                backoff_limit=3,
-                ttl_seconds_after_finished=3600  # 1시간 후 자동 삭제
-            )
-        )
-
-        return job
+            Kubernetes Job 매니페스트 (batch/v1 JSON dict)
+        """
+        return self.templates.render(appwrapper, target_cluster or appwrapper.spec.target_cluster)
 
 
 # 전역 싱글톤 인스턴스
-hub_dispatcher = HubDispatcher()
+_cluster_concurrency = int(os.getenv("HUB_DISPATCH_CLUSTER_CONCURRENCY", "16"))
+hub_dispatcher = HubDispatcher(
+    max_concurrency=int(os.getenv("HUB_DISPATCH_CONCURRENCY", "64")),
+    cluster_concurrency=_cluster_concurrency,
+    client_pool=KubeClientPool(
+        pool_maxsize=_cluster_concurrency,
+        transport=os.getenv("HUB_K8S_TRANSPORT", "async"),
+        health_check_interval=float(os.getenv("HUB_K8S_HEALTH_CHECK_INTERVAL", "60"))
+    ),
+    migration_link_concurrency=int(os.getenv("HUB_MIGRATION_LINK_CONCURRENCY", "2")),
+    failure_threshold=int(os.getenv("HUB_CIRCUIT_FAILURE_THRESHOLD", "5")),
+    backoff_base=float(os.getenv("HUB_DISPATCH_BACKOFF_BASE", "5")),
+    backoff_max=float(os.getenv("HUB_DISPATCH_BACKOFF_MAX", "300")),
+    indexed_batch_size=int(os.getenv("HUB_DISPATCH_INDEXED_BATCH", "0")),
+    tenant_weights=parse_weights(os.getenv("HUB_TENANT_WEIGHTS", "")),
+    max_cycle_dispatch=int(os.getenv("HUB_DISPATCH_CYCLE_LIMIT", "0"))
+)
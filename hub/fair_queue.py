@@ -0,0 +1,136 @@
+"""
+Hub Fair Dispatch Queue
+테넌트(metadata["user"])별 가중치에 따라 배포 순서를 정하는 deficit round robin
+
+한 사용자가 AppWrapper를 수천 개 제출해도 다른 사용자의 작업이 그 뒤에 줄 서지 않도록,
+라운드마다 테넌트별로 가중치만큼 작업을 번갈아 꺼낸다.
+Job 생성 요청은 동시 실행 한도(세마포어)를 요청 순서대로 얻으므로 이 순서가 곧 배포 순서가 된다.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+from hub.records import AppWrapperRecord
+
+T = TypeVar("T")
+
+# 메타데이터에 사용자가 없는 작업의 테넌트
+DEFAULT_TENANT = "default"
+
+# 가중치 * scale의 부동소수점 오차로 1에 조금 못 미치는 deficit 허용
+_EPSILON = 1e-9
+
+
+def tenant_of(appwrapper: AppWrapperRecord) -> str:
+    """AppWrapper의 테넌트 (metadata["user"])"""
+    return appwrapper.metadata.get("user") or DEFAULT_TENANT
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """
+    "alice=2,bob=0.5" 형식의 테넌트 가중치 파싱
+
+    Args:
+        value: 쉼표로 구분한 테넌트=가중치 목록
+
+    Returns:
+        테넌트 -> 가중치
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 가중치가 0 이하
+    """
+    weights = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        tenant, _, weight = entry.partition("=")
+        if float(weight) <= 0:
+            raise ValueError(f"Tenant weight must be positive: {entry}")
+        weights[tenant.strip()] = float(weight)
+    return weights
+
+
+class FairQueue:
+    """
+    테넌트별 가중 deficit round robin
+
+    테넌트 차례마다 deficit에 가중치를 더하고, deficit이 1 이상인 만큼 작업을 꺼낸다.
+    가장 작은 가중치가 한 차례에 1이 되도록 맞추므로 빈 라운드 없이 O(작업 수)로 정렬된다.
+    같은 테넌트 안에서는 입력 순서를 유지한다.
+
+    deficit과 라운드 위치(cursor)는 호출 사이에 유지되므로, 사이클마다 limit개만 배포해도
+    다음 사이클은 이전 사이클이 멈춘 테넌트 다음부터 이어서 돈다 (작업이 없어진 테넌트의 deficit은 버림).
+    deficit 단위는 대기 중인 테넌트의 최소 가중치(scale)에 따라 정해지므로, scale이 바뀌면 deficit을 초기화한다.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        """
+        Args:
+            weights: 테넌트 -> 가중치 (없는 테넌트는 default_weight)
+            default_weight: 기본 가중치
+        """
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        # 라운드 순서 (처음 본 순서), 다음 차례의 위치, 가중치를 받고 아직 차례가 끝나지 않은 테넌트
+        self._ring: List[str] = []
+        self._cursor = 0
+        self._visiting: Optional[str] = None
+        self._deficits: Dict[str, float] = {}
+        # _deficits를 쌓을 때 쓴 scale
+        self._scale: Optional[float] = None
+
+    def weight(self, tenant: str) -> float:
+        return self.weights.get(tenant, self.default_weight)
+
+    def order(self, items: List[T], tenant: Callable[[T], str] = tenant_of, limit: int = 0) -> List[T]:
+        """
+        가중치 비율로 테넌트를 번갈아 가며 정렬
+
+        Args:
+            items: 대기 중인 작업 전체 (테넌트 안에서는 이 순서 유지)
+            tenant: 작업의 테넌트 함수
+            limit: 꺼낼 최대 작업 수 (0이면 전부, 라운드 위치는 꺼낸 지점까지만 진행)
+
+        Returns:
+            배포 순서대로 정렬한 작업
+        """
+        queues: Dict[str, Deque[T]] = {}
+        for item in items:
+            queues.setdefault(tenant(item), deque()).append(item)
+        if not queues:
+            return []
+
+        # 이전 라운드 순서를 유지하고 새 테넌트는 뒤에 붙임 (작업이 없는 테넌트는 빠짐)
+        cursor = sum(1 for name in self._ring[:self._cursor] if name in queues)
+        ring = [name for name in self._ring if name in queues]
+        seen = set(ring)
+        ring.extend(name for name in queues if name not in seen)
+        deficits = {name: self._deficits.get(name, 0.0) for name in ring}
+        visiting = self._visiting if self._visiting in queues else None
+        cursor %= len(ring)
+
+        scale = 1.0 / min(self.weight(name) for name in ring)
+        if scale != self._scale:
+            # 이전 deficit은 다른 단위로 쌓였으므로 이어 쓰지 않음 (라운드 위치는 유지)
+            deficits = dict.fromkeys(ring, 0.0)
+            visiting = None
+        limit = min(limit, len(items)) if limit > 0 else len(items)
+        ordered: List[T] = []
+        while len(ordered) < limit:
+            name = ring[cursor]
+            queue = queues[name]
+            if queue:
+                if visiting != name:
+                    deficits[name] += self.weight(name) * scale
+                    visiting = name
+                while queue and deficits[name] >= 1.0 - _EPSILON and len(ordered) < limit:
+                    ordered.append(queue.popleft())
+                    deficits[name] -= 1.0
+                if queue and deficits[name] >= 1.0 - _EPSILON:
+                    # limit에 걸려 차례 도중에 멈춤: 다음 호출은 이 테넌트부터 가중치를 다시 더하지 않고 이어감
+                    break
+            if not queue:
+                deficits[name] = 0.0
+            visiting = None
+            cursor = (cursor + 1) % len(ring)
+
+        self._ring, self._cursor, self._visiting = ring, cursor, visiting
+        self._deficits, self._scale = deficits, scale
+        return ordered
@@ -0,0 +1,601 @@
+"""
+Fake Spoke Kubernetes API
+실제 kind 클러스터 없이 Dispatcher/Informer를 대규모로 돌려 보기 위한 batch/v1 Jobs, core/v1 Nodes 대역
+
+FakeSpoke 하나가 클러스터 하나의 상태(노드, Job, Pod 배치, watch 이벤트 기록)를 가지고,
+create_fake_spoke_app이 여러 Spoke를 /spokes/{name} 아래에 붙인 ASGI 앱을 만든다.
+AsyncBatchApi/BatchV1Api는 kubeconfig의 server를 http://host:port/spokes/{name}으로 두면 그대로 붙는다.
+
+- 응답 지연(latency)과 오류 주입(error_rate, error_status)은 Spoke별로 바꿀 수 있다
+- Pod는 노드 용량 안에서 first-fit으로 배치하고, 자리가 없으면 FIFO로 대기한다
+- Pod는 job_duration 뒤에 끝나며(job_failure_rate 확률로 실패), Job 상태와 조건은 실제 Job controller처럼 바뀐다
+- Indexed Job(completionMode=Indexed)은 인덱스별로 completedIndexes/failedIndexes를 기록한다
+
+사용법:
+    spokes = {f"C{i}": FakeSpoke(f"C{i}") for i in range(20)}
+    async with serve_fake_spokes(spokes) as base_url:
+        write_kubeconfig(path, base_url, spokes)
+"""
+
+import asyncio
+import json
+import random
+import socket
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from hub.models import NodeResources
+
+
+class FakeApiError(Exception):
+    """Kubernetes Status 응답으로 바뀌는 오류"""
+
+    def __init__(self, code: int, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.code = code
+        self.reason = reason
+        self.message = message or reason
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "kind": "Status", "apiVersion": "v1", "status": "Failure",
+            "message": self.message, "reason": self.reason, "code": self.code
+        }
+
+
+def _rfc3339(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_cpu(value: Any) -> float:
+    """CPU 수량("2", "0.5", "500m")을 코어 수로 변환"""
+    value = str(value)
+    return float(value[:-1]) / 1000 if value.endswith("m") else float(value)
+
+
+# 접미사 -> GiB 배율 (두 글자 접미사를 먼저 확인)
+_MEMORY_UNITS = {
+    "Ki": 2 ** -20, "Mi": 2 ** -10, "Gi": 1.0, "Ti": 2 ** 10,
+    "K": 1e3 / 2 ** 30, "M": 1e6 / 2 ** 30, "G": 1e9 / 2 ** 30
+}
+
+
+def _parse_memory_gb(value: Any) -> float:
+    """메모리 수량("4Gi", "512Mi", "1000000000")을 GiB로 변환"""
+    value = str(value)
+    for unit, scale in _MEMORY_UNITS.items():
+        if value.endswith(unit):
+            return float(value[:-len(unit)]) * scale
+    return float(value) / 2 ** 30
+
+
+def _indexes_string(indexes: List[int]) -> str:
+    """인덱스 목록을 Job status 형식("0-2,5")으로 변환"""
+    ranges: List[List[int]] = []
+    for index in sorted(indexes):
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def _matches(labels: Dict[str, str], selector: Optional[str]) -> bool:
+    """등호 라벨 셀렉터("a=b,c=d") 일치 여부"""
+    if not selector:
+        return True
+    for term in selector.split(","):
+        key, _, value = term.partition("=")
+        if labels.get(key.strip()) != value.strip():
+            return False
+    return True
+
+
+class _FakeJob:
+    """Job 하나의 Pod 진행 상태"""
+
+    __slots__ = ("key", "cpu", "mem_gb", "pods", "succeeded", "failed", "suspended")
+
+    def __init__(self, key: Tuple[str, str], cpu: float, mem_gb: float):
+        self.key = key
+        self.cpu = cpu
+        self.mem_gb = mem_gb
+        self.pods: Dict[int, Tuple[int, asyncio.TimerHandle]] = {}   # 인덱스 -> (노드, 종료 타이머)
+        self.succeeded: List[int] = []
+        self.failed: List[int] = []
+        self.suspended = False
+
+
+class FakeSpoke:
+    """
+    Spoke 클러스터 하나의 fake batch/v1 Jobs, core/v1 Nodes 상태
+
+    Job 객체(dict)는 바뀔 때마다 새 dict로 교체하므로, watch 기록에 남긴 객체를 복사하지 않고 공유한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        nodes: int = 4,
+        node_cpu: float = 16.0,
+        node_mem_gb: float = 64.0,
+        job_duration: float = 1.0,
+        duration_of: Optional[Callable[[Dict[str, Any]], float]] = None,
+        job_failure_rate: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        history: int = 10000,
+        seed: int = 0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Fake Spoke 초기화
+
+        Args:
+            name: 클러스터 이름
+            nodes: 노드 수
+            node_cpu: 노드별 CPU 코어
+            node_mem_gb: 노드별 메모리 (GiB)
+            job_duration: Pod 실행 시간 (초)
+            duration_of: Job dict -> Pod 실행 시간 (지정 시 job_duration 대신 사용)
+            job_failure_rate: Pod가 실패로 끝날 확률
+            latency: 요청마다 응답 전 대기 (초, watch는 스트림을 열 때 한 번)
+            error_rate: 요청이 error_status로 실패할 확률
+            error_status: 주입할 오류 응답 코드 (500, 429, 503 등)
+            history: watch로 이어 받을 수 있는 최근 이벤트 수 (넘으면 410 Gone)
+            seed: 실패/오류 주입 난수 시드
+            clock: 현재 시각 함수 (Job 시각 필드)
+        """
+        self.name = name
+        self.node_cpu = node_cpu
+        self.node_mem_gb = node_mem_gb
+        self.job_duration = job_duration
+        self.duration_of = duration_of
+        self.job_failure_rate = job_failure_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._clock = clock
+
+        # 노드별 남은 (CPU, 메모리)
+        self.node_free: List[List[float]] = [[node_cpu, node_mem_gb] for _ in range(nodes)]
+        # (namespace, name) -> Job dict
+        self.jobs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._state: Dict[Tuple[str, str], _FakeJob] = {}
+        # 자리가 나기를 기다리는 (Job, 인덱스)
+        self._pending: Deque[Tuple[Tuple[str, str], int]] = deque()
+
+        self.resource_version = 0
+        self._events: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=history)
+        self._changed = asyncio.Event()
+        self._closed = False
+        self.requests = 0
+
+    # ==================== 요청 공통 ====================
+
+    async def handle(self):
+        """요청 하나의 지연과 오류 주입"""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakeApiError(self.error_status, "InjectedError", f"injected failure from {self.name}")
+
+    # ==================== Jobs ====================
+
+    def create_job(self, namespace: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Job 생성 (이름이 이미 있으면 409)"""
+        name = body["metadata"]["name"]
+        key = (namespace, name)
+        if key in self.jobs:
+            raise FakeApiError(409, "AlreadyExists", f'jobs.batch "{name}" already exists')
+
+        spec = dict(body.get("spec") or {})
+        container = spec["template"]["spec"]["containers"][0]
+        requests = (container.get("resources") or {}).get("requests") or {}
+        spec.setdefault("completions", 1)
+        spec.setdefault("parallelism", spec["completions"])
+        spec.setdefault("suspend", False)
+
+        job = {
+            "apiVersion": "batch/v1", "kind": "Job",
+            "metadata": {
+                **body["metadata"], "namespace": namespace,
+                "uid": f"{self.name}-{self.resource_version + 1}",
+                "creationTimestamp": _rfc3339(self._clock())
+            },
+            "spec": spec,
+            "status": {}
+        }
+        state = self._state[key] = _FakeJob(
+            key, _parse_cpu(requests.get("cpu", 0)), _parse_memory_gb(requests.get("memory", 0))
+        )
+        state.suspended = spec["suspend"]
+        self._commit(key, job, "ADDED")
+        if not state.suspended:
+            self._enqueue(state)
+            self._schedule()
+        return self.jobs[key]
+
+    def get_job(self, namespace: str, name: str) -> Dict[str, Any]:
+        job = self.jobs.get((namespace, name))
+        if job is None:
+            raise FakeApiError(404, "NotFound", f'jobs.batch "{name}" not found')
+        return job
+
+    def patch_job(self, namespace: str, name: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Job 부분 수정 (spec.suspend, metadata.labels/annotations만 반영)"""
+        key = (namespace, name)
+        job = self.get_job(namespace, name)
+        metadata = dict(job["metadata"])
+        for field in ("labels", "annotations"):
+            if field in (patch.get("metadata") or {}):
+                metadata[field] = {**(metadata.get(field) or {}), **patch["metadata"][field]}
+        spec = {**job["spec"], **(patch.get("spec") or {})}
+        self._commit(key, {**job, "metadata": metadata, "spec": spec}, "MODIFIED")
+
+        state = self._state[key]
+        if spec.get("suspend") and not state.suspended:
+            state.suspended = True
+            self._release(state)
+            self._pending = deque(item for item in self._pending if item[0] != key)
+            self._update_status(key, active=0, conditions=[
+                {"type": "Suspended", "status": "True", "reason": "JobSuspended",
+                 "lastTransitionTime": _rfc3339(self._clock())}
+            ])
+            self._schedule()
+        elif not spec.get("suspend") and state.suspended:
+            state.suspended = False
+            self._update_status(key, conditions=[])
+            self._enqueue(state)
+            self._schedule()
+        return self.jobs[key]
+
+    def delete_job(self, namespace: str, name: str) -> Dict[str, Any]:
+        """Job 삭제 (Pod도 바로 정리)"""
+        key = (namespace, name)
+        job = self.get_job(namespace, name)
+        state = self._state.pop(key)
+        self._release(state)
+        self._pending = deque(item for item in self._pending if item[0] != key)
+        del self.jobs[key]
+        self._record("DELETED", job)
+        self._schedule()
+        return {"kind": "Status", "apiVersion": "v1", "status": "Success", "details": {"name": name, "kind": "jobs"}}
+
+    def list_jobs(
+        self,
+        namespace: str,
+        label_selector: Optional[str] = None,
+        limit: Optional[int] = None,
+        continue_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """JobList (limit/continue 페이지 지원, continue는 시작 위치)"""
+        items = [
+            job for (job_namespace, _), job in self.jobs.items()
+            if job_namespace == namespace and _matches(job["metadata"].get("labels") or {}, label_selector)
+        ]
+        start = int(continue_token or 0)
+        end = start + limit if limit else len(items)
+        metadata = {"resourceVersion": str(self.resource_version)}
+        if end < len(items):
+            metadata["continue"] = str(end)
+        return {"apiVersion": "batch/v1", "kind": "JobList", "metadata": metadata, "items": items[start:end]}
+
+    async def watch_jobs(
+        self,
+        namespace: str,
+        resource_version: Optional[str],
+        label_selector: Optional[str] = None,
+        timeout_seconds: float = 300.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        resource_version 이후의 Job 이벤트 (timeout_seconds 뒤 BOOKMARK를 보내고 종료)
+        기록이 이미 밀려난 버전이면 410 ERROR 이벤트 하나를 보낸다.
+        """
+        since = int(resource_version or self.resource_version)
+        if self._events and since < self._events[0][0] - 1:
+            yield {"type": "ERROR", "object": {
+                "kind": "Status", "apiVersion": "v1", "status": "Failure", "code": 410,
+                "reason": "Expired", "message": f"too old resource version: {since}"
+            }}
+            return
+
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            changed = self._changed
+            for version, kind, job in list(self._events):
+                if version <= since:
+                    continue
+                since = version
+                if job["metadata"].get("namespace") == namespace and \
+                        _matches(job["metadata"].get("labels") or {}, label_selector):
+                    yield {"type": kind, "object": job}
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._closed:
+                break
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        yield {"type": "BOOKMARK", "object": {
+            "kind": "Job", "apiVersion": "batch/v1", "metadata": {"resourceVersion": str(since)}
+        }}
+
+    # ==================== Nodes ====================
+
+    def list_nodes(self) -> Dict[str, Any]:
+        """NodeList (capacity/allocatable은 노드 전체 용량)"""
+        def quantity(cpu: float, mem_gb: float) -> Dict[str, str]:
+            return {"cpu": f"{cpu:g}", "memory": f"{int(mem_gb * 2 ** 20)}Ki", "pods": "110"}
+
+        items = [
+            {
+                "apiVersion": "v1", "kind": "Node",
+                "metadata": {
+                    "name": f"{self.name.lower()}-node-{i}",
+                    "labels": {"kubernetes.io/hostname": f"{self.name.lower()}-node-{i}"}
+                },
+                "status": {
+                    "capacity": quantity(self.node_cpu, self.node_mem_gb),
+                    "allocatable": quantity(self.node_cpu, self.node_mem_gb),
+                    "conditions": [{"type": "Ready", "status": "True"}]
+                }
+            }
+            for i in range(len(self.node_free))
+        ]
+        return {"apiVersion": "v1", "kind": "NodeList", "metadata": {"resourceVersion": str(self.resource_version)},
+                "items": items}
+
+    def node_resources(self) -> List[NodeResources]:
+        """Hub 등록용 노드별 리소스 (ClusterResources.nodes, 현재 남은 양 포함)"""
+        return [
+            NodeResources(
+                name=f"{self.name.lower()}-node-{i}",
+                cpu_free=cpu, mem_free_gb=mem_gb,
+                cpu_allocatable=self.node_cpu, mem_allocatable_gb=self.node_mem_gb
+            )
+            for i, (cpu, mem_gb) in enumerate(self.node_free)
+        ]
+
+    @property
+    def cpu_used(self) -> float:
+        return sum(self.node_cpu - cpu for cpu, _ in self.node_free)
+
+    # ==================== Job controller ====================
+
+    def _commit(self, key: Tuple[str, str], job: Dict[str, Any], kind: str):
+        self.resource_version += 1
+        job["metadata"] = {**job["metadata"], "resourceVersion": str(self.resource_version)}
+        self.jobs[key] = job
+        self._events.append((self.resource_version, kind, job))
+        self._notify()
+
+    def _record(self, kind: str, job: Dict[str, Any]):
+        self.resource_version += 1
+        job = {**job, "metadata": {**job["metadata"], "resourceVersion": str(self.resource_version)}}
+        self._events.append((self.resource_version, kind, job))
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _update_status(self, key: Tuple[str, str], **status):
+        job = self.jobs[key]
+        self._commit(key, {**job, "status": {**job["status"], **status}}, "MODIFIED")
+
+    def _enqueue(self, state: _FakeJob):
+        done = set(state.succeeded) | set(state.failed) | set(state.pods)
+        completions = self.jobs[state.key]["spec"]["completions"]
+        self._pending.extend((state.key, index) for index in range(completions) if index not in done)
+
+    def _release(self, state: _FakeJob):
+        for node, timer in state.pods.values():
+            timer.cancel()
+            self.node_free[node][0] += state.cpu
+            self.node_free[node][1] += state.mem_gb
+        state.pods.clear()
+
+    def _schedule(self):
+        """대기 Pod를 순서대로 first-fit 배치 (맨 앞 Pod가 들어갈 자리가 없으면 멈춤)"""
+        loop = asyncio.get_running_loop()
+        started: Dict[Tuple[str, str], int] = {}
+        while self._pending:
+            key, index = self._pending[0]
+            state = self._state[key]
+            node = next(
+                (i for i, (cpu, mem) in enumerate(self.node_free) if cpu >= state.cpu and mem >= state.mem_gb),
+                None
+            )
+            if node is None:
+                break
+            self._pending.popleft()
+            self.node_free[node][0] -= state.cpu
+            self.node_free[node][1] -= state.mem_gb
+            job = self.jobs[key]
+            duration = self.duration_of(job) if self.duration_of else self.job_duration
+            state.pods[index] = (node, loop.call_later(duration, self._finish_pod, key, index))
+            started[key] = started.get(key, 0) + 1
+
+        for key in started:
+            state = self._state[key]
+            status = {"active": len(state.pods)}
+            if "startTime" not in self.jobs[key]["status"]:
+                status["startTime"] = _rfc3339(self._clock())
+            self._update_status(key, **status)
+
+    def _finish_pod(self, key: Tuple[str, str], index: int):
+        state = self._state.get(key)
+        if state is None or index not in state.pods:
+            return
+        node, _ = state.pods.pop(index)
+        self.node_free[node][0] += state.cpu
+        self.node_free[node][1] += state.mem_gb
+        failed = self.job_failure_rate and self._rng.random() < self.job_failure_rate
+        (state.failed if failed else state.succeeded).append(index)
+
+        job = self.jobs[key]
+        spec = job["spec"]
+        status = {"active": len(state.pods), "succeeded": len(state.succeeded), "failed": len(state.failed)}
+        if spec.get("completionMode") == "Indexed":
+            status["completedIndexes"] = _indexes_string(state.succeeded)
+            if state.failed:
+                status["failedIndexes"] = _indexes_string(state.failed)
+
+        now = _rfc3339(self._clock())
+        if len(state.succeeded) == spec["completions"]:
+            status["completionTime"] = now
+            status["conditions"] = [{"type": "Complete", "status": "True", "lastTransitionTime": now}]
+        elif len(state.succeeded) + len(state.failed) == spec["completions"]:
+            reason = "FailedIndexes" if spec.get("completionMode") == "Indexed" else "BackoffLimitExceeded"
+            status["conditions"] = [{"type": "Failed", "status": "True", "reason": reason, "lastTransitionTime": now}]
+        self._update_status(key, **status)
+        self._schedule()
+
+    def close(self):
+        """실행 중인 Pod 타이머 정리, 열린 watch 스트림 종료 (서버 종료 시)"""
+        self._closed = True
+        self._notify()
+        for state in self._state.values():
+            for _, timer in state.pods.values():
+                timer.cancel()
+
+
+def create_fake_spoke_app(spokes: Dict[str, FakeSpoke]) -> FastAPI:
+    """
+    여러 Fake Spoke를 /spokes/{name} 아래에 노출하는 ASGI 앱
+
+    Args:
+        spokes: 클러스터 이름 -> FakeSpoke
+
+    Returns:
+        FastAPI 앱
+    """
+    app = FastAPI(title="CASPIAN Fake Spoke API")
+    jobs_path = "/spokes/{spoke}/apis/batch/v1/namespaces/{namespace}/jobs"
+
+    @app.exception_handler(FakeApiError)
+    async def status_error(request: Request, error: FakeApiError):
+        return JSONResponse(error.status(), status_code=error.code)
+
+    async def spoke_of(spoke: str) -> FakeSpoke:
+        fake = spokes.get(spoke)
+        if fake is None:
+            raise FakeApiError(404, "NotFound", f"unknown spoke {spoke}")
+        await fake.handle()
+        return fake
+
+    def respond(payload: Dict[str, Any], status_code: int = 200) -> Response:
+        return Response(json.dumps(payload, separators=(",", ":")), status_code=status_code,
+                        media_type="application/json")
+
+    @app.get("/spokes/{spoke}/version")
+    async def version(spoke: str):
+        await spoke_of(spoke)
+        return respond({"major": "1", "minor": "30", "gitVersion": "v1.30.0-fake"})
+
+    @app.get("/spokes/{spoke}/api/v1/nodes")
+    async def list_nodes(spoke: str):
+        return respond((await spoke_of(spoke)).list_nodes())
+
+    @app.post(jobs_path)
+    async def create_job(spoke: str, namespace: str, request: Request):
+        fake = await spoke_of(spoke)
+        return respond(fake.create_job(namespace, json.loads(await request.body())), 201)
+
+    @app.get(jobs_path)
+    async def list_jobs(spoke: str, namespace: str, request: Request):
+        params = request.query_params
+        fake = await spoke_of(spoke)
+        if params.get("watch") in ("true", "1"):
+            events = fake.watch_jobs(
+                namespace, params.get("resourceVersion"), params.get("labelSelector"),
+                float(params.get("timeoutSeconds", 300))
+            )
+            return StreamingResponse(
+                (json.dumps(event, separators=(",", ":")) + "\n" async for event in events),
+                media_type="application/json"
+            )
+        limit = params.get("limit")
+        return respond(fake.list_jobs(
+            namespace, params.get("labelSelector"), int(limit) if limit else None, params.get("continue")
+        ))
+
+    @app.get(jobs_path + "/{name}")
+    async def get_job(spoke: str, namespace: str, name: str):
+        return respond((await spoke_of(spoke)).get_job(namespace, name))
+
+    @app.patch(jobs_path + "/{name}")
+    async def patch_job(spoke: str, namespace: str, name: str, request: Request):
+        fake = await spoke_of(spoke)
+        return respond(fake.patch_job(namespace, name, json.loads(await request.body())))
+
+    @app.delete(jobs_path + "/{name}")
+    async def delete_job(spoke: str, namespace: str, name: str):
+        return respond((await spoke_of(spoke)).delete_job(namespace, name))
+
+    return app
+
+
+@asynccontextmanager
+async def serve_fake_spokes(spokes: Dict[str, FakeSpoke], host: str = "127.0.0.1") -> AsyncIterator[str]:
+    """
+    Fake Spoke API를 현재 이벤트 루프에서 실행 (uvicorn)
+
+    Args:
+        spokes: 클러스터 이름 -> FakeSpoke
+        host: 바인드 주소
+
+    Yields:
+        서버 주소 (http://host:port, Spoke별 server는 {주소}/spokes/{name})
+    """
+    sock = socket.socket()
+    sock.bind((host, 0))
+    server = uvicorn.Server(uvicorn.Config(
+        create_fake_spoke_app(spokes), log_level="warning", backlog=4096, timeout_graceful_shutdown=1
+    ))
+    # 호스트 프로세스(테스트, 벤치마크)의 시그널 처리를 가로채지 않음
+    server.install_signal_handlers = lambda: None
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://{host}:{sock.getsockname()[1]}"
+    finally:
+        for fake in spokes.values():
+            fake.close()
+        server.should_exit = True
+        await task
+        sock.close()
+
+
+def write_kubeconfig(path: str, base_url: str, spokes: Dict[str, FakeSpoke]):
+    """
+    Spoke마다 context "fake-{name}"(소문자)을 가진 kubeconfig 작성
+
+    Args:
+        path: kubeconfig 경로
+        base_url: serve_fake_spokes가 돌려준 서버 주소
+        spokes: 클러스터 이름 -> FakeSpoke
+    """
+    config = {
+        "apiVersion": "v1", "kind": "Config",
+        "clusters": [{"name": name, "cluster": {"server": f"{base_url}/spokes/{name}"}} for name in spokes],
+        "users": [{"name": "fake", "user": {"token": "fake"}}],
+        "contexts": [
+            {"name": f"fake-{name.lower()}", "context": {"cluster": name, "user": "fake"}} for name in spokes
+        ],
+        "current-context": f"fake-{next(iter(spokes)).lower()}"
+    }
+    with open(path, "w") as f:
+        json.dump(config, f)
@@ -0,0 +1,321 @@
+"""
+Hub Job Garbage Collector
+삭제된 AppWrapper의 Spoke Job(과 pod)을 백그라운드에서 정리하는 cascading delete
+
+AppWrapper를 지우면 실행 중인 Spoke Job은 삭제 대기로 표시하고 이 collector에 넘긴다.
+    1. 클러스터별 큐에 쌓인 Job을 batch_size개씩 묶어 삭제 요청 (Foreground propagation: pod가 모두 지워진 뒤 Job 삭제)
+    2. 클러스터별 초당 rate개로 요청 속도 제한
+    3. informer가 Job 삭제(DELETED)를 확인하면 store에서 AppWrapper 제거
+confirm_timeout 안에 확인되지 않은 삭제는 다시 요청하고(이미 없으면 404로 확인),
+요청이 실패하면 retry_interval 뒤에 다시 보낸다.
+삭제가 확인되기 전까지 AppWrapper는 Running으로 남아 optimizer가 그 용량을 사용 중으로 본다.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from kubernetes.client.rest import ApiException
+from hub.dispatcher import hub_dispatcher
+from hub.kube_clients import KubeClientPool, call_api
+from hub.models import AppWrapper
+from hub.records import AppWrapperRecord
+from hub.store import HubStore, hub_store
+
+logger = logging.getLogger(__name__)
+
+# 삭제 대기로 표시한 시각 (AppWrapper metadata 키)
+DELETION_ANNOTATION = "deletion_requested_at"
+
+# 셀렉터 요구 조건: (키, 연산자 "=" 또는 "!=", 값)
+Requirement = Tuple[str, str, str]
+
+
+def parse_selector(selector: str) -> List[Requirement]:
+    """
+    "user=alice,team!=infra" 형식의 AppWrapper metadata 셀렉터 파싱 (조건은 모두 AND)
+
+    Args:
+        selector: 쉼표로 구분한 key=value, key==value, key!=value 목록
+
+    Returns:
+        요구 조건 목록
+
+    Raises:
+        ValueError: 조건이 없거나 형식이 잘못됨
+    """
+    requirements = []
+    for term in filter(None, (part.strip() for part in selector.split(","))):
+        for op in ("!=", "==", "="):
+            key, found, value = term.partition(op)
+            if found:
+                break
+        if not found or not key.strip():
+            raise ValueError(f"Invalid selector term: {term}")
+        requirements.append((key.strip(), "!=" if op == "!=" else "=", value.strip()))
+    if not requirements:
+        raise ValueError("Selector must not be empty")
+    return requirements
+
+
+def matches(metadata: Dict[str, str], requirements: List[Requirement]) -> bool:
+    """metadata가 모든 조건을 만족하는지 (!=는 키가 없어도 만족)"""
+    for key, op, value in requirements:
+        if (metadata.get(key) == value) != (op == "="):
+            return False
+    return True
+
+
+class JobGarbageCollector:
+    """
+    Spoke Job 비동기 삭제기
+
+    클러스터마다 큐가 비고 확인 대기도 없어질 때까지 도는 태스크 하나가 삭제를 보낸다.
+    Indexed Job으로 묶인 작업은 묶음의 다른 작업이 아직 실행 중이면 Job을 지우지 않고
+    AppWrapper만 바로 제거한다 (그 인덱스는 끝까지 실행된다).
+    """
+
+    def __init__(
+        self,
+        store: Optional[HubStore] = None,
+        client_pool: Optional[KubeClientPool] = None,
+        batch_size: int = 50,
+        rate: float = 20.0,
+        confirm_timeout: float = 300.0,
+        retry_interval: float = 30.0,
+        clock: Callable[[], float] = time.time,
+        namespace: str = "default"
+    ):
+        """
+        Collector 초기화
+
+        Args:
+            store: Hub Store (기본값: 전역 hub_store)
+            client_pool: Spoke 클라이언트 풀 (기본값: 전역 Dispatcher의 풀)
+            batch_size: 클러스터 하나에 동시에 보내는 최대 삭제 요청 수
+            rate: 클러스터별 초당 최대 삭제 요청 수
+            confirm_timeout: informer 확인이 없으면 삭제를 다시 요청하기까지 대기 (초)
+            retry_interval: 삭제 요청 실패 후 재시도까지 대기 (초)
+            clock: 삭제 요청 시각 기록용 현재 시각 함수
+            namespace: Job 네임스페이스
+        """
+        self.store = store if store is not None else hub_store
+        self.client_pool = client_pool if client_pool is not None else hub_dispatcher.client_pool
+        self.batch_size = batch_size
+        self.rate = rate
+        self.confirm_timeout = confirm_timeout
+        self.retry_interval = retry_interval
+        self.namespace = namespace
+        self._clock = clock
+
+        # 클러스터 -> 삭제 요청을 보낼 Job 이름 -> 그 Job의 AppWrapper job_id (삽입 순서대로 처리)
+        self.queued: Dict[str, Dict[str, List[str]]] = {}
+        # (클러스터, Job 이름) -> (job_id, 다시 요청할 이벤트 루프 시각)
+        self.awaiting: Dict[Tuple[str, str], Tuple[List[str], float]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+
+    async def delete(self, appwrappers: List[AppWrapperRecord]) -> Dict[str, int]:
+        """
+        AppWrapper 삭제 (Spoke에서 실행 중인 Job은 삭제 대기로 표시하고 큐에 넣음)
+
+        Args:
+            appwrappers: 삭제할 AppWrapper
+
+        Returns:
+            {"removed": 바로 제거한 수, "deleting": Job 삭제 확인을 기다리는 수}
+        """
+        removed: List[str] = []
+        jobs: Dict[Tuple[str, str], List[str]] = {}
+        indexed: Set[Tuple[str, str]] = set()
+        deleting = 0
+        for aw in appwrappers:
+            if DELETION_ANNOTATION in aw.metadata:
+                deleting += 1
+            elif aw.status.dispatched and aw.status.phase == "Running" and aw.status.cluster:
+                key = (aw.status.cluster, aw.metadata.get("indexed_job", aw.spec.job_id))
+                jobs.setdefault(key, []).append(aw.spec.job_id)
+                if "indexed_job" in aw.metadata:
+                    indexed.add(key)
+            else:
+                removed.append(aw.spec.job_id)
+
+        if indexed:
+            await self._keep_shared_indexed_jobs(jobs, indexed, removed)
+
+        for job_id in removed:
+            await self.store.remove_appwrapper(job_id)
+
+        if jobs:
+            requested_at = self._clock()
+
+            def mark(cluster: str) -> Callable[[AppWrapper], None]:
+                def mutate(aw: AppWrapper):
+                    aw.metadata[DELETION_ANNOTATION] = str(requested_at)
+                    aw.status.message = f"Deleting Job from {cluster}"
+                return mutate
+
+            await self.store.patch_appwrappers([
+                (job_id, mark(cluster)) for (cluster, _), job_ids in jobs.items() for job_id in job_ids
+            ])
+            for (cluster, name), job_ids in jobs.items():
+                self._enqueue(cluster, name, job_ids)
+                deleting += len(job_ids)
+            logger.info(f"Queued {len(jobs)} spoke Jobs for deletion ({deleting} AppWrappers)")
+
+        return {"removed": len(removed), "deleting": deleting}
+
+    async def _keep_shared_indexed_jobs(
+        self,
+        jobs: Dict[Tuple[str, str], List[str]],
+        indexed: Set[Tuple[str, str]],
+        removed: List[str]
+    ):
+        """다른 실행 중 작업이 남은 Indexed Job은 삭제 대상에서 빼고 AppWrapper만 제거 목록으로 옮김"""
+        live: Dict[str, int] = {}
+        for aw in await self.store.get_running_appwrappers():
+            name = aw.metadata.get("indexed_job")
+            if name is not None and DELETION_ANNOTATION not in aw.metadata:
+                live[name] = live.get(name, 0) + 1
+
+        for key in indexed:
+            job_ids = jobs[key]
+            if live.get(key[1], 0) > len(job_ids):
+                logger.info(f"Indexed Job {key[1]} still runs other AppWrappers; removing {len(job_ids)} members only")
+                removed.extend(jobs.pop(key))
+
+    async def confirm(self, cluster: str, names: List[str]) -> int:
+        """
+        Spoke에서 사라진 Job의 AppWrapper를 store에서 제거 (informer가 호출)
+
+        Args:
+            cluster: Job이 있던 클러스터
+            names: 삭제된 Job 이름
+
+        Returns:
+            제거한 AppWrapper 수
+        """
+        confirmed = 0
+        for name in names:
+            entry = self.awaiting.pop((cluster, name), None)
+            job_ids = entry[0] if entry is not None else self.queued.get(cluster, {}).pop(name, None)
+            if job_ids is None:
+                continue
+            for job_id in job_ids:
+                if await self.store.remove_appwrapper(job_id):
+                    confirmed += 1
+            logger.info(f"Confirmed deletion of Job {name} from {cluster}")
+        return confirmed
+
+    def stats(self) -> Dict[str, int]:
+        """큐에서 기다리는 Job 수와 삭제 확인을 기다리는 Job 수"""
+        return {
+            "queued": sum(len(queue) for queue in self.queued.values()),
+            "awaiting_confirmation": len(self.awaiting)
+        }
+
+    async def wait(self):
+        """모든 클러스터의 삭제 요청과 확인이 끝날 때까지 대기"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def stop(self):
+        """삭제 태스크 취소 (큐와 확인 대기는 유지)"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _enqueue(self, cluster: str, name: str, job_ids: List[str]):
+        self.queued.setdefault(cluster, {})[name] = job_ids
+        if cluster in self._tasks:
+            self._wakeups[cluster].set()
+        else:
+            self._wakeups[cluster] = asyncio.Event()
+            self._tasks[cluster] = asyncio.create_task(self._drain(cluster))
+
+    async def _drain(self, cluster: str):
+        """클러스터 큐를 batch_size개씩 rate 안에서 비우고, 확인이 늦은 삭제를 다시 큐에 넣음"""
+        loop = asyncio.get_running_loop()
+        wakeup = self._wakeups[cluster]
+        try:
+            while True:
+                queue = self.queued.get(cluster)
+                if queue:
+                    batch = [(name, queue.pop(name)) for name in list(itertools.islice(queue, self.batch_size))]
+                    started = loop.time()
+                    await self._delete_batch(cluster, batch)
+                    await asyncio.sleep(max(0.0, len(batch) / self.rate - (loop.time() - started)))
+                    continue
+
+                deadlines = [deadline for (c, _), (_, deadline) in self.awaiting.items() if c == cluster]
+                if not deadlines:
+                    break
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), max(0.0, min(deadlines) - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+                now = loop.time()
+                for key, (job_ids, deadline) in list(self.awaiting.items()):
+                    if key[0] == cluster and deadline <= now:
+                        del self.awaiting[key]
+                        self.queued.setdefault(cluster, {})[key[1]] = job_ids
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job garbage collection for {cluster} failed: {e}", exc_info=True)
+        finally:
+            self._tasks.pop(cluster, None)
+            self._wakeups.pop(cluster, None)
+
+    async def _delete_batch(self, cluster: str, batch: List[Tuple[str, List[str]]]):
+        loop = asyncio.get_running_loop()
+        # 요청 중에 informer가 먼저 삭제를 확인할 수 있으므로 요청 전에 확인 대기로 등록
+        for name, job_ids in batch:
+            self.awaiting[(cluster, name)] = (job_ids, loop.time() + self.confirm_timeout)
+        try:
+            api = await self._api_of(cluster)
+        except Exception as e:
+            logger.warning(f"Cannot delete Jobs in {cluster}: {e}; retrying in {self.retry_interval:.0f}s")
+            for name, job_ids in batch:
+                self.awaiting[(cluster, name)] = (job_ids, loop.time() + self.retry_interval)
+            return
+
+        async def delete_one(name: str, job_ids: List[str]):
+            try:
+                await call_api(
+                    api.delete_namespaced_job, name=name, namespace=self.namespace,
+                    propagation_policy="Foreground"
+                )
+            except ApiException as e:
+                if e.status == 404:
+                    await self.confirm(cluster, [name])
+                    return
+                self._retry_later(cluster, name, job_ids, e.reason)
+            except Exception as e:
+                self._retry_later(cluster, name, job_ids, str(e))
+
+        await asyncio.gather(*(delete_one(name, job_ids) for name, job_ids in batch))
+        logger.debug(f"Requested deletion of {len(batch)} Jobs in {cluster}")
+
+    def _retry_later(self, cluster: str, name: str, job_ids: List[str], reason: Any):
+        if (cluster, name) not in self.awaiting:
+            return
+        logger.warning(f"Failed to delete Job {name} in {cluster}: {reason}; retrying in {self.retry_interval:.0f}s")
+        self.awaiting[(cluster, name)] = (job_ids, asyncio.get_running_loop().time() + self.retry_interval)
+
+    async def _api_of(self, cluster: str):
+        cluster_info = await self.store.get_cluster_info(cluster)
+        if not cluster_info:
+            raise ValueError(f"Cluster {cluster} not found")
+        return self.client_pool.batch_api(cluster_info.kubeconfig_context)
+
+
+# 전역 싱글톤 인스턴스
+job_garbage_collector = JobGarbageCollector(
+    batch_size=int(os.getenv("HUB_GC_BATCH_SIZE", "50")),
+    rate=float(os.getenv("HUB_GC_RATE", "20")),
+    confirm_timeout=float(os.getenv("HUB_GC_CONFIRM_TIMEOUT", "300"))
+)
@@ -0,0 +1,433 @@
+"""
+Hub Job Informer
+Spoke 클러스터의 CASPIAN Job을 list+watch로 추적하여 배포된 AppWrapper의 완료/실패 반영
+
+Spoke마다 JobInformer가 Dispatcher가 만든 Job(scheduled-by=caspian)의 로컬 캐시를 유지한다.
+처음과 watch가 만료(410 Gone)될 때 전체 목록을 다시 읽고, 그 사이에는 watch 이벤트로만 갱신한다.
+Job이 끝나면 CompletionTracker가 해당 AppWrapper를 Completed/Failed로 바꾸어
+Running 인덱스에서 빼므로, 다음 최적화부터 그 작업의 용량을 더 이상 잡아두지 않는다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from hub.dispatcher import hub_dispatcher
+from hub.garbage_collector import JobGarbageCollector, job_garbage_collector
+from hub.kube_clients import KubeClientPool, call_api
+from hub.manifests import JOB_IDS_ANNOTATION
+from hub.models import AppWrapper
+from hub.store import HubStore, hub_store
+
+logger = logging.getLogger(__name__)
+
+# Dispatcher가 생성하는 Job의 라벨
+CASPIAN_JOB_SELECTOR = "scheduled-by=caspian"
+
+_serializer = client.ApiClient()
+
+
+class FinishedJob(NamedTuple):
+    """Spoke에서 끝난 Job"""
+    job_id: str
+    phase: str                       # Completed 또는 Failed
+    completed_at: Optional[float]    # Job status의 종료 시각 (없으면 None)
+    message: str
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """RFC 3339 시각 문자열을 Unix timestamp로 변환"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def job_outcome(job: Dict[str, Any]) -> Optional[FinishedJob]:
+    """
+    Job dict의 종료 상태
+
+    Args:
+        job: Kubernetes Job (JSON dict)
+
+    Returns:
+        끝났으면 FinishedJob, 아직 실행 중이면 None
+    """
+    status = job.get("status") or {}
+    for condition in status.get("conditions") or []:
+        if condition.get("status") != "True":
+            continue
+        if condition.get("type") == "Complete":
+            return FinishedJob(
+                job["metadata"]["name"], "Completed",
+                _timestamp(status.get("completionTime")) or _timestamp(condition.get("lastTransitionTime")),
+                "Job completed"
+            )
+        if condition.get("type") == "Failed":
+            return FinishedJob(
+                job["metadata"]["name"], "Failed",
+                _timestamp(condition.get("lastTransitionTime")),
+                f"Job failed: {condition.get('reason') or condition.get('message') or 'unknown'}"
+            )
+    return None
+
+
+def job_members(job: Dict[str, Any]) -> List[str]:
+    """Indexed Job으로 묶인 AppWrapper job_id (인덱스 순서, 일반 Job이면 빈 리스트)"""
+    annotations = job["metadata"].get("annotations") or {}
+    value = annotations.get(JOB_IDS_ANNOTATION)
+    return value.split(",") if value else []
+
+
+def _indexes(value: Optional[str]) -> Set[int]:
+    """Job status의 인덱스 구간 문자열("0-2,5")을 인덱스 집합으로 변환"""
+    indexes = set()
+    for part in (value or "").split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        indexes.update(range(int(start), int(end or start) + 1))
+    return indexes
+
+
+def member_outcomes(job: Dict[str, Any], outcome: FinishedJob) -> List[FinishedJob]:
+    """
+    끝난 Job을 AppWrapper별 종료 상태로 펼침
+    Indexed Job은 completedIndexes에 있는 인덱스만 Completed, 나머지는 Failed
+
+    Args:
+        job: 끝난 Kubernetes Job (JSON dict)
+        outcome: job_outcome(job)
+
+    Returns:
+        AppWrapper별 FinishedJob
+    """
+    members = job_members(job)
+    if not members:
+        return [outcome]
+    completed = _indexes((job.get("status") or {}).get("completedIndexes"))
+    return [
+        outcome._replace(job_id=job_id, phase="Completed", message="Job completed") if index in completed
+        else outcome._replace(job_id=job_id, phase="Failed", message=f"Index {index} failed in {outcome.job_id}")
+        for index, job_id in enumerate(members)
+    ]
+
+
+class JobInformer:
+    """
+    Spoke 클러스터 하나의 CASPIAN Job list+watch 캐시
+
+    비동기 클라이언트(AsyncBatchApi)는 watch로 변경을 받고,
+    watch를 지원하지 않는 동기 클라이언트는 resync_interval마다 목록을 다시 읽는다.
+    """
+
+    def __init__(
+        self,
+        cluster: str,
+        api: Callable[[], Any],
+        on_finished: Callable[[str, List[FinishedJob]], Awaitable[Any]],
+        namespace: str = "default",
+        label_selector: str = CASPIAN_JOB_SELECTOR,
+        resync_interval: float = 300.0,
+        page_size: int = 500,
+        on_deleted: Optional[Callable[[str, List[str]], Awaitable[Any]]] = None
+    ):
+        """
+        Informer 초기화
+
+        Args:
+            cluster: 클러스터 이름
+            api: batch/v1 클라이언트를 반환하는 함수 (재연결마다 호출하여 교체된 자격 증명 반영)
+            on_finished: 끝난 Job 목록을 받는 콜백 (cluster, jobs)
+            namespace: Job 네임스페이스
+            label_selector: 추적할 Job 라벨 셀렉터
+            resync_interval: watch 스트림 길이 / 폴링 주기 (초)
+            page_size: 목록 조회 페이지 크기
+            on_deleted: Spoke에서 사라진 Job 이름 목록을 받는 콜백 (cluster, names), 종료 처리보다 먼저 호출
+        """
+        self.cluster = cluster
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.resync_interval = resync_interval
+        self.page_size = page_size
+        self._api = api
+        self._on_finished = on_finished
+        self._on_deleted = on_deleted
+
+        # job 이름 -> 종료 상태 (실행 중이면 None)
+        self.cache: Dict[str, Optional[FinishedJob]] = {}
+        # Indexed Job 이름 -> 묶인 AppWrapper job_id
+        self.members: Dict[str, List[str]] = {}
+        self.synced = False
+
+    async def run(self):
+        """list+watch 반복 (취소될 때까지, 오류 시 지수 backoff 후 다시 list)"""
+        backoff = 1.0
+        while True:
+            try:
+                api = self._api()
+                resource_version = await self._list(api)
+                backoff = 1.0
+                if not hasattr(api, "watch_namespaced_job"):
+                    await asyncio.sleep(self.resync_interval)
+                    continue
+                while resource_version is not None:
+                    resource_version = await self._watch(api, resource_version)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job informer for {self.cluster} failed: {e}; retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _list(self, api) -> Optional[str]:
+        """
+        전체 목록으로 캐시 교체
+
+        Returns:
+            watch를 시작할 resourceVersion
+        """
+        jobs: List[Dict[str, Any]] = []
+        resource_version, token = None, None
+        while True:
+            page = await call_api(
+                api.list_namespaced_job, namespace=self.namespace,
+                label_selector=self.label_selector, limit=self.page_size, _continue=token
+            )
+            # 동기 클라이언트의 V1JobList는 비동기 클라이언트와 같은 dict 형태로 변환
+            if not isinstance(page, dict):
+                page = _serializer.sanitize_for_serialization(page)
+            jobs.extend(page.get("items") or [])
+            resource_version = page["metadata"].get("resourceVersion")
+            token = page["metadata"].get("continue")
+            if not token:
+                break
+
+        previous, self.cache = self.cache, {}
+        previous_members, self.members = self.members, {}
+        finished = []
+        for job in jobs:
+            name = job["metadata"]["name"]
+            self._remember_members(job)
+            outcome = self.cache[name] = job_outcome(job)
+            if outcome is not None and previous.get(name) is None:
+                finished.extend(member_outcomes(job, outcome))
+        # 실행 중이던 Job이 끝난 기록 없이 사라짐 (삭제됨)
+        for name, outcome in previous.items():
+            if outcome is None and name not in self.cache:
+                finished.extend(self._deleted(name, previous_members.get(name)))
+
+        self.synced = True
+        logger.debug(f"Listed {len(jobs)} CASPIAN Jobs in {self.cluster} (rv {resource_version})")
+        gone = [name for name in previous if name not in self.cache]
+        if gone and self._on_deleted is not None:
+            await self._on_deleted(self.cluster, gone)
+        if finished:
+            await self._on_finished(self.cluster, finished)
+        return resource_version
+
+    async def _watch(self, api, resource_version: str) -> Optional[str]:
+        """
+        resource_version 이후 변경 구독 (서버가 스트림을 닫을 때까지)
+
+        Returns:
+            이어서 구독할 resourceVersion (만료되어 다시 list해야 하면 None)
+        """
+        events = api.watch_namespaced_job(
+            namespace=self.namespace, resource_version=resource_version,
+            label_selector=self.label_selector, timeout_seconds=int(self.resync_interval)
+        )
+        async for event in events:
+            kind, job = event.get("type"), event.get("object") or {}
+            if kind == "ERROR":
+                if job.get("code") == 410:
+                    logger.info(f"Job watch for {self.cluster} expired at rv {resource_version}; relisting")
+                    return None
+                raise ApiException(status=job.get("code"), reason=job.get("message"))
+
+            resource_version = job["metadata"].get("resourceVersion", resource_version)
+            if kind == "BOOKMARK":
+                continue
+
+            name = job["metadata"]["name"]
+            was_running = self.cache.get(name) is None
+            if kind == "DELETED":
+                known = name in self.cache
+                self.cache.pop(name, None)
+                members = self.members.pop(name, None)
+                if self._on_deleted is not None:
+                    await self._on_deleted(self.cluster, [name])
+                if known and was_running:
+                    await self._on_finished(self.cluster, self._deleted(name, members))
+                continue
+
+            self._remember_members(job)
+            outcome = self.cache[name] = job_outcome(job)
+            if outcome is not None and was_running:
+                await self._on_finished(self.cluster, member_outcomes(job, outcome))
+        return resource_version
+
+    def _remember_members(self, job: Dict[str, Any]):
+        members = job_members(job)
+        if members:
+            self.members[job["metadata"]["name"]] = members
+
+    def _deleted(self, name: str, members: Optional[List[str]] = None) -> List[FinishedJob]:
+        return [
+            FinishedJob(job_id, "Failed", None, f"Job deleted from {self.cluster}")
+            for job_id in members or [name]
+        ]
+
+
+class CompletionTracker:
+    """
+    Spoke별 JobInformer를 관리하고, 끝난 Job을 AppWrapper 상태에 반영
+
+    store의 클러스터 목록을 주기적으로 확인하여 새 클러스터의 informer를 시작하고
+    사라진 클러스터의 informer는 중지한다.
+    """
+
+    def __init__(
+        self,
+        store: Optional[HubStore] = None,
+        client_pool: Optional[KubeClientPool] = None,
+        clock: Callable[[], float] = time.time,
+        namespace: str = "default",
+        resync_interval: float = 300.0,
+        cluster_poll_interval: float = 30.0,
+        garbage_collector: Optional[JobGarbageCollector] = None
+    ):
+        """
+        Tracker 초기화
+
+        Args:
+            store: 사용할 Hub Store (기본값: 전역 hub_store)
+            client_pool: Spoke 클라이언트 풀 (기본값: 전역 Dispatcher의 풀)
+            clock: 종료 시각이 없는 Job에 쓸 현재 시각 함수
+            namespace: Job 네임스페이스
+            resync_interval: informer watch 스트림 길이 / 폴링 주기 (초)
+            cluster_poll_interval: 클러스터 목록 확인 주기 (초)
+            garbage_collector: Job 삭제 확인을 전달할 collector (삭제 대기 AppWrapper 제거)
+        """
+        self.store = store if store is not None else hub_store
+        self.client_pool = client_pool if client_pool is not None else hub_dispatcher.client_pool
+        self.namespace = namespace
+        self.resync_interval = resync_interval
+        self.cluster_poll_interval = cluster_poll_interval
+        self.garbage_collector = garbage_collector
+        self._clock = clock
+        # 클러스터 이름 -> (kubeconfig context, informer, task)
+        self.informers: Dict[str, Tuple[str, JobInformer, asyncio.Task]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """클러스터 감시 및 informer 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._supervise())
+            logger.info("Completion tracker started")
+
+    async def stop(self):
+        """모든 informer 중지"""
+        tasks = [task for _, _, task in self.informers.values()]
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        self.informers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Completion tracker stopped")
+
+    async def _supervise(self):
+        while True:
+            try:
+                await self.sync_informers()
+            except Exception as e:
+                logger.error(f"Error in completion tracker: {e}", exc_info=True)
+            await asyncio.sleep(self.cluster_poll_interval)
+
+    async def sync_informers(self):
+        """store의 클러스터 목록에 맞춰 informer 시작/중지 (context가 바뀐 클러스터는 재시작)"""
+        clusters = {ci.name: ci.kubeconfig_context for ci in await self.store.get_all_cluster_info()}
+
+        for name in list(self.informers):
+            context, _, task = self.informers[name]
+            if clusters.get(name) != context:
+                task.cancel()
+                del self.informers[name]
+
+        for name, context in clusters.items():
+            if name in self.informers:
+                continue
+            informer = JobInformer(
+                name,
+                api=lambda context=context: self.client_pool.batch_api(context),
+                on_finished=self.handle_finished,
+                namespace=self.namespace,
+                resync_interval=self.resync_interval,
+                on_deleted=self.garbage_collector.confirm if self.garbage_collector is not None else None
+            )
+            self.informers[name] = (context, informer, asyncio.create_task(informer.run()))
+            logger.info(f"Started Job informer for {name} (context: {context})")
+
+    async def handle_finished(self, cluster: str, jobs: List[FinishedJob]) -> int:
+        """
+        끝난 Job을 AppWrapper에 반영
+        이 클러스터에서 실행 중(Running)인 AppWrapper만 바꾸므로, 다른 클러스터로 옮겨진 작업의
+        이전 Job이나 이미 반영된 Job은 무시한다.
+        Dispatcher가 배포 결과를 반영하기 전에 끝난 Job(이 클러스터로 배치되었지만 아직 dispatched가 아님)도
+        바로 반영한다. 그렇지 않으면 종료 이벤트를 놓쳐 작업이 계속 Running으로 남는다.
+
+        Args:
+            cluster: Job이 실행된 클러스터
+            jobs: 끝난 Job 목록
+
+        Returns:
+            상태가 바뀐 AppWrapper 수
+        """
+        now = self._clock()
+
+        def finishable(aw: AppWrapper) -> bool:
+            if aw.status.dispatched:
+                return aw.status.phase == "Running" and aw.status.cluster == cluster
+            return aw.spec.target_cluster == cluster
+
+        def finish(job: FinishedJob) -> Callable[[AppWrapper], Optional[bool]]:
+            def mutate(aw: AppWrapper) -> Optional[bool]:
+                # 조회 이후 다른 쓰기가 먼저 바꿨으면 커밋하지 않음
+                if not finishable(aw):
+                    return False
+                if not aw.status.dispatched:
+                    aw.status.dispatched = True
+                    aw.status.cluster = cluster
+                aw.status.phase = job.phase
+                aw.status.completion_time = job.completed_at or now
+                aw.status.message = job.message
+            return mutate
+
+        candidates = []
+        for job in jobs:
+            appwrapper = await self.store.get_appwrapper(job.job_id)
+            if appwrapper is not None and finishable(appwrapper):
+                candidates.append(job)
+        if not candidates:
+            return 0
+
+        results = await self.store.patch_appwrappers([(job.job_id, finish(job)) for job in candidates])
+        finished = [job for job, record in zip(candidates, results) if record is not None]
+        for job in finished:
+            logger.info(f"AppWrapper {job.job_id} {job.phase.lower()} in {cluster}")
+        return len(finished)
+
+
+# 전역 싱글톤 인스턴스
+completion_tracker = CompletionTracker(
+    resync_interval=float(os.getenv("HUB_INFORMER_RESYNC", "300")),
+    garbage_collector=job_garbage_collector
+)
@@ -0,0 +1,496 @@
+"""
+Kubernetes 클라이언트 풀
+kubeconfig context별로 격리된 Configuration과 ApiClient를 만들고 재사용
+
+config.load_kube_config(context=...)는 전역 기본 Configuration을 바꾸므로
+여러 context를 동시에 쓰면 서로의 host/인증 정보를 덮어쓸 수 있다.
+풀은 context마다 새 Configuration에 kubeconfig를 읽어 넣고(persist 없음),
+연결 풀 크기와 TCP keep-alive를 설정한 ApiClient를 캐시한다.
+
+기본 전송은 context별 httpx.AsyncClient 위의 AsyncBatchApi로, Dispatcher/informer/GC가
+쓰는 batch/v1 엔드포인트만 감싼다. 요청마다 스레드를 점유하지 않으므로 동시 요청 수가
+스레드 풀 크기에 묶이지 않는다. transport="threaded"이면 동기 kubernetes 클라이언트를 쓴다.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import socket
+import ssl
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+import httpx
+from kubernetes import client, config
+from kubernetes.client.rest import ApiException
+from urllib3.connection import HTTPConnection
+
+logger = logging.getLogger(__name__)
+
+# 유휴 연결을 API 서버/중간 장비가 끊기 전에 살려 두는 TCP keep-alive 설정
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+] + [
+    (socket.IPPROTO_TCP, option, value)
+    for option, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    for option in [getattr(socket, option, None)]
+    if option is not None
+]
+
+# V1Job 등 모델 객체를 JSON으로 바꾸는 데만 사용 (연결을 만들지 않음)
+_serializer = client.ApiClient()
+
+
+class AsyncBatchApi:
+    """
+    batch/v1 Jobs API의 비동기 클라이언트 (context별 httpx.AsyncClient)
+
+    격리된 Configuration의 host/TLS/토큰/proxy를 그대로 쓰고, 동시 요청은 max_connections개로 제한하며
+    그만큼의 keep-alive 연결을 유지해 재사용한다. 응답은 JSON dict로 반환하며
+    오류는 동기 클라이언트와 같은 ApiException으로 올린다.
+
+    연결 실패는 요청을 보내기 전이므로 전송 계층에서 한 번 다시 시도하고, 쉬던 연결이 끊겨
+    응답을 못 받은 경우는 멱등 요청(GET/DELETE/PATCH)만 다시 보낸다 (Job 생성 POST는 중복 생성될 수 있음).
+    """
+
+    # 응답 없이 연결이 끊겼을 때 다시 보내도 되는 메서드
+    IDEMPOTENT_METHODS = ("GET", "DELETE", "PATCH")
+
+    def __init__(
+        self,
+        configuration: client.Configuration,
+        max_connections: int = 16,
+        timeout: float = 30.0,
+        keepalive_expiry: float = 60.0
+    ):
+        """
+        비동기 클라이언트 초기화
+
+        Args:
+            configuration: context별 Kubernetes 설정
+            max_connections: 동시 요청 수와 유지할 keep-alive 연결 수 (클러스터별 동시 요청 한도에 맞춤)
+            timeout: 요청 타임아웃 (초)
+            keepalive_expiry: 이보다 오래 쉰 연결은 재사용하지 않음 (초)
+        """
+        self.configuration = configuration
+        self.timeout = timeout
+        https = configuration.host.startswith("https")
+        transport = httpx.AsyncHTTPTransport(
+            verify=self._ssl_context(configuration) if https else True,
+            # watch 스트림은 요청 한도(_slots) 밖에서 연결을 따로 쓰므로 전체 연결 수는 제한하지 않음
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            proxy=configuration.proxy or None,
+            retries=1,
+            socket_options=KEEPALIVE_SOCKET_OPTIONS
+        )
+        self._client = httpx.AsyncClient(
+            base_url=configuration.host,
+            transport=transport,
+            timeout=timeout,
+            headers={"Accept": "application/json", "User-Agent": "caspian-hub"}
+        )
+        self._extensions = {"sni_hostname": configuration.tls_server_name} if configuration.tls_server_name else {}
+        self._slots = asyncio.Semaphore(max_connections)
+
+    @staticmethod
+    def _ssl_context(configuration: client.Configuration) -> ssl.SSLContext:
+        """Configuration의 CA/클라이언트 인증서로 TLS 설정"""
+        context = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
+        if not configuration.verify_ssl:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if configuration.cert_file:
+            context.load_cert_chain(configuration.cert_file, configuration.key_file)
+        return context
+
+    # ==================== 요청 ====================
+
+    def _build_request(
+        self,
+        method: str,
+        path: str,
+        body: Any,
+        params: Dict[str, Any],
+        content_type: str = "application/json",
+        timeout: Any = httpx.USE_CLIENT_DEFAULT
+    ) -> httpx.Request:
+        """
+        요청 생성 (인증 토큰은 요청마다 읽으므로 refresh hook이 갱신한 값을 씀)
+        dict 본문(템플릿 매니페스트, patch)은 이미 JSON 형태이므로 모델 변환 없이 바로 인코딩한다.
+        """
+        headers = {"Content-Type": content_type}
+        for setting in self.configuration.auth_settings().values():
+            if setting["in"] == "header" and setting["value"]:
+                headers[setting["key"]] = setting["value"]
+        content = None
+        if body is not None:
+            if not isinstance(body, dict):
+                body = _serializer.sanitize_for_serialization(body)
+            content = json.dumps(body, separators=(",", ":")).encode()
+        return self._client.build_request(
+            method, path, content=content, headers=headers,
+            params={k: v for k, v in params.items() if v is not None},
+            timeout=timeout, extensions=self._extensions
+        )
+
+    @staticmethod
+    def _error(response: httpx.Response) -> ApiException:
+        """동기 클라이언트와 같은 형태의 ApiException"""
+        error = ApiException(status=response.status_code, reason=response.reason_phrase)
+        error.body = response.text
+        error.headers = dict(response.headers)
+        return error
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        content_type: str = "application/json",
+        **params
+    ) -> Dict[str, Any]:
+        async with self._slots:
+            try:
+                response = await self._client.send(self._build_request(method, path, body, params, content_type))
+            except (httpx.RemoteProtocolError, httpx.ReadError):
+                # 쉬는 동안 서버가 닫은 연결: 멱등 요청만 새 연결로 다시 보냄
+                if method not in self.IDEMPOTENT_METHODS:
+                    raise
+                response = await self._client.send(self._build_request(method, path, body, params, content_type))
+
+        if response.status_code >= 400:
+            raise self._error(response)
+        return response.json() if response.content else {}
+
+    async def _stream(self, path: str, **params) -> AsyncIterator[Dict[str, Any]]:
+        """
+        watch 스트림 (한 줄에 JSON 이벤트 하나)
+        오래 열려 있으므로 요청 한도 밖에서 연결을 쓰고, 응답 헤더까지만 타임아웃을 적용한다.
+        """
+        request = self._build_request(
+            "GET", path, None, params, timeout=httpx.Timeout(self.timeout, read=None)
+        )
+        response = await self._client.send(request, stream=True)
+        try:
+            if response.status_code >= 400:
+                await response.aread()
+                raise self._error(response)
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            await response.aclose()
+
+    async def create_namespaced_job(self, namespace: str, body) -> Dict[str, Any]:
+        """Job 생성 (POST /apis/batch/v1/namespaces/{namespace}/jobs)"""
+        return await self._request("POST", f"/apis/batch/v1/namespaces/{namespace}/jobs", body)
+
+    async def patch_namespaced_job(self, name: str, namespace: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Job 부분 수정 (strategic merge patch, 동기 클라이언트의 dict 본문과 동일)"""
+        return await self._request(
+            "PATCH", f"/apis/batch/v1/namespaces/{namespace}/jobs/{name}", body,
+            content_type="application/strategic-merge-patch+json"
+        )
+
+    async def delete_namespaced_job(
+        self,
+        name: str,
+        namespace: str,
+        propagation_policy: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Job 삭제 (propagation_policy: Background/Foreground/Orphan)"""
+        return await self._request(
+            "DELETE", f"/apis/batch/v1/namespaces/{namespace}/jobs/{name}",
+            propagationPolicy=propagation_policy
+        )
+
+    async def list_namespaced_job(
+        self,
+        namespace: str,
+        label_selector: Optional[str] = None,
+        limit: Optional[int] = None,
+        _continue: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Job 목록 (GET /apis/batch/v1/namespaces/{namespace}/jobs), JobList dict"""
+        return await self._request(
+            "GET", f"/apis/batch/v1/namespaces/{namespace}/jobs",
+            labelSelector=label_selector, limit=limit, **{"continue": _continue}
+        )
+
+    def watch_namespaced_job(
+        self,
+        namespace: str,
+        resource_version: str,
+        label_selector: Optional[str] = None,
+        timeout_seconds: int = 300
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Job 변경 구독 (GET ...?watch=true)
+
+        Args:
+            namespace: 네임스페이스
+            resource_version: 이 버전 이후의 변경부터 수신 (list 응답의 metadata.resourceVersion)
+            label_selector: 라벨 셀렉터
+            timeout_seconds: 서버가 스트림을 닫는 시간 (이후 같은 버전에서 다시 구독)
+
+        Returns:
+            {"type": ADDED|MODIFIED|DELETED|BOOKMARK|ERROR, "object": ...} 이벤트 스트림
+        """
+        return self._stream(
+            f"/apis/batch/v1/namespaces/{namespace}/jobs",
+            watch="true", allowWatchBookmarks="true", resourceVersion=resource_version,
+            labelSelector=label_selector, timeoutSeconds=timeout_seconds
+        )
+
+    async def get_version(self) -> Dict[str, Any]:
+        """API 서버 버전 (health check)"""
+        return await self._request("GET", "/version")
+
+    async def aclose(self):
+        """연결 닫기"""
+        await self._client.aclose()
+
+
+async def call_api(func: Callable[..., Any], executor: Optional[Executor] = None, **kwargs) -> Any:
+    """
+    batch/v1 API 호출
+    비동기 클라이언트(AsyncBatchApi)는 이벤트 루프에서 바로 기다리고, 동기 클라이언트(BatchV1Api)는 스레드에서 실행
+
+    Args:
+        func: 클라이언트 메서드 (예: api.create_namespaced_job)
+        executor: 동기 호출을 실행할 스레드 풀 (None이면 asyncio 기본 풀)
+        **kwargs: API 인자
+
+    Returns:
+        API 응답 (비동기 클라이언트는 dict, 동기 클라이언트는 모델 객체)
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await func(**kwargs)
+    if executor is None:
+        return await asyncio.to_thread(func, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, **kwargs))
+
+
+class _CachedClient(NamedTuple):
+    """context별 캐시 항목"""
+    configuration: Optional[client.Configuration]
+    batch_api: Any
+    fingerprint: Optional[Tuple]    # 인증 정보 파일 상태 (None이면 직접 등록한 클라이언트)
+
+
+class KubeClientPool:
+    """
+    context별 Kubernetes 클라이언트 캐시
+
+    - context마다 독립된 Configuration (전역 기본 설정을 바꾸지 않음)
+    - 클러스터별 동시 요청 수만큼 연결 풀 유지, TCP keep-alive
+    - kubeconfig나 인증서/키 파일이 바뀌면(자격 증명 교체) 다음 조회 시 재생성
+    - 주기적 health check에 실패하거나 401을 받은 클라이언트는 폐기 후 재생성
+    - transport="async"(기본값)이면 AsyncBatchApi, "threaded"면 동기 BatchV1Api 반환
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        pool_maxsize: int = 16,
+        health_check_interval: float = 60.0,
+        health_check_timeout: float = 5.0,
+        transport: str = "async"
+    ):
+        """
+        클라이언트 풀 초기화
+
+        Args:
+            config_file: kubeconfig 경로 (기본값: KUBECONFIG 또는 ~/.kube/config)
+            pool_maxsize: context별 최대 유지 연결 수 (동시 요청 한도에 맞춤)
+            health_check_interval: health check 주기 (초)
+            health_check_timeout: health check 요청 타임아웃 (초)
+            transport: "async" (httpx 위의 AsyncBatchApi) 또는 "threaded" (동기 kubernetes 클라이언트)
+        """
+        if transport not in ("async", "threaded"):
+            raise ValueError(f"Unknown K8s client transport: {transport}")
+        self.config_file = config_file
+        self.pool_maxsize = pool_maxsize
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.transport = transport
+        self._clients: Dict[str, _CachedClient] = {}
+        # 이벤트 루프와 executor 스레드 양쪽에서 조회될 수 있으므로 생성/교체를 직렬화
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # ==================== 조회 ====================
+
+    def batch_api(self, context: str):
+        """
+        context의 BatchV1Api (캐시, 자격 증명이 바뀌었으면 재생성)
+
+        Args:
+            context: kubeconfig context 이름
+
+        Returns:
+            AsyncBatchApi 또는 BatchV1Api (또는 register로 등록한 대역)
+        """
+        with self._lock:
+            cached = self._clients.get(context)
+            if cached is not None and (
+                cached.fingerprint is None or cached.fingerprint == self._fingerprint(cached.configuration)
+            ):
+                return cached.batch_api
+
+            if cached is not None:
+                logger.info(f"Credentials for context {context} changed; rebuilding K8s client")
+                self._close(cached)
+            cached = self._build(context)
+            self._clients[context] = cached
+            return cached.batch_api
+
+    def register(self, context: str, batch_api):
+        """
+        미리 만든 클라이언트 등록 (시뮬레이터/테스트의 fake API 주입용, health check 대상 아님)
+
+        Args:
+            context: kubeconfig context 이름
+            batch_api: create_namespaced_job 등을 제공하는 객체
+        """
+        with self._lock:
+            self._clients[context] = _CachedClient(None, batch_api, None)
+
+    def invalidate(self, context: str):
+        """context의 클라이언트 폐기 (401 등 인증 실패 시, 다음 조회에서 재생성)"""
+        with self._lock:
+            cached = self._clients.get(context)
+            if cached is None or cached.fingerprint is None:
+                return
+            del self._clients[context]
+            self._close(cached)
+        logger.info(f"Invalidated K8s client for context {context}")
+
+    # ==================== 생성 ====================
+
+    def _build(self, context: str) -> _CachedClient:
+        """격리된 Configuration으로 ApiClient 생성 (락 보유 상태에서 호출)"""
+        configuration = client.Configuration()
+        config.load_kube_config(
+            config_file=self.config_file,
+            context=context,
+            client_configuration=configuration,
+            persist_config=False
+        )
+        configuration.connection_pool_maxsize = self.pool_maxsize
+
+        if self.transport == "async":
+            batch_api = AsyncBatchApi(configuration, max_connections=self.pool_maxsize)
+        else:
+            api_client = client.ApiClient(configuration)
+            # 이후 생성되는 연결에 keep-alive 적용 (kubernetes 클라이언트는 socket_options를 넘기지 않음)
+            api_client.rest_client.pool_manager.connection_pool_kw["socket_options"] = KEEPALIVE_SOCKET_OPTIONS
+            batch_api = client.BatchV1Api(api_client)
+
+        logger.info(f"Created {self.transport} K8s client for context: {context} ({configuration.host})")
+        return _CachedClient(configuration, batch_api, self._fingerprint(configuration))
+
+    def _fingerprint(self, configuration: client.Configuration) -> Tuple:
+        """kubeconfig와 인증서/키 파일의 상태 (바뀌면 자격 증명이 교체된 것으로 봄)"""
+        paths = [
+            self.config_file or os.path.expanduser(os.environ.get("KUBECONFIG", "~/.kube/config")).split(os.pathsep)[0],
+            configuration.cert_file,
+            configuration.key_file,
+            configuration.ssl_ca_cert,
+        ]
+        return tuple(_file_state(path) for path in paths)
+
+    @staticmethod
+    def _close(cached: _CachedClient):
+        """클라이언트 연결 닫기 (비동기 클라이언트는 실행 중인 이벤트 루프에서 닫음)"""
+        if cached.fingerprint is None:
+            return
+        try:
+            if isinstance(cached.batch_api, AsyncBatchApi):
+                asyncio.get_running_loop().create_task(cached.batch_api.aclose())
+            else:
+                cached.batch_api.api_client.close()
+        except Exception as e:
+            logger.debug(f"Error closing K8s client: {e}")
+
+    # ==================== Health check ====================
+
+    async def start(self):
+        """주기적 health check 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        """health check 중지 및 모든 클라이언트 닫기"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for cached in clients:
+            if cached.fingerprint is not None and isinstance(cached.batch_api, AsyncBatchApi):
+                await cached.batch_api.aclose()
+            else:
+                self._close(cached)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.error(f"Error in K8s client health check: {e}", exc_info=True)
+
+    async def health_check(self) -> List[str]:
+        """
+        캐시된 클라이언트마다 API 서버 /version 확인, 실패하면 폐기
+
+        Returns:
+            폐기된 context 목록
+        """
+        with self._lock:
+            targets = [
+                (context, cached) for context, cached in self._clients.items()
+                if cached.fingerprint is not None
+            ]
+
+        async def check(context: str, cached: _CachedClient) -> Optional[str]:
+            try:
+                if isinstance(cached.batch_api, AsyncBatchApi):
+                    await asyncio.wait_for(cached.batch_api.get_version(), self.health_check_timeout)
+                else:
+                    await asyncio.to_thread(
+                        client.VersionApi(cached.batch_api.api_client).get_code,
+                        _request_timeout=self.health_check_timeout
+                    )
+                return None
+            except Exception as e:
+                logger.warning(f"K8s client health check failed for {context}: {e}")
+                return context
+
+        failed = [context for context in await asyncio.gather(*(check(*t) for t in targets)) if context]
+        for context in failed:
+            self.invalidate(context)
+        return failed
+
+
+def _file_state(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """파일의 (mtime_ns, size), 없으면 None"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,150 @@
+"""
+Hub Job Manifest Templates
+AppWrapper 형태(이미지, 명령, 리소스)별로 미리 렌더링한 Job 매니페스트
+
+배포마다 V1Job 객체 그래프를 만들고 다시 직렬화하는 대신, 형태별 템플릿 dict를 한 번 만들어 두고
+작업별 필드(이름, 라벨, 어노테이션)만 바꾼 얕은 복사본을 돌려준다.
+같은 형태의 AppWrapper 여러 개는 Indexed Job 하나로 묶어 만들 수 있다.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+from hub.records import AppWrapperRecord, SpecRecord
+
+# Indexed Job의 인덱스 순서대로 나열한 AppWrapper job_id (쉼표 구분)
+JOB_IDS_ANNOTATION = "caspian.io/job-ids"
+
+# 템플릿 캐시 키: (image, command, cpu, mem_gb)
+Shape = Tuple[str, Tuple[str, ...], float, float]
+
+
+def shape_of(spec: SpecRecord) -> Shape:
+    """AppWrapper의 매니페스트 형태 (같으면 같은 Pod 템플릿을 공유)"""
+    return (spec.image, tuple(spec.command), spec.cpu, spec.mem_gb)
+
+
+def indexed_job_name(job_ids: List[str]) -> str:
+    """묶인 job_id 목록으로 정해지는 Indexed Job 이름 (재시도해도 같은 이름)"""
+    digest = hashlib.sha1(",".join(job_ids).encode()).hexdigest()[:12]
+    return f"caspian-batch-{digest}"
+
+
+class ManifestTemplates:
+    """
+    형태별 Job 매니페스트 템플릿 캐시 (LRU)
+
+    반환하는 dict는 템플릿의 Pod spec 등을 참조로 공유하므로 호출자가 수정하면 안 된다.
+    """
+
+    def __init__(self, max_templates: int = 1024):
+        """
+        Args:
+            max_templates: 유지할 최대 형태 수
+        """
+        self.max_templates = max_templates
+        self._pod_specs: "OrderedDict[Shape, Dict[str, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pod_specs)
+
+    def render(self, appwrapper: AppWrapperRecord, target_cluster: str) -> Dict[str, Any]:
+        """
+        AppWrapper 하나의 Job 매니페스트 (batch/v1 JSON 형태)
+
+        Args:
+            appwrapper: AppWrapper
+            target_cluster: 배포 대상 클러스터
+
+        Returns:
+            Job 매니페스트 dict
+        """
+        job_id = appwrapper.spec.job_id
+        return {
+            "apiVersion": "batch/v1",
+            "kind": "Job",
+            "metadata": {
+                "name": job_id,
+                "labels": {"app": "caspian-workload", "job-id": job_id, "scheduled-by": "caspian"},
+                "annotations": {
+                    "caspian.io/target-cluster": target_cluster,
+                    "caspian.io/estimated-co2": appwrapper.metadata.get("estimated_co2_g", "0")
+                }
+            },
+            "spec": {
+                "template": {
+                    "metadata": {"labels": {"app": "caspian-workload", "job-id": job_id}},
+                    "spec": self._pod_spec(appwrapper.spec)
+                },
+                "backoffLimit": 3,
+                "ttlSecondsAfterFinished": 3600  # 1시간 후 자동 삭제
+            }
+        }
+
+    def render_indexed(self, appwrappers: List[AppWrapperRecord], target_cluster: str) -> Dict[str, Any]:
+        """
+        같은 형태의 AppWrapper 여러 개를 묶은 Indexed Job 매니페스트
+        인덱스 i의 Pod가 appwrappers[i]를 실행하며(JOB_COMPLETION_INDEX, CASPIAN_JOB_IDS 환경 변수),
+        인덱스별 backoff로 한 작업의 실패가 나머지를 멈추지 않는다.
+
+        Args:
+            appwrappers: 같은 형태의 AppWrapper (인덱스 순서)
+            target_cluster: 배포 대상 클러스터
+
+        Returns:
+            Indexed Job 매니페스트 dict
+        """
+        job_ids = [aw.spec.job_id for aw in appwrappers]
+        name = indexed_job_name(job_ids)
+        estimated_co2 = sum(float(aw.metadata.get("estimated_co2_g", "0")) for aw in appwrappers)
+
+        pod_spec = self._pod_spec(appwrappers[0].spec)
+        container = dict(pod_spec["containers"][0])
+        container["env"] = [{"name": "CASPIAN_JOB_IDS", "value": ",".join(job_ids)}]
+
+        return {
+            "apiVersion": "batch/v1",
+            "kind": "Job",
+            "metadata": {
+                "name": name,
+                "labels": {"app": "caspian-workload", "job-id": name, "scheduled-by": "caspian"},
+                "annotations": {
+                    "caspian.io/target-cluster": target_cluster,
+                    "caspian.io/estimated-co2": str(estimated_co2),
+                    JOB_IDS_ANNOTATION: ",".join(job_ids)
+                }
+            },
+            "spec": {
+                "completionMode": "Indexed",
+                "completions": len(job_ids),
+                "parallelism": len(job_ids),
+                "template": {
+                    "metadata": {"labels": {"app": "caspian-workload", "job-id": name}},
+                    "spec": {**pod_spec, "containers": [container]}
+                },
+                "backoffLimitPerIndex": 3,
+                "ttlSecondsAfterFinished": 3600
+            }
+        }
+
+    def _pod_spec(self, spec: SpecRecord) -> Dict[str, Any]:
+        """형태별 Pod spec (캐시)"""
+        shape = shape_of(spec)
+        pod_spec = self._pod_specs.get(shape)
+        if pod_spec is not None:
+            self._pod_specs.move_to_end(shape)
+            return pod_spec
+
+        resources = {"cpu": f"{spec.cpu}", "memory": f"{spec.mem_gb}Gi"}
+        pod_spec = self._pod_specs[shape] = {
+            "containers": [{
+                "name": "workload",
+                "image": spec.image,
+                "command": list(spec.command),
+                "resources": {"requests": resources, "limits": resources}
+            }],
+            "restartPolicy": "Never"
+        }
+        if len(self._pod_specs) > self.max_templates:
+            self._pod_specs.popitem(last=False)
+        return pod_spec
@@ -0,0 +1,277 @@
+"""
+Hub Migration Executor
+실행 중인 AppWrapper를 다른 Spoke 클러스터로 옮기는 라이브 마이그레이션
+
+Scheduler가 Running 작업의 targetCluster를 바꾸면 Dispatcher가 이 Executor에 넘긴다.
+작업 하나의 마이그레이션 단계:
+    1. Draining      원본 Job을 suspend (pod 종료 신호로 워크로드가 checkpoint를 남김)
+    2. Transferring  전송 백엔드로 data_gb를 대상 클러스터에 복사
+    3. Starting      대상 클러스터에 Job 생성
+    4. store 반영    status.cluster를 대상으로 변경 (완료 추적이 원본 Job 삭제를 실패로 보지 않도록 먼저 반영)
+    5. Cleanup       원본 Job 삭제 (Background propagation)
+대상 Job 생성 전에 실패하면 원본 Job을 다시 재개하고 retry_interval 동안 재시도하지 않는다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from kubernetes.client.rest import ApiException
+from hub.kube_clients import KubeClientPool, call_api
+from hub.models import AppWrapper, MigrationProgress
+from hub.records import AppWrapperRecord
+from hub.store import HubStore
+from app.metrics import migrations_in_progress
+
+logger = logging.getLogger(__name__)
+
+
+class TransferBackend:
+    """
+    마이그레이션 데이터 전송 백엔드
+    기본 구현은 데이터가 공유 스토리지에 있다고 보고 즉시 완료한다.
+    실제 전송(오브젝트 스토리지 복사, rsync 등)은 transfer를 재정의한다.
+    """
+
+    async def transfer(
+        self,
+        job_id: str,
+        from_cluster: str,
+        to_cluster: str,
+        data_gb: float,
+        progress: Callable[[float], None]
+    ):
+        """
+        작업 데이터 전송
+
+        Args:
+            job_id: Job ID
+            from_cluster: 원본 클러스터
+            to_cluster: 대상 클러스터
+            data_gb: 전송할 데이터 크기 (GB)
+            progress: 누적 전송량(GB)을 보고하는 콜백
+        """
+        progress(data_gb)
+
+
+class RateLimitedTransfer(TransferBackend):
+    """링크 대역폭만큼 시간이 걸리는 전송 (시뮬레이션, 벤치마크, 테스트용)"""
+
+    def __init__(self, gb_per_second: float, chunk_gb: float = 1.0):
+        self.gb_per_second = gb_per_second
+        self.chunk_gb = chunk_gb
+
+    async def transfer(self, job_id, from_cluster, to_cluster, data_gb, progress):
+        sent = 0.0
+        while sent < data_gb:
+            chunk = min(self.chunk_gb, data_gb - sent)
+            await asyncio.sleep(chunk / self.gb_per_second)
+            sent += chunk
+            progress(sent)
+
+
+class MigrationExecutor:
+    """
+    라이브 마이그레이션 실행기
+
+    작업마다 태스크 하나로 단계를 진행하며, (원본, 대상) 링크별로 동시 마이그레이션 수를 제한한다.
+    진행 중인 수는 migrations_in_progress gauge로, 작업별 단계/전송량은 in_progress로 노출한다.
+    """
+
+    def __init__(
+        self,
+        store: HubStore,
+        client_pool: KubeClientPool,
+        create_manifest: Callable[[AppWrapperRecord, str], Any],
+        transfer: Optional[TransferBackend] = None,
+        link_concurrency: int = 2,
+        retry_interval: float = 300.0,
+        clock: Callable[[], float] = time.time,
+        namespace: str = "default"
+    ):
+        """
+        Executor 초기화
+
+        Args:
+            store: Hub Store
+            client_pool: Spoke 클라이언트 풀
+            create_manifest: (AppWrapper, 대상 클러스터) -> Job 매니페스트
+            transfer: 데이터 전송 백엔드 (기본값: 즉시 완료)
+            link_concurrency: (원본, 대상) 링크별 동시 마이그레이션 수
+            retry_interval: 실패한 작업을 다시 시도하기까지 대기 (초)
+            clock: 현재 시각 함수
+            namespace: Job 네임스페이스
+        """
+        self.store = store
+        self.client_pool = client_pool
+        self.transfer = transfer if transfer is not None else TransferBackend()
+        self.link_concurrency = link_concurrency
+        self.retry_interval = retry_interval
+        self.namespace = namespace
+        self._create_manifest = create_manifest
+        self._clock = clock
+
+        self.in_progress: Dict[str, MigrationProgress] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._links: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+        # job_id -> 마지막 실패 시각
+        self._failed_at: Dict[str, float] = {}
+
+    def submit(self, appwrappers: List[AppWrapperRecord]) -> int:
+        """
+        targetCluster가 실행 중인 클러스터와 다른 AppWrapper의 마이그레이션 시작 (기다리지 않음)
+        이미 진행 중이거나 최근 실패한 작업은 건너뛴다.
+
+        Args:
+            appwrappers: 옮길 Running AppWrapper
+
+        Returns:
+            새로 시작한 마이그레이션 수
+        """
+        now = self._clock()
+        started = 0
+        for aw in appwrappers:
+            job_id = aw.spec.job_id
+            if job_id in self._tasks:
+                continue
+            if now - self._failed_at.get(job_id, float("-inf")) < self.retry_interval:
+                continue
+            self._failed_at.pop(job_id, None)
+
+            self.in_progress[job_id] = MigrationProgress(
+                job_id=job_id,
+                from_cluster=aw.status.cluster,
+                to_cluster=aw.spec.target_cluster,
+                data_gb=aw.spec.data_gb,
+                started_at=now
+            )
+            migrations_in_progress.inc()
+            self._tasks[job_id] = asyncio.create_task(self._migrate(aw))
+            started += 1
+        return started
+
+    async def wait(self):
+        """진행 중인 마이그레이션이 모두 끝날 때까지 대기"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def stop(self):
+        """진행 중인 마이그레이션 취소"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _link(self, from_cluster: str, to_cluster: str) -> asyncio.Semaphore:
+        """링크별 동시 마이그레이션 한도"""
+        link = self._links.get((from_cluster, to_cluster))
+        if link is None:
+            link = self._links[(from_cluster, to_cluster)] = asyncio.Semaphore(self.link_concurrency)
+        return link
+
+    def _set_state(self, job_id: str, state: str):
+        self.in_progress[job_id] = self.in_progress[job_id].model_copy(update={"state": state})
+
+    async def _migrate(self, appwrapper: AppWrapperRecord):
+        job_id = appwrapper.spec.job_id
+        source = appwrapper.status.cluster
+        target = appwrapper.spec.target_cluster
+        try:
+            async with self._link(source, target):
+                await self._run_steps(appwrapper, source, target)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._failed_at[job_id] = self._clock()
+            logger.error(f"Migration of {job_id} from {source} to {target} failed: {e}")
+        finally:
+            self.in_progress.pop(job_id, None)
+            self._tasks.pop(job_id, None)
+            migrations_in_progress.dec()
+
+    async def _run_steps(self, appwrapper: AppWrapperRecord, source: str, target: str):
+        job_id = appwrapper.spec.job_id
+        source_api = await self._api_of(source)
+        target_api = await self._api_of(target)
+        started = time.perf_counter()
+        logger.info(f"Migrating {job_id} from {source} to {target} ({appwrapper.spec.data_gb:.2f}GB)")
+
+        target_created = False
+        try:
+            # 1. 원본 drain: suspend하면 Job controller가 pod를 종료 (SIGTERM에 checkpoint)
+            self._set_state(job_id, "Draining")
+            await self._ignore_missing(
+                source_api.patch_namespaced_job, name=job_id, namespace=self.namespace,
+                body={"spec": {"suspend": True}}
+            )
+
+            # 2. 데이터 전송
+            self._set_state(job_id, "Transferring")
+
+            def report(transferred_gb: float):
+                self.in_progress[job_id] = self.in_progress[job_id].model_copy(
+                    update={"transferred_gb": transferred_gb}
+                )
+
+            await self.transfer.transfer(job_id, source, target, appwrapper.spec.data_gb, report)
+
+            # 3. 대상 클러스터에 Job 생성 (이전 시도에서 이미 만들었으면 그대로 사용)
+            self._set_state(job_id, "Starting")
+            try:
+                await call_api(
+                    target_api.create_namespaced_job, namespace=self.namespace,
+                    body=self._create_manifest(appwrapper, target)
+                )
+            except ApiException as e:
+                if e.status != 409:
+                    raise
+            target_created = True
+        except BaseException:
+            if not target_created:
+                # 원본에서 다시 실행
+                try:
+                    await self._ignore_missing(
+                        source_api.patch_namespaced_job, name=job_id, namespace=self.namespace,
+                        body={"spec": {"suspend": False}}
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to resume {job_id} in {source}: {e}")
+            raise
+
+        # 4. store 반영 (원본 Job 삭제 전에 실행 클러스터를 바꿔야 완료 추적이 삭제를 실패로 보지 않음)
+        migrated_at = self._clock()
+
+        def mutate(aw: AppWrapper):
+            if aw.status.cluster != source:
+                return
+            aw.status.cluster = target
+            aw.status.start_time = migrated_at
+            aw.status.message = f"Migrated from {source} to {target}"
+            aw.metadata["migrated_at"] = str(migrated_at)
+
+        await self.store.patch_appwrapper(job_id, mutate)
+
+        # 5. 원본 정리
+        self._set_state(job_id, "Cleanup")
+        try:
+            await self._ignore_missing(
+                source_api.delete_namespaced_job, name=job_id, namespace=self.namespace,
+                propagation_policy="Background"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to delete source Job {job_id} in {source}: {e}")
+
+        logger.info(f"Migrated {job_id} from {source} to {target} in {time.perf_counter() - started:.2f}s")
+
+    async def _api_of(self, cluster: str):
+        cluster_info = await self.store.get_cluster_info(cluster)
+        if not cluster_info:
+            raise ValueError(f"Cluster {cluster} not found")
+        return self.client_pool.batch_api(cluster_info.kubeconfig_context)
+
+    async def _ignore_missing(self, func: Callable[..., Any], **kwargs):
+        """원본 Job이 이미 없으면(끝나서 TTL로 삭제 등) 건너뜀"""
+        try:
+            await call_api(func, **kwargs)
+        except ApiException as e:
+            if e.status != 404:
+                raise
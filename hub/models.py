@@ -3,7 +3,7 @@ Hub Cluster 데이터 모델
 ClusterInfo, AppWrapper 등 Hub에서 사용하는 모델 정의
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional
 from enum import Enum
 
@@ -21,6 +21,17 @@ class ClusterStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
+class NodeResources(BaseModel):
+    """노드 하나의 리소스 정보 (할당 가능량과 현재 남은 양)"""
+    name: str = Field(description="노드 이름")
+    cpu_free: float = Field(description="남은 CPU 코어 수")
+    mem_free_gb: float = Field(description="남은 메모리 (GB)")
+    gpu_free: int = Field(default=0, description="남은 GPU 개수")
+    cpu_allocatable: float = Field(description="할당 가능한 CPU 코어 수")
+    mem_allocatable_gb: float = Field(description="할당 가능한 메모리 (GB)")
+    gpu_allocatable: int = Field(default=0, description="할당 가능한 GPU 개수")
+
+
 class ClusterResources(BaseModel):
     """클러스터 리소스 정보"""
     cpu_available: float = Field(description="가용 CPU 코어 수")
@@ -29,6 +40,9 @@ class ClusterResources(BaseModel):
     mem_total_gb: float = Field(description="전체 메모리 (GB)")
     gpu_available: int = Field(default=0, description="가용 GPU 개수")
     gpu_total: int = Field(default=0, description="전체 GPU 개수")
+    nodes: List[NodeResources] = Field(
+        default_factory=list, description="노드별 리소스 (비어 있으면 노드 단위 적합성 검사 생략)"
+    )
 
 
 class ClusterInfo(BaseModel):
@@ -97,6 +111,7 @@ class AppWrapper(BaseModel):
     metadata: Dict[str, str] = Field(default_factory=dict, description="메타데이터")
     spec: AppWrapperSpec = Field(description="AppWrapper 명세")
     status: AppWrapperStatus = Field(default_factory=AppWrapperStatus, description="AppWrapper 상태")
+    resource_version: int = Field(default=0, description="Hub Store 커밋 버전 (compare-and-swap용)")
 
 
 class SchedulingDecision(BaseModel):
@@ -104,8 +119,61 @@ class SchedulingDecision(BaseModel):
     스케줄링 결정
     Optimizer가 반환하는 배치 결정
     """
+    model_config = ConfigDict(frozen=True)
+
     job_id: str
     target_cluster: str
     start_time_minutes: int = Field(description="시작 시간 (분 단위)")
+    start_at: Optional[float] = Field(default=None, description="계획된 시작 시각 (Unix timestamp, 슬롯 경계)")
     estimated_co2_g: float = Field(description="예상 CO2 배출량 (g)")
     reason: str = Field(description="배치 이유")
+
+
+class SchedulingPlan(BaseModel):
+    """
+    스케줄링 계획
+    한 스케줄링 사이클의 결정 전체를 담는 불변(immutable) 버전 객체
+    """
+    model_config = ConfigDict(frozen=True)
+
+    version: int = Field(description="계획 버전 (단조 증가)")
+    created_at: float = Field(description="계획 생성 시간 (Unix timestamp)")
+    solve_seconds: float = Field(default=0.0, description="최적화 소요 시간 (초)")
+    decisions: Dict[str, SchedulingDecision] = Field(
+        default_factory=dict,
+        description="job_id별 스케줄링 결정 (읽기 전용)"
+    )
+
+
+class MigrationRecord(BaseModel):
+    """
+    마이그레이션 기록
+    스케줄링 결정 적용 중 클러스터 변경이 감지된 작업
+    """
+    job_id: str
+    from_cluster: str
+    to_cluster: str
+    data_gb: float = Field(default=0, description="전송 데이터 크기 (GB)")
+
+
+class MigrationProgress(BaseModel):
+    """
+    진행 중인 라이브 마이그레이션
+    Migration Executor가 단계마다 갱신
+    """
+    job_id: str
+    from_cluster: str
+    to_cluster: str
+    data_gb: float = Field(default=0, description="전송할 데이터 크기 (GB)")
+    transferred_gb: float = Field(default=0, description="전송된 데이터 크기 (GB)")
+    state: str = Field(default="Queued", description="단계 (Queued, Draining, Transferring, Starting, Cleanup)")
+    started_at: float = Field(description="시작 시간 (Unix timestamp)")
+
+
+class PartitionHandoff(BaseModel):
+    """
+    파티션 이관 요청
+    샤딩 모드에서 다른 Hub로 클러스터 정보와 AppWrapper를 넘길 때 사용
+    """
+    clusters: List[ClusterInfo] = Field(default_factory=list)
+    appwrappers: List[AppWrapper] = Field(default_factory=list)
@@ -0,0 +1,132 @@
+"""
+Hub Node Fit Index
+노드 단위 적합성 사전 검사: 작업 요청(cpu, mem, gpu)이 어느 한 노드에 들어가는지 판단
+
+클러스터 합계로는 자리가 남아 있어도 여러 노드에 조금씩 흩어져 있으면(단편화) Pod는 Pending에 머문다.
+Spoke 등록 정보의 노드별 리소스로 클러스터마다 작은 색인을 만들고,
+Optimizer에 넘기기 전에 어떤 노드에도 들어가지 않는 (작업, 클러스터) 후보를 제외한다.
+"""
+
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from hub.models import ClusterInfo
+
+# 요청과 남은 양 비교 시 부동소수점 오차 허용
+_EPSILON = 1e-9
+
+# (cpu, mem_gb, gpu)
+Shape = Tuple[float, float, int]
+
+
+class NodeFitIndex:
+    """
+    노드 집합에 대한 단일 노드 적합성 색인
+
+    노드를 CPU 내림차순으로 정렬하고 메모리 누적 최댓값을 저장하므로
+    GPU가 없는 요청은 이진 탐색 한 번으로 답한다 (O(log 노드 수)).
+    GPU 요청은 CPU 조건을 만족하는 앞부분만 선형 탐색한다.
+    """
+
+    __slots__ = ("_nodes", "_neg_cpu", "_mem_max")
+
+    def __init__(self, nodes: Iterable[Shape]):
+        """
+        Args:
+            nodes: 노드별 (cpu, mem_gb, gpu) 여유량
+        """
+        self._nodes: List[Shape] = sorted(nodes, key=lambda node: -node[0])
+        # bisect용 오름차순 키
+        self._neg_cpu = [-cpu for cpu, _, _ in self._nodes]
+        self._mem_max: List[float] = []
+        best = float("-inf")
+        for _, mem_gb, _ in self._nodes:
+            best = max(best, mem_gb)
+            self._mem_max.append(best)
+
+    def fits(self, cpu: float, mem_gb: float, gpu: int = 0) -> bool:
+        """요청 전체가 들어가는 노드가 하나라도 있는지"""
+        # CPU가 요청 이상인 노드 수 (정렬 순서상 앞에서부터)
+        k = bisect_right(self._neg_cpu, -cpu + _EPSILON)
+        if k == 0:
+            return False
+        if not gpu:
+            return self._mem_max[k - 1] >= mem_gb - _EPSILON
+        return any(m >= mem_gb - _EPSILON and g >= gpu for _, m, g in self._nodes[:k])
+
+
+class FeasibilityIndex:
+    """
+    클러스터별 NodeFitIndex 묶음
+
+    클러스터마다 현재 남은 양(free)과 할당 가능량(allocatable) 색인을 두고,
+    같은 크기의 작업은 결과를 재사용한다 (작업 수천 개도 크기 종류만큼만 탐색).
+    노드 정보를 보고하지 않은 클러스터는 항상 들어갈 수 있다고 본다.
+    """
+
+    def __init__(self, cluster_infos: List[ClusterInfo]):
+        """
+        Args:
+            cluster_infos: 클러스터 정보 리스트
+        """
+        self._free: Dict[str, NodeFitIndex] = {}
+        self._allocatable: Dict[str, NodeFitIndex] = {}
+        for ci in cluster_infos:
+            nodes = ci.resources.nodes
+            if not nodes:
+                continue
+            self._free[ci.name] = NodeFitIndex((n.cpu_free, n.mem_free_gb, n.gpu_free) for n in nodes)
+            self._allocatable[ci.name] = NodeFitIndex(
+                (n.cpu_allocatable, n.mem_allocatable_gb, n.gpu_allocatable) for n in nodes
+            )
+        self._cache: Dict[Tuple[Shape, bool], FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        """노드 정보가 있는 클러스터 수"""
+        return len(self._free)
+
+    def blocked(self, cpu: float, mem_gb: float, gpu: int = 0, free: bool = True) -> FrozenSet[str]:
+        """
+        요청이 어느 노드에도 들어가지 않는 클러스터 집합
+
+        Args:
+            cpu, mem_gb, gpu: 작업 요청
+            free: True면 현재 남은 양, False면 할당 가능량 기준
+
+        Returns:
+            제외할 클러스터 이름 집합
+        """
+        key = ((cpu, mem_gb, gpu), free)
+        result = self._cache.get(key)
+        if result is None:
+            indexes = self._free if free else self._allocatable
+            result = frozenset(name for name, index in indexes.items() if not index.fits(cpu, mem_gb, gpu))
+            self._cache[key] = result
+        return result
+
+    def candidates(
+        self,
+        regions: List[str],
+        cpu: float,
+        mem_gb: float,
+        gpu: int = 0,
+        keep: Optional[str] = None
+    ) -> List[str]:
+        """
+        요청이 들어갈 수 있는 후보 클러스터
+
+        지금 남은 양으로 들어가는 곳 -> 없으면 노드가 비면 들어가는 곳(할당 가능량) -> 없으면 원래 후보 순으로 완화한다.
+
+        Args:
+            regions: 원래 후보 클러스터
+            cpu, mem_gb, gpu: 작업 요청
+            keep: 제외하지 않을 클러스터 (실행 중인 작업은 이미 그 노드 자리를 차지하고 있음)
+
+        Returns:
+            후보 클러스터 (원래 순서 유지)
+        """
+        for free in (True, False):
+            blocked = self.blocked(cpu, mem_gb, gpu, free)
+            remaining = [r for r in regions if r == keep or r not in blocked]
+            if remaining:
+                return remaining
+        return list(regions)
@@ -0,0 +1,380 @@
+"""
+Hub Partition
+여러 Hub 프로세스가 Spoke 클러스터를 나눠 소유하는 샤딩 모드
+
+- 클러스터 소유권은 TTL이 있는 lease로 관리 (로컬 다중 프로세스용 SQLite stand-in)
+- Rendezvous hashing으로 멤버가 바뀌어도 최소한의 클러스터만 재배치
+- affinity가 여러 파티션에 걸친 작업은 coordinator lease 보유 Hub가 파티션 결정
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from hub.models import AppWrapperSpec, ClusterInfo
+
+logger = logging.getLogger(__name__)
+
+# coordinator 역할도 하나의 lease 키로 관리
+COORDINATOR_KEY = "__coordinator__"
+
+
+def rendezvous_owner(key: str, members: List[str]) -> Optional[str]:
+    """
+    Rendezvous(HRW) hashing으로 키의 소유 멤버 결정
+
+    Args:
+        key: 클러스터 이름 또는 lease 키
+        members: 살아있는 Hub ID 리스트
+
+    Returns:
+        소유 Hub ID (멤버가 없으면 None)
+    """
+    if not members:
+        return None
+    return max(members, key=lambda m: hashlib.sha1(f"{m}:{key}".encode()).digest())
+
+
+class LeaseStore:
+    """
+    SQLite 기반 lease 저장소
+
+    동기 API이며 PartitionManager가 스레드에서 호출한다.
+    여러 프로세스가 같은 DB 파일을 공유하여 멤버십, lease, 클러스터 요약을 교환.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS members (
+            hub_id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            heartbeat_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS leases (
+            key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS clusters (
+            name TEXT PRIMARY KEY,
+            carbon_intensity REAL,
+            cpu_available REAL,
+            updated_at REAL
+        );
+    """
+
+    def __init__(self, path: str):
+        """
+        Lease 저장소 초기화
+
+        Args:
+            path: SQLite DB 파일 경로
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """트랜잭션을 직접 제어하는 연결 생성"""
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # ==================== 멤버십 ====================
+
+    def heartbeat(self, hub_id: str, url: str, now: float):
+        """Hub 생존 신호 기록"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO members (hub_id, url, heartbeat_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(hub_id) DO UPDATE SET url = excluded.url, heartbeat_at = excluded.heartbeat_at",
+                (hub_id, url, now)
+            )
+
+    def live_members(self, now: float, ttl: float) -> Dict[str, str]:
+        """TTL 안에 heartbeat를 보낸 Hub 조회 (hub_id -> url)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT hub_id, url FROM members WHERE heartbeat_at > ?",
+                (now - ttl,)
+            ).fetchall()
+        return dict(rows)
+
+    def leave(self, hub_id: str):
+        """멤버십 탈퇴 및 보유 lease 반납"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM members WHERE hub_id = ?", (hub_id,))
+            conn.execute("DELETE FROM leases WHERE owner = ?", (hub_id,))
+            conn.execute("COMMIT")
+
+    # ==================== 클러스터 ====================
+
+    def register_cluster(self, name: str):
+        """lease 대상 클러스터 등록"""
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO clusters (name) VALUES (?)", (name,))
+
+    def publish_cluster_summary(self, name: str, carbon_intensity: float, cpu_available: float, now: float):
+        """coordinator가 참고할 클러스터 요약 기록"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO clusters (name, carbon_intensity, cpu_available, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET carbon_intensity = excluded.carbon_intensity, "
+                "cpu_available = excluded.cpu_available, updated_at = excluded.updated_at",
+                (name, carbon_intensity, cpu_available, now)
+            )
+
+    def cluster_summaries(self) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        """(name, carbon_intensity, cpu_available) 리스트 조회"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT name, carbon_intensity, cpu_available FROM clusters"
+            ).fetchall()
+
+    # ==================== Lease ====================
+
+    def leases(self, now: float) -> Dict[str, str]:
+        """유효한 lease 조회 (key -> owner)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, owner FROM leases WHERE expires_at > ?",
+                (now,)
+            ).fetchall()
+        return dict(rows)
+
+    def try_acquire(self, key: str, hub_id: str, now: float, ttl: float) -> bool:
+        """
+        lease 획득 또는 갱신
+        비어 있거나, 만료되었거나, 이미 자신이 소유한 경우에만 성공
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT owner, expires_at FROM leases WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row and row[0] != hub_id and row[1] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at",
+                (key, hub_id, now + ttl)
+            )
+            conn.execute("COMMIT")
+            return True
+
+    def release(self, key: str, hub_id: str):
+        """자신이 소유한 lease 반납"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, hub_id))
+
+
+class PartitionManager:
+    """
+    Hub 파티션 관리자
+
+    주기적으로:
+    1. heartbeat 기록 및 살아있는 Hub 조회
+    2. rendezvous hashing으로 클러스터별 소유 Hub 계산
+    3. 자신에게 배정된 lease 획득/갱신, 다른 Hub에 배정된 lease 반납
+    4. 소유권이 바뀌면 on_change 콜백으로 상태 이관
+    """
+
+    def __init__(
+        self,
+        hub_id: str,
+        hub_url: str,
+        lease_db: str,
+        lease_ttl: float = 15.0,
+        renew_interval: float = 5.0
+    ):
+        """
+        Partition Manager 초기화
+
+        Args:
+            hub_id: 이 Hub 프로세스의 ID
+            hub_url: 다른 Hub가 요청을 전달할 이 Hub의 URL
+            lease_db: 공유 lease DB 경로
+            lease_ttl: lease 및 멤버십 TTL (초)
+            renew_interval: lease 갱신 주기 (초)
+        """
+        self.hub_id = hub_id
+        self.hub_url = hub_url
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.leases = LeaseStore(lease_db)
+
+        self.owned_clusters: Set[str] = set()
+        self.is_coordinator = False
+        self._members: Dict[str, str] = {}
+        self._lease_owners: Dict[str, str] = {}
+        self._on_change: Optional[Callable[[Set[str], Set[str]], Awaitable[None]]] = None
+        self._running = False
+        self._task = None
+
+        logger.info(f"Partition Manager initialized (hub={hub_id}, db={lease_db})")
+
+    def on_change(self, callback: Callable[[Set[str], Set[str]], Awaitable[None]]):
+        """소유권 변경 콜백 등록: callback(gained, lost)"""
+        self._on_change = callback
+
+    async def start(self):
+        """파티션 관리 시작"""
+        if self._running:
+            logger.warning("Partition manager already running")
+            return
+
+        self._running = True
+        await self.rebalance()
+        self._task = asyncio.create_task(self._partition_loop())
+        logger.info("Partition Manager started")
+
+    async def stop(self):
+        """파티션 관리 중지 및 lease 반납"""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        await asyncio.to_thread(self.leases.leave, self.hub_id)
+        logger.info("Partition Manager stopped")
+
+    async def _partition_loop(self):
+        """lease 갱신 루프"""
+        while self._running:
+            try:
+                await asyncio.sleep(self.renew_interval)
+                await self.rebalance()
+
+            except Exception as e:
+                logger.error(f"Error in partition loop: {e}", exc_info=True)
+
+    async def rebalance(self) -> Tuple[Set[str], Set[str]]:
+        """
+        lease 갱신 및 재배치 1회 실행
+
+        Returns:
+            (새로 얻은 클러스터, 잃은 클러스터)
+        """
+        owned, members, lease_owners = await asyncio.to_thread(self._rebalance_sync, time.time())
+
+        gained = owned - self.owned_clusters - {COORDINATOR_KEY}
+        lost = self.owned_clusters - owned
+
+        self._members = members
+        self._lease_owners = lease_owners
+        self.is_coordinator = COORDINATOR_KEY in owned
+        self.owned_clusters = owned - {COORDINATOR_KEY}
+
+        if gained or lost:
+            logger.info(
+                f"Partition changed for {self.hub_id}: "
+                f"gained={sorted(gained)}, lost={sorted(lost)}, owned={sorted(self.owned_clusters)}"
+            )
+            if self._on_change:
+                await self._on_change(gained, lost)
+
+        return gained, lost
+
+    def _rebalance_sync(self, now: float) -> Tuple[Set[str], Dict[str, str], Dict[str, str]]:
+        """rebalance의 동기 부분 (스레드에서 실행)"""
+        self.leases.heartbeat(self.hub_id, self.hub_url, now)
+        members = self.leases.live_members(now, self.lease_ttl)
+        member_ids = sorted(members)
+
+        keys = [name for name, _, _ in self.leases.cluster_summaries()] + [COORDINATOR_KEY]
+        owned: Set[str] = set()
+
+        for key in keys:
+            if rendezvous_owner(key, member_ids) == self.hub_id:
+                # 이전 소유자가 반납하거나 lease가 만료되면 획득
+                if self.leases.try_acquire(key, self.hub_id, now, self.lease_ttl):
+                    owned.add(key)
+            else:
+                # 다른 Hub에 배정된 lease는 반납하여 이관
+                self.leases.release(key, self.hub_id)
+
+        return owned, members, self.leases.leases(now)
+
+    # ==================== 라우팅 ====================
+
+    @property
+    def coordinator_id(self) -> Optional[str]:
+        """현재 coordinator Hub ID"""
+        return self._lease_owners.get(COORDINATOR_KEY) or rendezvous_owner(
+            COORDINATOR_KEY, sorted(self._members)
+        )
+
+    def owner_of(self, cluster_name: str) -> Optional[str]:
+        """클러스터 소유 Hub (lease 보유자, 없으면 rendezvous 배정 대상)"""
+        return self._lease_owners.get(cluster_name) or rendezvous_owner(
+            cluster_name, sorted(self._members)
+        )
+
+    def url_of(self, hub_id: str) -> Optional[str]:
+        """Hub URL 조회"""
+        return self._members.get(hub_id)
+
+    async def register_cluster(self, cluster_name: str) -> Optional[str]:
+        """
+        새 클러스터를 lease 대상에 등록
+
+        Returns:
+            클러스터 소유 Hub ID
+        """
+        await asyncio.to_thread(self.leases.register_cluster, cluster_name)
+        return self.owner_of(cluster_name)
+
+    def route(self, spec: AppWrapperSpec) -> Optional[str]:
+        """
+        AppWrapper의 소유 Hub 결정
+
+        affinity 클러스터가 모두 한 파티션에 있으면 그 Hub,
+        affinity가 없거나 여러 파티션에 걸치면 None (coordinator가 결정)
+        """
+        owners = {self.owner_of(c) for c in spec.affinity_clusters}
+        if len(owners) == 1:
+            return owners.pop()
+        return None
+
+    async def assign(self, spec: AppWrapperSpec) -> Optional[str]:
+        """
+        coordinator 역할: 여러 파티션에 걸친 작업의 파티션 결정
+        후보 클러스터 중 CPU가 충분하고 탄소 집약도가 가장 낮은 클러스터의 소유 Hub 선택
+
+        Returns:
+            배정된 Hub ID
+        """
+        summaries = await asyncio.to_thread(self.leases.cluster_summaries)
+        candidates = [
+            (name, ci, cpu) for name, ci, cpu in summaries
+            if not spec.affinity_clusters or name in spec.affinity_clusters
+        ]
+        if not candidates:
+            return None
+
+        fitting = [c for c in candidates if (c[2] or 0) >= spec.cpu] or candidates
+        name, _, _ = min(fitting, key=lambda c: c[1] if c[1] is not None else float("inf"))
+        return self.owner_of(name)
+
+    async def publish_clusters(self, cluster_infos: List[ClusterInfo]):
+        """소유 클러스터의 요약을 공유 DB에 기록 (coordinator 배정용)"""
+        now = time.time()
+
+        def _publish():
+            for ci in cluster_infos:
+                if ci.name in self.owned_clusters:
+                    self.leases.publish_cluster_summary(
+                        ci.name, ci.carbon_intensity, ci.resources.cpu_available, now
+                    )
+
+        await asyncio.to_thread(_publish)
@@ -0,0 +1,144 @@
+"""
+Hub Store 레코드
+Store 내부에 보관하는 AppWrapper의 compact 표현
+
+pydantic AppWrapper는 모델마다 __dict__, fields_set 등을 가지고 gate/status까지
+중첩 모델이라 작업 하나에 수 KB를 차지한다. 레코드는 NamedTuple(__slots__ = (),
+튜플에 필드를 직접 저장)이고 반복되는 문자열(클러스터, 이미지, phase 등)과
+튜플, gate, 초기 status를 공유한다.
+
+레코드는 불변이며 필드 이름이 pydantic 모델과 같아 Scheduler/Dispatcher는
+그대로 읽을 수 있다. 변경은 _replace()로 새 레코드를 만들고,
+API 응답, WAL 직렬화 등 경계에서만 to_model()로 변환한다.
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from hub.models import AppWrapper, GateStatus
+
+# 공유 테이블에 남기는 최대 값 수
+SHARED_VALUES_MAX = 4096
+
+# 반복되는 불변 값 공유 (command, affinity_clusters 튜플, gate 튜플)
+# 튜플은 weakref를 지원하지 않으므로 최근에 쓴 값만 남기는 LRU로 크기를 제한한다
+# (작업마다 다른 command가 아카이브된 뒤에도 계속 남지 않도록).
+_shared: "OrderedDict[Any, Any]" = OrderedDict()
+
+
+def intern_value(value):
+    """반복되는 문자열/튜플을 하나의 객체로 공유 (튜플은 최근 SHARED_VALUES_MAX개까지)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return sys.intern(value)
+    shared = _shared.get(value)
+    if shared is not None:
+        try:
+            _shared.move_to_end(value)
+        except KeyError:
+            # 다른 스레드가 방금 내보낸 값
+            pass
+        return shared
+    shared = _shared.setdefault(value, value)
+    if len(_shared) > SHARED_VALUES_MAX:
+        _shared.popitem(last=False)
+    return shared
+
+
+class GateRecord(NamedTuple):
+    """Dispatching gate"""
+    name: str
+    status: GateStatus
+    reason: Optional[str]
+
+
+class SpecRecord(NamedTuple):
+    """AppWrapperSpec 레코드"""
+    job_id: str
+    cpu: float
+    mem_gb: float
+    gpu: int
+    runtime_minutes: int
+    deadline_minutes: int
+    data_gb: float
+    affinity_clusters: Tuple[str, ...]
+    image: str
+    command: Tuple[str, ...]
+    target_cluster: Optional[str]
+    dispatching_gates: Tuple[GateRecord, ...]
+
+
+class StatusRecord(NamedTuple):
+    """AppWrapperStatus 레코드"""
+    phase: str
+    dispatched: bool
+    cluster: Optional[str]
+    start_time: Optional[float]
+    completion_time: Optional[float]
+    message: Optional[str]
+
+
+# 제출 직후의 status는 모든 작업이 같으므로 하나를 공유
+PENDING_STATUS = StatusRecord("Pending", False, None, None, None, None)
+
+
+def gates_of(gates) -> Tuple[GateRecord, ...]:
+    """gate 목록을 공유 튜플로 변환 (같은 상태의 gate 튜플은 모든 작업이 공유)"""
+    return intern_value(tuple(
+        GateRecord(intern_value(gate.name), GateStatus(gate.status), intern_value(gate.reason))
+        for gate in gates
+    ))
+
+
+class AppWrapperRecord(NamedTuple):
+    """
+    Store에 저장되는 AppWrapper
+
+    metadata는 dict이지만 레코드와 마찬가지로 읽기 전용으로 취급한다.
+    """
+    metadata: Dict[str, str]
+    spec: SpecRecord
+    status: StatusRecord
+    resource_version: int
+
+    @classmethod
+    def from_model(cls, appwrapper: AppWrapper) -> "AppWrapperRecord":
+        """pydantic AppWrapper를 레코드로 변환 (입력 객체는 참조하지 않음)"""
+        spec = appwrapper.spec
+        status = appwrapper.status
+
+        status_record = StatusRecord(
+            intern_value(status.phase), status.dispatched, intern_value(status.cluster),
+            status.start_time, status.completion_time, status.message
+        )
+        if status_record == PENDING_STATUS:
+            status_record = PENDING_STATUS
+
+        return cls(
+            {sys.intern(key): intern_value(value) for key, value in appwrapper.metadata.items()},
+            SpecRecord(
+                spec.job_id, spec.cpu, spec.mem_gb, spec.gpu, spec.runtime_minutes,
+                spec.deadline_minutes, spec.data_gb,
+                intern_value(tuple(intern_value(c) for c in spec.affinity_clusters)),
+                intern_value(spec.image),
+                intern_value(tuple(spec.command)),
+                intern_value(spec.target_cluster),
+                gates_of(spec.dispatching_gates)
+            ),
+            status_record,
+            appwrapper.resource_version
+        )
+
+    def to_model(self) -> AppWrapper:
+        """API 경계용 pydantic AppWrapper 생성 (호출자 소유의 새 객체)"""
+        spec = self.spec
+        return AppWrapper.model_validate({
+            "metadata": dict(self.metadata),
+            "spec": {
+                **spec._asdict(),
+                "dispatching_gates": [gate._asdict() for gate in spec.dispatching_gates]
+            },
+            "status": self.status._asdict(),
+            "resource_version": self.resource_version
+        })
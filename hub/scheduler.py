@@ -9,12 +9,14 @@ Hub Scheduler
 import asyncio
 import logging
 import time
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 from hub.models import (
-    AppWrapper, ClusterInfo, SchedulingDecision,
-    GateStatus, DispatchingGate, AppWrapperStatus
+    AppWrapper, ClusterInfo, SchedulingDecision, SchedulingPlan,
+    GateStatus, DispatchingGate, AppWrapperStatus, MigrationRecord
 )
-from hub.store import hub_store
+from hub.node_fit import FeasibilityIndex
+from hub.records import AppWrapperRecord
+from hub.store import HubStore, hub_store
 from app.schemas import OptimizeInput, JobSpec, ClusterCapacity, CarbonPoint
 from app.optimizer import build_and_solve
 from app.metrics import (
@@ -26,6 +28,9 @@ from app.metrics import (
 
 logger = logging.getLogger(__name__)
 
+# 용량 제약을 유지하기 위한 최소 용량 (0이면 ClusterCapacity 검증 실패 및 제약 누락)
+MIN_CAPACITY = 1e-3
+
 
 class HubScheduler:
     """
@@ -35,23 +40,65 @@ class HubScheduler:
     1. Spoke 클러스터 정보 수집
     2. CASPIAN Optimizer 호출
     3. AppWrapper 업데이트
+
+    결과는 불변 SchedulingPlan으로 게시되며, 다음 계획이 계산되는 동안
+    Dispatcher와 API는 마지막으로 게시된 계획을 락 없이 읽는다.
     """
 
-    def __init__(self, schedule_interval: int = 300):
+    def __init__(
+        self,
+        schedule_interval: int = 300,
+        store: Optional[HubStore] = None,
+        clock: Callable[[], float] = time.time
+    ):
         """
         Hub Scheduler 초기화
 
         Args:
             schedule_interval: 스케줄링 주기 (초, 기본값: 300 = 5분)
+            store: 사용할 Hub Store (기본값: 전역 hub_store)
+            clock: 현재 시각 함수 (기본값: time.time, 시뮬레이터는 가상 시계 사용)
         """
         self.schedule_interval = schedule_interval
+        self.store = store if store is not None else hub_store
+        self._clock = clock
         self.slot_seconds = 300  # 5분 슬롯
         self.horizon_slots = 12  # 1시간 예측 구간
+        self.expedite_slack_slots = 1  # 남은 slack이 이 값 이하이면 즉시 시작
         self._running = False
         self._task = None
 
+        # 더블 버퍼링된 계획: 새 계획이 준비되면 포인터만 교체
+        self._current_plan: Optional[SchedulingPlan] = None
+        self._plan_version = 0
+        # 수동 트리거와 루프의 사이클이 겹치지 않도록 직렬화
+        self._cycle_lock = asyncio.Lock()
+        # (job_id, submitted_at) -> 절대 (release, deadline) epoch 슬롯
+        self._slot_cache: Dict[Tuple[str, Optional[str]], Tuple[int, int]] = {}
+        # Dispatcher circuit이 열린 클러스터 -> half-open 시각 (그때까지 용량 0으로 계획)
+        self._unavailable: Dict[str, float] = {}
+
         logger.info(f"Hub Scheduler initialized (interval: {schedule_interval}s)")
 
+    def mark_cluster_unavailable(self, cluster: str, until: float):
+        """
+        클러스터 용량을 until까지 0으로 취급 (Dispatcher circuit이 열렸을 때)
+
+        Args:
+            cluster: 클러스터 이름
+            until: circuit이 half-open 되는 시각 (Unix timestamp)
+        """
+        self._unavailable[cluster] = until
+
+    def mark_cluster_available(self, cluster: str):
+        """클러스터 용량을 다시 반영 (Dispatcher circuit이 닫혔을 때)"""
+        self._unavailable.pop(cluster, None)
+
+    def unavailable_clusters(self) -> List[str]:
+        """지금 용량을 0으로 취급하는 클러스터"""
+        now = self._clock()
+        return [cluster for cluster, until in self._unavailable.items() if until > now]
+
     async def start(self):
         """스케줄러 시작"""
         if self._running:
@@ -77,6 +124,43 @@ class HubScheduler:
 
         logger.info("Hub Scheduler stopped")
 
+    @property
+    def current_plan(self) -> Optional[SchedulingPlan]:
+        """마지막으로 게시된 스케줄링 계획 (솔버를 기다리지 않음)"""
+        return self._current_plan
+
+    def _publish_plan(
+        self,
+        decisions: List[SchedulingDecision],
+        solve_seconds: float
+    ) -> SchedulingPlan:
+        """
+        새 스케줄링 계획 게시
+        완성된 불변 객체를 만든 뒤 current plan 포인터를 한 번에 교체하므로
+        읽는 쪽은 절반만 적용된 계획을 볼 수 없다.
+
+        Args:
+            decisions: 이번 사이클의 스케줄링 결정
+            solve_seconds: 최적화 소요 시간 (초)
+
+        Returns:
+            게시된 계획
+        """
+        self._plan_version += 1
+        plan = SchedulingPlan(
+            version=self._plan_version,
+            created_at=self._clock(),
+            solve_seconds=solve_seconds,
+            decisions={d.job_id: d for d in decisions}
+        )
+        self._current_plan = plan
+
+        logger.info(
+            f"Published plan v{plan.version}: "
+            f"{len(plan.decisions)} decisions, solve={solve_seconds:.2f}s"
+        )
+        return plan
+
     async def _scheduler_loop(self):
         """
         스케줄러 메인 루프
@@ -100,12 +184,17 @@ class HubScheduler:
         Pending과 Running 워크로드를 모두 스케줄링하여
         탄소 강도 변화에 따른 마이그레이션을 지원
         """
+        async with self._cycle_lock:
+            await self._run_scheduling_cycle()
+
+    async def _run_scheduling_cycle(self):
+        """스케줄링 사이클 본체 (_cycle_lock 보유 상태에서 호출)"""
         logger.info("=" * 60)
         logger.info("Starting scheduling cycle")
 
         # Step 0: Pending + Running AppWrapper 모두 가져오기 (마이그레이션 지원)
-        pending_appwrappers = await hub_store.get_pending_appwrappers()
-        running_appwrappers = await hub_store.get_running_appwrappers()
+        pending_appwrappers = await self.store.get_pending_appwrappers()
+        running_appwrappers = await self.store.get_running_appwrappers()
 
         # Pending과 Running을 합쳐서 재스케줄링
         all_schedulable = pending_appwrappers + running_appwrappers
@@ -133,15 +222,18 @@ class HubScheduler:
             )
 
         # ===== Step 2: CASPIAN Optimizer 호출 =====
+        solve_started = time.time()
         decisions = await self._call_optimizer(all_schedulable, cluster_infos)
+        solve_seconds = time.time() - solve_started
         if not decisions:
             logger.warning("No scheduling decisions from optimizer")
             return
 
         logger.info(f"Step 2: Optimizer returned {len(decisions)} decisions")
 
-        # ===== Step 3: AppWrapper 업데이트 =====
+        # ===== Step 3: AppWrapper 업데이트 및 계획 게시 =====
         await self._update_appwrappers(decisions)
+        self._publish_plan(decisions, solve_seconds)
         logger.info("Step 3: Updated AppWrappers with scheduling decisions")
 
         logger.info("Scheduling cycle completed")
@@ -154,7 +246,7 @@ class HubScheduler:
         Returns:
             준비 상태인 클러스터 정보 리스트
         """
-        cluster_infos = await hub_store.get_ready_clusters()
+        cluster_infos = await self.store.get_ready_clusters()
 
         if not cluster_infos:
             logger.warning("No ready clusters available")
@@ -163,7 +255,7 @@ class HubScheduler:
 
     async def _call_optimizer(
         self,
-        appwrappers: List[AppWrapper],
+        appwrappers: List[AppWrapperRecord],
         cluster_infos: List[ClusterInfo]
     ) -> List[SchedulingDecision]:
         """
@@ -176,41 +268,34 @@ class HubScheduler:
         Returns:
             스케줄링 결정 리스트
         """
-        # AppWrapper를 JobSpec으로 변환
-        jobs = []
-        for aw in appwrappers:
-            spec = aw.spec
-            # 분 단위를 슬롯 단위로 변환 (5분 슬롯)
-            runtime_slots = max(1, spec.runtime_minutes // 5)
-            deadline_slots = max(runtime_slots, spec.deadline_minutes // 5)
+        # 슬롯은 wall-clock epoch에 고정: 현재 epoch 슬롯이 계획 구간의 0번 슬롯
+        now_slot = self._epoch_slot(self._clock())
 
-            job = JobSpec(
-                job_id=spec.job_id,
-                cpu=spec.cpu,
-                mem_gb=spec.mem_gb,
-                gpu=spec.gpu,
-                runtime_slots=runtime_slots,
-                release_slot=0,
-                deadline_slot=deadline_slots,
-                data_gb=spec.data_gb,
-                affinity_regions=spec.affinity_clusters
-            )
-            jobs.append(job)
+        # AppWrapper를 JobSpec으로 변환
+        jobs = self._build_job_specs(appwrappers, now_slot)
 
         # ClusterInfo로부터 용량 및 탄소 데이터 구축
         regions = [ci.name for ci in cluster_infos]
+
+        # 어떤 노드에도 들어가지 않는 (작업, 클러스터) 후보는 솔버에 넘기기 전에 제외
+        jobs = self._prune_infeasible(jobs, appwrappers, cluster_infos, regions)
         capacities = []
         carbons = []
+        unavailable = set(self.unavailable_clusters())
+        if unavailable:
+            logger.info(f"Treating clusters with open dispatch circuits as full: {sorted(unavailable)}")
 
         for ci in cluster_infos:
+            down = ci.name in unavailable
             for slot in range(self.horizon_slots):
                 # 용량
+                # 가득 찬 클러스터(0)는 optimizer에서 '제약 없음'으로 처리되므로 최소값으로 고정
                 capacities.append(ClusterCapacity(
                     region=ci.name,
                     slot=slot,
-                    cpu_cap=ci.resources.cpu_available,
-                    mem_gb_cap=ci.resources.mem_available_gb,
-                    gpu_cap=ci.resources.gpu_available
+                    cpu_cap=MIN_CAPACITY if down else max(ci.resources.cpu_available, MIN_CAPACITY),
+                    mem_gb_cap=MIN_CAPACITY if down else max(ci.resources.mem_available_gb, MIN_CAPACITY),
+                    gpu_cap=0 if down else ci.resources.gpu_available
                 ))
 
                 # 탄소 집약도 (현재는 고정값, 향후 예측 데이터 사용)
@@ -238,7 +323,8 @@ class HubScheduler:
         )
 
         # 최적화 실행
-        result = build_and_solve(opt_input)
+        # 솔버는 동기 코드이므로 스레드에서 실행하여 이벤트 루프(디스패치, API)를 막지 않음
+        result = await asyncio.to_thread(build_and_solve, opt_input)
 
         logger.info(
             f"Optimizer result: {result.solver_status}, "
@@ -247,14 +333,19 @@ class HubScheduler:
         )
 
         # 결과를 SchedulingDecision으로 변환
+        # plan마다 선형 탐색하지 않도록 dict 인덱스 사용
+        jobs_by_id = {j.job_id: j for j in jobs}
+        clusters_by_name = {ci.name: ci for ci in cluster_infos}
+        slot_minutes = self.slot_seconds // 60
+
         decisions = []
         for plan in result.plans:
             # 해당 작업의 탄소 배출량 추정
-            job = next((j for j in jobs if j.job_id == plan.job_id), None)
+            job = jobs_by_id.get(plan.job_id)
             if not job:
                 continue
 
-            cluster = next((ci for ci in cluster_infos if ci.name == plan.region), None)
+            cluster = clusters_by_name.get(plan.region)
             if not cluster:
                 continue
 
@@ -270,7 +361,8 @@ class HubScheduler:
             decision = SchedulingDecision(
                 job_id=plan.job_id,
                 target_cluster=plan.region,
-                start_time_minutes=plan.start_slot * 5,
+                start_time_minutes=plan.start_slot * slot_minutes,
+                start_at=(now_slot + plan.start_slot) * self.slot_seconds,
                 estimated_co2_g=estimated_co2,
                 reason=f"Optimal placement for minimum carbon footprint"
             )
@@ -278,6 +370,141 @@ class HubScheduler:
 
         return decisions
 
+    def _prune_infeasible(
+        self,
+        jobs: List[JobSpec],
+        appwrappers: List[AppWrapperRecord],
+        cluster_infos: List[ClusterInfo],
+        regions: List[str]
+    ) -> List[JobSpec]:
+        """
+        노드 단위 적합성 사전 검사로 작업별 후보 클러스터(affinity_regions) 축소
+
+        클러스터 합계 용량만 보는 솔버가 단편화된 클러스터에 작업을 배치해
+        Pod가 Pending에 머무는 일을 막는다. 노드 정보가 없는 클러스터는 제외하지 않는다.
+
+        Args:
+            jobs: JobSpec 리스트
+            appwrappers: 스케줄링 대상 AppWrapper 리스트
+            cluster_infos: 클러스터 정보 리스트
+            regions: 후보 클러스터 이름 (affinity가 없는 작업의 후보)
+
+        Returns:
+            후보를 축소한 JobSpec 리스트
+        """
+        index = FeasibilityIndex(cluster_infos)
+        if not index:
+            return jobs
+
+        # 실행 중인 작업의 현재 클러스터는 자신이 차지한 자리를 포함하므로 항상 후보로 유지
+        current = {aw.spec.job_id: aw.status.cluster for aw in appwrappers if aw.status.dispatched}
+
+        pruned = 0
+        result = []
+        for job in jobs:
+            allowed = job.affinity_regions or regions
+            candidates = index.candidates(allowed, job.cpu, job.mem_gb, job.gpu, keep=current.get(job.job_id))
+            if len(candidates) < len(allowed):
+                pruned += len(allowed) - len(candidates)
+                job = job.model_copy(update={"affinity_regions": candidates})
+            result.append(job)
+
+        if pruned:
+            logger.info(f"Pruned {pruned} (job, cluster) candidates that fit on no single node")
+        return result
+
+    def _epoch_slot(self, timestamp: float) -> int:
+        """Unix timestamp를 절대 epoch 슬롯 인덱스로 변환"""
+        return int(timestamp // self.slot_seconds)
+
+    def _job_window(self, appwrapper: AppWrapperRecord, now_slot: int) -> Tuple[int, int]:
+        """
+        작업의 절대 (release, deadline) epoch 슬롯 조회
+        submitted_at 기준으로 한 번 계산한 뒤 사이클 간 캐시를 재사용
+
+        Args:
+            appwrapper: AppWrapper
+            now_slot: 현재 epoch 슬롯
+
+        Returns:
+            (release epoch 슬롯, deadline epoch 슬롯)
+        """
+        submitted_at = appwrapper.metadata.get("submitted_at")
+        key = (appwrapper.spec.job_id, submitted_at)
+
+        window = self._slot_cache.get(key)
+        if window is None:
+            if submitted_at is not None:
+                release_slot = self._epoch_slot(float(submitted_at))
+                deadline_slot = self._epoch_slot(
+                    float(submitted_at) + appwrapper.spec.deadline_minutes * 60
+                )
+            else:
+                # 제출 시간이 없으면 처음 관측한 시점에 고정
+                release_slot = now_slot
+                deadline_slot = now_slot + appwrapper.spec.deadline_minutes * 60 // self.slot_seconds
+            window = (release_slot, deadline_slot)
+            self._slot_cache[key] = window
+
+        return window
+
+    def _build_job_specs(self, appwrappers: List[AppWrapperRecord], now_slot: int) -> List[JobSpec]:
+        """
+        AppWrapper를 현재 계획 구간 기준의 JobSpec으로 변환
+
+        대기한 시간만큼 남은 slack이 줄어들며,
+        slack이 expedite_slack_slots 이하인 작업은 0번 슬롯 시작으로 고정(긴급 처리)
+
+        Args:
+            appwrappers: 스케줄링 대상 AppWrapper 리스트
+            now_slot: 현재 epoch 슬롯
+
+        Returns:
+            JobSpec 리스트
+        """
+        jobs = []
+        live_keys = set()
+        expedited = 0
+
+        for aw in appwrappers:
+            spec = aw.spec
+            # 분 단위를 슬롯 단위로 변환
+            runtime_slots = max(1, spec.runtime_minutes * 60 // self.slot_seconds)
+
+            release_epoch, deadline_epoch = self._job_window(aw, now_slot)
+            live_keys.add((spec.job_id, aw.metadata.get("submitted_at")))
+
+            # 현재 슬롯 기준 상대 슬롯
+            release_slot = max(0, release_epoch - now_slot)
+            deadline_slot = deadline_epoch - now_slot
+
+            # 데드라인이 임박했거나 이미 지난 작업은 즉시 시작
+            if deadline_slot - runtime_slots - release_slot <= self.expedite_slack_slots:
+                release_slot = 0
+                deadline_slot = runtime_slots
+                expedited += 1
+
+            jobs.append(JobSpec(
+                job_id=spec.job_id,
+                cpu=spec.cpu,
+                mem_gb=spec.mem_gb,
+                gpu=spec.gpu,
+                runtime_slots=runtime_slots,
+                release_slot=release_slot,
+                deadline_slot=deadline_slot,
+                data_gb=spec.data_gb,
+                affinity_regions=spec.affinity_clusters
+            ))
+
+        # 더 이상 스케줄링 대상이 아닌 작업의 캐시 정리
+        if len(self._slot_cache) > len(live_keys):
+            self._slot_cache = {k: v for k, v in self._slot_cache.items() if k in live_keys}
+
+        if expedited:
+            logger.info(f"Expedited {expedited} jobs close to their deadline")
+
+        return jobs
+
     async def _update_appwrappers(self, decisions: List[SchedulingDecision]):
         """
         Step 3: AppWrapper 업데이트
@@ -287,71 +514,55 @@ class HubScheduler:
         Args:
             decisions: 스케줄링 결정 리스트
         """
-        for decision in decisions:
-            appwrapper = await hub_store.get_appwrapper(decision.job_id)
-            if not appwrapper:
-                logger.warning(f"AppWrapper {decision.job_id} not found")
-                continue
+        # 모든 결정을 한 번의 store 트랜잭션으로 적용
+        migrations = await self.store.apply_decisions(decisions)
 
-            # 이전 클러스터 할당 확인 (마이그레이션 감지)
-            previous_cluster = appwrapper.spec.target_cluster
-            new_cluster = decision.target_cluster
-            is_migration = previous_cluster and previous_cluster != new_cluster
-
-            # 마이그레이션 발생 시 메트릭 기록
-            if is_migration:
-                data_gb = appwrapper.spec.data_gb
-                
-                # 마이그레이션 카운트 증가
-                migrations_total.labels(
-                    from_cluster=previous_cluster,
-                    to_cluster=new_cluster
-                ).inc()
-                
-                # 전송 데이터 기록
-                migration_data_transferred_gb.labels(
-                    from_cluster=previous_cluster,
-                    to_cluster=new_cluster
-                ).inc(data_gb)
-                
-                # 마이그레이션 비용 계산 및 기록
-                # lam_dev (100.0) + net_cost * data_gb
-                # 네트워크 비용은 현재 0으로 가정
-                migration_carbon_cost = 100.0  # lam_dev 기본값
-                migration_cost_gco2.labels(
-                    from_cluster=previous_cluster,
-                    to_cluster=new_cluster
-                ).inc(migration_carbon_cost)
-                
-                logger.info(
-                    f"  MIGRATION detected for {decision.job_id}: "
-                    f"{previous_cluster} -> {new_cluster}, "
-                    f"data={data_gb:.2f}GB, cost={migration_carbon_cost:.2f}gCO2"
-                )
+        if migrations:
+            self._record_migrations(migrations)
 
-            # targetCluster 설정
-            appwrapper.spec.target_cluster = decision.target_cluster
+    def _record_migrations(self, migrations: List[MigrationRecord]):
+        """
+        마이그레이션 메트릭 일괄 기록
+        (from, to) 클러스터 쌍별로 합산 후 한 번씩 기록
+
+        Args:
+            migrations: 감지된 마이그레이션 리스트
+        """
+        # lam_dev (100.0) + net_cost * data_gb
+        # 네트워크 비용은 현재 0으로 가정
+        migration_carbon_cost = 100.0  # lam_dev 기본값
+
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for m in migrations:
+            entry = totals.setdefault((m.from_cluster, m.to_cluster), [0, 0.0])
+            entry[0] += 1
+            entry[1] += m.data_gb
+
+            logger.debug(
+                f"  MIGRATION detected for {m.job_id}: "
+                f"{m.from_cluster} -> {m.to_cluster}, data={m.data_gb:.2f}GB"
+            )
 
-            # dispatching gate 열기 (sustainability gate)
-            for gate in appwrapper.spec.dispatching_gates:
-                gate.status = GateStatus.OPEN
-                gate.reason = decision.reason
+        for (from_cluster, to_cluster), (count, data_gb) in totals.items():
+            migrations_total.labels(
+                from_cluster=from_cluster,
+                to_cluster=to_cluster
+            ).inc(count)
 
-            # 메타데이터 업데이트
-            appwrapper.metadata["scheduled_at"] = str(time.time())
-            appwrapper.metadata["estimated_co2_g"] = str(decision.estimated_co2_g)
-            
-            if is_migration:
-                appwrapper.metadata["migrated_from"] = previous_cluster
-                appwrapper.metadata["migration_time"] = str(time.time())
+            migration_data_transferred_gb.labels(
+                from_cluster=from_cluster,
+                to_cluster=to_cluster
+            ).inc(data_gb)
 
-            # 저장
-            await hub_store.update_appwrapper(decision.job_id, appwrapper)
+            migration_cost_gco2.labels(
+                from_cluster=from_cluster,
+                to_cluster=to_cluster
+            ).inc(migration_carbon_cost * count)
 
             logger.info(
-                f"  Updated {decision.job_id}: "
-                f"target={decision.target_cluster}, "
-                f"CO2={decision.estimated_co2_g:.2f}g"
+                f"  MIGRATION {from_cluster} -> {to_cluster}: "
+                f"{count} jobs, data={data_gb:.2f}GB, "
+                f"cost={migration_carbon_cost * count:.2f}gCO2"
             )
 
 
@@ -0,0 +1,554 @@
+"""
+Hub Simulator
+가상 시계 기반 이산 사건(discrete-event) 시뮬레이터
+
+HubStore, HubScheduler, HubDispatcher를 실제 코드 그대로 구동하되
+- 시간은 VirtualClock으로 이벤트 사이를 즉시 건너뛰고
+- Spoke Kubernetes API는 FakeBatchApi로 대체하며
+- 탄소 집약도는 재생 가능한 CarbonTrace에서 읽는다.
+
+사용법:
+    python -m hub.simulator --hours 24 --jobs-per-hour 60 --seed 1
+    python -m hub.simulator --trace carbon_trace.csv --save-trace out.csv
+"""
+
+import argparse
+import asyncio
+import bisect
+import csv
+import heapq
+import itertools
+import json
+import logging
+import math
+import random
+import statistics
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from kubernetes.client.rest import ApiException
+from pydantic import BaseModel, Field
+
+from app.carbon_client import CarbonClient
+from hub.dispatcher import HubDispatcher
+from hub.models import (
+    AppWrapper, AppWrapperSpec, ClusterInfo, ClusterResources, MigrationRecord
+)
+from hub.scheduler import HubScheduler
+from hub.store import HubStore
+
+logger = logging.getLogger(__name__)
+
+WATT_PER_CPU = 30.0  # Scheduler와 동일한 CPU 코어당 전력
+
+
+class VirtualClock:
+    """시뮬레이션 시계: 이벤트 시각으로만 이동"""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def time(self) -> float:
+        """현재 가상 시각 (Unix timestamp)"""
+        return self.now
+
+    def advance_to(self, timestamp: float):
+        """가상 시각 이동 (되돌아가지 않음)"""
+        self.now = max(self.now, timestamp)
+
+
+class CarbonTrace:
+    """
+    재생 가능한 탄소 집약도 트레이스
+    zone별 (시작 기준 offset 초, gCO2/kWh) 계단 함수
+    """
+
+    def __init__(self, points: Dict[str, List[Tuple[float, float]]]):
+        self._offsets: Dict[str, List[float]] = {}
+        self._values: Dict[str, List[float]] = {}
+        for zone, series in points.items():
+            series = sorted(series)
+            self._offsets[zone] = [t for t, _ in series]
+            self._values[zone] = [v for _, v in series]
+
+    @property
+    def zones(self) -> List[str]:
+        """트레이스에 포함된 zone 목록"""
+        return list(self._offsets)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "CarbonTrace":
+        """offset_seconds,zone,carbon_intensity 형식의 CSV 로드"""
+        points: Dict[str, List[Tuple[float, float]]] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                points.setdefault(row["zone"], []).append(
+                    (float(row["offset_seconds"]), float(row["carbon_intensity"]))
+                )
+        return cls(points)
+
+    @classmethod
+    def synthetic(
+        cls,
+        zones: List[str],
+        duration_seconds: float,
+        step_seconds: float = 300,
+        seed: int = 0
+    ) -> "CarbonTrace":
+        """
+        일 단위 주기 + 노이즈로 합성 트레이스 생성
+        기준값은 CarbonClient의 mock 데이터를 사용
+        """
+        rng = random.Random(seed)
+        points: Dict[str, List[Tuple[float, float]]] = {}
+        steps = int(duration_seconds // step_seconds) + 1
+
+        for index, zone in enumerate(zones):
+            base = CarbonClient.MOCK_DATA.get(zone, {}).get("carbonIntensity", 400)
+            phase = index * 2 * math.pi / max(1, len(zones))
+            series = []
+            for step in range(steps):
+                offset = step * step_seconds
+                daily = math.sin(offset / 86400 * 2 * math.pi + phase)
+                value = base + daily * base * 0.3 + rng.uniform(-25, 25)
+                series.append((offset, max(50.0, min(800.0, value))))
+            points[zone] = series
+
+        return cls(points)
+
+    def to_csv(self, path: str):
+        """CSV로 저장 (from_csv로 재생 가능)"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["offset_seconds", "zone", "carbon_intensity"])
+            for zone in self.zones:
+                for offset, value in zip(self._offsets[zone], self._values[zone]):
+                    writer.writerow([offset, zone, round(value, 3)])
+
+    def at(self, zone: str, offset: float) -> float:
+        """특정 시점의 탄소 집약도"""
+        offsets = self._offsets[zone]
+        i = max(0, bisect.bisect_right(offsets, offset) - 1)
+        return self._values[zone][i]
+
+    def change_points(self) -> List[float]:
+        """값이 바뀌는 모든 offset (정렬)"""
+        return sorted({t for offsets in self._offsets.values() for t in offsets})
+
+    def integrate(self, zone: str, start: float, end: float) -> float:
+        """구간 [start, end]의 탄소 집약도 적분 (gCO2/kWh * 초)"""
+        offsets = self._offsets[zone]
+        total = 0.0
+        t = start
+        i = max(0, bisect.bisect_right(offsets, start) - 1)
+        while t < end:
+            next_t = offsets[i + 1] if i + 1 < len(offsets) else end
+            segment_end = min(end, next_t)
+            total += self._values[zone][i] * (segment_end - t)
+            t = segment_end
+            i += 1
+        return total
+
+
+class FakeBatchApi:
+    """
+    Spoke 클러스터의 batch/v1 Jobs API 대역
+
+    용량 안에서 Job을 시작하고, 부족하면 대기열에 두었다가
+    용량이 풀리면 FIFO로 시작 (pending pod 모사)
+    """
+
+    def __init__(
+        self,
+        cluster: str,
+        cpu_total: float,
+        mem_total_gb: float,
+        resources_of: Callable[[str], Tuple[float, float]],
+        on_start: Callable[[str, str], None]
+    ):
+        self.cluster = cluster
+        self.cpu_total = cpu_total
+        self.mem_total_gb = mem_total_gb
+        self.cpu_used = 0.0
+        self.mem_used_gb = 0.0
+        self.jobs: Dict[str, Tuple[float, float]] = {}
+        self._queue: Deque[str] = deque()
+        self._running: Dict[str, Tuple[float, float]] = {}
+        self._resources_of = resources_of
+        self._on_start = on_start
+
+    def create_namespaced_job(self, namespace: str, body):
+        """Job 생성 (BatchV1Api.create_namespaced_job 대역)"""
+        name = body["metadata"]["name"] if isinstance(body, dict) else body.metadata.name
+        if name in self.jobs:
+            raise ApiException(status=409, reason="AlreadyExists")
+
+        self.jobs[name] = self._resources_of(name)
+        self._queue.append(name)
+        self._start_queued()
+        return body
+
+    def finish(self, name: str):
+        """Job 완료 처리 및 용량 반환"""
+        cpu, mem = self._running.pop(name)
+        self.cpu_used -= cpu
+        self.mem_used_gb -= mem
+        self._start_queued()
+
+    def _start_queued(self):
+        while self._queue:
+            cpu, mem = self.jobs[self._queue[0]]
+            if self.cpu_used + cpu > self.cpu_total or self.mem_used_gb + mem > self.mem_total_gb:
+                break
+            name = self._queue.popleft()
+            self._running[name] = (cpu, mem)
+            self.cpu_used += cpu
+            self.mem_used_gb += mem
+            self._on_start(self.cluster, name)
+
+
+class SimulationConfig(BaseModel):
+    """시뮬레이션 설정"""
+    hours: float = Field(default=24.0, gt=0, description="작업 제출 기간 (시간)")
+    drain_hours: float = Field(default=12.0, ge=0, description="제출 종료 후 완료 대기 한도 (시간)")
+    jobs_per_hour: float = Field(default=60.0, gt=0, description="평균 제출률 (Poisson)")
+    seed: int = Field(default=0, description="난수 시드")
+    schedule_interval: int = Field(default=300, description="스케줄링 주기 (가상 초)")
+    dispatch_interval: int = Field(default=30, description="배포 주기 (가상 초)")
+    start_time: float = Field(default=1_700_000_100.0, description="가상 시작 시각 (Unix timestamp)")
+    clusters: Dict[str, float] = Field(
+        default_factory=lambda: {"KR": 64.0, "JP": 64.0, "CN": 64.0},
+        description="클러스터별 CPU 코어 수"
+    )
+    mem_per_cpu_gb: float = Field(default=4.0, description="CPU 코어당 메모리 (GB)")
+
+
+class SimulationReport(BaseModel):
+    """시뮬레이션 결과"""
+    simulated_hours: float
+    wall_seconds: float
+    jobs_submitted: int
+    jobs_completed: int
+    jobs_per_second: float = Field(description="wall-clock 초당 완료 작업 수")
+    scheduling_cycles: int
+    decision_latency_ms_p50: float = Field(description="스케줄링 사이클 wall-clock 지연 (중앙값)")
+    decision_latency_ms_p95: float
+    mean_queue_wait_seconds: float = Field(description="제출부터 실제 시작까지 평균 대기 (가상 초)")
+    deadline_misses: int
+    migrations: int
+    total_co2_kg: float
+
+
+class _SimScheduler(HubScheduler):
+    """마이그레이션 수를 집계하는 Scheduler"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.migration_count = 0
+
+    def _record_migrations(self, migrations: List[MigrationRecord]):
+        self.migration_count += len(migrations)
+        super()._record_migrations(migrations)
+
+
+class _SimDispatcher(HubDispatcher):
+    """fake Spoke API를 이벤트 루프에서 직접 호출하는 Dispatcher (가상 시계와 실행 순서를 결정적으로 유지)"""
+
+    async def _call_api(self, func, **kwargs):
+        return func(**kwargs)
+
+
+class HubSimulator:
+    """
+    Hub 파이프라인 이산 사건 시뮬레이터
+
+    이벤트: 작업 제출, 스케줄링 사이클, 배포 사이클, 탄소 집약도 변화, 작업 완료
+    """
+
+    def __init__(self, config: SimulationConfig, trace: Optional[CarbonTrace] = None):
+        self.config = config
+        self.clock = VirtualClock(config.start_time)
+        duration = (config.hours + config.drain_hours) * 3600
+        self.trace = trace or CarbonTrace.synthetic(
+            list(config.clusters), duration, seed=config.seed
+        )
+
+        self.store = HubStore(clock=self.clock.time)
+        self.scheduler = _SimScheduler(
+            schedule_interval=config.schedule_interval,
+            store=self.store,
+            clock=self.clock.time
+        )
+        self.dispatcher = _SimDispatcher(
+            dispatch_interval=config.dispatch_interval,
+            store=self.store,
+            scheduler=self.scheduler,
+            clock=self.clock.time,
+            # fake Spoke는 작업을 처음 시작한 클러스터에서 끝까지 실행하므로 마이그레이션은 집계만 함
+            live_migration=False
+        )
+
+        self.spokes: Dict[str, FakeBatchApi] = {}
+        for name, cpu in config.clusters.items():
+            spoke = FakeBatchApi(
+                name, cpu, cpu * config.mem_per_cpu_gb,
+                resources_of=self._resources_of,
+                on_start=self._on_job_start
+            )
+            self.spokes[name] = spoke
+            # Dispatcher의 클라이언트 캐시에 fake API 주입
+            self.dispatcher.client_pool.register(f"sim-{name}", spoke)
+
+        self._events: List[Tuple[float, int, str, object]] = []
+        self._seq = itertools.count()
+        self._specs: Dict[str, AppWrapperSpec] = {}
+        self._submitted_at: Dict[str, float] = {}
+        self._started_at: Dict[str, Tuple[str, float]] = {}
+        self._outstanding = 0
+        self._dirty_clusters = set()
+        # 예약된 보류 타이머 배포 이벤트 시각 (중복 예약 방지)
+        self._timer_wakeups = set()
+
+        self._latencies_ms: List[float] = []
+        self._queue_waits: List[float] = []
+        self._completed = 0
+        self._deadline_misses = 0
+        self._co2_g = 0.0
+
+    # ==================== 이벤트 큐 ====================
+
+    def _push(self, timestamp: float, kind: str, payload: object = None):
+        heapq.heappush(self._events, (timestamp, next(self._seq), kind, payload))
+
+    def _offset(self) -> float:
+        return self.clock.now - self.config.start_time
+
+    # ==================== 워크로드 ====================
+
+    def generate_workload(self) -> List[Tuple[float, AppWrapperSpec, str]]:
+        """Poisson 도착 과정으로 (offset, spec, user) 리스트 생성"""
+        rng = random.Random(self.config.seed)
+        rate = self.config.jobs_per_hour / 3600.0
+        clusters = list(self.config.clusters)
+        workload = []
+        offset = 0.0
+
+        for index in itertools.count():
+            offset += rng.expovariate(rate)
+            if offset >= self.config.hours * 3600:
+                break
+
+            cpu = rng.choice([0.5, 1.0, 2.0, 4.0])
+            runtime = rng.choice([5, 10, 30, 60, 120])
+            spec = AppWrapperSpec(
+                job_id=f"sim-{index:06d}",
+                cpu=cpu,
+                mem_gb=cpu * 2,
+                runtime_minutes=runtime,
+                deadline_minutes=runtime + rng.choice([30, 60, 120, 240, 480]),
+                data_gb=round(rng.uniform(0, 5), 2),
+                affinity_clusters=[rng.choice(clusters)] if rng.random() < 0.1 else []
+            )
+            workload.append((offset, spec, rng.choice(["team-a", "team-b", "team-c"])))
+
+        return workload
+
+    def _resources_of(self, job_id: str) -> Tuple[float, float]:
+        spec = self._specs[job_id]
+        return spec.cpu, spec.mem_gb
+
+    # ==================== 실행 ====================
+
+    async def run(self) -> SimulationReport:
+        """시뮬레이션 실행"""
+        start = self.config.start_time
+        submit_end = start + self.config.hours * 3600
+        hard_end = submit_end + self.config.drain_hours * 3600
+
+        for name, cpu in self.config.clusters.items():
+            await self.store.update_cluster_info(ClusterInfo(
+                name=name,
+                geolocation=name,
+                carbon_intensity=self.trace.at(name, 0),
+                resources=ClusterResources(
+                    cpu_available=cpu,
+                    cpu_total=cpu,
+                    mem_available_gb=cpu * self.config.mem_per_cpu_gb,
+                    mem_total_gb=cpu * self.config.mem_per_cpu_gb
+                ),
+                kubeconfig_context=f"sim-{name}",
+                last_updated=start
+            ))
+
+        for offset, spec, user in self.generate_workload():
+            self._push(start + offset, "submit", (spec, user))
+        for offset in self.trace.change_points():
+            if start + offset <= hard_end:
+                self._push(start + offset, "carbon")
+        self._push(start + self.config.schedule_interval, "schedule")
+        self._push(start + self.config.dispatch_interval, "dispatch")
+
+        wall_started = time.perf_counter()
+
+        while self._events:
+            timestamp, _, kind, payload = heapq.heappop(self._events)
+            if timestamp > hard_end:
+                break
+            # 제출이 끝나고 모든 작업이 완료되면 종료
+            if timestamp > submit_end and self._outstanding == 0:
+                break
+
+            self.clock.advance_to(timestamp)
+            await self._handle(kind, payload)
+            if self._dirty_clusters:
+                await self._flush_resources()
+
+        wall_seconds = time.perf_counter() - wall_started
+        return self._report(wall_seconds)
+
+    async def _handle(self, kind: str, payload: object):
+        if kind == "submit":
+            spec, user = payload
+            self._specs[spec.job_id] = spec
+            self._submitted_at[spec.job_id] = self.clock.now
+            self._outstanding += 1
+            await self.store.add_appwrapper(AppWrapper(
+                metadata={"submitted_at": str(self.clock.now), "user": user},
+                spec=spec
+            ))
+
+        elif kind == "schedule":
+            started = time.perf_counter()
+            await self.scheduler.run_scheduling_cycle()
+            self._latencies_ms.append((time.perf_counter() - started) * 1000)
+            self._push(self.clock.now + self.config.schedule_interval, "schedule")
+
+        elif kind == "dispatch":
+            await self.dispatcher.run_dispatch_cycle()
+            self._push(self.clock.now + self.config.dispatch_interval, "dispatch")
+            self._schedule_timer_wakeup()
+
+        elif kind == "dispatch_timer":
+            # 보류된 작업의 계획 시작 시각에 맞춘 배포 (Dispatcher 루프의 정밀 기상과 동일)
+            self._timer_wakeups.discard(self.clock.now)
+            await self.dispatcher.run_dispatch_cycle()
+            self._schedule_timer_wakeup()
+
+        elif kind == "carbon":
+            for name in self.config.clusters:
+                cluster_info = await self.store.get_cluster_info(name)
+                if cluster_info and name in self.trace.zones:
+                    await self.store.update_cluster_info(cluster_info.model_copy(update={
+                        "carbon_intensity": self.trace.at(name, self._offset()),
+                        "last_updated": self.clock.now
+                    }))
+
+        elif kind == "complete":
+            await self._complete(payload)
+
+    def _schedule_timer_wakeup(self):
+        """Dispatcher에 보류된 작업이 있으면 가장 이른 계획 시작 시각에 배포 이벤트 예약"""
+        wakeup = self.dispatcher.next_wakeup()
+        if wakeup is not None and wakeup > self.clock.now and wakeup not in self._timer_wakeups:
+            self._timer_wakeups.add(wakeup)
+            self._push(wakeup, "dispatch_timer")
+
+    def _on_job_start(self, cluster: str, job_id: str):
+        """fake Spoke에서 pod가 실제로 시작된 시점"""
+        spec = self._specs[job_id]
+        self._started_at[job_id] = (cluster, self.clock.now)
+        self._queue_waits.append(self.clock.now - self._submitted_at[job_id])
+        self._push(self.clock.now + spec.runtime_minutes * 60, "complete", job_id)
+        self._refresh_resources(cluster)
+
+    async def _complete(self, job_id: str):
+        spec = self._specs[job_id]
+        cluster, started = self._started_at.pop(job_id)
+        self.spokes[cluster].finish(job_id)
+        self._refresh_resources(cluster)
+
+        completed_at = self.clock.now
+
+        def mark_completed(aw: AppWrapper):
+            aw.status.phase = "Completed"
+            aw.status.completion_time = completed_at
+
+        await self.store.patch_appwrapper(job_id, mark_completed)
+
+        self._completed += 1
+        self._outstanding -= 1
+
+        deadline = self._submitted_at[job_id] + spec.deadline_minutes * 60
+        if self.clock.now > deadline:
+            self._deadline_misses += 1
+
+        start_offset = started - self.config.start_time
+        ci_seconds = self.trace.integrate(cluster, start_offset, self._offset())
+        self._co2_g += spec.cpu * WATT_PER_CPU / 1000.0 * ci_seconds / 3600.0
+
+    def _refresh_resources(self, cluster: str):
+        """fake Spoke 사용량이 바뀐 클러스터 표시 (이벤트 처리 후 반영)"""
+        self._dirty_clusters.add(cluster)
+
+    async def _flush_resources(self):
+        """fake Spoke 사용량을 ClusterInfo 가용 리소스에 반영"""
+        for cluster in self._dirty_clusters:
+            spoke = self.spokes[cluster]
+            cluster_info = await self.store.get_cluster_info(cluster)
+            if cluster_info:
+                resources = cluster_info.resources.model_copy(update={
+                    "cpu_available": max(0.0, spoke.cpu_total - spoke.cpu_used),
+                    "mem_available_gb": max(0.0, spoke.mem_total_gb - spoke.mem_used_gb)
+                })
+                await self.store.update_cluster_info(
+                    cluster_info.model_copy(update={"resources": resources})
+                )
+        self._dirty_clusters.clear()
+
+    def _report(self, wall_seconds: float) -> SimulationReport:
+        latencies = sorted(self._latencies_ms) or [0.0]
+        p95_index = min(len(latencies) - 1, int(len(latencies) * 0.95))
+        return SimulationReport(
+            simulated_hours=round(self._offset() / 3600, 3),
+            wall_seconds=round(wall_seconds, 3),
+            jobs_submitted=len(self._specs),
+            jobs_completed=self._completed,
+            jobs_per_second=round(self._completed / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+            scheduling_cycles=len(self._latencies_ms),
+            decision_latency_ms_p50=round(statistics.median(latencies), 3),
+            decision_latency_ms_p95=round(latencies[p95_index], 3),
+            mean_queue_wait_seconds=round(statistics.fmean(self._queue_waits), 3) if self._queue_waits else 0.0,
+            deadline_misses=self._deadline_misses,
+            migrations=self.scheduler.migration_count,
+            total_co2_kg=round(self._co2_g / 1000.0, 6)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CASPIAN Hub discrete-event simulator")
+    parser.add_argument("--hours", type=float, default=24.0, help="작업 제출 기간 (시간)")
+    parser.add_argument("--jobs-per-hour", type=float, default=60.0, help="평균 제출률")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--trace", help="재생할 탄소 트레이스 CSV (offset_seconds,zone,carbon_intensity)")
+    parser.add_argument("--save-trace", help="사용한 탄소 트레이스를 CSV로 저장")
+    parser.add_argument("--log-level", default="WARNING", help="Hub 컴포넌트 로그 레벨")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    config = SimulationConfig(hours=args.hours, jobs_per_hour=args.jobs_per_hour, seed=args.seed)
+    trace = CarbonTrace.from_csv(args.trace) if args.trace else None
+    simulator = HubSimulator(config, trace)
+    if args.save_trace:
+        simulator.trace.to_csv(args.save_trace)
+
+    report = asyncio.run(simulator.run())
+    print(json.dumps(report.model_dump(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
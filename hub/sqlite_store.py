@@ -0,0 +1,596 @@
+"""
+SQLite Hub Store
+HubStore와 같은 async 인터페이스를 제공하는 SQLite(WAL 모드) 백엔드
+
+- 모든 쓰기는 단일 writer task로 모아 한 트랜잭션에 일괄 커밋
+- phase/dispatched/gate/cluster 컬럼 인덱스로 pending, running, dispatchable 조회를 SQL로 처리
+- 읽기는 스레드별 연결에서 수행 (WAL 모드이므로 writer와 동시에 진행)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from hub.archive import FINISHED_PHASES
+from hub.models import AppWrapper, ClusterInfo, SchedulingDecision, MigrationRecord
+from hub.records import AppWrapperRecord
+from hub.store import ResourceConflictError, StoreSnapshot, apply_decision, _index_key
+from hub.watch import ChangeFeed, WatchEvent, WatchEventType
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS appwrappers (
+    job_id TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    dispatched INTEGER NOT NULL,
+    gates_open INTEGER NOT NULL,
+    target_cluster TEXT,
+    cluster TEXT,
+    resource_version INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_appwrappers_phase ON appwrappers (phase, dispatched);
+CREATE INDEX IF NOT EXISTS idx_appwrappers_dispatchable ON appwrappers (dispatched, gates_open, target_cluster);
+CREATE INDEX IF NOT EXISTS idx_appwrappers_target ON appwrappers (target_cluster);
+CREATE INDEX IF NOT EXISTS idx_appwrappers_cluster ON appwrappers (cluster);
+CREATE TABLE IF NOT EXISTS clusters (
+    name TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+UPSERT_APPWRAPPER = """
+INSERT INTO appwrappers (job_id, phase, dispatched, gates_open, target_cluster, cluster, resource_version, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (job_id) DO UPDATE SET
+    phase = excluded.phase,
+    dispatched = excluded.dispatched,
+    gates_open = excluded.gates_open,
+    target_cluster = excluded.target_cluster,
+    cluster = excluded.cluster,
+    resource_version = excluded.resource_version,
+    body = excluded.body
+"""
+
+# 쓰기 작업: writer 연결을 받아 실행되는 동기 함수
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+def _decode(body: str) -> AppWrapperRecord:
+    return AppWrapperRecord.from_model(AppWrapper.model_validate_json(body))
+
+
+def _load_appwrappers(rows) -> List[AppWrapperRecord]:
+    return [_decode(body) for (body,) in rows]
+
+
+class SqliteHubStore:
+    """
+    SQLite 기반 Hub Store
+
+    HubStore와 같은 메서드를 제공하므로 Scheduler/Dispatcher/API는
+    설정(HUB_STORE_BACKEND=sqlite)만으로 백엔드를 바꿀 수 있다.
+    조회 결과는 dict store와 같은 읽기 전용 AppWrapperRecord다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        synchronous: str = "NORMAL",
+        max_batch: int = 1000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        SQLite Hub Store 초기화
+
+        Args:
+            path: 데이터베이스 파일 경로
+            synchronous: SQLite synchronous 설정 (OFF, NORMAL, FULL)
+            max_batch: 한 트랜잭션에 묶을 최대 쓰기 수
+            clock: 현재 시각 함수
+        """
+        self.path = path
+        self.synchronous = synchronous
+        self.max_batch = max_batch
+        self._clock = clock
+
+        self._writer_conn = self._connect()
+        self._writer_conn.executescript(SCHEMA)
+        row = self._writer_conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        # writer task만 증가시키는 store 버전
+        self._version = row[0] if row else 0
+
+        # 변경 이벤트: writer 스레드가 모으고 커밋 후 이벤트 루프에서 게시
+        self._feed = ChangeFeed()
+        self._feed.reset(self._version)
+        self._batch_events: List[WatchEvent] = []
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._read_conns_lock = threading.Lock()
+
+        logger.info(f"SQLite Hub Store initialized at {path} (v{self._version})")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        return conn
+
+    # ==================== 쓰기 (단일 writer task) ====================
+
+    async def _submit(self, op: WriteOp) -> Any:
+        """쓰기 작업을 writer task에 넘기고 커밋될 때까지 대기"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._writer_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future))
+        return await future
+
+    async def _writer_loop(self):
+        """대기 중인 쓰기를 모아 한 트랜잭션으로 커밋"""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty() and len(batch) < self.max_batch:
+                batch.append(self._queue.get_nowait())
+
+            try:
+                results, events = await asyncio.to_thread(self._run_batch, [op for op, _ in batch])
+            except Exception as e:
+                logger.error(f"Error committing SQLite batch: {e}", exc_info=True)
+                results, events = [(False, e)] * len(batch), []
+
+            for event in events:
+                self._feed.publish(*event)
+
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _run_batch(self, ops: List[WriteOp]) -> Tuple[List[Tuple[bool, Any]], List[WatchEvent]]:
+        """
+        쓰기 작업을 한 트랜잭션에서 실행 (writer 스레드)
+        작업마다 savepoint를 두어 하나가 실패해도(CAS 충돌 등) 나머지는 커밋된다.
+
+        Returns:
+            (작업별 (성공 여부, 결과 또는 예외), 커밋된 변경 이벤트)
+        """
+        conn = self._writer_conn
+        results: List[Tuple[bool, Any]] = []
+        events = self._batch_events = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op in ops:
+                conn.execute("SAVEPOINT op")
+                mark = len(events)
+                try:
+                    results.append((True, op(conn)))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    del events[mark:]
+                    results.append((False, e))
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (self._version,)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results, events
+
+    def _put(self, conn: sqlite3.Connection, appwrapper: AppWrapperRecord) -> AppWrapperRecord:
+        """새 버전을 부여해 행 저장 (writer 스레드)"""
+        existed = conn.execute(
+            "SELECT 1 FROM appwrappers WHERE job_id = ?", (appwrapper.spec.job_id,)
+        ).fetchone()
+        self._version += 1
+        appwrapper = appwrapper._replace(resource_version=self._version)
+        self._batch_events.append(WatchEvent(
+            self._version,
+            WatchEventType.MODIFIED if existed else WatchEventType.ADDED,
+            appwrapper
+        ))
+        phase, dispatched, gates_open, target, cluster = _index_key(appwrapper)
+        conn.execute(UPSERT_APPWRAPPER, (
+            appwrapper.spec.job_id, phase, dispatched, gates_open, target, cluster,
+            appwrapper.resource_version, appwrapper.to_model().model_dump_json(exclude_defaults=True)
+        ))
+        return appwrapper
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, job_id: str) -> Optional[AppWrapperRecord]:
+        row = conn.execute("SELECT body FROM appwrappers WHERE job_id = ?", (job_id,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    @staticmethod
+    def _check_version(job_id: str, current: Optional[AppWrapperRecord], expected_version: Optional[int]):
+        if expected_version is None:
+            return
+        actual = current.resource_version if current is not None else None
+        if actual != expected_version:
+            raise ResourceConflictError(job_id, expected_version, actual)
+
+    def watch(self, since_version: Optional[int] = None) -> AsyncIterator[WatchEvent]:
+        """
+        AppWrapper 변경 구독 (커밋된 배치 단위로 전달)
+
+        Args:
+            since_version: 이 버전 이후의 변경부터 전달 (None이면 지금 이후)
+        """
+        return self._feed.watch(since_version)
+
+    # ==================== 읽기 (스레드별 연결) ====================
+
+    async def _read(self, query: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._run_read, query)
+
+    def _run_read(self, query: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._read_conns_lock:
+                self._read_conns.append(conn)
+        return query(conn)
+
+    async def _select(self, where: str = "", params: Tuple = ()) -> List[AppWrapperRecord]:
+        sql = f"SELECT body FROM appwrappers {where} ORDER BY rowid"
+        return await self._read(lambda conn: _load_appwrappers(conn.execute(sql, params)))
+
+    # ==================== AppWrapper 관리 ====================
+
+    async def add_appwrapper(self, appwrapper: AppWrapper) -> str:
+        """
+        AppWrapper 추가
+
+        Args:
+            appwrapper: AppWrapper 객체
+
+        Returns:
+            Job ID
+        """
+        await self._submit(lambda conn: self._put(conn, AppWrapperRecord.from_model(appwrapper)))
+        job_id = appwrapper.spec.job_id
+        logger.info(f"Added AppWrapper {job_id}: {appwrapper.spec.cpu} CPU, {appwrapper.spec.mem_gb}GB RAM")
+        return job_id
+
+    async def get_appwrapper(self, job_id: str) -> Optional[AppWrapperRecord]:
+        """특정 AppWrapper 조회"""
+        return await self._read(lambda conn: self._get(conn, job_id))
+
+    async def get_all_appwrappers(self) -> List[AppWrapperRecord]:
+        """모든 AppWrapper 조회"""
+        return await self._select()
+
+    async def get_pending_appwrappers(self) -> List[AppWrapperRecord]:
+        """배포 대기 중인 AppWrapper 조회 (Pending이고 아직 배포되지 않은 것)"""
+        return await self._select("WHERE phase = 'Pending' AND dispatched = 0")
+
+    async def get_running_appwrappers(self) -> List[AppWrapperRecord]:
+        """실행 중인 AppWrapper 조회"""
+        return await self._select("WHERE phase = 'Running'")
+
+    async def get_dispatchable_appwrappers(self) -> List[AppWrapperRecord]:
+        """배포 가능한 AppWrapper 조회 (targetCluster 있음, gate open, 미배포)"""
+        return await self._select(
+            "WHERE dispatched = 0 AND gates_open = 1 AND target_cluster IS NOT NULL"
+        )
+
+    async def get_finished_appwrappers(self) -> List[AppWrapperRecord]:
+        """완료/실패한 AppWrapper 조회 (보존 기간 정리용)"""
+        return await self._select(
+            f"WHERE phase IN ({', '.join('?' * len(FINISHED_PHASES))})", FINISHED_PHASES
+        )
+
+    async def get_appwrappers_by_target(self, cluster_name: str) -> List[AppWrapperRecord]:
+        """특정 클러스터를 targetCluster로 가진 AppWrapper 조회"""
+        return await self._select("WHERE target_cluster = ?", (cluster_name,))
+
+    async def get_cluster_counts(self) -> Dict[str, int]:
+        """실제 배포된 클러스터별 AppWrapper 수"""
+        return await self._read(lambda conn: dict(conn.execute(
+            "SELECT cluster, COUNT(*) FROM appwrappers WHERE cluster IS NOT NULL GROUP BY cluster"
+        )))
+
+    async def update_appwrapper(
+        self,
+        job_id: str,
+        appwrapper: AppWrapper,
+        expected_version: Optional[int] = None
+    ) -> AppWrapperRecord:
+        """
+        AppWrapper 교체
+
+        Raises:
+            ResourceConflictError: expected_version이 현재 버전과 다를 때
+        """
+        record = AppWrapperRecord.from_model(appwrapper)
+
+        def op(conn: sqlite3.Connection) -> AppWrapperRecord:
+            if expected_version is not None:
+                self._check_version(job_id, self._get(conn, job_id), expected_version)
+            return self._put(conn, record)
+
+        committed = await self._submit(op)
+        logger.debug(f"Updated AppWrapper {job_id} (v{committed.resource_version})")
+        return committed
+
+    async def patch_appwrapper(
+        self,
+        job_id: str,
+        mutate: Callable[[AppWrapper], Optional[bool]],
+        expected_version: Optional[int] = None
+    ) -> Optional[AppWrapperRecord]:
+        """
+        AppWrapper 부분 수정
+        writer 트랜잭션 안에서 최신 행을 pydantic 모델로 읽어 mutate를 적용한다.
+        mutate가 False를 반환하면 쓰지 않고 None을 반환한다.
+
+        Raises:
+            ResourceConflictError: expected_version이 현재 버전과 다를 때
+        """
+        def op(conn: sqlite3.Connection) -> Optional[AppWrapperRecord]:
+            current = self._get(conn, job_id)
+            if current is None:
+                return None
+            self._check_version(job_id, current, expected_version)
+            draft = current.to_model()
+            if mutate(draft) is False:
+                return None
+            return self._put(conn, AppWrapperRecord.from_model(draft))
+
+        committed = await self._submit(op)
+        if committed is not None:
+            logger.debug(f"Patched AppWrapper {job_id} (v{committed.resource_version})")
+        return committed
+
+    async def patch_appwrappers(
+        self,
+        patches: List[Tuple[str, Callable[[AppWrapper], Optional[bool]]]]
+    ) -> List[Optional[AppWrapperRecord]]:
+        """
+        여러 AppWrapper 부분 수정을 한 트랜잭션으로 커밋 (mutate가 False를 반환한 항목은 쓰지 않음)
+
+        Returns:
+            patches 순서대로 커밋된 레코드 (없거나 커밋하지 않은 항목은 None)
+        """
+        def op(conn: sqlite3.Connection) -> List[Optional[AppWrapperRecord]]:
+            results: List[Optional[AppWrapperRecord]] = []
+            for job_id, mutate in patches:
+                current = self._get(conn, job_id)
+                if current is None:
+                    results.append(None)
+                    continue
+                draft = current.to_model()
+                if mutate(draft) is False:
+                    results.append(None)
+                    continue
+                results.append(self._put(conn, AppWrapperRecord.from_model(draft)))
+            return results
+
+        return await self._submit(op)
+
+    async def snapshot(self) -> StoreSnapshot:
+        """
+        현재 시점의 읽기 전용 스냅샷
+        읽기 스레드의 한 트랜잭션에서 버전과 전체 행을 함께 읽는다 (이벤트 루프를 막지 않음).
+        """
+        def query(conn: sqlite3.Connection) -> StoreSnapshot:
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+                appwrappers = {
+                    aw.spec.job_id: aw
+                    for aw in _load_appwrappers(conn.execute("SELECT body FROM appwrappers ORDER BY rowid"))
+                }
+                clusters = {
+                    ci.name: ci
+                    for ci in (ClusterInfo.model_validate_json(body) for (body,) in conn.execute("SELECT body FROM clusters"))
+                }
+            finally:
+                conn.execute("COMMIT")
+            return StoreSnapshot(row[0] if row else 0, appwrappers, clusters)
+
+        return await self._read(query)
+
+    async def apply_decisions(
+        self,
+        decisions: List[SchedulingDecision]
+    ) -> List[MigrationRecord]:
+        """
+        스케줄링 결정 일괄 적용 (한 트랜잭션)
+
+        Args:
+            decisions: 스케줄링 결정 리스트
+
+        Returns:
+            감지된 마이그레이션 리스트
+        """
+        now = str(self._clock())
+
+        def op(conn: sqlite3.Connection) -> Tuple[List[MigrationRecord], int]:
+            migrations: List[MigrationRecord] = []
+            missing = 0
+            for decision in decisions:
+                appwrapper = self._get(conn, decision.job_id)
+                if appwrapper is None:
+                    missing += 1
+                    continue
+                updated, migration = apply_decision(appwrapper, decision, now)
+                if migration is not None:
+                    migrations.append(migration)
+                self._put(conn, updated)
+            return migrations, missing
+
+        migrations, missing = await self._submit(op)
+
+        if missing:
+            logger.warning(f"{missing} AppWrappers not found while applying decisions")
+
+        logger.info(
+            f"Applied {len(decisions) - missing} scheduling decisions "
+            f"({len(migrations)} migrations)"
+        )
+        return migrations
+
+    async def remove_appwrapper(self, job_id: str) -> bool:
+        """AppWrapper 삭제"""
+        def op(conn: sqlite3.Connection) -> bool:
+            current = self._get(conn, job_id)
+            if current is None:
+                return False
+            conn.execute("DELETE FROM appwrappers WHERE job_id = ?", (job_id,))
+            self._version += 1
+            self._batch_events.append(WatchEvent(self._version, WatchEventType.DELETED, current))
+            return True
+
+        removed = await self._submit(op)
+        if removed:
+            logger.info(f"Removed AppWrapper {job_id}")
+        return removed
+
+    async def remove_appwrappers_if_unchanged(self, appwrappers: List[AppWrapperRecord]) -> int:
+        """
+        읽은 뒤 변경되지 않은 AppWrapper만 삭제 (아카이브로 옮긴 작업 정리용)
+
+        Args:
+            appwrappers: 삭제할 레코드 (resource_version이 현재와 같을 때만 삭제)
+
+        Returns:
+            삭제된 수
+        """
+        def op(conn: sqlite3.Connection) -> int:
+            removed = 0
+            for appwrapper in appwrappers:
+                job_id = appwrapper.spec.job_id
+                deleted = conn.execute(
+                    "DELETE FROM appwrappers WHERE job_id = ? AND resource_version = ?",
+                    (job_id, appwrapper.resource_version)
+                ).rowcount
+                if deleted:
+                    self._version += 1
+                    self._batch_events.append(WatchEvent(self._version, WatchEventType.DELETED, appwrapper))
+                    removed += 1
+            return removed
+
+        return await self._submit(op)
+
+    # ==================== ClusterInfo 관리 ====================
+
+    async def update_cluster_info(self, cluster_info: ClusterInfo):
+        """
+        ClusterInfo 업데이트
+
+        Args:
+            cluster_info: 클러스터 정보
+        """
+        def op(conn: sqlite3.Connection):
+            self._version += 1
+            conn.execute(
+                "INSERT INTO clusters (name, status, body) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET status = excluded.status, body = excluded.body",
+                (cluster_info.name, cluster_info.status.value, cluster_info.model_dump_json())
+            )
+
+        await self._submit(op)
+        logger.info(
+            f"Updated ClusterInfo {cluster_info.name}: "
+            f"CI={cluster_info.carbon_intensity} gCO2/kWh, "
+            f"CPU={cluster_info.resources.cpu_available}/{cluster_info.resources.cpu_total}"
+        )
+
+    async def remove_cluster_info(self, cluster_name: str) -> bool:
+        """ClusterInfo 삭제"""
+        def op(conn: sqlite3.Connection) -> bool:
+            if conn.execute("DELETE FROM clusters WHERE name = ?", (cluster_name,)).rowcount == 0:
+                return False
+            self._version += 1
+            return True
+
+        removed = await self._submit(op)
+        if removed:
+            logger.info(f"Removed ClusterInfo {cluster_name}")
+        return removed
+
+    async def _select_clusters(self, where: str = "") -> List[ClusterInfo]:
+        sql = f"SELECT body FROM clusters {where} ORDER BY rowid"
+        return await self._read(lambda conn: [
+            ClusterInfo.model_validate_json(body) for (body,) in conn.execute(sql)
+        ])
+
+    async def get_cluster_info(self, cluster_name: str) -> Optional[ClusterInfo]:
+        """특정 클러스터 정보 조회"""
+        row = await self._read(lambda conn: conn.execute(
+            "SELECT body FROM clusters WHERE name = ?", (cluster_name,)
+        ).fetchone())
+        return ClusterInfo.model_validate_json(row[0]) if row else None
+
+    async def get_all_cluster_info(self) -> List[ClusterInfo]:
+        """모든 클러스터 정보 조회"""
+        return await self._select_clusters()
+
+    async def get_ready_clusters(self) -> List[ClusterInfo]:
+        """준비 상태인 클러스터만 조회"""
+        return await self._select_clusters("WHERE status = 'ready'")
+
+    # ==================== 통계 ====================
+
+    async def get_stats(self) -> Dict:
+        """Hub Store 통계 (인덱스 집계)"""
+        def query(conn: sqlite3.Connection) -> Dict:
+            phases = dict(conn.execute("SELECT phase, COUNT(*) FROM appwrappers GROUP BY phase"))
+            total_clusters, ready_clusters = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status = 'ready'), 0) FROM clusters"
+            ).fetchone()
+            return {
+                "total_appwrappers": sum(phases.values()),
+                "pending": phases.get("Pending", 0),
+                "running": phases.get("Running", 0),
+                "completed": phases.get("Completed", 0),
+                "failed": phases.get("Failed", 0),
+                "total_clusters": total_clusters,
+                "ready_clusters": ready_clusters
+            }
+
+        return await self._read(query)
+
+    # ==================== 종료 ====================
+
+    async def close(self):
+        """대기 중인 쓰기를 마치고 연결 닫기"""
+        if self._writer is not None:
+            # 큐는 FIFO이므로 빈 쓰기가 커밋되면 앞선 쓰기도 모두 커밋된 상태
+            await self._submit(lambda conn: None)
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+        with self._read_conns_lock:
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns.clear()
+        self._writer_conn.close()
+        logger.info(f"SQLite Hub Store closed ({self.path})")
@@ -4,14 +4,211 @@ AppWrapper 및 ClusterInfo 저장 관리
 """
 
 import asyncio
+import gc
+import itertools
 import logging
-from typing import Dict, List, Optional
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
-from hub.models import AppWrapper, ClusterInfo, AppWrapperStatus
+from hub.models import (
+    AppWrapper, ClusterInfo, AppWrapperStatus,
+    SchedulingDecision, MigrationRecord, GateStatus
+)
+from hub.archive import FINISHED_PHASES
+from hub.records import AppWrapperRecord, gates_of, intern_value
+from hub.wal import WriteAheadLog, WalRecord
+from hub.watch import ChangeFeed, WatchEvent, WatchEventType
 
 logger = logging.getLogger(__name__)
 
 
+class ResourceConflictError(Exception):
+    """compare-and-swap 실패: 읽은 뒤 다른 쓰기가 먼저 커밋됨"""
+
+    def __init__(self, job_id: str, expected_version: int, actual_version: Optional[int]):
+        self.job_id = job_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        super().__init__(
+            f"AppWrapper {job_id} changed: expected version {expected_version}, "
+            f"found {actual_version}"
+        )
+
+
+class StoreSnapshot:
+    """
+    특정 store 버전의 읽기 전용 스냅샷
+    저장된 객체는 커밋 후 변경되지 않으므로 참조만 복사해도 일관된 시점을 본다.
+    """
+
+    __slots__ = ("version", "appwrappers", "cluster_info")
+
+    def __init__(self, version: int, appwrappers: Dict[str, AppWrapperRecord], cluster_info: Dict[str, ClusterInfo]):
+        self.version = version
+        self.appwrappers: Mapping[str, AppWrapperRecord] = MappingProxyType(appwrappers)
+        self.cluster_info: Mapping[str, ClusterInfo] = MappingProxyType(cluster_info)
+
+
+# 인덱스 키: (phase, dispatched, 모든 gate open 여부, target_cluster, 실제 배포 cluster)
+IndexKey = Tuple[str, bool, bool, Optional[str], Optional[str]]
+
+
+def _index_key(appwrapper: AppWrapperRecord) -> IndexKey:
+    """AppWrapper의 현재 인덱스 키 계산"""
+    return (
+        appwrapper.status.phase,
+        appwrapper.status.dispatched,
+        all(gate.status == GateStatus.OPEN for gate in appwrapper.spec.dispatching_gates),
+        appwrapper.spec.target_cluster,
+        appwrapper.status.cluster
+    )
+
+
+def apply_decision(
+    appwrapper: AppWrapperRecord,
+    decision: SchedulingDecision,
+    now: str
+) -> Tuple[AppWrapperRecord, Optional[MigrationRecord]]:
+    """
+    스케줄링 결정 하나를 적용한 새 레코드 생성 (원본은 변경하지 않음)
+
+    - targetCluster 설정 및 dispatching gate 열기
+    - 스케줄링 메타데이터 기록
+    - 클러스터가 바뀐 경우 마이그레이션으로 기록
+
+    Args:
+        appwrapper: 현재 레코드
+        decision: 스케줄링 결정
+        now: 스케줄링 시각 (메타데이터 값)
+
+    Returns:
+        (새 레코드, 마이그레이션 또는 None)
+    """
+    # 이전 클러스터 할당 확인 (마이그레이션 감지)
+    previous_cluster = appwrapper.spec.target_cluster
+    new_cluster = decision.target_cluster
+    migration = None
+
+    # 메타데이터 업데이트
+    metadata = dict(appwrapper.metadata)
+    metadata["scheduled_at"] = now
+    metadata["estimated_co2_g"] = str(decision.estimated_co2_g)
+
+    if previous_cluster and previous_cluster != new_cluster:
+        migration = MigrationRecord(
+            job_id=decision.job_id,
+            from_cluster=previous_cluster,
+            to_cluster=new_cluster,
+            data_gb=appwrapper.spec.data_gb
+        )
+        metadata["migrated_from"] = previous_cluster
+        metadata["migration_time"] = now
+
+    # targetCluster 설정 및 dispatching gate 열기 (sustainability gate)
+    # 변경된 부분만 복사하고 나머지(status 등)는 이전 버전과 공유
+    gates = gates_of(
+        gate._replace(status=GateStatus.OPEN, reason=decision.reason)
+        for gate in appwrapper.spec.dispatching_gates
+    )
+    spec = appwrapper.spec._replace(
+        target_cluster=intern_value(new_cluster), dispatching_gates=gates
+    )
+    return appwrapper._replace(spec=spec, metadata=metadata), migration
+
+
+class _Shard:
+    """
+    job_id 해시 파티션 하나
+    AppWrapper 레코드, 보조 인덱스, 쓰기 락을 파티션마다 따로 가진다.
+
+    인덱스 버킷은 job_id -> 삽입 순번(store 전역)의 ordered dict이므로
+    여러 shard의 버킷을 순번으로 병합하면 단일 store와 같은 순서가 된다.
+    """
+
+    __slots__ = (
+        "lock", "appwrappers", "created", "index_keys",
+        "by_phase", "pending", "dispatchable", "by_target", "by_cluster"
+    )
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.appwrappers: Dict[str, AppWrapperRecord] = {}
+        # job_id -> 최초 추가 순번 (전체 목록 병합 순서)
+        self.created: Dict[str, int] = {}
+        self.index_keys: Dict[str, IndexKey] = {}
+        self.by_phase: Dict[str, Dict[str, int]] = {}
+        self.pending: Dict[str, int] = {}
+        self.dispatchable: Dict[str, int] = {}
+        self.by_target: Dict[str, Dict[str, int]] = {}
+        self.by_cluster: Dict[str, Dict[str, int]] = {}
+
+    def put(self, job_id: str, appwrapper: AppWrapperRecord, seq: int) -> Optional[AppWrapperRecord]:
+        """레코드 교체 및 인덱스 갱신, 이전 레코드 반환 (락 보유 상태에서 호출)"""
+        previous = self.appwrappers.get(job_id)
+        self.appwrappers[job_id] = appwrapper
+        if previous is None:
+            self.created[job_id] = seq
+        self.reindex(job_id, appwrapper, seq)
+        return previous
+
+    def pop(self, job_id: str, seq: int) -> AppWrapperRecord:
+        """레코드 삭제 및 인덱스 갱신 (락 보유 상태에서 호출)"""
+        removed = self.appwrappers.pop(job_id)
+        del self.created[job_id]
+        self.reindex(job_id, None, seq)
+        return removed
+
+    def reindex(self, job_id: str, appwrapper: Optional[AppWrapperRecord], seq: int):
+        """
+        AppWrapper의 보조 인덱스 갱신 (락 보유 상태에서 호출)
+        마지막으로 인덱싱한 키를 기억해 두었다가 바뀐 버킷만 옮긴다.
+
+        Args:
+            job_id: Job ID
+            appwrapper: 현재 레코드 (삭제 시 None)
+            seq: 버킷에 새로 넣을 때 사용할 삽입 순번
+        """
+        old_key = self.index_keys.get(job_id)
+        new_key = _index_key(appwrapper) if appwrapper is not None else None
+        if old_key == new_key:
+            return
+
+        if old_key is not None:
+            phase, dispatched, gates_open, target, cluster = old_key
+            _discard(self.by_phase, phase, job_id)
+            self.pending.pop(job_id, None)
+            self.dispatchable.pop(job_id, None)
+            if target:
+                _discard(self.by_target, target, job_id)
+            if cluster:
+                _discard(self.by_cluster, cluster, job_id)
+            del self.index_keys[job_id]
+
+        if new_key is not None:
+            phase, dispatched, gates_open, target, cluster = new_key
+            self.index_keys[job_id] = new_key
+            self.by_phase.setdefault(phase, {})[job_id] = seq
+            if phase == "Pending" and not dispatched:
+                self.pending[job_id] = seq
+            if target and gates_open and not dispatched:
+                self.dispatchable[job_id] = seq
+            if target:
+                self.by_target.setdefault(target, {})[job_id] = seq
+            if cluster:
+                self.by_cluster.setdefault(cluster, {})[job_id] = seq
+
+
+def _discard(index: Dict[str, Dict[str, int]], key: str, job_id: str):
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(job_id, None)
+        if not bucket:
+            del index[key]
+
+
 class HubStore:
     """
     Hub Cluster의 중앙 저장소
@@ -19,20 +216,112 @@ class HubStore:
     - AppWrapper 관리
     - ClusterInfo 관리
     - 스케줄링 히스토리
+
+    phase, 배포 대기/가능 여부, 클러스터별 보조 인덱스를 모든 쓰기 시점에 갱신하여
+    자주 쓰는 조회는 결과 크기에 비례하고 통계는 O(1)이다.
+
+    AppWrapper는 job_id 해시로 shard에 나뉘어 저장되며 shard마다 락과 인덱스를 가진다.
+    쓰기는 해당 shard의 락만 잡고, 일괄 적용(apply_decisions 등)은 shard 단위로 커밋하면서
+    shard 사이에 이벤트 루프를 양보하므로 큰 배치가 다른 shard의 제출을 막지 않는다.
+    store 버전은 shard와 무관하게 전역으로 증가하며, 조회는 shard 결과를 삽입 순서로 병합한다.
+
+    Copy-on-write: AppWrapper는 읽기 전용 AppWrapperRecord(hub/records.py)로 저장한다.
+    쓰기는 새 레코드를 만들어 resource_version을 올린 뒤 참조를 교체하므로
+    읽기는 락 없이 일관된 객체를 받는다. 변경은 patch_appwrapper 또는
+    expected_version을 지정한 update_appwrapper로 하고, 입력은 pydantic AppWrapper다.
+
+    open_wal로 WAL을 연결하면 모든 쓰기가 로그에 기록되고,
+    쓰기 메서드는 fsync 정책에 따라 영속화된 뒤 반환한다.
+
+    watch()로 AppWrapper 변경을 버전 순서대로 구독할 수 있다.
     """
 
-    def __init__(self):
-        """Hub Store 초기화"""
-        self._appwrappers: Dict[str, AppWrapper] = {}
+    def __init__(self, clock: Callable[[], float] = time.time, shards: int = 8):
+        """
+        Hub Store 초기화
+
+        Args:
+            clock: 현재 시각 함수 (기본값: time.time, 시뮬레이터는 가상 시계 사용)
+            shards: AppWrapper shard 수 (기본값: 8)
+        """
+        if shards < 1:
+            raise ValueError(f"Shard count must be positive: {shards}")
+
+        self._clock = clock
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
         self._cluster_info: Dict[str, ClusterInfo] = {}
-        self._lock = asyncio.Lock()
-        logger.info("Hub Store initialized")
+        # ClusterInfo 쓰기 직렬화 (AppWrapper 쓰기는 shard 락 사용, 읽기는 락을 잡지 않음)
+        self._cluster_lock = asyncio.Lock()
+        # 커밋마다 증가하는 store 버전 (AppWrapper.resource_version의 출처)
+        self._version = 0
+        # 인덱스 버킷 삽입 순번 (shard 간 병합 순서)
+        self._seq = itertools.count()
+        self._ready_clusters: Dict[str, None] = {}
+
+        # 변경 이벤트 구독 (watch)
+        self._feed = ChangeFeed()
+
+        # 영속화 (open_wal 호출 전에는 메모리 전용)
+        self._wal: Optional[WriteAheadLog] = None
+        self._checkpoint_task: Optional[asyncio.Task] = None
+
+        logger.info(f"Hub Store initialized ({shards} shards)")
+
+    # ==================== Shard ====================
+
+    def _shard_of(self, job_id: str) -> _Shard:
+        """job_id가 속한 shard"""
+        return self._shards[hash(job_id) % len(self._shards)]
+
+    def _group_by_shard(self, items, job_id_of) -> Dict[int, list]:
+        """항목을 shard 번호별로 묶음 (shard 안에서는 입력 순서 유지)"""
+        groups: Dict[int, list] = {}
+        shard_count = len(self._shards)
+        for item in items:
+            groups.setdefault(hash(job_id_of(item)) % shard_count, []).append(item)
+        return groups
+
+    @asynccontextmanager
+    async def _all_locks(self):
+        """모든 shard 락과 ClusterInfo 락 획득 (항상 같은 순서로 잡아 교착 방지)"""
+        async with AsyncExitStack() as stack:
+            for shard in self._shards:
+                await stack.enter_async_context(shard.lock)
+            await stack.enter_async_context(self._cluster_lock)
+            yield
+
+    @asynccontextmanager
+    async def _shard_locks(self, numbers):
+        """지정한 shard 락을 번호 순으로 획득 (_all_locks와 같은 순서라 교착 없음)"""
+        async with AsyncExitStack() as stack:
+            for number in sorted(numbers):
+                await stack.enter_async_context(self._shards[number].lock)
+            yield
+
+    def _merge(self, buckets: Callable[[_Shard], Mapping[str, int]]) -> List[AppWrapperRecord]:
+        """
+        shard별 인덱스 버킷을 삽입 순번으로 병합해 레코드 리스트로 변환
+
+        Args:
+            buckets: shard에서 job_id -> 순번 버킷을 고르는 함수
+        """
+        parts = [(shard, buckets(shard)) for shard in self._shards]
+        parts = [(shard, bucket) for shard, bucket in parts if bucket]
+        if len(parts) == 1:
+            shard, bucket = parts[0]
+            return [shard.appwrappers[job_id] for job_id in bucket]
+        # 각 버킷은 이미 순번 순서이므로 Timsort가 run을 병합하는 데 가깝게 동작
+        merged = sorted(
+            (seq, shard.appwrappers[job_id]) for shard, bucket in parts for job_id, seq in bucket.items()
+        )
+        return [appwrapper for _, appwrapper in merged]
 
     # ==================== AppWrapper 관리 ====================
 
     async def add_appwrapper(self, appwrapper: AppWrapper) -> str:
         """
         AppWrapper 추가
+        compact 레코드로 변환해 저장하므로 전달한 객체는 참조하지 않는다.
 
         Args:
             appwrapper: AppWrapper 객체
@@ -40,68 +329,309 @@ class HubStore:
         Returns:
             Job ID
         """
-        async with self._lock:
-            job_id = appwrapper.spec.job_id
-            self._appwrappers[job_id] = appwrapper
-            logger.info(f"Added AppWrapper {job_id}: {appwrapper.spec.cpu} CPU, {appwrapper.spec.mem_gb}GB RAM")
-            return job_id
+        job_id = appwrapper.spec.job_id
+        record = AppWrapperRecord.from_model(appwrapper)
+        shard = self._shard_of(job_id)
+        async with shard.lock:
+            self._commit(shard, job_id, record)
+        await self._persist()
+        logger.info(f"Added AppWrapper {job_id}: {appwrapper.spec.cpu} CPU, {appwrapper.spec.mem_gb}GB RAM")
+        return job_id
+
+    # 읽기는 락을 잡지 않는다: 동기 구간은 이벤트 루프에서 원자적이고
+    # 커밋된 객체는 변경되지 않으므로 쓰기 중에도 일관된 버전을 본다.
 
-    async def get_appwrapper(self, job_id: str) -> Optional[AppWrapper]:
+    async def get_appwrapper(self, job_id: str) -> Optional[AppWrapperRecord]:
         """특정 AppWrapper 조회"""
-        async with self._lock:
-            return self._appwrappers.get(job_id)
+        return self._shard_of(job_id).appwrappers.get(job_id)
 
-    async def get_all_appwrappers(self) -> List[AppWrapper]:
-        """모든 AppWrapper 조회"""
-        async with self._lock:
-            return list(self._appwrappers.values())
+    async def get_all_appwrappers(self) -> List[AppWrapperRecord]:
+        """모든 AppWrapper 조회 (추가 순서)"""
+        return self._merge(lambda shard: shard.created)
 
-    async def get_pending_appwrappers(self) -> List[AppWrapper]:
+    async def get_pending_appwrappers(self) -> List[AppWrapperRecord]:
         """
         배포 대기 중인 AppWrapper 조회
-        target_cluster가 없거나 dispatching gate가 닫혀있는 것들
-        """
-        async with self._lock:
-            pending = []
-            for aw in self._appwrappers.values():
-                # target_cluster가 없으면 pending
-                if not aw.spec.target_cluster:
-                    pending.append(aw)
+        아직 배포되지 않은 Pending 상태의 것들
+        (gate가 열렸지만 배포 전인 것도 포함하여 매 사이클 재계획)
+        """
+        return self._merge(lambda shard: shard.pending)
+
+    async def get_running_appwrappers(self) -> List[AppWrapperRecord]:
+        """
+        실행 중인 AppWrapper 조회
+        마이그레이션 대상이 될 수 있는 Running 상태의 워크로드
+        """
+        return self._merge(lambda shard: shard.by_phase.get("Running"))
+
+    async def get_dispatchable_appwrappers(self) -> List[AppWrapperRecord]:
+        """
+        배포 가능한 AppWrapper 조회
+        targetCluster가 있고, 모든 gate가 열려 있으며, 아직 배포되지 않은 것들
+        """
+        return self._merge(lambda shard: shard.dispatchable)
+
+    async def get_finished_appwrappers(self) -> List[AppWrapperRecord]:
+        """완료/실패한 AppWrapper 조회 (보존 기간 정리용, phase 진입 순서)"""
+        return [
+            appwrapper
+            for phase in FINISHED_PHASES
+            for appwrapper in self._merge(lambda shard: shard.by_phase.get(phase))
+        ]
+
+    async def get_appwrappers_by_target(self, cluster_name: str) -> List[AppWrapperRecord]:
+        """특정 클러스터를 targetCluster로 가진 AppWrapper 조회"""
+        return self._merge(lambda shard: shard.by_target.get(cluster_name))
+
+    async def get_cluster_counts(self) -> Dict[str, int]:
+        """실제 배포된 클러스터별 AppWrapper 수"""
+        counts: Dict[str, int] = {}
+        for shard in self._shards:
+            for cluster, bucket in shard.by_cluster.items():
+                counts[cluster] = counts.get(cluster, 0) + len(bucket)
+        return counts
+
+    async def update_appwrapper(
+        self,
+        job_id: str,
+        appwrapper: AppWrapper,
+        expected_version: Optional[int] = None
+    ) -> AppWrapperRecord:
+        """
+        AppWrapper 교체
+
+        Args:
+            job_id: Job ID
+            appwrapper: 새 AppWrapper
+            expected_version: 지정 시 현재 resource_version과 같을 때만 커밋 (compare-and-swap)
+
+        Returns:
+            커밋된 레코드
+
+        Raises:
+            ResourceConflictError: expected_version이 현재 버전과 다를 때
+        """
+        record = AppWrapperRecord.from_model(appwrapper)
+        shard = self._shard_of(job_id)
+        async with shard.lock:
+            self._check_version(shard, job_id, expected_version)
+            committed = self._commit(shard, job_id, record)
+        await self._persist()
+        logger.debug(f"Updated AppWrapper {job_id} (v{committed.resource_version})")
+        return committed
+
+    async def patch_appwrapper(
+        self,
+        job_id: str,
+        mutate: Callable[[AppWrapper], Optional[bool]],
+        expected_version: Optional[int] = None
+    ) -> Optional[AppWrapperRecord]:
+        """
+        AppWrapper 부분 수정 (copy-on-write)
+        락 안에서 최신 버전을 pydantic 모델로 변환해 mutate를 적용하므로 동시 쓰기가 유실되지 않는다.
+
+        Args:
+            job_id: Job ID
+            mutate: pydantic AppWrapper 복사본을 수정하는 함수 (False를 반환하면 바꿀 것이 없으므로 커밋하지 않음)
+            expected_version: 지정 시 현재 resource_version과 같을 때만 커밋
+
+        Returns:
+            커밋된 레코드 (없거나 커밋하지 않았으면 None)
+
+        Raises:
+            ResourceConflictError: expected_version이 현재 버전과 다를 때
+        """
+        shard = self._shard_of(job_id)
+        async with shard.lock:
+            current = shard.appwrappers.get(job_id)
+            if current is None:
+                return None
+            self._check_version(shard, job_id, expected_version)
+
+            draft = current.to_model()
+            if mutate(draft) is False:
+                return None
+            committed = self._commit(shard, job_id, AppWrapperRecord.from_model(draft))
+        await self._persist()
+        logger.debug(f"Patched AppWrapper {job_id} (v{committed.resource_version})")
+        return committed
+
+    async def patch_appwrappers(
+        self,
+        patches: List[Tuple[str, Callable[[AppWrapper], Optional[bool]]]]
+    ) -> List[Optional[AppWrapperRecord]]:
+        """
+        여러 AppWrapper 부분 수정을 한 번에 커밋 (배포 결과 일괄 반영 등)
+        관련 shard 락을 모두 잡은 채 양보 없이 커밋하므로 일부만 반영된 상태는 보이지 않는다.
+        mutate가 예외를 던지면 아무것도 커밋하지 않는다 (SqliteHubStore와 동일).
+        영속화는 한 번의 group commit으로 묶는다.
+
+        Args:
+            patches: (job_id, mutate) 리스트 (mutate가 False를 반환하면 그 항목은 커밋하지 않음)
+
+        Returns:
+            patches 순서대로 커밋된 레코드 (없거나 커밋하지 않은 항목은 None)
+        """
+        results: List[Optional[AppWrapperRecord]] = [None] * len(patches)
+        async with self._shard_locks(self._group_by_shard(patches, lambda patch: patch[0])):
+            # 모든 mutate를 먼저 적용한 뒤 입력 순서로 커밋 (같은 job_id는 앞의 수정 위에 적용)
+            staged: Dict[str, AppWrapperRecord] = {}
+            drafts = []
+            for position, (job_id, mutate) in enumerate(patches):
+                shard = self._shard_of(job_id)
+                current = staged.get(job_id) or shard.appwrappers.get(job_id)
+                if current is None:
+                    continue
+                draft = current.to_model()
+                if mutate(draft) is False:
                     continue
+                staged[job_id] = AppWrapperRecord.from_model(draft)
+                drafts.append((position, shard, job_id, staged[job_id]))
+            for position, shard, job_id, record in drafts:
+                results[position] = self._commit(shard, job_id, record)
+        if drafts:
+            await self._persist()
+        return results
 
-                # dispatching gate가 모두 열려있지 않으면 pending
-                all_open = all(gate.status == "open" for gate in aw.spec.dispatching_gates)
-                if not all_open and aw.status.phase == "Pending":
-                    pending.append(aw)
+    @staticmethod
+    def _check_version(shard: _Shard, job_id: str, expected_version: Optional[int]):
+        """compare-and-swap 버전 확인 (shard 락 보유 상태에서 호출)"""
+        if expected_version is None:
+            return
+        current = shard.appwrappers.get(job_id)
+        actual = current.resource_version if current is not None else None
+        if actual != expected_version:
+            raise ResourceConflictError(job_id, expected_version, actual)
 
-            return pending
+    def _commit(self, shard: _Shard, job_id: str, appwrapper: AppWrapperRecord) -> AppWrapperRecord:
+        """새 버전을 부여해 참조 교체 및 인덱스 갱신 (shard 락 보유 상태에서 호출)"""
+        self._version += 1
+        appwrapper = appwrapper._replace(resource_version=self._version)
+        previous = shard.put(job_id, appwrapper, next(self._seq))
+        self._feed.publish(
+            self._version,
+            WatchEventType.ADDED if previous is None else WatchEventType.MODIFIED,
+            appwrapper
+        )
+        if self._wal is not None:
+            self._log(WalRecord(op="put", v=self._version, aw=appwrapper.to_model()))
+        return appwrapper
 
-    async def get_running_appwrappers(self) -> List[AppWrapper]:
+    async def snapshot(self) -> StoreSnapshot:
         """
-        실행 중인 AppWrapper 조회
-        마이그레이션 대상이 될 수 있는 Running 상태의 워크로드
+        현재 시점의 읽기 전용 스냅샷 (락 없이 즉시 반환, SqliteHubStore와 같은 async 인터페이스)
+        await 없이 모든 shard를 병합하므로 shard 사이에서도 같은 버전을 본다.
+
+        Returns:
+            store 버전과 AppWrapper/ClusterInfo 매핑
+        """
+        appwrappers = {appwrapper.spec.job_id: appwrapper for appwrapper in self._merge(lambda shard: shard.created)}
+        return StoreSnapshot(self._version, appwrappers, dict(self._cluster_info))
+
+    def watch(self, since_version: Optional[int] = None) -> AsyncIterator[WatchEvent]:
+        """
+        AppWrapper 변경 구독
+
+        전체 목록이 필요하면 await snapshot()을 읽은 뒤 snapshot.version부터 구독하면
+        누락 없이 이어진다.
+
+        Args:
+            since_version: 이 버전 이후의 변경부터 전달 (None이면 지금 이후)
+
+        Returns:
+            WatchEvent async iterator (WatchExpiredError 시 재구독)
+        """
+        return self._feed.watch(since_version)
+
+    async def apply_decisions(
+        self,
+        decisions: List[SchedulingDecision]
+    ) -> List[MigrationRecord]:
         """
-        async with self._lock:
-            running = []
-            for aw in self._appwrappers.values():
-                if aw.status.phase == "Running":
-                    running.append(aw)
-            return running
+        스케줄링 결정 일괄 적용
+        관련 shard 락을 모두 잡은 채 양보 없이 커밋하므로 계획이 일부만 반영된 상태는 보이지 않는다.
+
+        - targetCluster 설정 및 dispatching gate 열기
+        - 스케줄링 메타데이터 기록
+        - 클러스터가 바뀐 경우 마이그레이션으로 기록
+
+        Args:
+            decisions: 스케줄링 결정 리스트
+
+        Returns:
+            감지된 마이그레이션 리스트 (결정 순서)
+        """
+        migrations: List[MigrationRecord] = []
+        missing = 0
+        now = str(self._clock())
+
+        async with self._shard_locks(self._group_by_shard(decisions, lambda decision: decision.job_id)):
+            for decision in decisions:
+                shard = self._shard_of(decision.job_id)
+                appwrapper = shard.appwrappers.get(decision.job_id)
+                if appwrapper is None:
+                    missing += 1
+                    logger.debug(f"AppWrapper {decision.job_id} not found")
+                    continue
+
+                updated, migration = apply_decision(appwrapper, decision, now)
+                if migration is not None:
+                    migrations.append(migration)
+                self._commit(shard, decision.job_id, updated)
+
+        # 모든 결정을 한 번의 group commit으로 영속화
+        await self._persist()
 
-    async def update_appwrapper(self, job_id: str, appwrapper: AppWrapper):
-        """AppWrapper 업데이트"""
-        async with self._lock:
-            self._appwrappers[job_id] = appwrapper
-            logger.info(f"Updated AppWrapper {job_id}")
+        if missing:
+            logger.warning(f"{missing} AppWrappers not found while applying decisions")
+
+        logger.info(
+            f"Applied {len(decisions) - missing} scheduling decisions "
+            f"({len(migrations)} migrations)"
+        )
+        return migrations
 
     async def remove_appwrapper(self, job_id: str) -> bool:
         """AppWrapper 삭제"""
-        async with self._lock:
-            if job_id in self._appwrappers:
-                del self._appwrappers[job_id]
-                logger.info(f"Removed AppWrapper {job_id}")
-                return True
-            return False
+        shard = self._shard_of(job_id)
+        async with shard.lock:
+            if job_id not in shard.appwrappers:
+                return False
+            self._remove(shard, job_id)
+        await self._persist()
+        logger.info(f"Removed AppWrapper {job_id}")
+        return True
+
+    async def remove_appwrappers_if_unchanged(self, appwrappers: List[AppWrapperRecord]) -> int:
+        """
+        읽은 뒤 변경되지 않은 AppWrapper만 삭제 (아카이브로 옮긴 작업 정리용)
+
+        Args:
+            appwrappers: 삭제할 레코드 (resource_version이 현재와 같을 때만 삭제)
+
+        Returns:
+            삭제된 수
+        """
+        removed = 0
+        for number, group in self._group_by_shard(appwrappers, lambda aw: aw.spec.job_id).items():
+            shard = self._shards[number]
+            async with shard.lock:
+                for appwrapper in group:
+                    job_id = appwrapper.spec.job_id
+                    current = shard.appwrappers.get(job_id)
+                    if current is not None and current.resource_version == appwrapper.resource_version:
+                        self._remove(shard, job_id)
+                        removed += 1
+            await asyncio.sleep(0)
+        await self._persist()
+        return removed
+
+    def _remove(self, shard: _Shard, job_id: str):
+        """AppWrapper 삭제 및 이벤트/WAL 기록 (shard 락 보유 상태에서 호출)"""
+        removed = shard.pop(job_id, next(self._seq))
+        self._version += 1
+        self._feed.publish(self._version, WatchEventType.DELETED, removed)
+        self._log(WalRecord(op="del", v=self._version, id=job_id))
 
     # ==================== ClusterInfo 관리 ====================
 
@@ -109,55 +639,222 @@ class HubStore:
         """
         ClusterInfo 업데이트
         Spoke 클러스터로부터 받은 정보 저장
+        (AppWrapper와 마찬가지로 저장된 객체는 수정하지 않고 새 객체로 교체)
 
         Args:
             cluster_info: 클러스터 정보
         """
-        async with self._lock:
-            self._cluster_info[cluster_info.name] = cluster_info
-            logger.info(
-                f"Updated ClusterInfo {cluster_info.name}: "
-                f"CI={cluster_info.carbon_intensity} gCO2/kWh, "
-                f"CPU={cluster_info.resources.cpu_available}/{cluster_info.resources.cpu_total}"
-            )
+        async with self._cluster_lock:
+            self._version += 1
+            self._put_cluster_info(cluster_info)
+            self._log(WalRecord(op="cluster", v=self._version, ci=cluster_info))
+        await self._persist()
+        logger.info(
+            f"Updated ClusterInfo {cluster_info.name}: "
+            f"CI={cluster_info.carbon_intensity} gCO2/kWh, "
+            f"CPU={cluster_info.resources.cpu_available}/{cluster_info.resources.cpu_total}"
+        )
+
+    async def remove_cluster_info(self, cluster_name: str) -> bool:
+        """ClusterInfo 삭제 (샤딩 모드에서 다른 Hub로 이관 시)"""
+        async with self._cluster_lock:
+            if cluster_name not in self._cluster_info:
+                return False
+            self._version += 1
+            self._drop_cluster_info(cluster_name)
+            self._log(WalRecord(op="cluster_del", v=self._version, id=cluster_name))
+        await self._persist()
+        logger.info(f"Removed ClusterInfo {cluster_name}")
+        return True
+
+    def _put_cluster_info(self, cluster_info: ClusterInfo):
+        """ClusterInfo 저장 및 ready 인덱스 갱신 (락 보유 상태에서 호출)"""
+        self._cluster_info[cluster_info.name] = cluster_info
+        if cluster_info.status == "ready":
+            self._ready_clusters[cluster_info.name] = None
+        else:
+            self._ready_clusters.pop(cluster_info.name, None)
+
+    def _drop_cluster_info(self, cluster_name: str):
+        """ClusterInfo 삭제 및 ready 인덱스 갱신 (락 보유 상태에서 호출)"""
+        self._cluster_info.pop(cluster_name, None)
+        self._ready_clusters.pop(cluster_name, None)
 
     async def get_cluster_info(self, cluster_name: str) -> Optional[ClusterInfo]:
         """특정 클러스터 정보 조회"""
-        async with self._lock:
-            return self._cluster_info.get(cluster_name)
+        return self._cluster_info.get(cluster_name)
 
     async def get_all_cluster_info(self) -> List[ClusterInfo]:
         """모든 클러스터 정보 조회"""
-        async with self._lock:
-            return list(self._cluster_info.values())
+        return list(self._cluster_info.values())
 
     async def get_ready_clusters(self) -> List[ClusterInfo]:
         """준비 상태인 클러스터만 조회"""
-        async with self._lock:
-            return [
-                ci for ci in self._cluster_info.values()
-                if ci.status == "ready"
-            ]
+        return [self._cluster_info[name] for name in self._ready_clusters]
 
     # ==================== 통계 ====================
 
     async def get_stats(self) -> Dict:
-        """Hub Store 통계"""
-        async with self._lock:
-            total_appwrappers = len(self._appwrappers)
-            pending = sum(1 for aw in self._appwrappers.values() if aw.status.phase == "Pending")
-            running = sum(1 for aw in self._appwrappers.values() if aw.status.phase == "Running")
-            completed = sum(1 for aw in self._appwrappers.values() if aw.status.phase == "Completed")
-
-            return {
-                "total_appwrappers": total_appwrappers,
-                "pending": pending,
-                "running": running,
-                "completed": completed,
-                "total_clusters": len(self._cluster_info),
-                "ready_clusters": sum(1 for ci in self._cluster_info.values() if ci.status == "ready")
-            }
-
-
-# 전역 싱글톤 인스턴스
-hub_store = HubStore()
+        """Hub Store 통계 (shard별 인덱스 크기의 합)"""
+        def phase_count(phase: str) -> int:
+            return sum(len(shard.by_phase.get(phase, ())) for shard in self._shards)
+
+        return {
+            "total_appwrappers": sum(len(shard.appwrappers) for shard in self._shards),
+            "pending": phase_count("Pending"),
+            "running": phase_count("Running"),
+            "completed": phase_count("Completed"),
+            "failed": phase_count("Failed"),
+            "total_clusters": len(self._cluster_info),
+            "ready_clusters": len(self._ready_clusters)
+        }
+
+    # ==================== 영속화 ====================
+
+    def _log(self, record: WalRecord):
+        """WAL에 레코드 추가 (락 보유 상태에서 호출)"""
+        if self._wal is not None:
+            self._wal.append(record.model_dump_json(exclude_defaults=True))
+
+    async def _persist(self):
+        """
+        지금까지의 쓰기를 fsync 정책에 맞게 영속화 (락 밖에서 호출)
+        동시에 대기하는 쓰기들은 하나의 fsync로 묶인다.
+        """
+        if self._wal is None:
+            return
+        await self._wal.commit(self._wal.last_seq)
+        if self._wal.needs_checkpoint() and (
+            self._checkpoint_task is None or self._checkpoint_task.done()
+        ):
+            self._checkpoint_task = asyncio.create_task(self.checkpoint())
+
+    async def open_wal(self, wal: WriteAheadLog):
+        """
+        WAL 연결: 스냅샷 로드 후 WAL 재생으로 상태 복구, 이후 모든 쓰기를 기록
+
+        Args:
+            wal: WriteAheadLog 인스턴스
+        """
+        started = time.perf_counter()
+        # 수백만 개의 객체를 한 번에 만드는 동안 순환 GC가 반복 실행되지 않도록 중지
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            await self._restore(wal)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        # 복구된 객체는 오래 살아남으므로 이후 GC 세대 검사 대상에서 제외
+        gc.freeze()
+
+        stats = await self.get_stats()
+        logger.info(
+            f"Restored {stats['total_appwrappers']} AppWrappers and {len(self._cluster_info)} clusters "
+            f"(store v{self._version}) in {time.perf_counter() - started:.2f}s"
+        )
+
+    async def _restore(self, wal: WriteAheadLog):
+        """스냅샷 로드 후 WAL 레코드 재생"""
+        snapshot, records = await asyncio.to_thread(wal.load)
+
+        async with self._all_locks():
+            if snapshot is not None:
+                for appwrapper in snapshot.appwrappers:
+                    record = AppWrapperRecord.from_model(appwrapper)
+                    job_id = record.spec.job_id
+                    self._shard_of(job_id).put(job_id, record, next(self._seq))
+                for cluster_info in snapshot.clusters:
+                    self._put_cluster_info(cluster_info)
+                self._version = max(self._version, snapshot.version)
+
+            for record in records:
+                if record.op == "put":
+                    job_id = record.aw.spec.job_id
+                    self._shard_of(job_id).put(job_id, AppWrapperRecord.from_model(record.aw), next(self._seq))
+                elif record.op == "del":
+                    shard = self._shard_of(record.id)
+                    if record.id in shard.appwrappers:
+                        shard.pop(record.id, next(self._seq))
+                elif record.op == "cluster":
+                    self._put_cluster_info(record.ci)
+                elif record.op == "cluster_del":
+                    self._drop_cluster_info(record.id)
+                self._version = max(self._version, record.v)
+
+            wal.open(self._version)
+            self._wal = wal
+            # 복구 이전의 변경 이력은 알 수 없으므로 현재 버전부터 재개 가능
+            self._feed.reset(self._version)
+
+        logger.info(
+            f"Loaded snapshot v{snapshot.version if snapshot else 0} "
+            f"and replayed {len(records)} WAL records"
+        )
+
+    async def checkpoint(self):
+        """
+        압축 스냅샷 생성
+        모든 shard 락 안에서는 참조 복사와 세그먼트 전환만 하고,
+        직렬화는 커밋된 객체가 불변이므로 락 밖의 스레드에서 수행한다.
+        """
+        if self._wal is None:
+            return
+        wal = self._wal
+        async with self._all_locks():
+            version = self._version
+            appwrappers = self._merge(lambda shard: shard.created)
+            clusters = list(self._cluster_info.values())
+            await wal.roll(version)
+        await asyncio.to_thread(
+            lambda: wal.write_snapshot(version, [aw.to_model() for aw in appwrappers], clusters)
+        )
+
+    async def close_wal(self):
+        """스냅샷을 남기고 WAL 닫기 (종료 시 호출)"""
+        if self._wal is None:
+            return
+        if self._checkpoint_task is not None:
+            await self._checkpoint_task
+        await self.checkpoint()
+        await self._wal.close()
+        self._wal = None
+
+    async def close(self):
+        """store 종료 (WAL이 연결되어 있으면 스냅샷 후 닫기)"""
+        await self.close_wal()
+
+
+def create_store(
+    backend: str = "memory",
+    sqlite_path: str = "hub.db",
+    sqlite_synchronous: str = "NORMAL",
+    shards: int = 8
+):
+    """
+    설정에 맞는 Hub Store 생성
+
+    Args:
+        backend: memory (dict + 선택적 WAL) 또는 sqlite
+        sqlite_path: sqlite 백엔드의 데이터베이스 파일
+        sqlite_synchronous: sqlite 백엔드의 synchronous 설정
+        shards: memory 백엔드의 AppWrapper shard 수
+
+    Returns:
+        HubStore 또는 SqliteHubStore (같은 async 인터페이스)
+    """
+    if backend == "memory":
+        return HubStore(shards=shards)
+    if backend == "sqlite":
+        from hub.sqlite_store import SqliteHubStore
+        return SqliteHubStore(sqlite_path, synchronous=sqlite_synchronous)
+    raise ValueError(f"Unknown store backend: {backend} (expected memory or sqlite)")
+
+
+# 전역 싱글톤 인스턴스 (HUB_STORE_BACKEND로 백엔드 선택)
+hub_store = create_store(
+    os.getenv("HUB_STORE_BACKEND", "memory"),
+    sqlite_path=os.getenv("HUB_SQLITE_PATH", "hub.db"),
+    sqlite_synchronous=os.getenv("HUB_SQLITE_SYNCHRONOUS", "NORMAL"),
+    shards=int(os.getenv("HUB_STORE_SHARDS", "8"))
+)
@@ -0,0 +1,66 @@
+"""
+Shared builders and fakes for hub tests.
+"""
+
+import asyncio
+from hub.models import (
+    AppWrapper, AppWrapperSpec, ClusterInfo, ClusterResources, SchedulingDecision
+)
+
+
+def make_appwrapper(job_id: str, **spec) -> AppWrapper:
+    """Build a minimal AppWrapper for tests."""
+    fields = {
+        "job_id": job_id,
+        "cpu": 1.0,
+        "mem_gb": 1.0,
+        "runtime_minutes": 10,
+        "deadline_minutes": 60,
+    }
+    fields.update(spec)
+    return AppWrapper(metadata={"user": "default"}, spec=AppWrapperSpec(**fields))
+
+
+def make_decision(job_id: str, cluster: str) -> SchedulingDecision:
+    """Build a scheduling decision for tests."""
+    return SchedulingDecision(
+        job_id=job_id,
+        target_cluster=cluster,
+        start_time_minutes=0,
+        estimated_co2_g=1.5,
+        reason="test"
+    )
+
+
+def make_cluster(name: str, carbon_intensity: float) -> ClusterInfo:
+    """Build a ready cluster for tests."""
+    return ClusterInfo(
+        name=name,
+        geolocation=name,
+        carbon_intensity=carbon_intensity,
+        resources=ClusterResources(
+            cpu_available=16, cpu_total=16,
+            mem_available_gb=64, mem_total_gb=64
+        ),
+        kubeconfig_context=f"kind-{name.lower()}"
+    )
+
+
+async def run_until(predicate, timeout: float = 1.0):
+    """Poll until predicate() is true or fail after timeout seconds."""
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+class CreatedJobs:
+    """생성 요청받은 Job 본문을 기록하는 batch/v1 대역"""
+
+    def __init__(self):
+        self.bodies = []
+
+    async def create_namespaced_job(self, namespace, body):
+        self.bodies.append(body)
+        return body
@@ -0,0 +1,84 @@
+"""
+Unit tests for job retention and the on-disk archive.
+Tests TTL-based archival, archive queries and recovery of a torn segment tail.
+"""
+
+import pytest
+from hub.archive import JobArchive, JobArchiver
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper
+
+
+async def add_finished(store: HubStore, job_id: str, completed_at: float, phase: str = "Completed"):
+    """종료된 AppWrapper 추가"""
+    appwrapper = make_appwrapper(job_id)
+    appwrapper.status.phase = phase
+    appwrapper.status.dispatched = True
+    appwrapper.status.completion_time = completed_at
+    await store.add_appwrapper(appwrapper)
+
+
+@pytest.mark.asyncio
+async def test_archiver_moves_expired_jobs_out_of_hot_store(tmp_path):
+    """Test that only finished jobs past the TTL are archived and remain queryable."""
+    now = 10_000.0
+    store = HubStore()
+    archive = JobArchive(str(tmp_path), segment_records=3)
+    archiver = JobArchiver(archive, store=store, ttl_seconds=100, clock=lambda: now)
+
+    for i in range(5):
+        await add_finished(store, f"old-{i}", completed_at=1000.0 + i)
+    await add_finished(store, "old-failed", completed_at=1005.0, phase="Failed")
+    await add_finished(store, "recent", completed_at=now - 10)
+    await store.add_appwrapper(make_appwrapper("pending"))
+
+    assert await archiver.run_archive_cycle() == 6
+    assert await archiver.run_archive_cycle() == 0
+
+    stats = await store.get_stats()
+    assert stats["total_appwrappers"] == 2
+    assert stats["completed"] == 1
+    assert archive.counts == {"Completed": 5, "Failed": 1}
+
+    # 닫힌 세그먼트(3개)와 열린 세그먼트 모두에서 조회
+    assert archive.get("old-1").status.completion_time == 1001.0
+    assert archive.get("old-failed").status.phase == "Failed"
+    assert archive.get("recent") is None
+    assert [aw.spec.job_id for aw in archive.query(1002.0, 1005.0)] == ["old-2", "old-3", "old-4"]
+    assert len(archive.query(limit=4)) == 4
+
+
+@pytest.mark.asyncio
+async def test_jobs_changed_after_read_stay_in_hot_store(tmp_path):
+    """Test that removal after archiving only deletes records that did not change meanwhile."""
+    store = HubStore()
+    await add_finished(store, "job-1", completed_at=1.0)
+    await add_finished(store, "job-2", completed_at=1.0)
+    finished = await store.get_finished_appwrappers()
+
+    def relabel(aw):
+        aw.status.message = "updated"
+
+    await store.patch_appwrapper("job-2", relabel)
+
+    assert await store.remove_appwrappers_if_unchanged(finished) == 1
+    assert [aw.spec.job_id for aw in await store.get_all_appwrappers()] == ["job-2"]
+
+
+@pytest.mark.asyncio
+async def test_reopen_truncates_uncommitted_tail(tmp_path):
+    """Test that bytes written after the last manifest update are discarded on reopen."""
+    store = HubStore()
+    for i in range(2):
+        await add_finished(store, f"job-{i}", completed_at=float(i))
+    archive = JobArchive(str(tmp_path))
+    archive.append(await store.get_finished_appwrappers())
+
+    segment = archive._manifest.segments[-1]
+    with open(tmp_path / segment.name, "ab") as f:
+        f.write(b"\x1f\x8b torn write")
+
+    reopened = JobArchive(str(tmp_path))
+    assert reopened.counts == {"Completed": 2}
+    assert reopened.get("job-1").spec.job_id == "job-1"
+    assert [aw.spec.job_id for aw in reopened.query()] == ["job-0", "job-1"]
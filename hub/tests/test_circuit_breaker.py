@@ -0,0 +1,155 @@
+"""
+Unit tests for the per-cluster circuit breaker.
+Tests backoff growth, open/half-open/closed transitions and scheduler feedback from the dispatcher.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from kubernetes.client.rest import ApiException
+from hub.circuit_breaker import CLOSED, HALF_OPEN, OPEN, ClusterCircuitBreaker
+from hub.dispatcher import HubDispatcher
+from hub.models import SchedulingPlan
+from hub.scheduler import HubScheduler
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, CreatedJobs
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock(1000.0)
+    events = []
+    breaker = ClusterCircuitBreaker(
+        failure_threshold=3, base_backoff=10.0, max_backoff=25.0, clock=clock.time, rng=lambda: 1.0,
+        on_open=lambda cluster, until: events.append(("open", cluster, until)),
+        on_close=lambda cluster: events.append(("close", cluster))
+    )
+
+    breaker.record_failure("KR")
+    assert breaker.state("KR") == CLOSED
+    assert not breaker.allow("KR")
+    # 같은 백오프 구간의 동시 실패는 한 번만 셈
+    breaker.record_failure("KR")
+    assert breaker.next_retry_at() == 1010.0
+
+    clock.now = 1010.0
+    assert breaker.allow("KR")
+    breaker.record_failure("KR")
+    clock.now = 1030.0
+    breaker.record_failure("KR")
+    # 세 번째 연속 실패: 백오프 40초는 max_backoff로 제한
+    assert breaker.state("KR") == OPEN
+    assert events == [("open", "KR", 1055.0)]
+    assert breaker.allow("JP")
+
+    clock.now = 1055.0
+    assert breaker.state("KR") == HALF_OPEN
+    assert breaker.allow("KR")
+    assert not breaker.allow("KR")
+    breaker.record_success("KR")
+    assert breaker.state("KR") == CLOSED
+    assert events[-1] == ("close", "KR")
+    assert breaker.next_retry_at() is None
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_stops_requests_and_zeroes_capacity():
+    """Test that a failing spoke stops receiving requests and the scheduler plans around it."""
+    clock = FakeClock(2000.0)
+    store = HubStore(clock=clock.time)
+    await store.update_cluster_info(make_cluster("KR", 100))
+    await store.update_cluster_info(make_cluster("JP", 400))
+    scheduler = HubScheduler(store=store, clock=clock.time)
+    dispatcher = HubDispatcher(
+        store=store, scheduler=scheduler, clock=clock.time,
+        failure_threshold=2, backoff_base=30.0, backoff_max=60.0
+    )
+
+    class DownBatchApi:
+        calls = 0
+
+        async def create_namespaced_job(self, namespace, body):
+            DownBatchApi.calls += 1
+            raise ApiException(status=503, reason="Service Unavailable")
+
+    class UpBatchApi:
+        async def create_namespaced_job(self, namespace, body):
+            return body
+
+    dispatcher.client_pool.register("kind-kr", DownBatchApi())
+    dispatcher.client_pool.register("kind-jp", UpBatchApi())
+    for i in range(8):
+        await store.add_appwrapper(make_appwrapper(f"job-{i}"))
+
+    # 탄소가 낮은 KR에 모두 배치되지만 요청은 한 번만 나가고 나머지는 백오프로 대기
+    await scheduler.run_scheduling_cycle()
+    assert {d.target_cluster for d in scheduler.current_plan.decisions.values()} == {"KR"}
+    await dispatcher.run_dispatch_cycle()
+    assert DownBatchApi.calls == 1
+    assert dispatcher.next_wakeup() <= 2030.0
+    assert len(await store.get_dispatchable_appwrappers()) == 8
+
+    clock.now = 2030.0
+    await dispatcher.run_dispatch_cycle()
+    assert DownBatchApi.calls == 2
+    assert dispatcher.breaker.state("KR") == OPEN
+    assert scheduler.unavailable_clusters() == ["KR"]
+
+    # circuit이 열린 동안 KR 용량은 0: 모두 JP로 재배치되어 계획 시작 시각에 배포
+    await scheduler.run_scheduling_cycle()
+    assert {d.target_cluster for d in scheduler.current_plan.decisions.values()} == {"JP"}
+
+    # half-open 시각이 지나면 다시 KR 용량을 반영
+    clock.now = 5000.0
+    assert scheduler.unavailable_clusters() == []
+    assert dispatcher.breaker.state("KR") == HALF_OPEN
+    await dispatcher.run_dispatch_cycle()
+    assert DownBatchApi.calls == 2
+    assert (await store.get_stats())["running"] == 8
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_block_cluster():
+    """Test that a half-open probe cancelled mid-request lets the next cycle probe again."""
+    clock = FakeClock(1000.0)
+    store = HubStore(clock=clock.time)
+    await store.update_cluster_info(make_cluster("KR", 100))
+    await store.add_appwrapper(make_appwrapper("job-0"))
+    await store.apply_decisions([make_decision("job-0", "KR")])
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={"job-0": make_decision("job-0", "KR")})
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan, mark_cluster_unavailable=lambda c, u: None,
+                                               mark_cluster_available=lambda c: None),
+        clock=clock.time, failure_threshold=1, backoff_base=10.0
+    )
+
+    class HangingBatchApi:
+        started = asyncio.Event()
+
+        async def create_namespaced_job(self, namespace, body):
+            HangingBatchApi.started.set()
+            await asyncio.Event().wait()
+
+    dispatcher.client_pool.register("kind-kr", HangingBatchApi())
+    dispatcher.breaker.record_failure("KR")
+    clock.now = 1010.0
+    assert dispatcher.breaker.state("KR") == HALF_OPEN
+
+    # 시험 요청 도중 사이클 취소
+    cycle = asyncio.create_task(dispatcher.run_dispatch_cycle())
+    await HangingBatchApi.started.wait()
+    cycle.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cycle
+
+    dispatcher.client_pool.register("kind-kr", CreatedJobs())
+    await dispatcher.run_dispatch_cycle()
+    assert dispatcher.breaker.state("KR") == CLOSED
+    assert (await store.get_appwrapper("job-0")).status.dispatched
@@ -0,0 +1,162 @@
+"""
+Unit tests for hub dispatcher.
+Tests concurrent Job creation limits and bulk application of dispatch results.
+"""
+
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from kubernetes.client.rest import ApiException
+from hub.dispatcher import HubDispatcher
+from hub.models import SchedulingPlan
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, CreatedJobs
+
+
+class SlowBatchApi:
+    """API 왕복 지연을 흉내 내며 동시 요청 수를 기록하는 batch/v1 대역"""
+
+    def __init__(self, delay: float, in_flight: dict, lock: threading.Lock):
+        self.delay = delay
+        self.peak = 0
+        self._active = 0
+        self._in_flight = in_flight
+        self._lock = lock
+
+    def create_namespaced_job(self, namespace: str, body):
+        with self._lock:
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+            self._in_flight["now"] += 1
+            self._in_flight["peak"] = max(self._in_flight["peak"], self._in_flight["now"])
+        time.sleep(self.delay)
+        with self._lock:
+            self._active -= 1
+            self._in_flight["now"] -= 1
+        if body["metadata"]["name"].endswith("-bad"):
+            raise ApiException(status=422, reason="Invalid")
+        return body
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fans_out_within_limits():
+    """Test that Job creation runs concurrently, respects both limits and applies results in bulk."""
+    store = HubStore()
+    clusters = ["KR", "JP", "CN"]
+    job_ids = [f"job-{i}" for i in range(30)] + ["job-bad"]
+    for name in clusters:
+        await store.update_cluster_info(make_cluster(name, 100))
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    decisions = [make_decision(job_id, clusters[i % 3]) for i, job_id in enumerate(job_ids)]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan),
+        max_concurrency=6, cluster_concurrency=3
+    )
+    in_flight, lock = {"now": 0, "peak": 0}, threading.Lock()
+    spokes = {name: SlowBatchApi(0.02, in_flight, lock) for name in clusters}
+    for name, spoke in spokes.items():
+        dispatcher.client_pool.register(f"kind-{name.lower()}", spoke)
+
+    started = time.perf_counter()
+    await dispatcher.run_dispatch_cycle()
+    elapsed = time.perf_counter() - started
+
+    # 31개 요청을 순차 실행하면 0.62초 이상 걸림
+    assert elapsed < 0.4
+    assert in_flight["peak"] == 6
+    assert all(spoke.peak <= 3 for spoke in spokes.values())
+
+    running = await store.get_running_appwrappers()
+    assert {aw.spec.job_id for aw in running} == set(job_ids) - {"job-bad"}
+    assert all(aw.metadata["plan_version"] == "1" for aw in running)
+    failed = await store.get_appwrapper("job-bad")
+    assert not failed.status.dispatched
+    assert failed.status.message == "Dispatch failed: Invalid"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_waits_for_planned_start():
+    """Test that AppWrappers are held until start_at and re-plans move their timers."""
+    now = {"t": 1000.0}
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+    for job_id in ["job-now", "job-later", "job-moved"]:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    decisions = {
+        "job-now": make_decision("job-now", "KR"),
+        "job-later": make_decision("job-later", "KR").model_copy(update={"start_at": 1600.0}),
+        "job-moved": make_decision("job-moved", "KR").model_copy(update={"start_at": 1900.0}),
+    }
+    await store.apply_decisions(list(decisions.values()))
+
+    scheduler = SimpleNamespace(current_plan=SchedulingPlan(version=1, created_at=0.0, decisions=decisions))
+    dispatcher = HubDispatcher(store=store, scheduler=scheduler, clock=lambda: now["t"])
+    dispatcher.client_pool.register("kind-kr", SlowBatchApi(0.0, {"now": 0, "peak": 0}, threading.Lock()))
+
+    await dispatcher.run_dispatch_cycle()
+    assert [aw.spec.job_id for aw in await store.get_running_appwrappers()] == ["job-now"]
+    assert dispatcher.next_wakeup() == 1600.0
+
+    # 재계획: job-moved를 앞당김
+    decisions["job-moved"] = decisions["job-moved"].model_copy(update={"start_at": 1300.0})
+    scheduler.current_plan = SchedulingPlan(version=2, created_at=0.0, decisions=decisions)
+    await dispatcher.run_dispatch_cycle()
+    assert dispatcher.next_wakeup() == 1300.0
+
+    now["t"] = 1300.0
+    await dispatcher.run_dispatch_cycle()
+    assert (await store.get_appwrapper("job-moved")).status.dispatched
+    assert not (await store.get_appwrapper("job-later")).status.dispatched
+    assert dispatcher.next_wakeup() == 1600.0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_before_first_plan_uses_stored_placement():
+    """Test that after a hub restart placed AppWrappers dispatch before the first scheduling cycle finishes."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+    for job_id in ["job-placed", "job-unplaced"]:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    await store.apply_decisions([make_decision("job-placed", "KR")])
+
+    # 재시작 직후: store에는 배치가 남아 있지만 게시된 계획은 없음
+    dispatcher = HubDispatcher(store=store, scheduler=SimpleNamespace(current_plan=None))
+    api = CreatedJobs()
+    dispatcher.client_pool.register("kind-kr", api)
+
+    await dispatcher.run_dispatch_cycle()
+    assert [body["metadata"]["name"] for body in api.bodies] == ["job-placed"]
+    placed = await store.get_appwrapper("job-placed")
+    assert placed.status.dispatched and placed.status.cluster == "KR"
+    assert "plan_version" not in placed.metadata
+    assert not (await store.get_appwrapper("job-unplaced")).status.dispatched
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_records_that_disagree_with_plan():
+    """Test that an AppWrapper whose stored targetCluster differs from the plan waits for the next plan."""
+    store = HubStore()
+    for name in ["KR", "JP"]:
+        await store.update_cluster_info(make_cluster(name, 100))
+    for job_id in ["job-agreed", "job-stale"]:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    await store.apply_decisions([make_decision("job-agreed", "KR"), make_decision("job-stale", "KR")])
+
+    # 계획은 job-stale을 JP로 옮겼지만 store에는 아직 반영되지 않음
+    decisions = {"job-agreed": make_decision("job-agreed", "KR"), "job-stale": make_decision("job-stale", "JP")}
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=SchedulingPlan(version=1, created_at=0.0, decisions=decisions))
+    )
+    kr, jp = CreatedJobs(), CreatedJobs()
+    dispatcher.client_pool.register("kind-kr", kr)
+    dispatcher.client_pool.register("kind-jp", jp)
+
+    await dispatcher.run_dispatch_cycle()
+    assert [body["metadata"]["name"] for body in kr.bodies] == ["job-agreed"]
+    assert jp.bodies == []
+    assert not (await store.get_appwrapper("job-stale")).status.dispatched
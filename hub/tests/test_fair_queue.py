@@ -0,0 +1,168 @@
+"""
+Unit tests for weighted fair dispatch across tenants.
+Tests deficit round robin ordering and per-cycle dispatch limits with tenant metrics.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from kubernetes.client.rest import ApiException
+from app.metrics import tenant_dispatch_latency_seconds, tenant_dispatch_queue_depth
+from hub.dispatcher import HubDispatcher
+from hub.fair_queue import FairQueue, parse_weights
+from hub.models import SchedulingPlan
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, CreatedJobs
+
+
+def test_weighted_round_robin_order():
+    jobs = [("bulk", i) for i in range(6)] + [("small", i) for i in range(2)] + [("vip", i) for i in range(4)]
+    queue = FairQueue(parse_weights("vip=2, bulk=1"), default_weight=0.5)
+
+    ordered = queue.order(jobs, tenant=lambda job: job[0])
+    assert [tenant for tenant, _ in ordered[:7]] == ["bulk", "bulk", "small", "vip", "vip", "vip", "vip"]
+    # 테넌트 안에서는 제출 순서 유지
+    assert [i for tenant, i in ordered if tenant == "bulk"] == list(range(6))
+    assert sorted(ordered) == sorted(jobs)
+    with pytest.raises(ValueError):
+        parse_weights("bulk=0")
+
+
+def test_deficits_reset_when_scale_changes():
+    queue = FairQueue({"a": 1.5, "b": 1.0, "c": 0.5})
+    jobs = [(name, i) for name in ("a", "b", "c") for i in range(6)]
+
+    # c가 있으면 scale 2: a는 한 차례에 3개를 받는데 1개만 꺼내고 멈춤
+    assert queue.order(jobs, tenant=lambda job: job[0], limit=1) == [("a", 0)]
+    # c가 빠져 scale 1이 되면 남은 deficit 2를 이어 쓰지 않고 새 단위로 차례를 시작
+    remaining = [job for job in jobs[1:] if job[0] != "c"]
+    ordered = queue.order(remaining, tenant=lambda job: job[0], limit=4)
+    assert [tenant for tenant, _ in ordered] == ["a", "b", "a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_small_tenant_is_not_starved_by_bulk_submission():
+    """Test that a capped cycle serves a small tenant before the bulk tenant's backlog."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+    bulk = [f"bulk-{i}" for i in range(20)]
+    for job_id in bulk:
+        aw = make_appwrapper(job_id)
+        aw.metadata.update(user="bulk", submitted_at="4990")
+        await store.add_appwrapper(aw)
+    small = make_appwrapper("small-0")
+    small.metadata.update(user="small", submitted_at="4999")
+    await store.add_appwrapper(small)
+    decisions = [make_decision(job_id, "KR") for job_id in bulk + ["small-0"]]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan), clock=lambda: 5000.0,
+        max_concurrency=1, max_cycle_dispatch=4
+    )
+    api = CreatedJobs()
+    dispatcher.client_pool.register("kind-kr", api)
+    small_latency = tenant_dispatch_latency_seconds.labels(tenant="small")
+    observed = small_latency._sum.get()
+
+    def created():
+        return [body["metadata"]["name"] for body in api.bodies]
+
+    await dispatcher.run_dispatch_cycle()
+    assert [name.split("-")[0] for name in created()] == ["bulk", "small", "bulk", "bulk"]
+    assert dispatcher._backlogged
+    assert tenant_dispatch_queue_depth.labels(tenant="bulk")._value.get() == 17
+    assert tenant_dispatch_queue_depth.labels(tenant="small")._value.get() == 0
+    assert small_latency._sum.get() == observed + 1.0
+
+    for _ in range(5):
+        await dispatcher.run_dispatch_cycle()
+    assert len(created()) == 21
+    assert not dispatcher._backlogged
+    assert tenant_dispatch_queue_depth.labels(tenant="bulk")._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_capped_cycles_alternate_tenants():
+    """Test that with fewer dispatch slots per cycle than tenants, successive cycles rotate through tenants."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+    job_ids = [f"a-{i}" for i in range(6)] + [f"b-{i}" for i in range(2)] + [f"c-{i}" for i in range(2)]
+    for job_id in job_ids:
+        aw = make_appwrapper(job_id)
+        aw.metadata["user"] = job_id.split("-")[0]
+        await store.add_appwrapper(aw)
+    decisions = [make_decision(job_id, "KR") for job_id in job_ids]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan), max_concurrency=1, max_cycle_dispatch=2
+    )
+    api = CreatedJobs()
+    dispatcher.client_pool.register("kind-kr", api)
+
+    for _ in range(3):
+        await dispatcher.run_dispatch_cycle()
+    # 한 테넌트가 매 사이클을 차지하지 않고 차례가 이어짐 (첫 차례 순서는 store의 shard 병합 순서)
+    tenants = [body["metadata"]["name"].split("-")[0] for body in api.bodies]
+    assert sorted(tenants[:3]) == ["a", "b", "c"]
+    assert tenants[3:] == tenants[:3]
+
+    for _ in range(2):
+        await dispatcher.run_dispatch_cycle()
+    assert len(api.bodies) == 10
+    assert not dispatcher._backlogged
+
+
+@pytest.mark.asyncio
+async def test_backlog_on_open_circuit_waits_for_retry():
+    """Test that a capped backlog bound to a backing-off cluster does not rerun cycles without waiting."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+    job_ids = [f"job-{i}" for i in range(10)]
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    decisions = [make_decision(job_id, "KR") for job_id in job_ids]
+    await store.apply_decisions(decisions)
+
+    class DownBatchApi:
+        calls = 0
+
+        async def create_namespaced_job(self, namespace, body):
+            DownBatchApi.calls += 1
+            raise ApiException(status=503, reason="Service Unavailable")
+
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+    scheduler = SimpleNamespace(
+        current_plan=plan,
+        mark_cluster_unavailable=lambda cluster, until: None,
+        mark_cluster_available=lambda cluster: None
+    )
+    dispatcher = HubDispatcher(
+        store=store, scheduler=scheduler, max_cycle_dispatch=2, failure_threshold=1, backoff_base=60.0
+    )
+    dispatcher.client_pool.register("kind-kr", DownBatchApi())
+
+    cycles = 0
+    run_dispatch_cycle = dispatcher.run_dispatch_cycle
+
+    async def counted():
+        nonlocal cycles
+        cycles += 1
+        await run_dispatch_cycle()
+
+    dispatcher.run_dispatch_cycle = counted
+    await dispatcher.run_dispatch_cycle()
+    assert dispatcher._backlogged
+    assert dispatcher.breaker.blocked("KR")
+
+    # 남은 8개는 KR 재시도 시각까지 대기: 루프는 한 번 확인한 뒤 쉼
+    await dispatcher.start()
+    await asyncio.sleep(0.3)
+    await dispatcher.stop()
+    assert cycles == 2
+    assert not dispatcher._backlogged
+    assert DownBatchApi.calls <= 2
+    assert tenant_dispatch_queue_depth.labels(tenant="default")._value.get() == 10
@@ -0,0 +1,108 @@
+"""
+Unit tests for the fake spoke Kubernetes API.
+Tests capacity-bound Job lifecycle, error injection, watch expiry and an end-to-end
+dispatcher + informer run over the real async transport.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from hub.dispatcher import HubDispatcher
+from hub.fake_spoke import FakeApiError, FakeSpoke, serve_fake_spokes, write_kubeconfig
+from hub.informer import CompletionTracker
+from hub.kube_clients import KubeClientPool
+from hub.models import ClusterInfo, ClusterResources, SchedulingPlan
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, run_until
+
+
+def job_body(name: str, cpu: str = "2", completions: int = None) -> dict:
+    spec = {"template": {"spec": {"containers": [
+        {"name": "workload", "image": "busybox", "resources": {"requests": {"cpu": cpu, "memory": "1Gi"}}}
+    ], "restartPolicy": "Never"}}}
+    if completions:
+        spec.update(completionMode="Indexed", completions=completions, parallelism=completions)
+    return {"metadata": {"name": name, "labels": {"scheduled-by": "caspian"}}, "spec": spec}
+
+
+@pytest.mark.asyncio
+async def test_jobs_wait_for_capacity_and_finish():
+    spoke = FakeSpoke("KR", nodes=2, node_cpu=4.0, job_duration=0.05)
+    for i in range(5):
+        spoke.create_job("default", job_body(f"job-{i}"))
+    spoke.create_job("default", job_body("batch", cpu="1", completions=3))
+    with pytest.raises(FakeApiError) as error:
+        spoke.create_job("default", job_body("job-0"))
+    assert error.value.code == 409
+
+    # 2노드 x 4코어: 2코어 Job 4개만 실행, 나머지는 대기
+    assert spoke.cpu_used == 8.0
+    assert spoke.jobs[("default", "job-4")]["status"] == {}
+    page = spoke.list_jobs("default", "scheduled-by=caspian", limit=4)
+    assert len(page["items"]) == 4 and page["metadata"]["continue"] == "4"
+
+    await run_until(lambda: all("conditions" in job["status"] for job in spoke.jobs.values()), timeout=2.0)
+    assert spoke.cpu_used == 0.0
+    batch = spoke.jobs[("default", "batch")]["status"]
+    assert batch["completedIndexes"] == "0-2"
+    assert batch["conditions"][0]["type"] == "Complete"
+
+    # 기록에서 밀려난 버전부터 watch하면 410
+    spoke = FakeSpoke("JP", history=2)
+    for i in range(3):
+        spoke.create_job("default", job_body(f"job-{i}"))
+    events = [event async for event in spoke.watch_jobs("default", "0", timeout_seconds=0)]
+    assert events[0]["object"]["code"] == 410
+    spoke.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_and_informer_run_against_fake_spokes(tmp_path):
+    """Test that dispatched Jobs run to completion on fake spokes and an erroring spoke opens its circuit."""
+    spokes = {
+        "KR": FakeSpoke("KR", nodes=1, node_cpu=4.0, job_duration=0.05),
+        "JP": FakeSpoke("JP", error_rate=1.0, error_status=503),
+    }
+    job_ids = [f"job-{i}" for i in range(12)]
+    store = HubStore()
+    for name in spokes:
+        await store.update_cluster_info(ClusterInfo(
+            name=name, geolocation=name, carbon_intensity=100,
+            resources=ClusterResources(cpu_available=4, cpu_total=4, mem_available_gb=64, mem_total_gb=64),
+            kubeconfig_context=f"fake-{name.lower()}"
+        ))
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    decisions = [make_decision(job_id, "KR") for job_id in job_ids[:10]]
+    decisions += [make_decision(job_id, "JP") for job_id in job_ids[10:]]
+    await store.apply_decisions(decisions)
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+
+    async with serve_fake_spokes(spokes) as base_url:
+        kubeconfig = tmp_path / "config"
+        write_kubeconfig(str(kubeconfig), base_url, spokes)
+        pool = KubeClientPool(config_file=str(kubeconfig))
+        scheduler = SimpleNamespace(current_plan=plan, mark_cluster_unavailable=lambda cluster, until: None)
+        dispatcher = HubDispatcher(store=store, scheduler=scheduler, client_pool=pool, failure_threshold=1)
+        tracker = CompletionTracker(store=store, client_pool=pool, resync_interval=5)
+        await tracker.sync_informers()
+
+        await dispatcher.run_dispatch_cycle()
+        assert dispatcher.breaker.state("JP") == "open"
+        # circuit이 열린 JP에는 다음 사이클에서 요청을 보내지 않음
+        requests = spokes["JP"].requests
+        await dispatcher.run_dispatch_cycle()
+        assert spokes["JP"].requests == requests
+
+        async def completed() -> int:
+            return (await store.get_stats())["completed"]
+
+        for _ in range(300):
+            if await completed() == 10:
+                break
+            await asyncio.sleep(0.01)
+        assert await completed() == 10
+        assert spokes["KR"].cpu_used == 0.0
+
+        await tracker.stop()
+        await pool.stop()
@@ -0,0 +1,130 @@
+"""
+Unit tests for asynchronous cascading delete of spoke Jobs.
+Tests informer-confirmed removal against fake spokes, rate-limited retries and Indexed Job members.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from kubernetes.client.rest import ApiException
+from hub.dispatcher import HubDispatcher
+from hub.fake_spoke import FakeSpoke, serve_fake_spokes, write_kubeconfig
+from hub.garbage_collector import DELETION_ANNOTATION, JobGarbageCollector, matches, parse_selector
+from hub.informer import CompletionTracker
+from hub.kube_clients import KubeClientPool
+from hub.models import AppWrapper, ClusterInfo, ClusterResources, SchedulingPlan
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, run_until
+
+
+@pytest.mark.asyncio
+async def test_selector_delete_removes_spoke_jobs_after_informer_confirms(tmp_path):
+    """Test that running Jobs are deleted on the spoke and records are removed only once the informer sees it."""
+    spoke = FakeSpoke("KR", nodes=1, node_cpu=8.0, job_duration=60.0)
+    store = HubStore()
+    await store.update_cluster_info(ClusterInfo(
+        name="KR", geolocation="KR", carbon_intensity=100,
+        resources=ClusterResources(cpu_available=8, cpu_total=8, mem_available_gb=64, mem_total_gb=64),
+        kubeconfig_context="fake-kr"
+    ))
+    for i in range(6):
+        aw = make_appwrapper(f"job-{i}")
+        aw.metadata["user"] = "bob" if i == 4 else "alice"
+        await store.add_appwrapper(aw)
+    decisions = [make_decision(f"job-{i}", "KR") for i in range(5)]
+    await store.apply_decisions(decisions)
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+
+    async with serve_fake_spokes({"KR": spoke}) as base_url:
+        kubeconfig = tmp_path / "config"
+        write_kubeconfig(str(kubeconfig), base_url, {"KR": spoke})
+        pool = KubeClientPool(config_file=str(kubeconfig))
+        collector = JobGarbageCollector(store=store, client_pool=pool, batch_size=2, rate=20.0)
+        tracker = CompletionTracker(store=store, client_pool=pool, garbage_collector=collector)
+        await tracker.sync_informers()
+        _, informer, _ = tracker.informers["KR"]
+
+        dispatcher = HubDispatcher(store=store, scheduler=SimpleNamespace(current_plan=plan), client_pool=pool)
+        await dispatcher.run_dispatch_cycle()
+        assert spoke.cpu_used == 5.0
+        await run_until(lambda: len(informer.cache) == 5)
+
+        # alice 작업 삭제: job-0~3은 실행 중, job-5는 아직 배치되지 않음
+        selected = [aw for aw in await store.get_all_appwrappers() if matches(aw.metadata, parse_selector("user=alice"))]
+        result = await collector.delete(selected)
+        assert result == {"removed": 1, "deleting": 4}
+        assert await store.get_appwrapper("job-5") is None
+        job_0 = await store.get_appwrapper("job-0")
+        assert DELETION_ANNOTATION in job_0.metadata and job_0.status.phase == "Running"
+        # 삭제 대기 중인 작업을 다시 삭제해도 요청을 중복하지 않음
+        assert (await collector.delete([job_0]))["deleting"] == 1
+
+        await collector.wait()
+        assert collector.stats() == {"queued": 0, "awaiting_confirmation": 0}
+        assert [aw.spec.job_id for aw in await store.get_all_appwrappers()] == ["job-4"]
+        assert sorted(name for _, name in spoke.jobs) == ["job-4"]
+        assert spoke.cpu_used == 1.0
+
+        await tracker.stop()
+        await pool.stop()
+
+
+class FlakyDeleteApi:
+    """첫 삭제 요청은 503, 이후에는 성공하지만 DELETED 이벤트를 보내지 않는 batch/v1 대역"""
+
+    def __init__(self):
+        self.deleted = []
+        self.calls = 0
+
+    async def delete_namespaced_job(self, name, namespace, propagation_policy=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise ApiException(status=503, reason="Service Unavailable")
+        if name in self.deleted:
+            raise ApiException(status=404, reason="Not Found")
+        self.deleted.append(name)
+        return {"status": "Success"}
+
+
+@pytest.mark.asyncio
+async def test_failed_and_unconfirmed_deletes_are_retried():
+    """Test that a failed delete is retried and an unconfirmed delete is confirmed by a 404 re-request."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 100))
+
+    def running(indexed_job: str = None):
+        def mutate(aw: AppWrapper):
+            aw.status.dispatched = True
+            aw.status.phase = "Running"
+            aw.status.cluster = "KR"
+            if indexed_job:
+                aw.metadata["indexed_job"] = indexed_job
+        return mutate
+
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    await store.patch_appwrapper("job-1", running())
+    for job_id in ("member-0", "member-1"):
+        await store.add_appwrapper(make_appwrapper(job_id))
+        await store.patch_appwrapper(job_id, running("caspian-batch-1"))
+
+    api = FlakyDeleteApi()
+    pool = KubeClientPool()
+    pool.register("kind-kr", api)
+    collector = JobGarbageCollector(store=store, client_pool=pool, confirm_timeout=0.05, retry_interval=0.05)
+
+    # 묶음의 다른 작업이 실행 중이면 Indexed Job은 두고 AppWrapper만 제거
+    member_0 = await store.get_appwrapper("member-0")
+    assert await collector.delete([member_0]) == {"removed": 1, "deleting": 0}
+    assert await store.get_appwrapper("member-0") is None
+
+    job_1 = await store.get_appwrapper("job-1")
+    member_1 = await store.get_appwrapper("member-1")
+    assert await collector.delete([job_1, member_1]) == {"removed": 0, "deleting": 2}
+    await asyncio.wait_for(collector.wait(), timeout=2.0)
+
+    # 503 -> 재시도 성공 -> 확인 없음 -> 재요청 404로 확인
+    assert sorted(api.deleted) == ["caspian-batch-1", "job-1"]
+    assert api.calls == 5
+    assert await store.get_all_appwrappers() == []
+    with pytest.raises(ValueError):
+        parse_selector("user")
@@ -0,0 +1,131 @@
+"""
+Unit tests for the spoke Job informer.
+Tests list+watch cache maintenance and AppWrapper completion tracking.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from hub.dispatcher import DispatchOutcome, HubDispatcher
+from hub.informer import CompletionTracker, FinishedJob, JobInformer, job_outcome
+from hub.kube_clients import KubeClientPool
+from hub.models import AppWrapper
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, run_until
+
+
+def make_job(name: str, rv: int, condition: str = None) -> dict:
+    """Build a Job dict as returned by the API server."""
+    status = {}
+    if condition:
+        status = {
+            "completionTime": "2026-01-01T00:10:00Z" if condition == "Complete" else None,
+            "conditions": [{"type": condition, "status": "True", "reason": "BackoffLimitExceeded",
+                            "lastTransitionTime": "2026-01-01T00:10:00Z"}],
+        }
+    return {"metadata": {"name": name, "resourceVersion": str(rv)}, "status": status}
+
+
+class FakeJobsApi:
+    """list 결과와 watch 이벤트 큐를 가진 batch/v1 대역"""
+
+    def __init__(self, jobs: list, rv: int):
+        self.jobs = jobs
+        self.rv = rv
+        self.lists = 0
+        self.events: asyncio.Queue = asyncio.Queue()
+
+    async def list_namespaced_job(self, namespace, label_selector=None, limit=None, _continue=None):
+        self.lists += 1
+        return {"metadata": {"resourceVersion": str(self.rv)}, "items": list(self.jobs)}
+
+    async def watch_namespaced_job(self, namespace, resource_version, label_selector=None, timeout_seconds=300):
+        while True:
+            event = await self.events.get()
+            if event is None:
+                return
+            yield event
+
+
+def test_job_outcome_reads_conditions():
+    assert job_outcome(make_job("job-1", 1)) is None
+    completed = job_outcome(make_job("job-1", 1, "Complete"))
+    assert completed.phase == "Completed"
+    assert completed.completed_at == 1767226200.0
+    failed = job_outcome(make_job("job-2", 1, "Failed"))
+    assert failed.phase == "Failed"
+    assert failed.message == "Job failed: BackoffLimitExceeded"
+
+
+@pytest.mark.asyncio
+async def test_informer_completes_running_appwrappers():
+    """Test that list+watch transitions only this cluster's Running AppWrappers and relists on 410."""
+    store = HubStore(clock=lambda: 5000.0)
+    await store.update_cluster_info(make_cluster("KR", 100))
+
+    def running_in(cluster: str):
+        def mutate(aw: AppWrapper):
+            aw.status.dispatched = True
+            aw.status.phase = "Running"
+            aw.status.cluster = cluster
+        return mutate
+
+    for job_id, cluster in [("job-1", "KR"), ("job-2", "KR"), ("job-3", "KR"), ("job-moved", "JP")]:
+        await store.add_appwrapper(make_appwrapper(job_id))
+        await store.patch_appwrapper(job_id, running_in(cluster))
+
+    # job-1은 list 시점에 이미 끝남, job-moved는 다른 클러스터로 옮겨간 작업의 이전 Job
+    api = FakeJobsApi([
+        make_job("job-1", 1, "Complete"), make_job("job-2", 2), make_job("job-3", 3),
+        make_job("job-moved", 4, "Complete"),
+    ], rv=4)
+    pool = KubeClientPool()
+    pool.register("kind-kr", api)
+    tracker = CompletionTracker(store=store, client_pool=pool, clock=lambda: 5000.0)
+    await tracker.sync_informers()
+    _, informer, _ = tracker.informers["KR"]
+
+    await run_until(lambda: informer.synced)
+    assert (await store.get_appwrapper("job-1")).status.phase == "Completed"
+    assert (await store.get_appwrapper("job-moved")).status.phase == "Running"
+
+    await api.events.put({"type": "MODIFIED", "object": make_job("job-2", 5, "Failed")})
+    await run_until(lambda: informer.cache.get("job-2") is not None)
+    job_2 = await store.get_appwrapper("job-2")
+    assert job_2.status.phase == "Failed"
+    assert job_2.status.message == "Job failed: BackoffLimitExceeded"
+
+    # watch 만료 후 다시 list: 그 사이 삭제된 실행 중 Job은 실패로 반영
+    api.jobs = [make_job("job-1", 1, "Complete"), make_job("job-2", 5, "Failed")]
+    await api.events.put({"type": "ERROR", "object": {"code": 410, "message": "too old resource version"}})
+    await run_until(lambda: api.lists == 2 and "job-3" not in informer.cache)
+    job_3 = await store.get_appwrapper("job-3")
+    assert job_3.status.phase == "Failed"
+    assert job_3.status.completion_time == 5000.0
+
+    running = await store.get_running_appwrappers()
+    assert [aw.spec.job_id for aw in running] == ["job-moved"]
+    await tracker.stop()
+
+
+@pytest.mark.asyncio
+async def test_completion_before_dispatch_result_is_kept():
+    """Test that a Job finishing before the dispatcher commits its result is not lost or reverted."""
+    store = HubStore(clock=lambda: 5000.0)
+    await store.update_cluster_info(make_cluster("KR", 100))
+    for job_id in ("job-1", "job-2"):
+        await store.add_appwrapper(make_appwrapper(job_id))
+    await store.apply_decisions([make_decision("job-1", "KR"), make_decision("job-2", "JP")])
+
+    tracker = CompletionTracker(store=store, clock=lambda: 5000.0)
+    finished = [FinishedJob(job_id, "Completed", 4990.0, "Job completed") for job_id in ("job-1", "job-2")]
+    # job-2는 다른 클러스터에 배치된 작업이므로 무시
+    assert await tracker.handle_finished("KR", finished) == 1
+
+    dispatcher = HubDispatcher(store=store, scheduler=SimpleNamespace(current_plan=None))
+    await dispatcher._apply_outcomes([DispatchOutcome("job-1", "KR", 4980.0)])
+    job_1 = await store.get_appwrapper("job-1")
+    assert (job_1.status.phase, job_1.status.cluster, job_1.status.dispatched) == ("Completed", "KR", True)
+    assert job_1.status.start_time == 4980.0
+    assert job_1.status.completion_time == 4990.0
+    assert (await store.get_appwrapper("job-2")).status.phase != "Completed"
@@ -0,0 +1,181 @@
+"""
+Unit tests for the per-context Kubernetes client pool.
+Tests configuration isolation, caching, rebuilding on credential rotation
+and the async httpx transport.
+"""
+
+import asyncio
+import json
+import os
+import httpx
+import pytest
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from hub.kube_clients import AsyncBatchApi, KubeClientPool
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: kr
+  cluster: {{server: "https://kr.example:6443"}}
+- name: jp
+  cluster: {{server: "https://jp.example:6443"}}
+users:
+- name: admin
+  user: {{token: "{token}"}}
+contexts:
+- name: kind-kr
+  context: {{cluster: kr, user: admin}}
+- name: kind-jp
+  context: {{cluster: jp, user: admin}}
+current-context: kind-kr
+"""
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    path = tmp_path / "config"
+    path.write_text(KUBECONFIG.format(token="first"))
+    return path
+
+
+def configuration_of(batch_api) -> client.Configuration:
+    if isinstance(batch_api, AsyncBatchApi):
+        return batch_api.configuration
+    return batch_api.api_client.configuration
+
+
+@pytest.mark.parametrize("transport", ["async", "threaded"])
+def test_contexts_get_isolated_configurations(kubeconfig, transport):
+    default_host = client.Configuration.get_default_copy().host
+    pool = KubeClientPool(config_file=str(kubeconfig), pool_maxsize=8, transport=transport)
+
+    kr = pool.batch_api("kind-kr")
+    jp = pool.batch_api("kind-jp")
+
+    assert configuration_of(kr).host == "https://kr.example:6443"
+    assert configuration_of(jp).host == "https://jp.example:6443"
+    assert configuration_of(kr).connection_pool_maxsize == 8
+    # 전역 기본 설정은 그대로
+    assert client.Configuration.get_default_copy().host == default_host
+    # 같은 context는 캐시된 클라이언트 재사용
+    assert pool.batch_api("kind-kr") is kr
+
+
+def test_rebuilds_client_when_credentials_rotate(kubeconfig):
+    pool = KubeClientPool(config_file=str(kubeconfig))
+    first = pool.batch_api("kind-kr")
+    assert first.configuration.api_key["authorization"] == "Bearer first"
+
+    kubeconfig.write_text(KUBECONFIG.format(token="rotated"))
+    stat = os.stat(kubeconfig)
+    os.utime(kubeconfig, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    rotated = pool.batch_api("kind-kr")
+    assert rotated is not first
+    assert rotated.configuration.api_key["authorization"] == "Bearer rotated"
+
+    # 401 등으로 폐기하면 다음 조회에서 재생성, 등록한 대역은 폐기 대상 아님
+    pool.invalidate("kind-kr")
+    assert pool.batch_api("kind-kr") is not rotated
+    fake = object()
+    pool.register("sim-kr", fake)
+    pool.invalidate("sim-kr")
+    assert pool.batch_api("sim-kr") is fake
+
+
+async def test_health_check_drops_unreachable_clients(kubeconfig):
+    pool = KubeClientPool(config_file=str(kubeconfig), health_check_timeout=0.5)
+    pool.batch_api("kind-kr")
+    pool.register("sim-kr", object())
+
+    # 테스트 환경에서 kr.example에는 연결할 수 없음
+    assert await pool.health_check() == ["kind-kr"]
+    assert await pool.health_check() == []
+    await pool.stop()
+
+
+async def serve_jobs_api(requests: list, connections: list):
+    """Job 생성 요청을 그대로 돌려주는 최소 HTTP/1.1 서버 (이름이 -bad로 끝나면 422)"""
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+                headers = {name.lower(): value for name, value in (line.split(": ", 1) for line in head[1:] if line)}
+                body = await reader.readexactly(int(headers["content-length"]))
+                requests.append((head[0], headers, json.loads(body)))
+                if json.loads(body)["metadata"]["name"].endswith("-bad"):
+                    error = b'{"reason":"Invalid"}'
+                    writer.write(b"HTTP/1.1 422 Unprocessable Entity\r\nContent-Length: %d\r\n\r\n%s" % (len(error), error))
+                else:
+                    writer.write(b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def test_async_batch_api_reuses_keepalive_connection():
+    requests, connections = [], []
+    server = await serve_jobs_api(requests, connections)
+    port = server.sockets[0].getsockname()[1]
+
+    configuration = client.Configuration(host=f"http://127.0.0.1:{port}", api_key={"authorization": "token"})
+    configuration.api_key_prefix["authorization"] = "Bearer"
+    api = AsyncBatchApi(configuration, max_connections=2)
+    job = client.V1Job(metadata=client.V1ObjectMeta(name="job-1"), spec=client.V1JobSpec(
+        template=client.V1PodTemplateSpec(spec=client.V1PodSpec(containers=[], restart_policy="Never")),
+        backoff_limit=3
+    ))
+
+    created = await api.create_namespaced_job(namespace="default", body=job)
+    assert created["spec"]["backoffLimit"] == 3
+    assert requests[0][0] == "POST /apis/batch/v1/namespaces/default/jobs HTTP/1.1"
+    assert requests[0][1]["authorization"] == "Bearer token"
+
+    job.metadata.name = "job-bad"
+    with pytest.raises(ApiException) as error:
+        await api.create_namespaced_job(namespace="default", body=job)
+    assert error.value.status == 422
+
+    # 동시 요청은 max_connections개 연결에서 처리, 이후 요청은 유휴 연결 재사용
+    job.metadata.name = "job-2"
+    await asyncio.gather(*(api.create_namespaced_job(namespace="default", body=job) for _ in range(6)))
+    assert len(requests) == 8
+    assert len(connections) == 2
+
+    await api.aclose()
+    server.close()
+
+
+async def test_async_batch_api_resends_only_idempotent_requests():
+    """응답 없이 끊긴 요청은 DELETE만 다시 보내고 Job 생성 POST는 그대로 실패시킴"""
+    requests = []
+
+    async def handle(reader, writer):
+        head = (await reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+        requests.append(head[0].split(" ")[0])
+        if len(requests) % 2:
+            # 첫 요청은 응답 없이 연결을 닫음
+            writer.close()
+            return
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    api = AsyncBatchApi(client.Configuration(host=f"http://127.0.0.1:{port}"))
+
+    assert await api.delete_namespaced_job(name="job-1", namespace="default") == {}
+    assert requests == ["DELETE", "DELETE"]
+
+    with pytest.raises(httpx.RemoteProtocolError):
+        await api.create_namespaced_job(namespace="default", body={"metadata": {"name": "job-2"}})
+    assert requests == ["DELETE", "DELETE", "POST"]
+
+    await api.aclose()
+    server.close()
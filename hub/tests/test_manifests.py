@@ -0,0 +1,113 @@
+"""
+Unit tests for templated Job manifests.
+Tests template equivalence with the V1Job model, Indexed Job batching and per-member completion.
+"""
+
+import pytest
+from types import SimpleNamespace
+from kubernetes import client
+from hub.dispatcher import HubDispatcher
+from hub.informer import job_outcome, member_outcomes
+from hub.manifests import JOB_IDS_ANNOTATION, ManifestTemplates
+from hub.models import SchedulingPlan
+from hub.records import AppWrapperRecord
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster, CreatedJobs
+
+
+def legacy_manifest(appwrapper: AppWrapperRecord, target_cluster: str) -> dict:
+    """템플릿 도입 전 V1Job으로 만들던 매니페스트 (직렬화 결과 비교용)"""
+    spec = appwrapper.spec
+    resources = {"cpu": f"{spec.cpu}", "memory": f"{spec.mem_gb}Gi"}
+    job = client.V1Job(
+        api_version="batch/v1",
+        kind="Job",
+        metadata=client.V1ObjectMeta(
+            name=spec.job_id,
+            labels={"app": "caspian-workload", "job-id": spec.job_id, "scheduled-by": "caspian"},
+            annotations={
+                "caspian.io/target-cluster": target_cluster,
+                "caspian.io/estimated-co2": appwrapper.metadata.get("estimated_co2_g", "0")
+            }
+        ),
+        spec=client.V1JobSpec(
+            template=client.V1PodTemplateSpec(
+                metadata=client.V1ObjectMeta(labels={"app": "caspian-workload", "job-id": spec.job_id}),
+                spec=client.V1PodSpec(
+                    containers=[client.V1Container(
+                        name="workload", image=spec.image, command=list(spec.command),
+                        resources=client.V1ResourceRequirements(requests=resources, limits=resources)
+                    )],
+                    restart_policy="Never"
+                )
+            ),
+            backoff_limit=3,
+            ttl_seconds_after_finished=3600
+        )
+    )
+    return client.ApiClient().sanitize_for_serialization(job)
+
+
+def test_template_matches_model_and_shares_pod_spec():
+    templates = ManifestTemplates(max_templates=2)
+    job_1 = AppWrapperRecord.from_model(make_appwrapper("job-1", cpu=2.0))
+    job_2 = AppWrapperRecord.from_model(make_appwrapper("job-2", cpu=2.0))
+
+    rendered = templates.render(job_1, "KR")
+    assert rendered == legacy_manifest(job_1, "KR")
+    other = templates.render(job_2, "JP")
+    assert other["metadata"]["name"] == "job-2"
+    assert other["spec"]["template"]["spec"] is rendered["spec"]["template"]["spec"]
+    assert len(templates) == 1
+
+    for cpu in (3.0, 4.0):
+        templates.render(AppWrapperRecord.from_model(make_appwrapper("job-3", cpu=cpu)), "KR")
+    assert len(templates) == 2
+
+
+@pytest.mark.asyncio
+async def test_same_shape_appwrappers_dispatch_as_indexed_jobs():
+    """Test that same-shape AppWrappers bound to one cluster become Indexed Jobs of bounded size."""
+    # 일괄 커밋 순서가 shard 배정(hash)에 따라 달라지지 않도록 shard 하나 사용
+    store = HubStore(shards=1)
+    await store.update_cluster_info(make_cluster("KR", 100))
+    job_ids = [f"job-{i}" for i in range(5)]
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    await store.add_appwrapper(make_appwrapper("job-big", cpu=8.0))
+    decisions = [make_decision(job_id, "KR") for job_id in job_ids + ["job-big"]]
+    await store.apply_decisions(decisions)
+
+    plan = SchedulingPlan(version=1, created_at=0.0, decisions={d.job_id: d for d in decisions})
+    dispatcher = HubDispatcher(store=store, scheduler=SimpleNamespace(current_plan=plan), indexed_batch_size=3)
+    api = CreatedJobs()
+    dispatcher.client_pool.register("kind-kr", api)
+
+    await dispatcher.run_dispatch_cycle()
+    assert (await store.get_stats())["running"] == 6
+    indexed = sorted(
+        (body for body in api.bodies if body["spec"].get("completionMode") == "Indexed"),
+        key=lambda body: -body["spec"]["completions"]
+    )
+    assert [body["spec"]["completions"] for body in indexed] == [3, 2]
+    assert [body["metadata"]["name"] for body in api.bodies if "completionMode" not in body["spec"]] == ["job-big"]
+
+    batch = indexed[0]
+    members = batch["metadata"]["annotations"][JOB_IDS_ANNOTATION].split(",")
+    assert members == job_ids[:3]
+    env = batch["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert env == [{"name": "CASPIAN_JOB_IDS", "value": "job-0,job-1,job-2"}]
+    job_1 = await store.get_appwrapper("job-1")
+    assert job_1.metadata["indexed_job"] == batch["metadata"]["name"]
+    assert job_1.metadata["job_index"] == "1"
+
+    # 인덱스 1만 실패한 Indexed Job 종료
+    finished = {**batch, "status": {
+        "completedIndexes": "0,2", "failedIndexes": "1",
+        "conditions": [{"type": "Failed", "status": "True", "reason": "FailedIndexes",
+                        "lastTransitionTime": "2026-01-01T00:10:00Z"}]
+    }}
+    outcomes = member_outcomes(finished, job_outcome(finished))
+    assert [(o.job_id, o.phase) for o in outcomes] == [
+        ("job-0", "Completed"), ("job-1", "Failed"), ("job-2", "Completed")
+    ]
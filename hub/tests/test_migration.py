@@ -0,0 +1,134 @@
+"""
+Unit tests for the live migration executor.
+Tests the drain/transfer/create/cleanup sequence, per-link limits and rollback on failure.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from kubernetes.client.rest import ApiException
+from app.metrics import migrations_in_progress
+from hub.dispatcher import HubDispatcher
+from hub.migration import TransferBackend
+from hub.models import AppWrapper, SchedulingPlan
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster
+
+
+class RecordingBatchApi:
+    """호출을 기록하는 비동기 batch/v1 대역"""
+
+    def __init__(self, name: str, calls: list, fail_create: bool = False):
+        self.name = name
+        self.calls = calls
+        self.fail_create = fail_create
+
+    async def create_namespaced_job(self, namespace, body):
+        self.calls.append((self.name, "create", body["metadata"]["name"]))
+        if self.fail_create:
+            raise ApiException(status=403, reason="Forbidden")
+        return body
+
+    async def patch_namespaced_job(self, name, namespace, body):
+        self.calls.append((self.name, "suspend" if body["spec"]["suspend"] else "resume", name))
+        return body
+
+    async def delete_namespaced_job(self, name, namespace, propagation_policy=None):
+        self.calls.append((self.name, f"delete:{propagation_policy}", name))
+        if name == "job-gone":
+            raise ApiException(status=404, reason="NotFound")
+        return {}
+
+
+class GatedTransfer(TransferBackend):
+    """release 될 때까지 전송을 멈춰 두는 백엔드 (링크 동시 실행 수 관찰용)"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    async def transfer(self, job_id, from_cluster, to_cluster, data_gb, progress):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        progress(data_gb / 2)
+        await self.release.wait()
+        progress(data_gb)
+        self.active -= 1
+
+
+async def make_migrating_dispatcher(job_ids, fail_create=False):
+    store = HubStore(clock=lambda: 7000.0)
+    for name in ("KR", "JP"):
+        await store.update_cluster_info(make_cluster(name, 100))
+
+    def running_in_kr(aw: AppWrapper):
+        aw.status.dispatched = True
+        aw.status.phase = "Running"
+        aw.status.cluster = "KR"
+
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id, data_gb=4.0))
+        await store.patch_appwrapper(job_id, running_in_kr)
+    decisions = [make_decision(job_id, "JP") for job_id in job_ids]
+    await store.apply_decisions(decisions)
+    plan = SchedulingPlan(version=2, created_at=0.0, decisions={d.job_id: d for d in decisions})
+
+    calls = []
+    transfer = GatedTransfer()
+    dispatcher = HubDispatcher(
+        store=store, scheduler=SimpleNamespace(current_plan=plan),
+        clock=lambda: 7000.0, migration_link_concurrency=2, transfer=transfer
+    )
+    dispatcher.client_pool.register("kind-kr", RecordingBatchApi("KR", calls))
+    dispatcher.client_pool.register("kind-jp", RecordingBatchApi("JP", calls, fail_create))
+    return store, dispatcher, transfer, calls
+
+
+@pytest.mark.asyncio
+async def test_migration_moves_running_job():
+    """Test that migrations drain the source, respect the link limit, create on the target, then delete the source."""
+    store, dispatcher, transfer, calls = await make_migrating_dispatcher(["job-1", "job-2", "job-gone"])
+    gauge_before = migrations_in_progress._value.get()
+
+    await dispatcher.run_dispatch_cycle()
+    await asyncio.sleep(0.01)
+    migrator = dispatcher.migrator
+    assert migrations_in_progress._value.get() == gauge_before + 3
+    assert transfer.peak == 2
+    states = sorted(p.state for p in migrator.in_progress.values())
+    assert states == ["Queued", "Transferring", "Transferring"]
+    assert all(p.transferred_gb == 2.0 for p in migrator.in_progress.values() if p.state == "Transferring")
+
+    # 링크 한도에 막힌 작업은 Queued, 진행 중인 작업은 다음 사이클에서 다시 시작하지 않음
+    await dispatcher.run_dispatch_cycle()
+    assert sum(1 for call in calls if call[1] == "suspend") == 2
+
+    transfer.release.set()
+    await migrator.wait()
+    assert migrations_in_progress._value.get() == gauge_before
+    assert migrator.in_progress == {}
+
+    for job_id in ("job-1", "job-2", "job-gone"):
+        job_calls = [call[:2] for call in calls if call[2] == job_id]
+        assert job_calls == [("KR", "suspend"), ("JP", "create"), ("KR", "delete:Background")]
+        aw = await store.get_appwrapper(job_id)
+        assert aw.status.cluster == "JP"
+        assert aw.status.phase == "Running"
+        assert aw.status.message == "Migrated from KR to JP"
+
+
+@pytest.mark.asyncio
+async def test_failed_migration_resumes_source():
+    """Test that a failed target create resumes the source Job and backs off before retrying."""
+    store, dispatcher, transfer, calls = await make_migrating_dispatcher(["job-1"], fail_create=True)
+    transfer.release.set()
+
+    await dispatcher.run_dispatch_cycle()
+    await dispatcher.migrator.wait()
+    assert [call[:2] for call in calls] == [("KR", "suspend"), ("JP", "create"), ("KR", "resume")]
+    assert (await store.get_appwrapper("job-1")).status.cluster == "KR"
+
+    await dispatcher.run_dispatch_cycle()
+    await dispatcher.migrator.wait()
+    assert len(calls) == 3
@@ -0,0 +1,80 @@
+"""
+Unit tests for the node-level fit pre-check.
+Tests the single-node feasibility index and candidate pruning before the optimizer runs.
+"""
+
+import pytest
+from hub.fake_spoke import FakeSpoke
+from hub.models import AppWrapper, ClusterInfo, ClusterResources, NodeResources
+from hub.node_fit import FeasibilityIndex, NodeFitIndex
+from hub.scheduler import HubScheduler
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_cluster
+
+
+def node(name: str, cpu_free: float, mem_free_gb: float, gpu_free: int = 0, cpu: float = 8.0) -> NodeResources:
+    return NodeResources(
+        name=name, cpu_free=cpu_free, mem_free_gb=mem_free_gb, gpu_free=gpu_free,
+        cpu_allocatable=cpu, mem_allocatable_gb=32.0, gpu_allocatable=gpu_free
+    )
+
+
+def test_fragmented_cluster_is_pruned_with_fallbacks():
+    index = NodeFitIndex([(4.0, 2.0, 0), (2.0, 16.0, 1), (1.0, 1.0, 0)])
+    assert index.fits(2.0, 16.0)
+    assert index.fits(4.0, 2.0)
+    assert not index.fits(4.0, 16.0)
+    assert index.fits(2.0, 8.0, gpu=1)
+    assert not index.fits(3.0, 1.0, gpu=1)
+
+    # 합계로는 CPU 9가 남지만 한 노드에 6이 들어갈 곳은 없음
+    fragmented = make_cluster("JP", 200)
+    fragmented.resources.nodes = [node("jp-0", 3.0, 16.0), node("jp-1", 3.0, 16.0), node("jp-2", 3.0, 16.0)]
+    busy = make_cluster("CN", 500)
+    busy.resources.nodes = [node("cn-0", 1.0, 1.0, cpu=16.0)]
+    feasibility = FeasibilityIndex([fragmented, busy, make_cluster("KR", 400)])
+    assert len(feasibility) == 2
+
+    regions = ["KR", "JP", "CN"]
+    assert feasibility.candidates(regions, 2.0, 4.0) == ["KR", "JP"]
+    assert feasibility.candidates(regions, 6.0, 4.0) == ["KR"]
+    # 실행 중인 클러스터는 유지
+    assert feasibility.candidates(regions, 6.0, 4.0, keep="JP") == ["KR", "JP"]
+    # 지금 들어갈 곳이 없으면 노드가 비었을 때 들어가는 곳, 그것도 없으면 원래 후보
+    assert feasibility.candidates(["JP", "CN"], 12.0, 4.0) == ["CN"]
+    assert feasibility.candidates(["JP", "CN"], 32.0, 4.0) == ["JP", "CN"]
+    assert feasibility.blocked(6.0, 4.0) is feasibility.blocked(6.0, 4.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_avoids_fragmented_cluster():
+    """Test that a job too wide for any node of the greenest cluster is placed elsewhere."""
+    spoke = FakeSpoke("JP", nodes=4, node_cpu=4.0, node_mem_gb=16.0)
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 400))
+    await store.update_cluster_info(ClusterInfo(
+        name="JP", geolocation="JP", carbon_intensity=200,
+        resources=ClusterResources(
+            cpu_available=16, cpu_total=16, mem_available_gb=64, mem_total_gb=64,
+            nodes=spoke.node_resources()
+        ),
+        kubeconfig_context="fake-jp"
+    ))
+    await store.add_appwrapper(make_appwrapper("narrow", cpu=2.0))
+    await store.add_appwrapper(make_appwrapper("wide", cpu=6.0))
+    await store.add_appwrapper(make_appwrapper("running", cpu=6.0))
+
+    def running(aw: AppWrapper):
+        aw.status.dispatched = True
+        aw.status.phase = "Running"
+        aw.status.cluster = "JP"
+    await store.patch_appwrapper("running", running)
+
+    scheduler = HubScheduler(store=store)
+    await scheduler.run_scheduling_cycle()
+
+    decisions = scheduler.current_plan.decisions
+    assert decisions["narrow"].target_cluster == "JP"
+    assert decisions["wide"].target_cluster == "KR"
+    # 이미 JP에서 실행 중인 작업은 후보에서 제외되지 않아 마이그레이션되지 않음
+    assert decisions["running"].target_cluster == "JP"
@@ -0,0 +1,139 @@
+"""
+Unit tests for hub partitioning.
+Tests lease-based cluster ownership across several hub managers.
+"""
+
+import pytest
+import hub.app
+from hub.informer import CompletionTracker, FinishedJob
+from hub.kube_clients import KubeClientPool
+from hub.models import AppWrapper, AppWrapperSpec, PartitionHandoff
+from hub.partition import PartitionManager, rendezvous_owner
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster
+
+
+CLUSTERS = ["KR", "JP", "CN", "US", "DE", "FR"]
+
+
+def make_manager(tmp_path, hub_id: str) -> PartitionManager:
+    """Build a partition manager sharing one lease DB."""
+    return PartitionManager(
+        hub_id=hub_id,
+        hub_url=f"http://{hub_id}",
+        lease_db=str(tmp_path / "leases.db"),
+        lease_ttl=30
+    )
+
+
+def test_rendezvous_owner_is_stable():
+    """Test that removing a member only moves the keys it owned."""
+    before = {c: rendezvous_owner(c, ["a", "b", "c"]) for c in CLUSTERS}
+    after = {c: rendezvous_owner(c, ["a", "b"]) for c in CLUSTERS}
+
+    for cluster in CLUSTERS:
+        if before[cluster] != "c":
+            assert after[cluster] == before[cluster]
+
+
+@pytest.mark.asyncio
+async def test_clusters_are_partitioned_and_rebalanced(tmp_path):
+    """Test that hubs split cluster leases and take over after a hub leaves."""
+    hub_a = make_manager(tmp_path, "hub-a")
+    hub_b = make_manager(tmp_path, "hub-b")
+    for cluster in CLUSTERS:
+        hub_a.leases.register_cluster(cluster)
+
+    # 두 Hub가 서로를 관측한 뒤 lease가 나뉨
+    for _ in range(3):
+        await hub_a.rebalance()
+        await hub_b.rebalance()
+
+    assert hub_a.owned_clusters | hub_b.owned_clusters == set(CLUSTERS)
+    assert not hub_a.owned_clusters & hub_b.owned_clusters
+    assert hub_a.is_coordinator != hub_b.is_coordinator
+
+    # hub-b 탈퇴 후 hub-a가 모든 클러스터 인수
+    hub_b.leases.leave("hub-b")
+    gained, lost = await hub_a.rebalance()
+
+    assert hub_a.owned_clusters == set(CLUSTERS)
+    assert gained and not lost
+    assert hub_a.is_coordinator
+
+
+@pytest.mark.asyncio
+async def test_route_by_affinity(tmp_path):
+    """Test that single-partition affinity routes directly and spanning affinity needs the coordinator."""
+    hub_a = make_manager(tmp_path, "hub-a")
+    hub_b = make_manager(tmp_path, "hub-b")
+    for cluster in CLUSTERS:
+        hub_a.leases.register_cluster(cluster)
+    for _ in range(2):
+        await hub_a.rebalance()
+        await hub_b.rebalance()
+
+    a_cluster = sorted(hub_a.owned_clusters)[0]
+    b_cluster = sorted(hub_b.owned_clusters)[0]
+    hub_a.leases.publish_cluster_summary(a_cluster, 500, 8, 0)
+    hub_a.leases.publish_cluster_summary(b_cluster, 100, 8, 0)
+
+    local = AppWrapperSpec(job_id="local", cpu=1, mem_gb=1, runtime_minutes=5,
+                           deadline_minutes=60, affinity_clusters=[a_cluster])
+    spanning = AppWrapperSpec(job_id="spanning", cpu=1, mem_gb=1, runtime_minutes=5,
+                              deadline_minutes=60, affinity_clusters=[a_cluster, b_cluster])
+
+    assert hub_b.route(local) == "hub-a"
+    assert hub_b.route(spanning) is None
+    # coordinator는 탄소 집약도가 낮은 파티션에 배정
+    assert await hub_a.assign(spanning) == "hub-b"
+
+
+@pytest.mark.asyncio
+async def test_running_appwrappers_follow_their_cluster(tmp_path, monkeypatch):
+    """Test that a rebalance hands running AppWrappers to the new owner, whose tracker then finishes them."""
+    hub_a = make_manager(tmp_path, "hub-a")
+    for cluster in CLUSTERS:
+        hub_a.leases.register_cluster(cluster)
+    await hub_a.rebalance()
+
+    # hub-b가 합류하면 hub-a는 일부 클러스터를 잃음
+    hub_b = make_manager(tmp_path, "hub-b")
+    await hub_b.rebalance()
+    _, lost = await hub_a.rebalance()
+    cluster = sorted(lost)[0]
+
+    old_store, new_store = HubStore(), HubStore()
+    await old_store.update_cluster_info(make_cluster(cluster, 100))
+    await old_store.add_appwrapper(make_appwrapper("job-running"))
+    await old_store.apply_decisions([make_decision("job-running", cluster)])
+
+    def running(aw: AppWrapper):
+        aw.status.dispatched = True
+        aw.status.phase = "Running"
+        aw.status.cluster = cluster
+    await old_store.patch_appwrapper("job-running", running)
+
+    async def adopt(hub_id, path, payload):
+        # hub-b의 /hub/partition/adopt
+        assert (hub_id, path) == ("hub-b", "/hub/partition/adopt")
+        handoff = PartitionHandoff(**payload)
+        for cluster_info in handoff.clusters:
+            await new_store.update_cluster_info(cluster_info)
+        for appwrapper in handoff.appwrappers:
+            await new_store.add_appwrapper(appwrapper)
+
+    monkeypatch.setattr(hub.app, "hub_store", old_store)
+    monkeypatch.setattr(hub.app, "partition_manager", hub_a)
+    monkeypatch.setattr(hub.app, "forward_to_hub", adopt)
+    await hub.app.handoff_partition(set(), lost)
+
+    assert await old_store.get_appwrapper("job-running") is None
+    assert await old_store.get_cluster_info(cluster) is None
+
+    # 새 소유 Hub의 informer가 Job 종료를 반영
+    tracker = CompletionTracker(store=new_store, client_pool=KubeClientPool())
+    assert await tracker.handle_finished(cluster, [FinishedJob("job-running", "Completed", 10.0, "")]) == 1
+    finished = await new_store.get_appwrapper("job-running")
+    assert finished.status.phase == "Completed"
+    assert finished.status.completion_time == 10.0
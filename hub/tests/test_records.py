@@ -0,0 +1,44 @@
+"""
+Unit tests for compact store records.
+Tests round-tripping through pydantic and sharing of repeated values.
+"""
+
+import pytest
+from hub.records import AppWrapperRecord, PENDING_STATUS, SHARED_VALUES_MAX, _shared
+from hub.tests.helpers import make_appwrapper
+
+
+def test_round_trip_preserves_model():
+    """Test that converting to a record and back yields an equal AppWrapper."""
+    appwrapper = make_appwrapper("job-1", affinity_clusters=["KR", "JP"])
+    appwrapper.status.message = "hello"
+
+    record = AppWrapperRecord.from_model(appwrapper)
+
+    assert record.to_model() == appwrapper
+    assert record.spec.affinity_clusters == ("KR", "JP")
+
+
+def test_records_share_values_and_are_read_only():
+    """Test that repeated values are shared and records reject mutation."""
+    first = AppWrapperRecord.from_model(make_appwrapper("job-1"))
+    second = AppWrapperRecord.from_model(make_appwrapper("job-2"))
+
+    assert first.status is PENDING_STATUS
+    assert first.spec.dispatching_gates is second.spec.dispatching_gates
+    assert first.spec.command is second.spec.command
+
+    with pytest.raises(AttributeError):
+        first.spec.target_cluster = "KR"
+
+    moved = first.spec._replace(target_cluster="KR")
+    assert moved.target_cluster == "KR"
+    assert first.spec.target_cluster is None
+
+    # 작업마다 다른 command는 공유 테이블을 키우지 않고 오래된 것부터 내보냄
+    for i in range(SHARED_VALUES_MAX + 100):
+        AppWrapperRecord.from_model(make_appwrapper(f"unique-{i}", command=["echo", str(i)]))
+    assert len(_shared) == SHARED_VALUES_MAX
+    assert ("echo", "0") not in _shared
+    third = AppWrapperRecord.from_model(make_appwrapper("job-3"))
+    assert third.spec.command == first.spec.command
@@ -0,0 +1,78 @@
+"""
+Unit tests for hub scheduler.
+Tests scheduling cycles against an isolated HubStore.
+"""
+
+import pytest
+from hub.scheduler import HubScheduler
+from hub.store import HubStore
+from hub.tests.helpers import make_appwrapper, make_cluster
+
+
+@pytest.fixture
+async def store():
+    """Fresh HubStore with two ready clusters."""
+    store = HubStore()
+    await store.update_cluster_info(make_cluster("KR", 400))
+    await store.update_cluster_info(make_cluster("JP", 200))
+    return store
+
+
+@pytest.mark.asyncio
+async def test_cycle_publishes_versioned_plan(store):
+    """Test that each cycle publishes a new immutable plan version."""
+    scheduler = HubScheduler(store=store)
+    assert scheduler.current_plan is None
+
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    await scheduler.run_scheduling_cycle()
+
+    first = scheduler.current_plan
+    assert first.version == 1
+    assert first.decisions["job-1"].target_cluster == "JP"
+
+    await store.add_appwrapper(make_appwrapper("job-2"))
+    await scheduler.run_scheduling_cycle()
+
+    second = scheduler.current_plan
+    assert second.version == 2
+    assert set(second.decisions) == {"job-1", "job-2"}
+    # 이전 계획 객체는 변경되지 않음
+    assert set(first.decisions) == {"job-1"}
+    with pytest.raises(Exception):
+        first.version = 3
+
+
+def test_job_slack_shrinks_while_waiting():
+    """Test that deadlines are anchored to submitted_at, not to the current cycle."""
+    scheduler = HubScheduler()
+    now = 1_700_000_000.0
+    now_slot = scheduler._epoch_slot(now)
+
+    fresh = make_appwrapper("fresh", runtime_minutes=10, deadline_minutes=60)
+    fresh.metadata["submitted_at"] = str(now)
+    waiting = make_appwrapper("waiting", runtime_minutes=10, deadline_minutes=60)
+    waiting.metadata["submitted_at"] = str(now - 30 * 60)
+
+    jobs = {j.job_id: j for j in scheduler._build_job_specs([fresh, waiting], now_slot)}
+
+    assert jobs["waiting"].deadline_slot < jobs["fresh"].deadline_slot
+
+    # 다음 사이클에서도 같은 절대 deadline을 캐시에서 재사용
+    later = scheduler._build_job_specs([waiting], now_slot + 1)
+    assert later[0].deadline_slot == jobs["waiting"].deadline_slot - 1
+
+
+def test_job_near_deadline_is_expedited():
+    """Test that a job whose slack is exhausted must start in the first slot."""
+    scheduler = HubScheduler()
+    now = 1_700_000_000.0
+    now_slot = scheduler._epoch_slot(now)
+
+    late = make_appwrapper("late", runtime_minutes=10, deadline_minutes=60)
+    late.metadata["submitted_at"] = str(now - 55 * 60)
+
+    job = scheduler._build_job_specs([late], now_slot)[0]
+
+    assert job.release_slot == 0
+    assert job.deadline_slot == job.runtime_slots
@@ -0,0 +1,35 @@
+"""
+Unit tests for the hub simulator.
+Runs short simulations against the virtual clock and fake spoke API.
+"""
+
+import pytest
+from hub.simulator import CarbonTrace, HubSimulator, SimulationConfig
+
+
+def test_carbon_trace_csv_round_trip(tmp_path):
+    """Test that a saved trace replays identically."""
+    trace = CarbonTrace.synthetic(["KR", "JP"], duration_seconds=3600, seed=3)
+    path = tmp_path / "trace.csv"
+    trace.to_csv(str(path))
+
+    replayed = CarbonTrace.from_csv(str(path))
+
+    for offset in (0, 299, 1800, 3600):
+        assert replayed.at("KR", offset) == pytest.approx(trace.at("KR", offset), abs=1e-3)
+    assert trace.integrate("JP", 0, 600) == pytest.approx(
+        trace.at("JP", 0) * 300 + trace.at("JP", 300) * 300
+    )
+
+
+@pytest.mark.asyncio
+async def test_short_simulation_completes_all_jobs():
+    """Test that a short simulated hour drains every submitted job."""
+    config = SimulationConfig(hours=1, jobs_per_hour=20, seed=7)
+
+    report = await HubSimulator(config).run()
+
+    assert report.jobs_submitted > 0
+    assert report.jobs_completed == report.jobs_submitted
+    assert report.scheduling_cycles > 0
+    assert report.total_co2_kg > 0
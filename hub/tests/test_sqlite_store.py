@@ -0,0 +1,90 @@
+"""
+Unit tests for the SQLite hub store backend.
+Tests query pushdown, batched writes and durability across reopen.
+"""
+
+import asyncio
+import pytest
+from hub.sqlite_store import SqliteHubStore
+from hub.store import ResourceConflictError, create_store
+from hub.tests.helpers import make_appwrapper, make_decision, make_cluster
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """Fresh SQLite store in a temporary directory."""
+    store = SqliteHubStore(str(tmp_path / "hub.db"))
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_queries_match_dict_store(store):
+    """Test that pending/dispatchable/running lookups are served from indexed columns."""
+    await store.update_cluster_info(make_cluster("KR", 400))
+    await asyncio.gather(*(store.add_appwrapper(make_appwrapper(f"job-{i}")) for i in range(4)))
+
+    migrations = await store.apply_decisions(
+        [make_decision("job-0", "KR"), make_decision("job-1", "KR"), make_decision("missing", "KR")]
+    )
+    assert migrations == []
+
+    def mark_running(aw):
+        aw.status.dispatched = True
+        aw.status.phase = "Running"
+        aw.status.cluster = "KR"
+
+    await store.patch_appwrapper("job-0", mark_running)
+
+    def ids(appwrappers):
+        return [aw.spec.job_id for aw in appwrappers]
+
+    assert ids(await store.get_pending_appwrappers()) == ["job-1", "job-2", "job-3"]
+    assert ids(await store.get_dispatchable_appwrappers()) == ["job-1"]
+    assert ids(await store.get_running_appwrappers()) == ["job-0"]
+    assert ids(await store.get_appwrappers_by_target("KR")) == ["job-0", "job-1"]
+    assert await store.get_cluster_counts() == {"KR": 1}
+
+    stats = await store.get_stats()
+    assert stats["total_appwrappers"] == 4
+    assert stats["running"] == 1
+    assert stats["ready_clusters"] == 1
+
+    migrations = await store.apply_decisions([make_decision("job-1", "JP")])
+    assert [(m.from_cluster, m.to_cluster) for m in migrations] == [("KR", "JP")]
+
+
+@pytest.mark.asyncio
+async def test_conflict_does_not_abort_batch(store):
+    """Test that a failed compare-and-swap only fails its own write in a shared transaction."""
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    current = await store.get_appwrapper("job-1")
+
+    results = await asyncio.gather(
+        store.update_appwrapper("job-1", make_appwrapper("job-1"), expected_version=current.resource_version + 5),
+        store.add_appwrapper(make_appwrapper("job-2")),
+        return_exceptions=True
+    )
+
+    assert isinstance(results[0], ResourceConflictError)
+    assert results[1] == "job-2"
+    assert (await store.get_appwrapper("job-1")).resource_version == current.resource_version
+
+
+@pytest.mark.asyncio
+async def test_reopen_restores_state_and_version(tmp_path):
+    """Test that data and the store version survive closing the database."""
+    path = str(tmp_path / "hub.db")
+    store = create_store("sqlite", sqlite_path=path)
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    await store.remove_appwrapper("missing")
+    version = (await store.snapshot()).version
+    await store.close()
+
+    reopened = SqliteHubStore(path)
+    try:
+        assert (await reopened.snapshot()).version == version
+        committed = await reopened.update_appwrapper("job-1", make_appwrapper("job-1"))
+        assert committed.resource_version == version + 1
+    finally:
+        await reopened.close()
@@ -0,0 +1,206 @@
+"""
+Unit tests for hub store.
+Tests AppWrapper bookkeeping and batched decision application.
+"""
+
+import pytest
+from hub.models import AppWrapper, GateStatus
+from hub.store import HubStore, ResourceConflictError, create_store
+from hub.tests.helpers import make_appwrapper, make_decision
+
+
+@pytest.mark.asyncio
+async def test_apply_decisions_opens_gates():
+    """Test that decisions set target cluster and open gates in one batch."""
+    store = HubStore()
+    for i in range(3):
+        await store.add_appwrapper(make_appwrapper(f"job-{i}"))
+
+    migrations = await store.apply_decisions(
+        [make_decision(f"job-{i}", "KR") for i in range(3)]
+    )
+
+    assert migrations == []
+    for i in range(3):
+        aw = await store.get_appwrapper(f"job-{i}")
+        assert aw.spec.target_cluster == "KR"
+        assert all(g.status == GateStatus.OPEN for g in aw.spec.dispatching_gates)
+        assert aw.metadata["estimated_co2_g"] == "1.5"
+
+
+@pytest.mark.asyncio
+async def test_apply_decisions_detects_migrations():
+    """Test that a changed target cluster is reported as a migration."""
+    store = HubStore()
+    await store.add_appwrapper(make_appwrapper("job-1", data_gb=2.0))
+    await store.apply_decisions([make_decision("job-1", "KR")])
+
+    migrations = await store.apply_decisions(
+        [make_decision("job-1", "JP"), make_decision("missing", "JP")]
+    )
+
+    assert len(migrations) == 1
+    assert migrations[0].from_cluster == "KR"
+    assert migrations[0].to_cluster == "JP"
+    assert migrations[0].data_gb == 2.0
+
+    aw = await store.get_appwrapper("job-1")
+    assert aw.metadata["migrated_from"] == "KR"
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_writes():
+    """Test that phase, dispatchable and cluster indexes track every write."""
+    store = HubStore()
+    for i in range(3):
+        await store.add_appwrapper(make_appwrapper(f"job-{i}"))
+
+    assert len(await store.get_pending_appwrappers()) == 3
+    assert await store.get_dispatchable_appwrappers() == []
+
+    await store.apply_decisions([make_decision("job-0", "KR"), make_decision("job-1", "JP")])
+    dispatchable = {aw.spec.job_id for aw in await store.get_dispatchable_appwrappers()}
+    assert dispatchable == {"job-0", "job-1"}
+    assert [aw.spec.job_id for aw in await store.get_appwrappers_by_target("KR")] == ["job-0"]
+
+    # 배포 처리
+    def mark_running(aw):
+        aw.status.dispatched = True
+        aw.status.phase = "Running"
+        aw.status.cluster = "KR"
+
+    await store.patch_appwrapper("job-0", mark_running)
+
+    assert [a.spec.job_id for a in await store.get_running_appwrappers()] == ["job-0"]
+    assert {a.spec.job_id for a in await store.get_dispatchable_appwrappers()} == {"job-1"}
+    assert await store.get_cluster_counts() == {"KR": 1}
+
+    stats = await store.get_stats()
+    assert stats["pending"] == 2
+    assert stats["running"] == 1
+
+    await store.remove_appwrapper("job-0")
+    assert await store.get_running_appwrappers() == []
+    assert await store.get_cluster_counts() == {}
+    assert (await store.get_stats())["total_appwrappers"] == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_isolated_from_later_writes():
+    """Test that snapshots and returned objects keep their version after writes."""
+    store = HubStore()
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    before = await store.get_appwrapper("job-1")
+    snapshot = await store.snapshot()
+
+    await store.apply_decisions([make_decision("job-1", "KR")])
+    await store.add_appwrapper(make_appwrapper("job-2"))
+
+    assert before.spec.target_cluster is None
+    assert snapshot.appwrappers["job-1"] is before
+    assert "job-2" not in snapshot.appwrappers
+    assert (await store.snapshot()).version > snapshot.version
+    assert (await store.get_appwrapper("job-1")).resource_version > before.resource_version
+
+
+@pytest.mark.asyncio
+async def test_compare_and_swap_rejects_stale_writes():
+    """Test that a write based on a stale version is rejected instead of lost."""
+    store = HubStore()
+    await store.add_appwrapper(make_appwrapper("job-1"))
+    stale = await store.get_appwrapper("job-1")
+
+    # 다른 쓰기 (scheduler)가 먼저 커밋
+    await store.apply_decisions([make_decision("job-1", "KR")])
+
+    replacement = stale.to_model()
+    replacement.status.message = "stale"
+    with pytest.raises(ResourceConflictError):
+        await store.update_appwrapper("job-1", replacement, expected_version=stale.resource_version)
+
+    # patch는 최신 버전에 적용되어 scheduler의 변경을 유지
+    def set_message(aw):
+        aw.status.message = "patched"
+
+    patched = await store.patch_appwrapper("job-1", set_message)
+    assert patched.spec.target_cluster == "KR"
+    assert patched.status.message == "patched"
+
+
+@pytest.mark.asyncio
+async def test_sharded_reads_merge_in_insertion_order():
+    """Test that lookups across shards keep single-store ordering and bulk writes commit in input order."""
+    store = HubStore(shards=4)
+    job_ids = [f"job-{i}" for i in range(20)]
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    assert len({id(store._shard_of(job_id)) for job_id in job_ids}) > 1
+
+    order = []
+    store._feed.publish = lambda version, event_type, record: order.append(record.spec.job_id)
+    decisions = [make_decision(job_id, "KR") for job_id in reversed(job_ids[::2])]
+    migrations = await store.apply_decisions(decisions + [make_decision("job-0", "JP")])
+
+    # 관련 shard 락을 모두 잡고 결정 순서대로 한 번에 커밋
+    assert order == [d.job_id for d in decisions] + ["job-0"]
+    assert [(m.job_id, m.to_cluster) for m in migrations] == [("job-0", "JP")]
+
+    assert [aw.spec.job_id for aw in await store.get_all_appwrappers()] == job_ids
+    assert list((await store.snapshot()).appwrappers) == job_ids
+    # 인덱스는 shard와 무관하게 커밋 순서를 유지
+    committed = list(dict.fromkeys(reversed(order)))[::-1]
+    assert [aw.spec.job_id for aw in await store.get_dispatchable_appwrappers()] == committed
+    assert [aw.spec.job_id for aw in await store.get_pending_appwrappers()] == job_ids[1::2] + committed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_bulk_patch_is_all_or_nothing(backend, tmp_path):
+    """Test that a failing mutate leaves every AppWrapper in a bulk patch unchanged on both backends."""
+    store = create_store(backend, sqlite_path=str(tmp_path / "hub.db"), shards=4)
+    job_ids = [f"job-{i}" for i in range(8)]
+    for job_id in job_ids:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    before = {job_id: (await store.get_appwrapper(job_id)).resource_version for job_id in job_ids}
+
+    def set_message(aw):
+        aw.status.message = "patched"
+
+    def fail(aw):
+        raise ValueError("bad patch")
+
+    with pytest.raises(ValueError):
+        await store.patch_appwrappers([(job_id, set_message) for job_id in job_ids[:-1]] + [(job_ids[-1], fail)])
+    for job_id in job_ids:
+        current = await store.get_appwrapper(job_id)
+        assert current.resource_version == before[job_id]
+        assert current.status.message != "patched"
+
+    if backend == "sqlite":
+        await store.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_patch_skips_commit_when_mutate_reports_no_change(backend, tmp_path):
+    """Test that a mutate returning False commits no new version on either backend."""
+    store = create_store(backend, sqlite_path=str(tmp_path / "hub.db"))
+    for job_id in ["job-1", "job-2"]:
+        await store.add_appwrapper(make_appwrapper(job_id))
+    version = (await store.snapshot()).version
+
+    def unchanged(aw):
+        return False
+
+    def set_message(aw):
+        aw.status.message = "patched"
+
+    assert await store.patch_appwrapper("job-1", unchanged) is None
+    results = await store.patch_appwrappers([("job-1", unchanged), ("job-2", set_message)])
+    assert results[0] is None
+    assert results[1].status.message == "patched"
+    assert (await store.snapshot()).version == version + 1
+    assert (await store.get_appwrapper("job-1")).resource_version <= version
+
+    if backend == "sqlite":
+        await store.close()
@@ -0,0 +1,56 @@
+"""
+Unit tests for the hierarchical timer wheel.
+Tests expiry across levels, rescheduling and cancellation.
+"""
+
+import random
+from hub.timer_wheel import TimerWheel
+
+
+def test_timers_expire_in_order_across_levels():
+    wheel = TimerWheel(start=1000.0, tick=1.0, wheel_size=8, levels=3)
+    wheel.schedule("near", 1003.2)     # level 0
+    wheel.schedule("mid", 1030.0)      # level 1
+    wheel.schedule("far", 1300.0)      # level 2
+    wheel.schedule("beyond", 5000.0)   # 범위(512틱) 밖: 최상위 level에서 다시 배치
+    wheel.schedule("past", 990.0)
+
+    assert wheel.next_deadline() == 1000.0
+    assert wheel.advance(1000.0) == ["past"]
+    assert wheel.next_deadline() == 1004.0
+    assert wheel.advance(1003.9) == []
+    assert wheel.advance(1004.0) == ["near"]
+    assert wheel.next_deadline() == 1030.0
+    assert wheel.advance(1200.0) == ["mid"]
+    assert wheel.next_deadline() == 1300.0
+    assert wheel.advance(1300.0) == ["far"]
+    assert wheel.next_deadline() == 5000.0
+    assert wheel.advance(4999.0) == []
+    assert wheel.advance(5000.0) == ["beyond"]
+    assert len(wheel) == 0 and wheel.next_deadline() is None
+
+
+def test_reschedule_and_cancel_match_reference():
+    rng = random.Random(3)
+    wheel = TimerWheel(start=0.0, tick=1.0, wheel_size=4, levels=3)
+    reference = {}
+    now = 0.0
+    for _ in range(2000):
+        key = rng.randrange(40)
+        if rng.random() < 0.6:
+            deadline = now + rng.uniform(-5, 300)
+            wheel.schedule(key, deadline)
+            reference[key] = -(-deadline // 1)
+        elif rng.random() < 0.3:
+            assert wheel.cancel(key) == (key in reference)
+            reference.pop(key, None)
+        else:
+            pending = [d for d in reference.values() if d > now // 1]
+            if pending and len(pending) == len(reference):
+                assert wheel.next_deadline() == min(pending)
+            now += rng.uniform(0, 40)
+            expired = {k for k, d in reference.items() if d <= now // 1}
+            assert set(wheel.advance(now)) == expired
+            for k in expired:
+                del reference[k]
+        assert len(wheel) == len(reference)
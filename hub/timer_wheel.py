@@ -0,0 +1,157 @@
+"""
+Hierarchical Timer Wheel
+계획된 시작 시각까지 작업을 보류하는 계층형 타이머 휠
+
+level L의 슬롯 하나는 wheel_size^L 틱을 덮는다. 가까운 타이머는 level 0에,
+먼 타이머는 상위 level에 두었다가 해당 구간에 들어오면 아래 level로 내려보낸다(cascade).
+등록/취소/재등록은 key로 슬롯을 바로 찾으므로 O(1)이다.
+"""
+
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TimerWheel:
+    """
+    key별 마감 시각 타이머
+
+    - schedule(key, deadline): 등록 (이미 있으면 옮김)
+    - cancel(key): 취소
+    - advance(now): now까지 만료된 key 반환
+    - next_deadline(): 가장 이른 만료 시각 (다음에 깨어날 시각)
+    """
+
+    def __init__(self, start: float, tick: float = 1.0, wheel_size: int = 64, levels: int = 4):
+        """
+        타이머 휠 초기화
+
+        Args:
+            start: 시작 시각 (Unix timestamp)
+            tick: 해상도 (초, 마감 시각은 틱 경계로 올림)
+            wheel_size: level별 슬롯 수
+            levels: level 수 (범위: tick * wheel_size^levels 초, 넘으면 최상위 level에서 다시 배치)
+        """
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self._span = [wheel_size ** level for level in range(levels + 1)]
+        self._now_tick = math.floor(start / tick)
+        # level -> 슬롯 -> {key: 마감 틱}
+        self._slots: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        # 이미 만료되어 다음 advance에서 반환할 key
+        self._due: Dict[Hashable, int] = {}
+        # key -> (level, 슬롯), 만료 대기 중이면 (-1, -1)
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        타이머 등록 (같은 key가 있으면 새 마감 시각으로 옮김)
+
+        Args:
+            key: 타이머 식별자
+            deadline: 마감 시각 (Unix timestamp)
+        """
+        deadline_tick = math.ceil(deadline / self.tick)
+        if key in self._where:
+            if self._bucket(key).get(key) == deadline_tick:
+                return
+            self.cancel(key)
+        self._place(key, deadline_tick)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        타이머 취소
+
+        Returns:
+            등록되어 있었는지 여부
+        """
+        if key not in self._where:
+            return False
+        del self._bucket(key)[key]
+        del self._where[key]
+        return True
+
+    def advance(self, now: float) -> List[Hashable]:
+        """
+        now까지 시간을 진행하고 만료된 key 반환 (반환된 key는 휠에서 제거됨)
+
+        Args:
+            now: 현재 시각 (Unix timestamp)
+
+        Returns:
+            마감 시각이 지난 key 목록
+        """
+        target = math.floor(now / self.tick)
+        if not self._where:
+            self._now_tick = max(self._now_tick, target)
+        while self._now_tick < target:
+            self._now_tick += 1
+            # 상위 level 구간 경계: 해당 슬롯의 타이머를 아래 level로 내림
+            for level in range(self.levels - 1, 0, -1):
+                if self._now_tick % self._span[level] == 0:
+                    self._cascade(level, (self._now_tick // self._span[level]) % self.wheel_size)
+            self._cascade(0, self._now_tick % self.wheel_size)
+
+        expired = list(self._due)
+        for key in expired:
+            del self._where[key]
+        self._due.clear()
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        가장 이른 만료 시각 (틱 경계, 타이머가 없으면 None)
+        level마다 현재 위치 다음의 첫 비어 있지 않은 슬롯만 확인한다.
+        (현재 구간 슬롯은 이미 cascade되었으므로 남은 타이머는 한 바퀴 뒤의 것,
+        범위를 넘어 최상위 level에 임시로 둔 타이머가 있을 수 있으므로 최상위 level은 모두 확인)
+        """
+        if self._due:
+            return self._now_tick * self.tick
+        earliest = None
+        for level in range(self.levels):
+            current = self._now_tick // self._span[level]
+            for step in range(1, self.wheel_size + 1):
+                bucket = self._slots[level][(current + step) % self.wheel_size]
+                if bucket:
+                    first = min(bucket.values())
+                    earliest = first if earliest is None else min(earliest, first)
+                    if level < self.levels - 1:
+                        break
+        return earliest * self.tick if earliest is not None else None
+
+    def _bucket(self, key: Hashable) -> Dict[Hashable, int]:
+        level, slot = self._where[key]
+        return self._due if level < 0 else self._slots[level][slot]
+
+    def _place(self, key: Hashable, deadline_tick: int):
+        """마감까지 남은 틱에 맞는 level/슬롯에 배치"""
+        delta = deadline_tick - self._now_tick
+        if delta <= 0:
+            self._due[key] = deadline_tick
+            self._where[key] = (-1, -1)
+            return
+        # 범위를 넘으면 최상위 level의 마지막 슬롯에 두고 cascade 때 다시 배치
+        position = min(deadline_tick, self._now_tick + self._span[self.levels] - 1)
+        level = 0
+        while delta >= self._span[level + 1] and level < self.levels - 1:
+            level += 1
+        slot = (position // self._span[level]) % self.wheel_size
+        self._slots[level][slot][key] = deadline_tick
+        self._where[key] = (level, slot)
+
+    def _cascade(self, level: int, slot: int):
+        """슬롯의 타이머를 남은 시간에 맞게 다시 배치 (level 0이면 만료 처리)"""
+        bucket = self._slots[level][slot]
+        if not bucket:
+            return
+        self._slots[level][slot] = {}
+        for key, deadline_tick in bucket.items():
+            self._place(key, deadline_tick)
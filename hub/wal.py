@@ -0,0 +1,274 @@
+"""
+Hub Write-Ahead Log
+HubStore 영속화를 위한 append-only 로그와 압축 스냅샷
+
+디렉토리 구성:
+    snapshot-<version>.json  특정 store 버전의 전체 상태 (압축 스냅샷)
+    wal-<version>.log        해당 버전 이후의 변경 기록 (NDJSON, 한 줄에 한 레코드)
+
+시작 시 가장 최근 스냅샷을 읽고, 그 이후 WAL 세그먼트를 순서대로 재생한다.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+from hub.models import AppWrapper, ClusterInfo
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class WalRecord(BaseModel):
+    """WAL 레코드 한 줄"""
+    op: str                           # put | del | cluster | cluster_del
+    v: int = 0                        # 커밋 시점의 store 버전
+    aw: Optional[AppWrapper] = None
+    ci: Optional[ClusterInfo] = None
+    id: Optional[str] = None
+
+
+class SnapshotFile(BaseModel):
+    """압축 스냅샷 파일"""
+    version: int
+    appwrappers: List[AppWrapper]
+    clusters: List[ClusterInfo]
+
+
+class WriteAheadLog:
+    """
+    Group commit을 지원하는 Write-Ahead Log
+
+    fsync 정책:
+    - always: 쓰기는 fsync 완료까지 대기 (동시에 대기 중인 쓰기를 한 번의 fsync로 묶음)
+    - interval: fsync_interval마다 백그라운드에서 기록 및 fsync (쓰기는 대기하지 않음)
+    - never: 백그라운드에서 기록만 하고 fsync는 OS에 맡김
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        fsync: str = "always",
+        fsync_interval: float = 0.05,
+        checkpoint_records: int = 100_000
+    ):
+        """
+        WAL 초기화
+
+        Args:
+            data_dir: 스냅샷과 WAL 세그먼트를 저장할 디렉토리
+            fsync: fsync 정책 (always, interval, never)
+            fsync_interval: interval/never 정책의 백그라운드 기록 주기 (초)
+            checkpoint_records: 이 개수만큼 기록되면 스냅샷으로 압축
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+
+        self.data_dir = data_dir
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.checkpoint_records = checkpoint_records
+        os.makedirs(data_dir, exist_ok=True)
+
+        self._file = None
+        self._buffer: List[str] = []
+        self._seq = 0            # 마지막으로 append한 레코드 번호
+        self._durable_seq = 0    # 파일에 기록(및 정책에 따라 fsync) 완료된 레코드 번호
+        self._records_since_checkpoint = 0
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    # ==================== 복구 ====================
+
+    def _snapshots(self) -> List[Tuple[int, str]]:
+        paths = glob.glob(os.path.join(self.data_dir, "snapshot-*.json"))
+        return sorted((int(os.path.basename(p)[9:-5]), p) for p in paths)
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        paths = glob.glob(os.path.join(self.data_dir, "wal-*.log"))
+        return sorted((int(os.path.basename(p)[4:-4]), p) for p in paths)
+
+    def load(self) -> Tuple[Optional[SnapshotFile], List[WalRecord]]:
+        """
+        최근 스냅샷과 그 이후 WAL 레코드 로드 (동기, 시작 시 한 번 호출)
+
+        Returns:
+            (스냅샷 또는 None, 재생할 레코드 리스트)
+        """
+        snapshot = None
+        snapshots = self._snapshots()
+        if snapshots:
+            with open(snapshots[-1][1], "rb") as f:
+                snapshot = SnapshotFile.model_validate_json(f.read())
+
+        base_version = snapshot.version if snapshot else 0
+        records: List[WalRecord] = []
+
+        for start_version, path in self._segments():
+            if start_version < base_version:
+                continue
+            with open(path, "rb") as f:
+                lines = f.read().splitlines()
+            for index, line in enumerate(lines):
+                if not line:
+                    continue
+                try:
+                    records.append(WalRecord.model_validate_json(line))
+                except ValueError:
+                    # 마지막 줄이 기록 도중 잘린 경우만 허용
+                    if index == len(lines) - 1:
+                        logger.warning(f"Ignoring torn WAL record at end of {path}")
+                        break
+                    raise
+
+        return snapshot, records
+
+    def open(self, version: int):
+        """
+        쓰기용 세그먼트 열기 (복구 후 호출)
+
+        Args:
+            version: 현재 store 버전 (새 세그먼트 이름)
+        """
+        self._open_segment(version)
+        logger.info(f"WAL opened in {self.data_dir} (fsync={self.fsync})")
+
+    def _open_segment(self, version: int):
+        if self._file:
+            self._file.close()
+        path = os.path.join(self.data_dir, f"wal-{version:020d}.log")
+        self._file = open(path, "ab")
+
+    # ==================== 쓰기 ====================
+
+    def append(self, record: str) -> int:
+        """
+        레코드를 버퍼에 추가 (HubStore 쓰기 락 안에서 호출)
+
+        Args:
+            record: JSON 직렬화된 WalRecord (기본값 필드는 생략)
+
+        Returns:
+            레코드 번호
+        """
+        self._buffer.append(record)
+        self._seq += 1
+        self._records_since_checkpoint += 1
+        return self._seq
+
+    @property
+    def last_seq(self) -> int:
+        """마지막으로 append한 레코드 번호"""
+        return self._seq
+
+    def needs_checkpoint(self) -> bool:
+        """스냅샷 압축이 필요한지 여부"""
+        return self._records_since_checkpoint >= self.checkpoint_records
+
+    async def commit(self, seq: int):
+        """
+        레코드가 정책에 맞게 영속화될 때까지 대기
+
+        always 정책에서는 이미 진행 중인 flush를 기다린 뒤,
+        그동안 쌓인 모든 쓰기를 한 번의 write + fsync로 기록 (group commit)
+        """
+        if self.fsync != "always":
+            self._ensure_flusher()
+            return
+
+        if self._durable_seq >= seq:
+            return
+        async with self._flush_lock:
+            if self._durable_seq < seq:
+                await self._flush()
+
+    async def _flush(self):
+        """버퍼를 파일에 기록 (_flush_lock 보유 상태에서 호출)"""
+        if not self._buffer:
+            return
+        batch, upto = self._buffer, self._seq
+        self._buffer = []
+        await asyncio.to_thread(self._write, batch)
+        self._durable_seq = upto
+
+    def _write(self, batch: List[str]):
+        self._file.write(("\n".join(batch) + "\n").encode())
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flusher_loop())
+
+    async def _flusher_loop(self):
+        """interval/never 정책의 백그라운드 기록 루프"""
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            try:
+                async with self._flush_lock:
+                    await self._flush()
+            except Exception as e:
+                logger.error(f"Error flushing WAL: {e}", exc_info=True)
+
+    # ==================== 스냅샷 ====================
+
+    async def roll(self, version: int):
+        """
+        남은 버퍼를 기록하고 새 세그먼트로 전환 (HubStore 쓰기 락 안에서 호출)
+        이후 레코드는 version 스냅샷 이후의 변경만 담는다.
+        """
+        async with self._flush_lock:
+            await self._flush()
+            await asyncio.to_thread(self._open_segment, version)
+        self._records_since_checkpoint = 0
+
+    def write_snapshot(self, version: int, appwrappers: List[AppWrapper], clusters: List[ClusterInfo]):
+        """
+        압축 스냅샷 기록 후 오래된 스냅샷/세그먼트 삭제 (동기, 스레드에서 호출)
+        커밋된 객체는 변경되지 않으므로 쓰기 락 없이 직렬화해도 안전하다.
+        """
+        started = time.perf_counter()
+        snapshot = SnapshotFile.model_construct(
+            version=version, appwrappers=appwrappers, clusters=clusters
+        )
+        path = os.path.join(self.data_dir, f"snapshot-{version:020d}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(snapshot.model_dump_json(exclude_defaults=True).encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        # 새 스냅샷 이전의 세그먼트와 스냅샷 정리
+        for start_version, old_path in self._segments():
+            if start_version < version:
+                os.remove(old_path)
+        for snapshot_version, old_path in self._snapshots():
+            if snapshot_version < version:
+                os.remove(old_path)
+
+        logger.info(
+            f"Wrote snapshot v{version}: {len(appwrappers)} AppWrappers "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    async def close(self):
+        """남은 버퍼 기록 후 닫기"""
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        async with self._flush_lock:
+            await self._flush()
+        if self._file:
+            self._file.close()
+            self._file = None
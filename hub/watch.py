@@ -0,0 +1,161 @@
+"""
+Hub Store Change Feed
+HubStore의 AppWrapper 변경을 구독자에게 순서대로 전달하는 watch 인터페이스
+
+- 이벤트는 store 버전(resource_version) 순서로 전달
+- 최근 이벤트를 history에 보관하여 마지막으로 받은 버전부터 재개 가능
+- 구독자별 버퍼는 제한되며, 넘치면 해당 구독만 만료시켜 writer를 막지 않음
+"""
+
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Deque, NamedTuple, Optional, Set
+from hub.records import AppWrapperRecord
+
+logger = logging.getLogger(__name__)
+
+
+class WatchEventType(str, Enum):
+    """변경 이벤트 종류"""
+    ADDED = "ADDED"
+    MODIFIED = "MODIFIED"
+    DELETED = "DELETED"
+
+
+class WatchEvent(NamedTuple):
+    """변경 이벤트 (DELETED는 삭제 직전의 레코드를 담음)"""
+    version: int
+    type: WatchEventType
+    object: AppWrapperRecord
+
+
+class WatchExpiredError(Exception):
+    """
+    요청한 버전이 history보다 오래되었거나 구독자 버퍼가 넘침
+    구독자는 마지막으로 받은 버전으로 재구독하거나, 전체를 다시 읽은 뒤 그 버전부터 구독한다.
+    """
+
+    def __init__(self, since_version: int, oldest_version: int, reason: str = "too old"):
+        self.since_version = since_version
+        self.oldest_version = oldest_version
+        super().__init__(
+            f"Watch from version {since_version} expired ({reason}); "
+            f"oldest resumable version is {oldest_version}"
+        )
+
+
+class _Subscriber:
+    __slots__ = ("queue", "overflowed", "last_version")
+
+    def __init__(self, buffer_size: int, since_version: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+        self.last_version = since_version
+
+
+class ChangeFeed:
+    """
+    HubStore 변경 이벤트 배포
+
+    publish는 store 쓰기 경로(락 안)에서 동기로 호출되며 대기하지 않는다.
+    """
+
+    def __init__(self, history_size: int = 10000, buffer_size: int = 1000):
+        """
+        Change feed 초기화
+
+        Args:
+            history_size: 재개를 위해 보관할 최근 이벤트 수
+            buffer_size: 구독자별 최대 미전달 이벤트 수
+        """
+        self.history_size = history_size
+        self.buffer_size = buffer_size
+        self._history: Deque[WatchEvent] = deque(maxlen=history_size)
+        # 이 버전 이하의 이벤트는 history에서 빠져 재개할 수 없음
+        self._expired_upto = 0
+        self._subscribers: Set[_Subscriber] = set()
+
+    @property
+    def oldest_version(self) -> int:
+        """재개 가능한 가장 오래된 버전"""
+        return self._expired_upto
+
+    def reset(self, version: int):
+        """history 초기화 (WAL 복구 등으로 이전 이벤트를 알 수 없을 때)"""
+        self._history.clear()
+        self._expired_upto = version
+
+    def publish(self, version: int, event_type: WatchEventType, record: AppWrapperRecord):
+        """
+        이벤트 게시
+
+        Args:
+            version: 변경 후 store 버전
+            event_type: 이벤트 종류
+            record: 변경된(삭제 시 삭제 직전) 레코드
+        """
+        event = WatchEvent(version, event_type, record)
+        if len(self._history) == self.history_size:
+            self._expired_upto = self._history[0].version
+        self._history.append(event)
+
+        overflowed = []
+        for subscriber in self._subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                overflowed.append(subscriber)
+        for subscriber in overflowed:
+            self._subscribers.discard(subscriber)
+            logger.warning(
+                f"Watch subscriber fell behind by {self.buffer_size} events; "
+                f"expiring at version {subscriber.last_version}"
+            )
+
+    async def watch(self, since_version: Optional[int] = None) -> AsyncIterator[WatchEvent]:
+        """
+        변경 이벤트 구독
+
+        Args:
+            since_version: 이 버전 이후의 이벤트부터 전달 (None이면 지금 이후)
+
+        Yields:
+            WatchEvent
+
+        Raises:
+            WatchExpiredError: since_version이 history보다 오래되었거나 버퍼가 넘쳤을 때
+        """
+        if since_version is not None and since_version < self._expired_upto:
+            raise WatchExpiredError(since_version, self._expired_upto)
+
+        # history 복사와 구독 등록 사이에 await가 없으므로 이벤트 누락/중복이 없다
+        backlog = []
+        if since_version is not None:
+            for event in reversed(self._history):
+                if event.version <= since_version:
+                    break
+                backlog.append(event)
+            backlog.reverse()
+        else:
+            since_version = self._history[-1].version if self._history else self._expired_upto
+
+        subscriber = _Subscriber(self.buffer_size, since_version)
+        self._subscribers.add(subscriber)
+        try:
+            for event in backlog:
+                subscriber.last_version = event.version
+                yield event
+
+            while True:
+                if subscriber.overflowed and subscriber.queue.empty():
+                    raise WatchExpiredError(
+                        subscriber.last_version, self._expired_upto, reason="subscriber buffer overflow"
+                    )
+                event = await subscriber.queue.get()
+                subscriber.last_version = event.version
+                yield event
+        finally:
+            self._subscribers.discard(subscriber)